@@ -11,6 +11,8 @@ import logging
 from typing import Dict
 from pathlib import Path
 
+from core.ollama_transport import get_ollama_transport
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,7 +52,7 @@ class GenericVisionAdapter:
         logger.info(f"GenericVisionAdapter: analyzing with {self.model_name}")
 
         try:
-            response = requests.post(
+            response = get_ollama_transport().post(
                 self.api_url,
                 json={
                     "model": self.model_name,
@@ -98,7 +100,7 @@ class GenericVisionAdapter:
     def health_check(self) -> bool:
         """Check if model is available in Ollama."""
         try:
-            response = requests.get(f"{self.ollama_host}/api/tags", timeout=5)
+            response = get_ollama_transport().get(f"{self.ollama_host}/api/tags", timeout=5)
             if response.status_code != 200:
                 return False
             models = [m.get("name") for m in response.json().get("models", [])]
@@ -0,0 +1,198 @@
+"""
+Vision Input Pre-processing
+
+Shrinks images before the adapters base64-encode them into the Ollama
+request. Vision models work at roughly 1 MP internally, so a 12 MP photo
+is mostly wasted upload, JSON parsing and model-side resizing.
+
+For each (image content, model) pair:
+- Apply EXIF orientation (models see the photo the way the user does)
+- Downscale to the model's longest edge (config.VISION_MAX_EDGE[_BY_MODEL])
+- Re-encode as JPEG/WebP (config.VISION_IMAGE_FORMAT), alpha flattened on white
+
+Prepared files are cached on disk by content hash, so task retries, model
+fallbacks and re-analysis reuse them. Images that are already small,
+upright JPEG/PNG files are sent as-is.
+"""
+
+import logging
+import os
+import time
+from dataclasses import dataclass
+from hashlib import sha256
+from io import BytesIO
+from typing import Dict, Optional
+
+from PIL import Image as PILImage, ImageOps
+
+from core import config
+
+logger = logging.getLogger(__name__)
+
+# Formats every Ollama vision model decodes
+PASSTHROUGH_FORMATS = ("JPEG", "PNG")
+EXIF_ORIENTATION = 0x0112
+
+
+@dataclass
+class PreparedImage:
+    """Result of pre-processing one image for one model."""
+    path: str
+    original_bytes: int
+    prepared_bytes: int
+    max_edge: int
+    cache_hit: bool = False
+    prepare_ms: float = 0.0
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.original_bytes - self.prepared_bytes
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "original_bytes": self.original_bytes,
+            "prepared_bytes": self.prepared_bytes,
+            "bytes_saved": self.bytes_saved,
+            "max_edge": self.max_edge,
+            "cache_hit": self.cache_hit,
+            "prepare_ms": round(self.prepare_ms, 1),
+        }
+
+
+def max_edge_for(model_name: str) -> int:
+    """Longest edge for a model: the longest matching prefix override, else the default."""
+    matches = [name for name in config.VISION_MAX_EDGE_BY_MODEL if model_name.startswith(name)]
+    if not matches:
+        return config.VISION_MAX_EDGE
+    return config.VISION_MAX_EDGE_BY_MODEL[max(matches, key=len)]
+
+
+def _cache_path(content_hash: str, max_edge: int) -> str:
+    fmt = config.VISION_IMAGE_FORMAT
+    extension = "jpg" if fmt == "jpeg" else fmt
+    return os.path.join(
+        config.VISION_CACHE_DIR,
+        f"{content_hash}.{max_edge}q{config.VISION_IMAGE_QUALITY}.{extension}",
+    )
+
+
+def _encode(img: PILImage.Image, max_edge: int) -> bytes:
+    """Downscale and encode an upright image."""
+    if img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info):
+        rgba = img.convert("RGBA")
+        img = PILImage.new("RGB", rgba.size, "white")
+        img.paste(rgba, mask=rgba.getchannel("A"))
+    elif img.mode != "RGB":
+        img = img.convert("RGB")
+
+    img.thumbnail((max_edge, max_edge), PILImage.Resampling.LANCZOS)
+
+    buffer = BytesIO()
+    if config.VISION_IMAGE_FORMAT == "webp":
+        img.save(buffer, "WEBP", quality=config.VISION_IMAGE_QUALITY, method=4)
+    else:
+        img.save(buffer, "JPEG", quality=config.VISION_IMAGE_QUALITY)
+    return buffer.getvalue()
+
+
+def _write(path: str, data: bytes) -> None:
+    """Write atomically so concurrent workers never read a partial file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def prune_cache() -> int:
+    """Delete least recently used prepared files beyond VISION_CACHE_MAX_MB. Returns files removed."""
+    try:
+        entries = [entry for entry in os.scandir(config.VISION_CACHE_DIR) if entry.is_file()]
+    except FileNotFoundError:
+        return 0
+
+    files = sorted((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in entries)
+    total = sum(size for _, size, _ in files)
+    limit = config.VISION_CACHE_MAX_MB * 1024 * 1024
+    removed = 0
+    for _, size, path in files:
+        if total <= limit:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+def prepare_image(image_path: str, model_name: str) -> PreparedImage:
+    """
+    Prepare an image for a vision model.
+
+    Returns:
+        PreparedImage whose path is either a cached prepared file or the
+        original (already small enough)
+
+    Raises:
+        FileNotFoundError: If the image does not exist
+        OSError: If the image cannot be decoded
+    """
+    started = time.perf_counter()
+    max_edge = max_edge_for(model_name)
+
+    with open(image_path, "rb") as f:
+        data = f.read()
+
+    cache_path = _cache_path(sha256(data).hexdigest()[:32], max_edge)
+    if os.path.exists(cache_path):
+        os.utime(cache_path)  # LRU order for prune_cache()
+        return PreparedImage(
+            path=cache_path,
+            original_bytes=len(data),
+            prepared_bytes=os.path.getsize(cache_path),
+            max_edge=max_edge,
+            cache_hit=True,
+            prepare_ms=(time.perf_counter() - started) * 1000,
+        )
+
+    unchanged = PreparedImage(path=image_path, original_bytes=len(data), prepared_bytes=len(data), max_edge=max_edge)
+
+    with PILImage.open(BytesIO(data)) as img:
+        rotated = img.getexif().get(EXIF_ORIENTATION, 1) != 1
+        passthrough = img.format in PASSTHROUGH_FORMATS
+        if passthrough and not rotated and max(img.size) <= max_edge:
+            unchanged.prepare_ms = (time.perf_counter() - started) * 1000
+            return unchanged
+
+        # JPEG decoders can scale down by 1/2..1/8 while decoding
+        img.draft("RGB", (max_edge, max_edge))
+        prepared = _encode(ImageOps.exif_transpose(img), max_edge)
+
+    if passthrough and not rotated and len(prepared) >= len(data):
+        unchanged.prepare_ms = (time.perf_counter() - started) * 1000
+        return unchanged
+
+    _write(cache_path, prepared)
+    prune_cache()
+    return PreparedImage(
+        path=cache_path,
+        original_bytes=len(data),
+        prepared_bytes=len(prepared),
+        max_edge=max_edge,
+        prepare_ms=(time.perf_counter() - started) * 1000,
+    )
+
+
+def try_prepare_image(image_path: str, model_name: str) -> Optional[PreparedImage]:
+    """prepare_image() that never fails: None means send the original."""
+    if not config.VISION_PREPROCESS_ENABLED:
+        return None
+    try:
+        return prepare_image(image_path, model_name)
+    except FileNotFoundError:
+        return None  # The adapter reports the missing file
+    except Exception as e:
+        logger.warning(f"Vision pre-processing failed for {image_path}, sending original: {e}")
+        return None
@@ -11,6 +11,8 @@ import logging
 from typing import Dict, Optional
 from pathlib import Path
 
+from core.ollama_transport import get_ollama_transport
+
 logger = logging.getLogger(__name__)
 
 
@@ -90,7 +92,7 @@ class LlamaVisionAdapter:
 
         try:
             # Call Ollama API (same as tasks.py:331-340)
-            response = requests.post(
+            response = get_ollama_transport().post(
                 self.api_url,
                 json={
                     "model": self.model_name,
@@ -162,7 +164,7 @@ class LlamaVisionAdapter:
         """
         try:
             # Check if Ollama server is up
-            response = requests.get(f"{self.ollama_host}/api/tags", timeout=5)
+            response = get_ollama_transport().get(f"{self.ollama_host}/api/tags", timeout=5)
 
             if response.status_code != 200:
                 logger.warning(f"Ollama server health check failed: HTTP {response.status_code}")
@@ -11,6 +11,8 @@ import logging
 from typing import Dict, Optional
 from pathlib import Path
 
+from core.ollama_transport import get_ollama_transport
+
 logger = logging.getLogger(__name__)
 
 
@@ -105,7 +107,7 @@ class QwenVisionAdapter:
 
         try:
             # Call Ollama API
-            response = requests.post(
+            response = get_ollama_transport().post(
                 self.api_url,
                 json=payload,
                 timeout=timeout
@@ -183,7 +185,7 @@ class QwenVisionAdapter:
         """
         try:
             # Check if Ollama server is up
-            response = requests.get(f"{self.ollama_host}/api/tags", timeout=5)
+            response = get_ollama_transport().get(f"{self.ollama_host}/api/tags", timeout=5)
 
             if response.status_code != 200:
                 logger.warning(f"Ollama server health check failed: HTTP {response.status_code}")
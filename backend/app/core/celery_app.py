@@ -23,6 +23,8 @@ celery_app = Celery(
         "features.search.tasks",
         "features.rag_chat.tasks",
         "features.images.tasks",
+        "features.images.tasks_renditions",  # Thumbnails and previews
+        "features.images.tasks_dedup",  # Upload content hash backfill
         "features.brain.tasks",
         "features.graph.tasks",  # Phase 2: Semantic edges and clustering
         "features.settings.tasks",  # Phase 4: Data export tasks
@@ -24,6 +24,13 @@ REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))  #
 
 # Ollama Configuration
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://ollama:11434")
+# Ollama transport - one pooled keep-alive client per process (sync) and event loop (async)
+OLLAMA_HTTP_MAX_CONNECTIONS = int(os.getenv("OLLAMA_HTTP_MAX_CONNECTIONS", "100"))
+OLLAMA_HTTP_MAX_KEEPALIVE = int(os.getenv("OLLAMA_HTTP_MAX_KEEPALIVE", "20"))
+# Timeouts (seconds) used when a caller does not pass its own
+OLLAMA_CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5"))
+OLLAMA_GENERATE_TIMEOUT = float(os.getenv("OLLAMA_GENERATE_TIMEOUT", "180"))  # /api/chat, /api/generate
+OLLAMA_METADATA_TIMEOUT = float(os.getenv("OLLAMA_METADATA_TIMEOUT", "5"))  # /api/tags, /api/ps, /api/show
 
 # AI Model Configuration (Phase 1: Migration to Qwen 2.5-VL)
 # Feature flags for gradual model migration
@@ -46,10 +53,49 @@ METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
 MAX_UPLOAD_SIZE_MB = int(os.getenv("MAX_UPLOAD_SIZE_MB", "10"))
 MAX_UPLOAD_SIZE_BYTES = MAX_UPLOAD_SIZE_MB * 1024 * 1024
 ALLOWED_FILE_TYPES = os.getenv("ALLOWED_FILE_TYPES", "image/jpeg,image/png,image/gif,image/webp").split(",")
+# Uploads are copied to disk in chunks of this many bytes (never held in memory whole)
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
 
 # Directory Configuration
 UPLOAD_DIR = "uploaded_images"
 
+# Image Renditions
+# Longest-side pixel buckets generated after upload and served instead of originals
+IMAGE_RENDITION_SIZES = sorted(int(size) for size in os.getenv("IMAGE_RENDITION_SIZES", "256,768,1600").split(","))
+# Renditions live under their own directory, one subdirectory per image
+IMAGE_RENDITION_DIR = os.getenv("IMAGE_RENDITION_DIR", os.path.join(UPLOAD_DIR, "renditions"))
+# Encoder quality for WebP/AVIF renditions (0-100)
+IMAGE_RENDITION_QUALITY = int(os.getenv("IMAGE_RENDITION_QUALITY", "80"))
+# Also write AVIF renditions when the installed Pillow can encode AVIF
+IMAGE_RENDITION_AVIF = os.getenv("IMAGE_RENDITION_AVIF", "true").lower() == "true"
+
+# Vision Input Pre-processing
+# Images are downscaled, EXIF-rotated and re-encoded before base64 upload to Ollama
+VISION_PREPROCESS_ENABLED = os.getenv("VISION_PREPROCESS_ENABLED", "true").lower() == "true"
+# Default longest edge (px) sent to vision models
+VISION_MAX_EDGE = int(os.getenv("VISION_MAX_EDGE", "1280"))
+# Per-model overrides as "model=edge" pairs; a model matches by name prefix
+VISION_MAX_EDGE_BY_MODEL = {
+    name.strip(): int(edge)
+    for name, edge in (
+        pair.split("=") for pair in os.getenv("VISION_MAX_EDGE_BY_MODEL", "llama3.2-vision=1120").split(",") if "=" in pair
+    )
+}
+# Encoding of prepared images: jpeg or webp
+VISION_IMAGE_FORMAT = os.getenv("VISION_IMAGE_FORMAT", "jpeg").lower()
+VISION_IMAGE_QUALITY = int(os.getenv("VISION_IMAGE_QUALITY", "85"))
+# Prepared images are cached by content hash so retries and re-analysis skip the resize
+VISION_CACHE_DIR = os.getenv("VISION_CACHE_DIR", os.path.join(UPLOAD_DIR, "vision_cache"))
+VISION_CACHE_MAX_MB = int(os.getenv("VISION_CACHE_MAX_MB", "512"))
+
+# Upload Deduplication
+# Re-uploads of an identical file (same owner, same SHA-256) reuse the existing record and analysis
+UPLOAD_DEDUP_ENABLED = os.getenv("UPLOAD_DEDUP_ENABLED", "true").lower() == "true"
+# Images whose perceptual hashes differ in at most this many of 64 bits are reported as near-duplicates
+IMAGE_NEAR_DUPLICATE_DISTANCE = int(os.getenv("IMAGE_NEAR_DUPLICATE_DISTANCE", "6"))
+# Most recent images compared by the near-duplicate report
+IMAGE_DUPLICATE_SCAN_LIMIT = int(os.getenv("IMAGE_DUPLICATE_SCAN_LIMIT", "5000"))
+
 # API Configuration
 API_TITLE = "AI Notes Notetaker API"
 API_VERSION = "1.1.0"
@@ -62,6 +108,10 @@ RAG_MODEL = os.getenv("RAG_MODEL", "qwen3:8b")
 RAG_TIMEOUT = int(os.getenv("RAG_TIMEOUT", "180"))  # seconds (increased for larger model)
 RAG_MAX_CONTEXT_TOKENS = int(os.getenv("RAG_MAX_CONTEXT_TOKENS", "8000"))  # Qwen3 supports 32K
 RAG_TEMPERATURE = float(os.getenv("RAG_TEMPERATURE", "0.3"))  # Lower for factual responses
+# Hybrid search: semantic, chunk, full-text and title candidates fused (RRF) in one SQL statement
+RAG_HYBRID_SEARCH = os.getenv("RAG_HYBRID_SEARCH", "false").lower() == "true"
+# Title search: pg_trgm word_similarity a title needs to match a search string fuzzily
+TITLE_SIMILARITY_THRESHOLD = float(os.getenv("TITLE_SIMILARITY_THRESHOLD", "0.6"))
 
 # Security Configuration (Phase 1: Settings)
 MAX_LOGIN_ATTEMPTS = int(os.getenv("MAX_LOGIN_ATTEMPTS", "5"))
@@ -129,6 +179,7 @@ BRAIN_CORE_TOKEN_BUDGET = int(os.getenv("BRAIN_CORE_TOKEN_BUDGET", "4000"))
 BRAIN_TOPIC_TOKEN_BUDGET = int(os.getenv("BRAIN_TOPIC_TOKEN_BUDGET", "6000"))
 BRAIN_TEMPERATURE = float(os.getenv("BRAIN_TEMPERATURE", "0.7"))
 BRAIN_MIN_NOTES = int(os.getenv("BRAIN_MIN_NOTES", "3"))
+BRAIN_TOPIC_INDEX_CACHE_SIZE = int(os.getenv("BRAIN_TOPIC_INDEX_CACHE_SIZE", "32"))  # users kept in-process
 
 # Dynamic Context Scaling - scales brain budget to the model's context window
 BRAIN_MIN_CONTEXT_TOKENS = int(os.getenv("BRAIN_MIN_CONTEXT_TOKENS", "2000"))
@@ -142,3 +193,49 @@ NEXUS_SOURCE_TOKEN_BUDGET = int(os.getenv("NEXUS_SOURCE_TOKEN_BUDGET", "4000"))
 NEXUS_CONNECTION_TOKEN_BUDGET = int(os.getenv("NEXUS_CONNECTION_TOKEN_BUDGET", "800"))
 NEXUS_ORIGIN_TOKEN_BUDGET = int(os.getenv("NEXUS_ORIGIN_TOKEN_BUDGET", "400"))
 NEXUS_CONVERSATION_TOKEN_BUDGET = int(os.getenv("NEXUS_CONVERSATION_TOKEN_BUDGET", "800"))
+# DEEP-mode diffusion graph: cached per user until the graph version changes or the TTL passes
+NEXUS_DIFFUSION_CACHE_TTL = int(os.getenv("NEXUS_DIFFUSION_CACHE_TTL", "600"))
+NEXUS_DIFFUSION_CACHE_SIZE = int(os.getenv("NEXUS_DIFFUSION_CACHE_SIZE", "8"))  # users kept in-process
+NEXUS_DIFFUSION_SEED_COUNT = int(os.getenv("NEXUS_DIFFUSION_SEED_COUNT", "200"))  # nearest notes seeding the walk
+
+# Embedding Client Configuration - batched /api/embed calls over a pooled session
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_MAX_CONCURRENCY = int(os.getenv("EMBEDDING_MAX_CONCURRENCY", "4"))
+EMBEDDING_MAX_RETRIES = int(os.getenv("EMBEDDING_MAX_RETRIES", "3"))
+EMBEDDING_TIMEOUT = int(os.getenv("EMBEDDING_TIMEOUT", "60"))  # seconds per batch
+
+# Embedding Cache - in-process LRU plus shared Redis tier, keyed on (model, text hash)
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "5000"))  # entries (~3 KB each)
+EMBEDDING_CACHE_TTL_SECONDS = int(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+EMBEDDING_CACHE_REDIS = os.getenv("EMBEDDING_CACHE_REDIS", "true").lower() == "true"
+
+# LLM Response Cache - opt-in per call (LLMProvider.generate_cached) for low-temperature, repeatable prompts
+# Keyed on (provider, model, messages hash, temperature, max_tokens); in-process LRU plus shared Redis tier
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1000"))  # in-process entries
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+LLM_CACHE_REDIS = os.getenv("LLM_CACHE_REDIS", "true").lower() == "true"
+LLM_CACHE_REDIS_MAX_ENTRIES = int(os.getenv("LLM_CACHE_REDIS_MAX_ENTRIES", "50000"))  # oldest evicted first
+
+# AI Settings Cache - per-user model preferences and cloud key fingerprint, dropped on settings/key changes
+# The TTL bounds how long other worker processes can serve stale settings
+AI_SETTINGS_CACHE_TTL = int(os.getenv("AI_SETTINGS_CACHE_TTL", "30"))  # seconds
+AI_SETTINGS_CACHE_SIZE = int(os.getenv("AI_SETTINGS_CACHE_SIZE", "1024"))  # users kept in-process
+
+# Cloud Provider Pool - one SDK client (and its connection pool) per user and provider
+# Replaced when the user's key changes, dropped after the idle timeout or when the pool is full
+CLOUD_CLIENT_POOL_SIZE = int(os.getenv("CLOUD_CLIENT_POOL_SIZE", "64"))
+CLOUD_CLIENT_IDLE_SECONDS = int(os.getenv("CLOUD_CLIENT_IDLE_SECONDS", "600"))
+
+# pgvector HNSW Index Configuration
+# m / ef_construction apply when indexes are (re)built; ef_search is set per query
+PGVECTOR_HNSW_M = int(os.getenv("PGVECTOR_HNSW_M", "16"))
+PGVECTOR_HNSW_EF_CONSTRUCTION = int(os.getenv("PGVECTOR_HNSW_EF_CONSTRUCTION", "64"))
+PGVECTOR_HNSW_EF_SEARCH = int(os.getenv("PGVECTOR_HNSW_EF_SEARCH", "100"))
+
+# Graph Snapshot - per-user compact graph shared between workers via Redis
+# Versions are bumped on note/tag/image/link writes; small note-only changes are patched in
+GRAPH_SNAPSHOT_ENABLED = os.getenv("GRAPH_SNAPSHOT_ENABLED", "true").lower() == "true"
+GRAPH_SNAPSHOT_TTL_SECONDS = int(os.getenv("GRAPH_SNAPSHOT_TTL_SECONDS", str(24 * 3600)))
+GRAPH_SNAPSHOT_LOCAL_SIZE = int(os.getenv("GRAPH_SNAPSHOT_LOCAL_SIZE", "16"))  # users kept in-process
+GRAPH_SNAPSHOT_MAX_INCREMENTAL = int(os.getenv("GRAPH_SNAPSHOT_MAX_INCREMENTAL", "50"))  # changed notes
@@ -45,6 +45,12 @@ def decrypt_api_key(ciphertext: str) -> str:
     return fernet.decrypt(ciphertext.encode("utf-8")).decode("utf-8")
 
 
+def make_key_fingerprint(api_key: str, base_url: str = None) -> str:
+    """Short SHA-256 fingerprint of a key and its endpoint, to detect rotation."""
+    material = f"{base_url or ''}\n{api_key}".encode("utf-8")
+    return hashlib.sha256(material).hexdigest()[:16]
+
+
 def make_key_hint(api_key: str) -> str:
     """Create a safe hint from an API key (e.g., 'sk-...abc1')."""
     if len(api_key) <= 8:
@@ -7,7 +7,7 @@ Defines the contract all LLM providers must implement.
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Optional, Generator, Any
+from typing import List, Optional, Generator, AsyncGenerator, Any
 
 
 class ProviderType(str, Enum):
@@ -58,13 +58,14 @@ ERROR_MESSAGES = {
 
 def classify_llm_error(error: Exception) -> tuple[str, str]:
     """Classify an LLM exception into (error_type, user_message)."""
+    import httpx
     import requests
 
     error_str = str(error).lower()
 
-    if isinstance(error, requests.exceptions.Timeout):
+    if isinstance(error, (requests.exceptions.Timeout, httpx.TimeoutException)):
         return "timeout", ERROR_MESSAGES["timeout"]
-    if isinstance(error, requests.exceptions.ConnectionError):
+    if isinstance(error, (requests.exceptions.ConnectionError, httpx.ConnectError)):
         return "connection", ERROR_MESSAGES["connection"]
     if "connection" in error_str or "refused" in error_str:
         return "connection", ERROR_MESSAGES["connection"]
@@ -105,6 +106,126 @@ class LLMProvider(ABC):
         """Stream response chunks."""
         ...
 
+    def generate_cached(
+        self,
+        messages: List[LLMMessage],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        cache_ttl: Optional[int] = None,
+        **kwargs,
+    ) -> LLMResponse:
+        """
+        generate() through the LLM response cache.
+
+        Opt-in for callers whose output only depends on the prompt (titles,
+        summaries, extraction over unchanged input). Empty responses are not
+        cached. See core/llm/response_cache.py.
+        """
+        from core import config
+        from core.llm.response_cache import get_llm_response_cache, make_llm_cache_key
+
+        if not config.LLM_CACHE_ENABLED:
+            return self.generate(messages, model, temperature=temperature, max_tokens=max_tokens, **kwargs)
+
+        cache = get_llm_response_cache()
+        key = make_llm_cache_key(
+            self.provider_type.value, model, messages, temperature, max_tokens, kwargs
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+        response = self.generate(messages, model, temperature=temperature, max_tokens=max_tokens, **kwargs)
+        if response.content:
+            cache.set(key, response, cache_ttl)
+        return response
+
+    async def agenerate(
+        self,
+        messages: List[LLMMessage],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        **kwargs,
+    ) -> LLMResponse:
+        """
+        Generate a complete response without blocking the event loop.
+
+        Default runs generate() in a worker thread. Providers with an
+        async HTTP client override this.
+        """
+        import asyncio
+
+        return await asyncio.to_thread(
+            lambda: self.generate(
+                messages, model, temperature=temperature, max_tokens=max_tokens, **kwargs
+            )
+        )
+
+    async def agenerate_cached(
+        self,
+        messages: List[LLMMessage],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        cache_ttl: Optional[int] = None,
+        **kwargs,
+    ) -> LLMResponse:
+        """Async version of generate_cached() on top of agenerate()."""
+        import asyncio
+        from core import config
+        from core.llm.response_cache import get_llm_response_cache, make_llm_cache_key
+
+        if not config.LLM_CACHE_ENABLED:
+            return await self.agenerate(messages, model, temperature=temperature, max_tokens=max_tokens, **kwargs)
+
+        cache = get_llm_response_cache()
+        key = make_llm_cache_key(
+            self.provider_type.value, model, messages, temperature, max_tokens, kwargs
+        )
+        # The Redis lookup blocks briefly; keep it off the event loop
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            return cached
+
+        response = await self.agenerate(messages, model, temperature=temperature, max_tokens=max_tokens, **kwargs)
+        if response.content:
+            await asyncio.to_thread(cache.set, key, response, cache_ttl)
+        return response
+
+    async def astream(
+        self,
+        messages: List[LLMMessage],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        **kwargs,
+    ) -> AsyncGenerator[LLMStreamChunk, None]:
+        """
+        Stream response chunks without blocking the event loop.
+
+        Default pulls chunks from the blocking stream() in a worker thread,
+        one chunk per hop. Providers with an async HTTP client override this.
+        """
+        import asyncio
+
+        chunks = self.stream(
+            messages, model, temperature=temperature, max_tokens=max_tokens, **kwargs
+        )
+        end = object()
+        try:
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, end)
+                if chunk is end:
+                    break
+                yield chunk
+        finally:
+            # Release the provider's HTTP response if the caller stopped early
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                await asyncio.to_thread(close)
+
     @abstractmethod
     def health_check(self) -> dict:
         """Check provider connectivity and return status."""
@@ -3,12 +3,17 @@ Ollama LLM Provider - Wraps local Ollama HTTP API.
 
 Implements the LLMProvider interface for Ollama's /api/chat endpoint.
 Includes a circuit breaker to fast-fail when Ollama is unreachable.
+
+All requests go through the shared Ollama transport (pooled keep-alive
+connections). Async variants (agenerate/astream) use its AsyncClient, so
+streaming endpoints never block the event loop.
 """
 
 import json
 import logging
-from typing import List, Generator, Optional
+from typing import Any, AsyncGenerator, Dict, List, Generator, Optional
 
+import httpx
 import requests
 
 from core import config
@@ -21,6 +26,7 @@ from core.llm.base import (
     classify_llm_error,
 )
 from core.llm.circuit_breaker import CircuitBreaker, CircuitBreakerOpen
+from core.ollama_transport import get_ollama_transport
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +43,44 @@ def get_ollama_circuit_breaker() -> CircuitBreaker:
     return _ollama_circuit_breaker
 
 
+def _chat_payload(
+    messages: List[LLMMessage],
+    model: str,
+    temperature: float,
+    max_tokens: int,
+    stream: bool,
+    kwargs: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Build the /api/chat request body."""
+    options = {"temperature": temperature, "num_predict": max_tokens}
+    if kwargs.get("context_window"):
+        options["num_ctx"] = kwargs["context_window"]
+    return {
+        "model": model,
+        "messages": [{"role": m.role, "content": m.content} for m in messages],
+        "stream": stream,
+        "think": False,
+        "options": options,
+    }
+
+
+def _parse_stream_line(line) -> Optional[LLMStreamChunk]:
+    """Parse one NDJSON line of a streaming /api/chat response."""
+    if not line:
+        return None
+    try:
+        data = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    done = data.get("done", False)
+    return LLMStreamChunk(
+        content=data.get("message", {}).get("content", ""),
+        done=done,
+        input_tokens=data.get("prompt_eval_count", 0) if done else 0,
+        output_tokens=data.get("eval_count", 0) if done else 0,
+    )
+
+
 class OllamaProvider(LLMProvider):
     """LLM provider for local Ollama models."""
 
@@ -57,23 +101,10 @@ class OllamaProvider(LLMProvider):
         """Non-streaming generation via Ollama /api/chat."""
         self._breaker.pre_request()
 
-        ollama_messages = [
-            {"role": m.role, "content": m.content} for m in messages
-        ]
-        options = {"temperature": temperature, "num_predict": max_tokens}
-        if kwargs.get("context_window"):
-            options["num_ctx"] = kwargs["context_window"]
-
         try:
-            response = requests.post(
+            response = get_ollama_transport().post(
                 f"{self.host}/api/chat",
-                json={
-                    "model": model,
-                    "messages": ollama_messages,
-                    "stream": False,
-                    "think": False,
-                    "options": options,
-                },
+                json=_chat_payload(messages, model, temperature, max_tokens, False, kwargs),
                 timeout=kwargs.get("timeout", 180),
             )
             response.raise_for_status()
@@ -111,51 +142,24 @@ class OllamaProvider(LLMProvider):
         """Streaming generation via Ollama /api/chat."""
         self._breaker.pre_request()
 
-        ollama_messages = [
-            {"role": m.role, "content": m.content} for m in messages
-        ]
-        options = {"temperature": temperature, "num_predict": max_tokens}
-        if kwargs.get("context_window"):
-            options["num_ctx"] = kwargs["context_window"]
-
         try:
-            response = requests.post(
+            with get_ollama_transport().post(
                 f"{self.host}/api/chat",
-                json={
-                    "model": model,
-                    "messages": ollama_messages,
-                    "stream": True,
-                    "think": False,
-                    "options": options,
-                },
+                json=_chat_payload(messages, model, temperature, max_tokens, True, kwargs),
                 stream=True,
                 timeout=kwargs.get("timeout", 180),
-            )
-            response.raise_for_status()
+            ) as response:
+                response.raise_for_status()
 
-            self._breaker.record_success()
+                self._breaker.record_success()
 
-            for line in response.iter_lines():
-                if not line:
-                    continue
-                try:
-                    data = json.loads(line)
-                    token = data.get("message", {}).get("content", "")
-                    done = data.get("done", False)
-                    yield LLMStreamChunk(
-                        content=token,
-                        done=done,
-                        input_tokens=(
-                            data.get("prompt_eval_count", 0) if done else 0
-                        ),
-                        output_tokens=(
-                            data.get("eval_count", 0) if done else 0
-                        ),
-                    )
-                    if done:
+                for line in response.iter_lines():
+                    chunk = _parse_stream_line(line)
+                    if chunk is None:
+                        continue
+                    yield chunk
+                    if chunk.done:
                         break
-                except json.JSONDecodeError:
-                    continue
 
         except CircuitBreakerOpen:
             raise
@@ -168,12 +172,90 @@ class OllamaProvider(LLMProvider):
                 is_error=True, error_type=error_type,
             )
 
+    async def agenerate(
+        self,
+        messages: List[LLMMessage],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        **kwargs,
+    ) -> LLMResponse:
+        """Non-streaming generation on the shared AsyncClient."""
+        self._breaker.pre_request()
+
+        try:
+            response = await get_ollama_transport().apost(
+                f"{self.host}/api/chat",
+                json=_chat_payload(messages, model, temperature, max_tokens, False, kwargs),
+                timeout=kwargs.get("timeout", 180),
+            )
+            response.raise_for_status()
+            data = response.json()
+
+            self._breaker.record_success()
+
+            return LLMResponse(
+                content=data.get("message", {}).get("content", ""),
+                model=model,
+                provider=ProviderType.OLLAMA,
+                input_tokens=data.get("prompt_eval_count", 0),
+                output_tokens=data.get("eval_count", 0),
+            )
+
+        except httpx.TimeoutException:
+            logger.error(f"Ollama timeout for model {model}")
+            self._breaker.record_failure()
+            raise
+        except httpx.HTTPError as e:
+            logger.error(f"Ollama request failed: {e}")
+            self._breaker.record_failure()
+            raise
+
+    async def astream(
+        self,
+        messages: List[LLMMessage],
+        model: str,
+        temperature: float = 0.7,
+        max_tokens: int = 2048,
+        **kwargs,
+    ) -> AsyncGenerator[LLMStreamChunk, None]:
+        """Streaming generation on the shared AsyncClient."""
+        self._breaker.pre_request()
+
+        try:
+            async with get_ollama_transport().astream(
+                "POST",
+                f"{self.host}/api/chat",
+                json=_chat_payload(messages, model, temperature, max_tokens, True, kwargs),
+                timeout=kwargs.get("timeout", 180),
+            ) as response:
+                response.raise_for_status()
+
+                self._breaker.record_success()
+
+                async for line in response.aiter_lines():
+                    chunk = _parse_stream_line(line)
+                    if chunk is None:
+                        continue
+                    yield chunk
+                    if chunk.done:
+                        break
+
+        except httpx.HTTPError as e:
+            logger.error(f"Ollama streaming failed: {e}")
+            self._breaker.record_failure()
+            error_type, user_msg = classify_llm_error(e)
+            yield LLMStreamChunk(
+                content=user_msg, done=True,
+                is_error=True, error_type=error_type,
+            )
+
     def health_check(self) -> dict:
         """Check Ollama connectivity and circuit breaker state."""
         breaker_status = self._breaker.get_status()
 
         try:
-            response = requests.get(
+            response = get_ollama_transport().get(
                 f"{self.host}/api/tags", timeout=5
             )
             healthy = response.status_code == 200
@@ -205,7 +287,7 @@ class OllamaProvider(LLMProvider):
     def list_models(self) -> List[dict]:
         """List models available in Ollama."""
         try:
-            response = requests.get(
+            response = get_ollama_transport().get(
                 f"{self.host}/api/tags", timeout=5
             )
             response.raise_for_status()
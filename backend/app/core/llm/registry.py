@@ -2,13 +2,22 @@
 LLM Provider Registry - Manages provider instances.
 
 Ollama is a shared singleton (no per-user credentials).
-Cloud providers (Anthropic, OpenAI, Custom) are created per-request
-via factory to prevent credential leakage between users.
+Cloud providers (Anthropic, OpenAI, Custom) are created by a factory and
+never registered globally. Chat requests reuse them through a pool keyed
+by (user_id, provider), so a client (and its TLS connections) is only
+ever handed back to the user whose key built it; a changed key
+fingerprint, the idle timeout or the pool bound drops it.
 """
 
 import logging
-from typing import Dict, Optional
-
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from core import config
+from core.encryption import make_key_fingerprint
 from core.llm.base import LLMProvider, ProviderType
 
 logger = logging.getLogger(__name__)
@@ -47,12 +56,12 @@ def create_cloud_provider(
     base_url: Optional[str] = None,
 ) -> LLMProvider:
     """
-    Create a new cloud LLM provider instance (per-request).
+    Create a new cloud LLM provider instance.
 
     This intentionally does NOT store the instance in the global
     registry, so each user gets an isolated provider with their
-    own API key. The instance is short-lived and garbage-collected
-    after the request completes.
+    own API key. Chat requests reuse instances through
+    get_pooled_cloud_provider(); key validation builds throwaway ones.
 
     Args:
         provider_type: ANTHROPIC, OPENAI, or CUSTOM
@@ -80,6 +89,91 @@ def create_cloud_provider(
     return provider
 
 
+@dataclass
+class _PooledProvider:
+    """A cloud provider built from one user's key."""
+    provider: LLMProvider
+    fingerprint: str
+    last_used: float
+
+
+_cloud_pool: "OrderedDict[Tuple[int, ProviderType], _PooledProvider]" = OrderedDict()
+_cloud_pool_lock = threading.Lock()
+
+
+def _evict_idle_cloud_providers(now: float) -> None:
+    """Drop pooled providers unused for CLOUD_CLIENT_IDLE_SECONDS (lock held)."""
+    idle = [
+        key for key, entry in _cloud_pool.items()
+        if now - entry.last_used > config.CLOUD_CLIENT_IDLE_SECONDS
+    ]
+    for key in idle:
+        del _cloud_pool[key]
+
+
+def get_pooled_cloud_provider(
+    user_id: int,
+    provider_type: ProviderType,
+    fingerprint: str,
+    load_credentials: Callable[[], Optional[dict]],
+) -> Optional[LLMProvider]:
+    """
+    Get a user's cloud provider, reusing the pooled client for the same key.
+
+    Args:
+        user_id: Owner of the credentials
+        provider_type: ANTHROPIC, OPENAI, or CUSTOM
+        fingerprint: make_key_fingerprint() of the key the caller expects
+        load_credentials: Returns {"api_key", "base_url"} on a pool miss
+
+    Returns:
+        The pooled provider, or None if no credentials could be loaded
+    """
+    key = (user_id, provider_type)
+    now = time.monotonic()
+    with _cloud_pool_lock:
+        _evict_idle_cloud_providers(now)
+        entry = _cloud_pool.get(key)
+        if entry is not None and entry.fingerprint == fingerprint:
+            entry.last_used = now
+            _cloud_pool.move_to_end(key)
+            return entry.provider
+
+    credentials = load_credentials()
+    if not credentials:
+        return None
+    provider = create_cloud_provider(
+        provider_type, credentials["api_key"], credentials.get("base_url"),
+    )
+    entry = _PooledProvider(
+        provider=provider,
+        fingerprint=make_key_fingerprint(credentials["api_key"], credentials.get("base_url")),
+        last_used=now,
+    )
+
+    # Evicted clients are only dropped, not closed: a request may still be streaming
+    with _cloud_pool_lock:
+        _cloud_pool[key] = entry
+        _cloud_pool.move_to_end(key)
+        while len(_cloud_pool) > config.CLOUD_CLIENT_POOL_SIZE:
+            _cloud_pool.popitem(last=False)
+    logger.debug(f"Pooled cloud provider {provider_type.value} for user {user_id}")
+    return provider
+
+
+def evict_cloud_providers(user_id: int) -> None:
+    """Drop all pooled providers of a user (API key saved or deleted)."""
+    with _cloud_pool_lock:
+        for key in [key for key in _cloud_pool if key[0] == user_id]:
+            del _cloud_pool[key]
+
+
+def clear_cloud_provider_pool() -> None:
+    """Drop all pooled cloud providers (tests, admin)."""
+    with _cloud_pool_lock:
+        _cloud_pool.clear()
+
+
 def register_cloud_provider(
     provider_type: ProviderType,
     api_key: str,
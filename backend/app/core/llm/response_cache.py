@@ -0,0 +1,245 @@
+"""
+LLM response cache for repeatable prompts.
+
+Opt-in per call via LLMProvider.generate_cached / agenerate_cached. Meant
+for low-temperature calls on inputs that rarely change (topic compression,
+askimap, fact extraction, document enrichment), so brain rebuilds and
+re-indexing do not pay for the same generation twice.
+
+Two tiers, keyed on (provider, model, SHA-256 of the messages, temperature,
+max_tokens, output-affecting options):
+- In-process LRU of LLMResponse objects
+- Redis, shared by all web and Celery workers, with a TTL and an entry cap
+  (oldest entries are evicted first)
+
+Redis failures degrade to memory-only and are retried after a cooldown.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from core import config
+from core.llm.base import LLMMessage, LLMResponse, ProviderType
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "llm"
+REDIS_INDEX_KEY = "llm:index"  # ZSET of cache keys scored by store time
+REDIS_RETRY_COOLDOWN_SECONDS = 30.0
+
+# generate() kwargs that change the output and therefore belong in the key
+KEYED_OPTIONS = ("context_window",)
+
+
+def make_llm_cache_key(
+    provider: str,
+    model: str,
+    messages: List[LLMMessage],
+    temperature: float,
+    max_tokens: int,
+    options: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Cache key for one generation request."""
+    payload = json.dumps(
+        {
+            "messages": [[m.role, m.content] for m in messages],
+            "temperature": round(float(temperature), 4),
+            "max_tokens": max_tokens,
+            "options": {k: (options or {}).get(k) for k in KEYED_OPTIONS},
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    digest = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    return f"{provider}:{model}:{digest}"
+
+
+class LLMResponseCache:
+    """
+    Thread-safe two-tier LLM response cache.
+
+    Args:
+        max_size: Max entries kept in the in-process LRU
+        ttl_seconds: Default expiry for Redis entries
+        redis_url: Redis URL for the shared tier, or None for memory only
+        redis_max_entries: Entry cap for the Redis tier
+    """
+
+    def __init__(
+        self,
+        max_size: int = config.LLM_CACHE_SIZE,
+        ttl_seconds: int = config.LLM_CACHE_TTL_SECONDS,
+        redis_url: Optional[str] = None,
+        redis_max_entries: int = config.LLM_CACHE_REDIS_MAX_ENTRIES,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.redis_url = redis_url
+        self.redis_max_entries = redis_max_entries
+
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at, response)
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_down_until = 0.0
+
+        self._memory_hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+        self._redis_errors = 0
+
+    # ── Public API ────────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[LLMResponse]:
+        """Look up a response in memory, then Redis."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and entry[0] > time.time():
+                self._memory.move_to_end(key)
+                self._memory_hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._memory[key]
+
+        response = self._redis_get(key)
+        with self._lock:
+            if response is None:
+                self._misses += 1
+            else:
+                self._redis_hits += 1
+                self._remember(key, response, self.ttl_seconds)
+        return response
+
+    def set(self, key: str, response: LLMResponse, ttl_seconds: Optional[int] = None) -> None:
+        """Store a response in both tiers."""
+        ttl = ttl_seconds or self.ttl_seconds
+        with self._lock:
+            self._remember(key, response, ttl)
+            self._stores += 1
+        self._redis_set(key, response, ttl)
+
+    def clear(self) -> None:
+        """Clear the in-process tier and reset counters (Redis is left intact)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_hits = 0
+            self._redis_hits = 0
+            self._misses = 0
+            self._stores = 0
+            self._evictions = 0
+            self._redis_errors = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process."""
+        with self._lock:
+            hits = self._memory_hits + self._redis_hits
+            total = hits + self._misses
+            return {
+                "size": len(self._memory),
+                "max_size": self.max_size,
+                "memory_hits": self._memory_hits,
+                "redis_hits": self._redis_hits,
+                "misses": self._misses,
+                "stores": self._stores,
+                "redis_evictions": self._evictions,
+                "hit_rate": round(hits / total, 3) if total > 0 else 0,
+                "redis_enabled": self.redis_url is not None,
+                "redis_errors": self._redis_errors,
+            }
+
+    # ── Internals ─────────────────────────────────────────────────
+
+    def _remember(self, key: str, response: LLMResponse, ttl: int) -> None:
+        """Insert into the LRU. Caller holds the lock."""
+        self._memory[key] = (time.time() + ttl, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def _get_redis(self):
+        if self.redis_url is None or time.time() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            import redis
+            self._redis = redis.from_url(
+                self.redis_url,
+                socket_connect_timeout=0.5,
+                socket_timeout=0.5,
+            )
+        return self._redis
+
+    def _redis_failed(self, error: Exception) -> None:
+        logger.warning(f"LLM cache Redis tier unavailable: {error}")
+        with self._lock:
+            self._redis_errors += 1
+        self._redis_down_until = time.time() + REDIS_RETRY_COOLDOWN_SECONDS
+
+    def _redis_get(self, key: str) -> Optional[LLMResponse]:
+        client = self._get_redis()
+        if client is None:
+            return None
+        try:
+            raw = client.get(f"{REDIS_KEY_PREFIX}:{key}")
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        if not raw:
+            return None
+        data = json.loads(raw)
+        data["provider"] = ProviderType(data["provider"])
+        return LLMResponse(**data)
+
+    def _redis_set(self, key: str, response: LLMResponse, ttl: int) -> None:
+        client = self._get_redis()
+        if client is None:
+            return
+        payload = json.dumps({
+            "content": response.content,
+            "model": response.model,
+            "provider": response.provider.value,
+            "input_tokens": response.input_tokens,
+            "output_tokens": response.output_tokens,
+        })
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.set(f"{REDIS_KEY_PREFIX}:{key}", payload, ex=ttl)
+            pipe.zadd(REDIS_INDEX_KEY, {key: time.time()})
+            pipe.zcard(REDIS_INDEX_KEY)
+            size = pipe.execute()[-1]
+            if size > self.redis_max_entries:
+                self._redis_evict(client, size - self.redis_max_entries)
+        except Exception as e:
+            self._redis_failed(e)
+
+    def _redis_evict(self, client, count: int) -> None:
+        """Drop the `count` oldest entries from the Redis tier."""
+        oldest = client.zrange(REDIS_INDEX_KEY, 0, count - 1)
+        if not oldest:
+            return
+        keys = [k.decode() if isinstance(k, bytes) else k for k in oldest]
+        pipe = client.pipeline(transaction=False)
+        pipe.delete(*[f"{REDIS_KEY_PREFIX}:{k}" for k in keys])
+        pipe.zrem(REDIS_INDEX_KEY, *keys)
+        pipe.execute()
+        with self._lock:
+            self._evictions += len(keys)
+
+
+# Global cache instance
+_llm_response_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """Get or create the process-wide LLM response cache."""
+    global _llm_response_cache
+    if _llm_response_cache is None:
+        _llm_response_cache = LLMResponseCache(
+            redis_url=config.REDIS_URL if config.LLM_CACHE_REDIS else None,
+        )
+    return _llm_response_cache
@@ -5,9 +5,17 @@ This service resolves which model to use for a user, considering:
 1. User's preference (if set)
 2. System default (from config)
 3. Model availability validation
+
+A user's AI preferences and cloud key fingerprint are cached per process
+for AI_SETTINGS_CACHE_TTL seconds; settings and API key writes drop the
+entry via invalidate_user_ai_settings().
 """
 
 import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Optional, Tuple
 from sqlalchemy.orm import Session
 
@@ -25,6 +33,86 @@ from core.models_registry import (
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class UserAISettings:
+    """A user's AI preferences as stored. Holds a key fingerprint, never the key."""
+    rag_model: Optional[str] = None
+    brain_model: Optional[str] = None
+    nexus_model: Optional[str] = None
+    cloud_ai_enabled: bool = False
+    cloud_ai_provider: Optional[str] = None
+    cloud_rag_model: Optional[str] = None
+    cloud_brain_model: Optional[str] = None
+    key_fingerprint: Optional[str] = None  # Cloud provider key; None = no usable key
+
+
+_settings_cache: "OrderedDict[int, Tuple[float, UserAISettings]]" = OrderedDict()
+_settings_lock = threading.Lock()
+
+
+def _load_user_ai_settings(db: Session, user_id: int) -> UserAISettings:
+    """Read preferences and fingerprint the cloud key (if cloud AI is on)."""
+    from models import UserPreferences
+
+    prefs = db.query(UserPreferences).filter(
+        UserPreferences.user_id == user_id
+    ).first()
+    if not prefs:
+        return UserAISettings()
+
+    cloud_enabled = bool(getattr(prefs, "cloud_ai_enabled", False))
+    cloud_provider = getattr(prefs, "cloud_ai_provider", None)
+
+    key_fingerprint = None
+    if cloud_enabled and cloud_provider:
+        from core.encryption import make_key_fingerprint
+        from features.settings.api_keys_service import get_api_key_with_url
+
+        key_info = get_api_key_with_url(db, user_id, cloud_provider)
+        if key_info:
+            key_fingerprint = make_key_fingerprint(key_info["api_key"], key_info.get("base_url"))
+
+    return UserAISettings(
+        rag_model=prefs.rag_model,
+        brain_model=prefs.brain_model,
+        nexus_model=getattr(prefs, "nexus_model", None),
+        cloud_ai_enabled=cloud_enabled,
+        cloud_ai_provider=cloud_provider,
+        cloud_rag_model=getattr(prefs, "cloud_rag_model", None),
+        cloud_brain_model=getattr(prefs, "cloud_brain_model", None),
+        key_fingerprint=key_fingerprint,
+    )
+
+
+def get_user_ai_settings(db: Session, user_id: int) -> UserAISettings:
+    """Get a user's AI settings, from the per-process cache when fresh."""
+    now = time.monotonic()
+    with _settings_lock:
+        cached = _settings_cache.get(user_id)
+    if cached is not None and now - cached[0] < config.AI_SETTINGS_CACHE_TTL:
+        return cached[1]
+
+    settings = _load_user_ai_settings(db, user_id)
+    with _settings_lock:
+        _settings_cache[user_id] = (now, settings)
+        _settings_cache.move_to_end(user_id)
+        while len(_settings_cache) > config.AI_SETTINGS_CACHE_SIZE:
+            _settings_cache.popitem(last=False)
+    return settings
+
+
+def invalidate_user_ai_settings(user_id: int) -> None:
+    """Drop a user's cached AI settings (preferences or API key changed)."""
+    with _settings_lock:
+        _settings_cache.pop(user_id, None)
+
+
+def clear_ai_settings_cache() -> None:
+    """Drop all cached AI settings (tests, admin)."""
+    with _settings_lock:
+        _settings_cache.clear()
+
+
 def _ensure_model_available(
     model_id: str, use_case: str,
 ) -> Tuple[str, Optional[str]]:
@@ -78,13 +166,9 @@ def get_effective_rag_model(
     If check_available is True, verifies the model is downloaded
     in Ollama and falls back to an available alternative if not.
     """
-    from models import UserPreferences
-
-    prefs = db.query(UserPreferences).filter(
-        UserPreferences.user_id == user_id
-    ).first()
+    prefs = get_user_ai_settings(db, user_id)
 
-    if prefs and prefs.rag_model:
+    if prefs.rag_model:
         info = get_model_info(prefs.rag_model)
         if info or is_model_available(prefs.rag_model):
             logger.debug(f"Using user RAG model preference: {prefs.rag_model}")
@@ -118,13 +202,9 @@ def get_effective_brain_model(
     If check_available is True, verifies the model is downloaded
     in Ollama and falls back to an available alternative if not.
     """
-    from models import UserPreferences
-
-    prefs = db.query(UserPreferences).filter(
-        UserPreferences.user_id == user_id
-    ).first()
+    prefs = get_user_ai_settings(db, user_id)
 
-    if prefs and prefs.brain_model:
+    if prefs.brain_model:
         info = get_model_info(prefs.brain_model)
         if info or is_model_available(prefs.brain_model):
             logger.debug(f"Using user Brain model preference: {prefs.brain_model}")
@@ -159,13 +239,9 @@ def get_effective_nexus_model(
     If check_available is True, verifies the model is downloaded
     in Ollama and falls back to an available alternative if not.
     """
-    from models import UserPreferences
-
-    prefs = db.query(UserPreferences).filter(
-        UserPreferences.user_id == user_id
-    ).first()
+    prefs = get_user_ai_settings(db, user_id)
 
-    if prefs and getattr(prefs, 'nexus_model', None):
+    if prefs.nexus_model:
         info = get_model_info(prefs.nexus_model)
         if info or is_model_available(prefs.nexus_model):
             logger.debug(f"Using user NEXUS model preference: {prefs.nexus_model}")
@@ -244,11 +320,7 @@ def get_user_model_config(db: Session, user_id: int) -> dict:
     - user_rag_override: Whether user has custom RAG model
     - user_brain_override: Whether user has custom Brain model
     """
-    from models import UserPreferences
-
-    prefs = db.query(UserPreferences).filter(
-        UserPreferences.user_id == user_id
-    ).first()
+    prefs = get_user_ai_settings(db, user_id)
 
     rag_model = get_effective_rag_model(db, user_id)
     brain_model = get_effective_brain_model(db, user_id)
@@ -258,8 +330,8 @@ def get_user_model_config(db: Session, user_id: int) -> dict:
         "brain_model": brain_model,
         "rag_model_info": get_model_info(rag_model),
         "brain_model_info": get_model_info(brain_model),
-        "user_rag_override": bool(prefs and prefs.rag_model),
-        "user_brain_override": bool(prefs and prefs.brain_model),
+        "user_rag_override": bool(prefs.rag_model),
+        "user_brain_override": bool(prefs.brain_model),
     }
 
 
@@ -297,50 +369,44 @@ def get_provider_for_user(db: Session, user_id: int, use_case: str = "rag"):
     Returns:
         Tuple of (LLMProvider, model_id, provider_type_str)
     """
-    from models import UserPreferences
-    from core.llm import get_default_provider, get_provider, ProviderType
+    from core.llm import get_default_provider
     from core.llm.base import ProviderType as PT
+    from core.llm.registry import get_pooled_cloud_provider
     from features.settings.api_keys_service import get_api_key_with_url
 
-    prefs = db.query(UserPreferences).filter(
-        UserPreferences.user_id == user_id
-    ).first()
+    prefs = get_user_ai_settings(db, user_id)
 
     # Check if cloud AI is enabled
-    if prefs and getattr(prefs, "cloud_ai_enabled", False):
-        cloud_provider = getattr(prefs, "cloud_ai_provider", None)
-
-        if cloud_provider:
-            # Get the cloud model for this use case
-            if use_case == "brain":
-                cloud_model = getattr(prefs, "cloud_brain_model", None)
-            else:
-                cloud_model = getattr(prefs, "cloud_rag_model", None)
-
-            if cloud_model:
-                # Try to get the provider
-                key_info = get_api_key_with_url(db, user_id, cloud_provider)
-                if key_info:
-                    try:
-                        from core.llm.registry import create_cloud_provider
-                        provider_map = {
-                            "anthropic": PT.ANTHROPIC,
-                            "openai": PT.OPENAI,
-                            "custom": PT.CUSTOM,
-                        }
-                        ptype = provider_map.get(cloud_provider)
-                        if ptype:
-                            provider = create_cloud_provider(
-                                ptype,
-                                key_info["api_key"],
-                                key_info.get("base_url"),
-                            )
-                            return provider, cloud_model, cloud_provider
-                    except Exception as e:
-                        logger.warning(
-                            f"Cloud provider {cloud_provider} failed for "
-                            f"user {user_id}, falling back to Ollama: {e}"
-                        )
+    if prefs.cloud_ai_enabled and prefs.cloud_ai_provider:
+        cloud_provider = prefs.cloud_ai_provider
+
+        # Get the cloud model for this use case
+        if use_case == "brain":
+            cloud_model = prefs.cloud_brain_model
+        else:
+            cloud_model = prefs.cloud_rag_model
+
+        # Reuse the user's pooled client while the key is unchanged
+        if cloud_model and prefs.key_fingerprint:
+            try:
+                provider_map = {
+                    "anthropic": PT.ANTHROPIC,
+                    "openai": PT.OPENAI,
+                    "custom": PT.CUSTOM,
+                }
+                ptype = provider_map.get(cloud_provider)
+                if ptype:
+                    provider = get_pooled_cloud_provider(
+                        user_id, ptype, prefs.key_fingerprint,
+                        lambda: get_api_key_with_url(db, user_id, cloud_provider),
+                    )
+                    if provider:
+                        return provider, cloud_model, cloud_provider
+            except Exception as e:
+                logger.warning(
+                    f"Cloud provider {cloud_provider} failed for "
+                    f"user {user_id}, falling back to Ollama: {e}"
+                )
 
     # Fallback to Ollama
     if use_case == "brain":
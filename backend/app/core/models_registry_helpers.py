@@ -6,10 +6,10 @@ Separated from models_registry.py for file size compliance.
 
 import time
 import logging
-import requests
 from typing import Dict, List, Optional, Set
 
 from core import config
+from core.ollama_transport import get_ollama_transport
 from core.models_registry import (
     AVAILABLE_MODELS, ModelInfo, ModelCategory, ModelUseCase, ProviderSource,
 )
@@ -98,7 +98,7 @@ def get_ollama_available_models() -> Set[str]:
 
     try:
         ollama_host = getattr(config, "OLLAMA_HOST", "http://ollama:11434")
-        response = requests.get(f"{ollama_host}/api/tags", timeout=5)
+        response = get_ollama_transport().get(f"{ollama_host}/api/tags", timeout=5)
         response.raise_for_status()
         data = response.json()
 
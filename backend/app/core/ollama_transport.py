@@ -0,0 +1,349 @@
+"""
+Ollama Transport - shared HTTP connection pool for every Ollama call.
+
+Embedding, chat, generate, vision and model-management requests all go
+through one transport per process instead of opening a TCP connection
+per call:
+- Sync: a keep-alive requests.Session, re-created after fork (Celery workers)
+- Async: one httpx.AsyncClient per event loop
+- Default timeouts per endpoint when the caller does not pass one
+- Latency and response-size histograms per endpoint (see stats())
+
+Callers pass full URLs, so adapters configured with another host still
+share the pool. Errors are the client library's own exceptions
+(requests.exceptions.* / httpx.HTTPError), so existing handlers keep working.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Sequence
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from core import config
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds (Prometheus "le" semantics, +Inf implied)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)  # seconds
+SIZE_BUCKETS = (1 << 10, 4 << 10, 16 << 10, 64 << 10, 256 << 10, 1 << 20, 4 << 20)  # bytes
+
+# Read timeouts per endpoint; None means wait as long as the server streams
+ENDPOINT_TIMEOUTS: Dict[str, Optional[float]] = {
+    "/api/embed": config.EMBEDDING_TIMEOUT,
+    "/api/embeddings": config.EMBEDDING_TIMEOUT,
+    "/api/chat": config.OLLAMA_GENERATE_TIMEOUT,
+    "/api/generate": config.OLLAMA_GENERATE_TIMEOUT,
+    "/api/tags": config.OLLAMA_METADATA_TIMEOUT,
+    "/api/ps": config.OLLAMA_METADATA_TIMEOUT,
+    "/api/show": config.OLLAMA_METADATA_TIMEOUT,
+    "/api/version": config.OLLAMA_METADATA_TIMEOUT,
+    "/api/delete": 30.0,
+    "/api/pull": None,
+}
+
+
+class Histogram:
+    """Fixed-bucket histogram with count and sum."""
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [str(b) for b in self.bounds] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class _EndpointStats:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.response_bytes = Histogram(SIZE_BUCKETS)
+
+
+def _endpoint(url: str) -> str:
+    return urlsplit(url).path or "/"
+
+
+class OllamaTransport:
+    """
+    Pooled sync + async HTTP client for Ollama.
+
+    Latency is measured until the response is handed to the caller: the
+    full body for plain requests, the headers for streamed ones. Response
+    sizes are recorded for plain requests and async streams.
+
+    Args:
+        pool_size: Keep-alive connections per host
+        max_connections: Upper bound on async connections per event loop
+        async_transport: Optional httpx transport (tests)
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        async_transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.pool_size = pool_size or config.OLLAMA_HTTP_MAX_KEEPALIVE
+        self.max_connections = max_connections or config.OLLAMA_HTTP_MAX_CONNECTIONS
+        self._async_transport = async_transport
+
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._session_pid: Optional[int] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stats: Dict[str, _EndpointStats] = {}
+
+    # ── Clients ──────────────────────────────────────────────────
+
+    @property
+    def session(self) -> requests.Session:
+        """Keep-alive session for this process (pools are not fork-safe)."""
+        pid = os.getpid()
+        if self._session is None or self._session_pid != pid:
+            with self._lock:
+                if self._session is None or self._session_pid != pid:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session, self._session_pid = session, pid
+        return self._session
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        """AsyncClient for the running event loop; connections belong to one loop."""
+        loop = asyncio.get_running_loop()
+        client = self._async_client
+        if client is None or client.is_closed or self._async_loop is not loop:
+            self._discard_async_client()
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.pool_size,
+                ),
+                transport=self._async_transport,
+            )
+            self._async_client, self._async_loop = client, loop
+        return client
+
+    # ── Sync API ─────────────────────────────────────────────────
+
+    def request(self, method: str, url: str, timeout=None, **kwargs) -> requests.Response:
+        """
+        Send a request over the pooled session.
+
+        Streamed responses (stream=True) hold their connection until the
+        body is consumed or the response is closed; use them as a context
+        manager.
+        """
+        endpoint = _endpoint(url)
+        started = time.perf_counter()
+        try:
+            response = self.session.request(
+                method, url, timeout=self._sync_timeout(endpoint, timeout), **kwargs
+            )
+        except requests.exceptions.RequestException:
+            self._record(endpoint, time.perf_counter() - started, error=True)
+            raise
+
+        size = None if kwargs.get("stream") else len(response.content)
+        self._record(
+            endpoint, time.perf_counter() - started, size,
+            error=response.status_code >= 400,
+        )
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    # ── Async API ────────────────────────────────────────────────
+
+    async def arequest(self, method: str, url: str, timeout=None, **kwargs) -> httpx.Response:
+        """Send a request on the shared AsyncClient and read the full body."""
+        endpoint = _endpoint(url)
+        started = time.perf_counter()
+        try:
+            response = await self.async_client.request(
+                method, url, timeout=self._async_timeout(endpoint, timeout), **kwargs
+            )
+        except httpx.HTTPError:
+            self._record(endpoint, time.perf_counter() - started, error=True)
+            raise
+
+        self._record(
+            endpoint, time.perf_counter() - started, len(response.content),
+            error=response.status_code >= 400,
+        )
+        return response
+
+    async def apost(self, url: str, **kwargs) -> httpx.Response:
+        return await self.arequest("POST", url, **kwargs)
+
+    @asynccontextmanager
+    async def astream(self, method: str, url: str, timeout=None, **kwargs) -> AsyncIterator[httpx.Response]:
+        """Stream a response on the shared AsyncClient (async context manager)."""
+        endpoint = _endpoint(url)
+        started = time.perf_counter()
+        opened = False
+        try:
+            async with self.async_client.stream(
+                method, url, timeout=self._async_timeout(endpoint, timeout), **kwargs
+            ) as response:
+                opened = True
+                self._record(
+                    endpoint, time.perf_counter() - started,
+                    error=response.status_code >= 400,
+                )
+                try:
+                    yield response
+                finally:
+                    self._record_size(endpoint, response.num_bytes_downloaded)
+        except httpx.HTTPError:
+            if not opened:
+                self._record(endpoint, time.perf_counter() - started, error=True)
+            raise
+
+    # ── Lifecycle / metrics ──────────────────────────────────────
+
+    def close(self) -> None:
+        """Close pooled sync connections."""
+        with self._lock:
+            session, self._session = self._session, None
+        if session is not None:
+            session.close()
+
+    async def aclose_async_client(self) -> None:
+        """
+        Close the async client if it belongs to the running loop.
+
+        Call before closing a short-lived event loop (Celery tasks that
+        run_until_complete on a fresh loop) so its connections do not leak.
+        """
+        if self._async_loop is not asyncio.get_running_loop():
+            return
+        client, self._async_client, self._async_loop = self._async_client, None, None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    async def aclose(self) -> None:
+        """Close the async client (application shutdown) and the sync pool."""
+        await self.aclose_async_client()
+        self.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-endpoint request/error counts and latency/size histograms."""
+        with self._lock:
+            return {
+                endpoint: {
+                    "requests": s.requests,
+                    "errors": s.errors,
+                    "latency_seconds": s.latency.snapshot(),
+                    "response_bytes": s.response_bytes.snapshot(),
+                }
+                for endpoint, s in sorted(self._stats.items())
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    # ── Internals ────────────────────────────────────────────────
+
+    def _discard_async_client(self) -> None:
+        """
+        Drop the client bound to another event loop.
+
+        If that loop is still running (another thread), the client is closed
+        there; a stopped or closed loop cannot run aclose(), so the client is
+        only dereferenced.
+        """
+        client, loop = self._async_client, self._async_loop
+        self._async_client, self._async_loop = None, None
+        if client is None or client.is_closed or loop is None:
+            return
+        if loop.is_running() and not loop.is_closed():
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        else:
+            logger.debug("Dropping Ollama AsyncClient from a stopped event loop")
+
+    @staticmethod
+    def _read_timeout(endpoint: str, timeout):
+        if timeout is not None:
+            return timeout
+        return ENDPOINT_TIMEOUTS.get(endpoint, config.OLLAMA_GENERATE_TIMEOUT)
+
+    def _sync_timeout(self, endpoint: str, timeout):
+        if isinstance(timeout, tuple):
+            return timeout
+        return (config.OLLAMA_CONNECT_TIMEOUT, self._read_timeout(endpoint, timeout))
+
+    def _async_timeout(self, endpoint: str, timeout):
+        if isinstance(timeout, httpx.Timeout):
+            return timeout
+        return httpx.Timeout(
+            self._read_timeout(endpoint, timeout), connect=config.OLLAMA_CONNECT_TIMEOUT
+        )
+
+    def _endpoint_stats(self, endpoint: str) -> _EndpointStats:
+        stats = self._stats.get(endpoint)
+        if stats is None:
+            stats = self._stats.setdefault(endpoint, _EndpointStats())
+        return stats
+
+    def _record(self, endpoint: str, latency: float, size: Optional[int] = None, error: bool = False) -> None:
+        with self._lock:
+            stats = self._endpoint_stats(endpoint)
+            stats.requests += 1
+            stats.errors += int(error)
+            stats.latency.observe(latency)
+            if size is not None:
+                stats.response_bytes.observe(size)
+
+    def _record_size(self, endpoint: str, size: int) -> None:
+        with self._lock:
+            self._endpoint_stats(endpoint).response_bytes.observe(size)
+
+
+# Global transport instance (one pool per process)
+_transport: Optional[OllamaTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_ollama_transport() -> OllamaTransport:
+    """Get or create the process-wide Ollama transport."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = OllamaTransport()
+    return _transport
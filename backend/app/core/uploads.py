@@ -0,0 +1,102 @@
+"""
+Streamed uploads - copy an UploadFile to disk without holding it in memory.
+
+Starlette has already spooled the multipart body to a temporary file; this
+copies it to its final directory in fixed-size chunks, hashing as it goes,
+inside the threadpool so the event loop keeps serving other requests:
+
+    stored = await stream_upload_to_disk(file, config.UPLOAD_DIR, max_bytes=...)
+    ...validate stored.size...
+    path = stored.commit(unique_filename)   # or stored.discard()
+    ...create the database record, or stored.discard() if that fails...
+
+Copies stop one byte past max_bytes, so oversized uploads are rejected
+after reading at most max_bytes + 1 bytes.
+"""
+
+import hashlib
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+from core import config
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredUpload:
+    """An upload written to a temporary file next to its final location."""
+    temp_path: str
+    directory: str
+    size: int
+    sha256: str
+    path: Optional[str] = None  # Final path once committed
+
+    def commit(self, filename: str) -> str:
+        """Move the upload to its final name in the same directory. Returns the path."""
+        path = os.path.join(self.directory, filename)
+        os.replace(self.temp_path, path)
+        self.path = path
+        return path
+
+    def discard(self) -> None:
+        """Delete the file, committed or not (rejected, duplicate or failed upload)."""
+        try:
+            os.remove(self.path or self.temp_path)
+        except FileNotFoundError:
+            pass
+
+
+def copy_to_disk(source: BinaryIO, directory: str, max_bytes: int, chunk_size: int = None) -> StoredUpload:
+    """
+    Copy a file object to a temporary file in directory, hashing while copying.
+
+    Stops after max_bytes + 1 bytes; callers compare size to their limit.
+    """
+    chunk_size = chunk_size or config.UPLOAD_CHUNK_SIZE
+    os.makedirs(directory, exist_ok=True)
+    temp_path = os.path.join(directory, f".{uuid.uuid4().hex}.part")
+
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(temp_path, "wb") as out:
+            while size <= max_bytes:
+                chunk = source.read(min(chunk_size, max_bytes + 1 - size))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    return StoredUpload(temp_path=temp_path, directory=directory, size=size, sha256=digest.hexdigest())
+
+
+def hash_file(path: str, chunk_size: int = None) -> str:
+    """SHA-256 of a file on disk, read in chunks (same digest as StoredUpload.sha256)."""
+    chunk_size = chunk_size or config.UPLOAD_CHUNK_SIZE
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def stream_upload_to_disk(file: UploadFile, directory: str, max_bytes: int) -> StoredUpload:
+    """Copy an UploadFile to disk in the threadpool (see copy_to_disk)."""
+    await file.seek(0)
+    stored = await run_in_threadpool(copy_to_disk, file.file, directory, max_bytes)
+    logger.debug(f"Streamed upload {file.filename}: {stored.size} bytes, sha256 {stored.sha256[:12]}")
+    return stored
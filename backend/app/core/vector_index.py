@@ -0,0 +1,50 @@
+"""
+pgvector query helpers.
+
+ANN indexes (HNSW) are only used when a query orders by the raw distance
+operator and has a LIMIT, e.g.:
+
+    ORDER BY embedding <=> CAST(:query_embedding AS vector)
+    LIMIT :limit
+
+Putting `1 - (embedding <=> q) >= :min_similarity` in the WHERE clause, or
+ordering by a derived similarity column, forces a sequential scan. Callers
+select the raw distance, order by it, and apply similarity thresholds to
+the returned rows (see `similarity_from_distance`).
+"""
+
+import logging
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from core import config
+
+logger = logging.getLogger(__name__)
+
+
+def to_vector_literal(embedding: List[float]) -> str:
+    """Convert an embedding to pgvector's text format: '[0.1,0.2,...]'."""
+    return '[' + ','.join(map(str, embedding)) + ']'
+
+
+def similarity_from_distance(distance: float) -> float:
+    """Cosine similarity from pgvector's cosine distance (<=>)."""
+    return 1.0 - float(distance)
+
+
+def apply_ann_search_params(db: Session, ef_search: int = None) -> None:
+    """
+    Set hnsw.ef_search for the current transaction.
+
+    Owner/trash filters are applied after the HNSW scan, so a larger candidate
+    list keeps enough rows for users holding a small share of the table.
+    """
+    try:
+        db.execute(
+            text("SELECT set_config('hnsw.ef_search', :ef_search, true)"),
+            {"ef_search": str(ef_search or config.PGVECTOR_HNSW_EF_SEARCH)},
+        )
+    except Exception as e:
+        logger.debug(f"Could not set hnsw.ef_search: {e}")
@@ -101,19 +101,10 @@ def create_note(db: Session, title: str, content: str, owner_id: int | None = No
     """Create a new note with auto-generated slug and extract tags."""
     from wikilink_parser import extract_hashtags
     from tasks_embeddings import generate_note_embedding_task
+    from features.notes.service import next_free_slug
 
     # Generate unique slug
-    base_slug = create_slug(title)
-    slug = base_slug
-    counter = 2
-
-    # Check for existing slug and append suffix if needed
-    while db.query(models.Note).filter(
-        models.Note.slug == slug,
-        models.Note.owner_id == owner_id
-    ).first() is not None:
-        slug = f"{base_slug}-{counter}"
-        counter += 1
+    slug = next_free_slug(db, create_slug(title), owner_id)
 
     db_note = models.Note(title=title, content=content, slug=slug, owner_id=owner_id,
                           is_standalone=is_standalone, source=source)
@@ -150,6 +141,13 @@ def create_note(db: Session, title: str, content: str, owner_id: int | None = No
                 logger.exception(f"Error committing tags for note {db_note.id}: {e}")
                 # Don't raise - note already created, tags are optional
 
+    # Record wikilinks from and to the new note
+    from features.notes.service import refresh_note_links
+    refresh_note_links(db, db_note)
+
+    from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+    invalidate_graph_snapshot(db_note.owner_id, [f"note-{db_note.id}"])
+
     # Trigger embedding generation (async, non-blocking)
     try:
         generate_note_embedding_task.delay(db_note.id)
@@ -170,7 +168,6 @@ def add_image_to_note(db: Session, image_id: int, note_id: int):
     try:
         db.commit()
         db.refresh(db_relation)
-        return db_relation
     except IntegrityError as e:
         db.rollback()
         logger.error(f"Integrity error linking image {image_id} to note {note_id}: {e}")
@@ -180,6 +177,12 @@ def add_image_to_note(db: Session, image_id: int, note_id: int):
         logger.exception(f"Error linking image {image_id} to note {note_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to link image to note")
 
+    note = db.query(models.Note.owner_id).filter(models.Note.id == note_id).first()
+    if note:
+        from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+        invalidate_graph_snapshot(note.owner_id, [f"note-{note_id}"])
+    return db_relation
+
 def get_images(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Image).offset(skip).limit(limit).all()
 
@@ -334,6 +337,7 @@ def update_note(db: Session, note_id: int, title: Optional[str] = None, content:
     """Update a note, regenerate slug if title changes, and extract tags."""
     from wikilink_parser import extract_hashtags
     from tasks_embeddings import generate_note_embedding_task
+    from features.notes.service import next_free_slug
 
     note = db.query(models.Note).filter(models.Note.id == note_id).first()
 
@@ -350,21 +354,8 @@ def update_note(db: Session, note_id: int, title: Optional[str] = None, content:
     if title is not None:
         note.title = title
 
-        # Generate unique slug for the new title
-        base_slug = create_slug(title)
-        slug = base_slug
-        counter = 2
-
-        # Check for existing slug (excluding current note)
-        while db.query(models.Note).filter(
-            models.Note.slug == slug,
-            models.Note.owner_id == note.owner_id,
-            models.Note.id != note_id
-        ).first() is not None:
-            slug = f"{base_slug}-{counter}"
-            counter += 1
-
-        note.slug = slug
+        # Generate unique slug for the new title (excluding current note)
+        note.slug = next_free_slug(db, create_slug(title), note.owner_id, exclude_note_id=note_id)
         content_changed = True  # Title change affects embedding
 
     if content is not None:
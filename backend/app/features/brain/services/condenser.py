@@ -14,11 +14,14 @@ Fact Types:
 import os
 import json
 import logging
-import requests
 from typing import List, Optional, Dict, Any
 from dataclasses import dataclass, field
 from datetime import datetime
 
+import httpx
+
+from core.llm import LLMMessage, get_default_provider
+
 logger = logging.getLogger(__name__)
 
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://ollama:11434")
@@ -178,33 +181,24 @@ class SemanticCondenser:
         prompt = FACT_EXTRACTION_PROMPT.format(text=text)
 
         try:
-            response = requests.post(
-                f"{OLLAMA_HOST}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "think": False,
-                    "options": {
-                        "temperature": 0.1,  # Low temp for consistent extraction
-                        "num_predict": 2000
-                    }
-                },
-                timeout=60
+            # Deterministic enough to serve re-runs over unchanged text from cache
+            response = await get_default_provider().agenerate_cached(
+                messages=[LLMMessage(role="user", content=prompt)],
+                model=self.model,
+                temperature=0.1,  # Low temp for consistent extraction
+                max_tokens=2000,
+                timeout=60,
             )
-            response.raise_for_status()
-
-            result = response.json()
-            response_text = result.get("response", "")
+            response_text = response.content
 
             # Parse JSON from response
             facts = self._parse_facts_response(response_text, text)
             return facts
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.error("Timeout during fact extraction")
             return []
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"Error during fact extraction: {e}")
             return []
         except Exception as e:
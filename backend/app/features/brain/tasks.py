@@ -13,6 +13,7 @@ from datetime import datetime
 from celery import shared_task
 
 from core.celery_app import celery_app
+from core.ollama_transport import get_ollama_transport
 from core.database import SessionLocal
 
 logger = logging.getLogger(__name__)
@@ -65,6 +66,7 @@ def index_brain_task(self, user_id: int, full_reindex: bool = False):
                 indexer.index_changes(full_reindex=full_reindex)
             )
         finally:
+            loop.run_until_complete(get_ollama_transport().aclose_async_client())
             loop.close()
 
         self.update_state(
@@ -166,6 +168,7 @@ def train_brain_task(self, user_id: int, adapter_id: int):
                 trainer.train(config, adapter, progress_callback)
             )
         finally:
+            loop.run_until_complete(get_ollama_transport().aclose_async_client())
             loop.close()
 
         self.update_state(
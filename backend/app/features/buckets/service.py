@@ -401,6 +401,10 @@ class DailyNoteService:
         db.commit()
         db.refresh(new_note)
 
+        # Record wikilinks from the template and from notes linking to this date
+        from features.notes.service import refresh_note_links
+        refresh_note_links(db, new_note)
+
         logger.info(f"Created new daily note for {date_str}: note_id={new_note.id}")
 
         return {
@@ -149,7 +149,9 @@ async def retry_document_analysis(
     try:
         from features.documents.tasks import analyze_document_task
 
-        task = analyze_document_task.delay(document_id=doc_id, filepath=doc.filepath)
+        task = analyze_document_task.delay(
+            document_id=doc_id, filepath=doc.filepath, user_instructions=doc.analysis_instructions,
+        )
         return schemas.RetryResponse(
             message="Document analysis retry queued",
             document_id=doc_id,
@@ -162,6 +162,10 @@ async def extract_text_to_note(
     doc.text_appended_to_note = True
     db.commit()
 
+    # Wikilinks in the extracted text become note_links like any other edit
+    from features.notes.service import refresh_note_links
+    refresh_note_links(db, note, incoming=False)
+
     return schemas.ExtractTextToNoteResponse(
         message="Extracted text appended to note",
         document_id=doc_id,
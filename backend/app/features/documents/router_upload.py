@@ -6,6 +6,7 @@ GET /documents/task-status/{task_id} - Poll processing status
 """
 
 from fastapi import APIRouter, UploadFile, File, Form, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 import os
 import uuid
@@ -13,15 +14,18 @@ import logging
 
 from core.database import get_db
 from core.auth import get_current_active_user
-from core import exceptions
+from core import config, exceptions
+from core.uploads import StoredUpload, stream_upload_to_disk
 import models
 
 from features.documents import schemas
-from features.documents.service import DocumentService, ALLOWED_DOCUMENT_TYPES
+from features.documents.service import (
+    DocumentService, ALLOWED_DOCUMENT_TYPES, DOCUMENT_UPLOAD_DIR, MAX_PDF_SIZE_BYTES,
+)
 
 from slowapi import Limiter
 from slowapi.util import get_remote_address
-from typing import Annotated, Optional
+from typing import Annotated, Optional, Tuple
 
 limiter = Limiter(key_func=get_remote_address)
 logger = logging.getLogger(__name__)
@@ -56,46 +60,35 @@ async def upload_document(
         raise exceptions.ValidationException("File type could not be determined")
 
     try:
-        contents = await file.read()
+        # Stream to disk off the event loop; nothing below holds the whole file
+        stored = await stream_upload_to_disk(file, DOCUMENT_UPLOAD_DIR, max_bytes=MAX_PDF_SIZE_BYTES)
 
         is_valid, error_msg = DocumentService.validate_file(
             content_type=file.content_type,
-            file_size=len(contents),
+            file_size=stored.size,
             filename=file.filename,
         )
         if not is_valid:
+            stored.discard()
             raise exceptions.ValidationException(error_msg)
 
         # Generate unique filename
         ext = ALLOWED_DOCUMENT_TYPES.get(file.content_type, ".pdf")
         unique_filename = f"{uuid.uuid4()}{ext}"
 
-        filepath = DocumentService.save_file(contents, unique_filename)
-
-        doc = DocumentService.create_document(
-            db=db,
-            filename=unique_filename,
-            filepath=filepath,
-            owner_id=current_user.id,
-            file_size=len(contents),
-            display_name=file.filename,
+        # Database writes and task queueing block - run them in the threadpool
+        doc, task_id, deduplicated = await run_in_threadpool(
+            _register_upload, db, current_user, stored, unique_filename, file.filename, instructions,
         )
 
-        # Queue Celery analysis task
-        task_id = None
-        try:
-            from features.documents.tasks import analyze_document_task
-
-            task = analyze_document_task.delay(
+        if deduplicated:
+            return schemas.DocumentUploadResponse(
+                message="Document already uploaded. Reusing its analysis.",
                 document_id=doc.id,
-                filepath=filepath,
-                user_instructions=instructions,
+                filename=doc.filename,
+                analysis_status=doc.ai_analysis_status,
+                deduplicated=True,
             )
-            task_id = task.id
-            logger.info(f"Document analysis task queued: doc={doc.id}, task={task.id}")
-        except Exception as e:
-            logger.error(f"Failed to queue analysis for doc {doc.id}: {e}", exc_info=True)
-            DocumentService.update_analysis_status(db, doc.id, "failed", str(e))
 
         return schemas.DocumentUploadResponse(
             message="Document uploaded. AI analysis queued.",
@@ -115,6 +108,67 @@ async def upload_document(
         raise exceptions.FileUploadException(f"Failed to upload document: {e}")
 
 
+def _register_upload(
+    db: Session,
+    current_user: models.User,
+    stored: StoredUpload,
+    unique_filename: str,
+    display_name: Optional[str],
+    instructions: Optional[str],
+) -> Tuple[models.Document, Optional[str], bool]:
+    """
+    Blocking part of an upload: commit the file, create the record, queue analysis.
+
+    Re-uploading a PDF the owner already has, with the same instructions (or
+    none), discards the upload and returns the existing document with its
+    chunks and embeddings. Returns (document, task_id or None, reused).
+    """
+    try:
+        if config.UPLOAD_DEDUP_ENABLED:
+            existing = DocumentService.find_duplicate(
+                db, owner_id=current_user.id, content_hash=stored.sha256, instructions=instructions
+            )
+            if existing:
+                stored.discard()
+                logger.info(f"Duplicate upload from user {current_user.username}: reusing document {existing.id}")
+                return existing, None, True
+
+        filepath = stored.commit(unique_filename)
+
+        doc = DocumentService.create_document(
+            db=db,
+            filename=unique_filename,
+            filepath=filepath,
+            owner_id=current_user.id,
+            file_size=stored.size,
+            display_name=display_name,
+            content_hash=stored.sha256,
+            analysis_instructions=instructions,
+        )
+    except Exception:
+        # Leave neither the temp file nor an orphaned committed file behind
+        stored.discard()
+        raise
+
+    # Queue Celery analysis task
+    task_id = None
+    try:
+        from features.documents.tasks import analyze_document_task
+
+        task = analyze_document_task.delay(
+            document_id=doc.id,
+            filepath=filepath,
+            user_instructions=instructions,
+        )
+        task_id = task.id
+        logger.info(f"Document analysis task queued: doc={doc.id}, task={task.id}")
+    except Exception as e:
+        logger.error(f"Failed to queue analysis for doc {doc.id}: {e}", exc_info=True)
+        DocumentService.update_analysis_status(db, doc.id, "failed", str(e))
+
+    return doc, task_id, False
+
+
 @router.get(
     "/documents/task-status/{task_id}",
     response_model=schemas.TaskStatusResponse,
@@ -20,6 +20,7 @@ class DocumentUploadResponse(BaseModel):
     filename: str
     task_id: Optional[str] = None
     analysis_status: str = "queued"
+    deduplicated: bool = False  # True if an identical existing document was reused
 
 
 class TaskStatusResponse(BaseModel):
@@ -9,6 +9,7 @@ import logging
 from datetime import datetime, timezone
 from typing import Optional, List, Tuple
 
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 
@@ -65,6 +66,8 @@ class DocumentService:
         owner_id: int,
         file_size: int,
         display_name: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        analysis_instructions: Optional[str] = None,
     ) -> Document:
         """Create a new document record in the database."""
         doc = Document(
@@ -72,6 +75,8 @@ class DocumentService:
             filepath=filepath,
             display_name=display_name or filename,
             file_size=file_size,
+            content_hash=content_hash,
+            analysis_instructions=analysis_instructions,
             owner_id=owner_id,
             ai_analysis_status="queued",
         )
@@ -81,6 +86,30 @@ class DocumentService:
         logger.info(f"Document created: ID {doc.id}, file {filename}")
         return doc
 
+    @staticmethod
+    def find_duplicate(
+        db: Session, owner_id: int, content_hash: str, instructions: Optional[str] = None
+    ) -> Optional[Document]:
+        """
+        Existing, non-trashed document with the same file content and usable analysis.
+
+        Only matches a document analysed with the same custom instructions
+        (or none, when the new upload has none).
+        """
+        query = db.query(Document).filter(
+            Document.owner_id == owner_id,
+            Document.content_hash == content_hash,
+            Document.is_trashed == False,
+            Document.ai_analysis_status != "failed",
+        )
+        if instructions:
+            query = query.filter(Document.analysis_instructions == instructions)
+        else:
+            query = query.filter(or_(
+                Document.analysis_instructions.is_(None), Document.analysis_instructions == "",
+            ))
+        return query.order_by(Document.id).first()
+
     @staticmethod
     def get_document(db: Session, doc_id: int, owner_id: int) -> Optional[Document]:
         """Get a single document by ID, owned by user."""
@@ -161,6 +190,9 @@ class DocumentService:
         doc.is_trashed = True
         doc.trashed_at = datetime.now(timezone.utc)
         db.commit()
+        if doc.summary_note_id:
+            from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+            invalidate_graph_snapshot(owner_id)
         return True
 
     @staticmethod
@@ -174,6 +206,9 @@ class DocumentService:
         doc.is_trashed = False
         doc.trashed_at = None
         db.commit()
+        if doc.summary_note_id:
+            from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+            invalidate_graph_snapshot(owner_id)
         return True
 
     @staticmethod
@@ -103,6 +103,10 @@ class DocumentApprovalService:
             logger.error(f"Failed to commit approval: {e}")
             raise
 
+        # New document node plus its source edge
+        from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+        invalidate_graph_snapshot(owner_id)
+
         # Queue embedding generation for the note (non-blocking)
         try:
             from tasks_embeddings import generate_note_embedding_task
@@ -14,6 +14,8 @@ import base64
 from typing import Dict, Optional
 
 from core import config
+from core.llm import LLMMessage, get_default_provider
+from core.ollama_transport import get_ollama_transport
 
 logger = logging.getLogger(__name__)
 
@@ -85,26 +87,22 @@ class DocumentEnricher:
         prompt += truncated
 
         try:
-            response = requests.post(
-                f"{self.ollama_host}/api/generate",
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {"temperature": 0.3, "num_predict": 4000},
-                },
+            # Re-processing an unchanged document reuses the cached analysis
+            response = get_default_provider().generate_cached(
+                messages=[LLMMessage(role="user", content=prompt)],
+                model=model,
+                temperature=0.3,
+                max_tokens=4000,
                 timeout=timeout,
             )
-
-            if response.status_code != 200:
-                logger.error(f"Ollama returned {response.status_code}")
-                return self._empty_result(f"Ollama error: {response.status_code}")
-
-            raw_text = response.json().get("response", "")
+            raw_text = response.content
             parsed = self._parse_ai_response(raw_text)
             parsed["raw_response"] = raw_text
             return parsed
 
+        except requests.exceptions.HTTPError as e:
+            logger.error(f"Ollama returned {e.response.status_code}")
+            return self._empty_result(f"Ollama error: {e.response.status_code}")
         except requests.exceptions.Timeout:
             logger.error("Ollama timeout during enrichment")
             return self._empty_result("AI enrichment timed out")
@@ -139,7 +137,7 @@ class DocumentEnricher:
                 image.save(buffer, format="PNG")
                 img_b64 = base64.b64encode(buffer.getvalue()).decode()
 
-                response = requests.post(
+                response = get_ollama_transport().post(
                     f"{self.ollama_host}/api/generate",
                     json={
                         "model": vision_model,
@@ -147,7 +147,6 @@ def generate_document_embeddings_task(
     try:
         from models import Document, DocumentChunk
         from features.documents.services.chunking import chunk_document, save_chunks
-        from features.search.logic.embeddings import generate_embedding
 
         doc = self.db.query(Document).filter(Document.id == document_id).first()
         if not doc:
@@ -197,27 +196,65 @@ def generate_document_embeddings_task(
         return {"status": "failed", "error": str(e)}
 
 
+@celery_app.task(
+    bind=True,
+    base=DatabaseTask,
+    name="features.documents.tasks.backfill_document_hashes",
+)
+def backfill_document_hashes(self, batch_size: int = 200) -> dict:
+    """Compute content hashes for documents uploaded before upload deduplication.
+    Walks documents by ID in batches, committing each batch; safe to re-run."""
+    import os
+    from models import Document
+    from core.uploads import hash_file
+
+    hashed = skipped = failed = 0
+    last_id = 0
+    while True:
+        batch = self.db.query(Document).filter(
+            Document.id > last_id, Document.content_hash.is_(None),
+        ).order_by(Document.id).limit(batch_size).all()
+        if not batch:
+            break
+        last_id = batch[-1].id
+
+        for doc in batch:
+            if not doc.filepath or not os.path.exists(doc.filepath):
+                skipped += 1
+                continue
+            try:
+                doc.content_hash = hash_file(doc.filepath)
+                hashed += 1
+            except OSError as e:
+                failed += 1
+                logger.warning(f"Hash backfill failed for document {doc.id}: {e}")
+        self.db.commit()
+
+    logger.info(f"Document hash backfill: {hashed} hashed, {skipped} skipped, {failed} failed")
+    return {"hashed": hashed, "skipped": skipped, "failed": failed}
+
+
 # ── Private helpers ───────────────────────────────────────────────
 
 
 def _embed_chunks(db, document_id: int) -> int:
-    """Generate embeddings for all document chunks. Returns count."""
+    """Generate embeddings for all document chunks in batched requests. Returns count."""
     from models import DocumentChunk
-    from features.search.logic.embeddings import generate_embedding
+    from features.search.logic.embeddings import batch_generate_embeddings
 
     db_chunks = db.query(DocumentChunk).filter(
         DocumentChunk.document_id == document_id
     ).order_by(DocumentChunk.chunk_index).all()
 
+    embeddings = batch_generate_embeddings([chunk.content for chunk in db_chunks])
+
     embedded = 0
-    for chunk in db_chunks:
-        try:
-            embedding = generate_embedding(chunk.content)
-            if embedding:
-                chunk.embedding = embedding
-                embedded += 1
-        except Exception as e:
-            logger.warning(f"Chunk {chunk.id} embedding failed: {e}")
+    for chunk, embedding in zip(db_chunks, embeddings):
+        if embedding:
+            chunk.embedding = embedding
+            embedded += 1
+        else:
+            logger.warning(f"Chunk {chunk.id} embedding failed")
     return embedded
 
 
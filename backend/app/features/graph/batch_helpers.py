@@ -46,6 +46,7 @@ def batch_resolve_wikilinks(
     db: Session,
     notes: List[models.Note],
     owner_id: int,
+    exclude_trashed: bool = False,
 ) -> Dict[int, List[int]]:
     """
     Resolve wikilinks for ALL notes in minimal DB queries.
@@ -56,6 +57,8 @@ def batch_resolve_wikilinks(
     3. ONE query to find all matching notes
     4. Map results back to source notes
 
+    Trashed notes are not valid targets when exclude_trashed is set.
+
     Returns:
         Dict mapping source_note_id -> list of target note IDs
     """
@@ -78,13 +81,16 @@ def batch_resolve_wikilinks(
 
     # Single query: find all notes matching any slug or title
     from sqlalchemy import or_, func as sa_func
-    matching_notes = db.query(models.Note).filter(
+    query = db.query(models.Note).filter(
         models.Note.owner_id == owner_id,
         or_(
             models.Note.slug.in_(list(all_slugs)),
             sa_func.lower(models.Note.title).in_(list(all_titles))
         )
-    ).all()
+    )
+    if exclude_trashed:
+        query = query.filter(models.Note.is_trashed == False)
+    matching_notes = query.all()
 
     # Build lookup: slug -> note_id and lowercase_title -> note_id
     slug_to_id: Dict[str, int] = {}
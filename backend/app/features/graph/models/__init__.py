@@ -4,12 +4,13 @@ Graph Feature - Models
 SQLAlchemy models for brain graph visualization.
 """
 
-from .semantic_edge import SemanticEdge
+from .semantic_edge import SemanticEdge, SemanticEdgeRun
 from .graph_position import GraphPosition
 from .community import CommunityMetadata
 
 __all__ = [
     "SemanticEdge",
+    "SemanticEdgeRun",
     "GraphPosition",
     "CommunityMetadata",
 ]
@@ -66,3 +66,21 @@ class SemanticEdge(Base):
     def target_node_id(self) -> str:
         """Get formatted target node ID for graph visualization."""
         return f"{self.target_type}-{self.target_id}"
+
+
+class SemanticEdgeRun(Base):
+    """
+    Last semantic edge generation run for a user.
+
+    Incremental runs only recompute notes whose embedding_updated_at is
+    newer than completed_at, and only while threshold/max_per_note match.
+    """
+    __tablename__ = "semantic_edge_runs"
+
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    threshold = Column(Float, nullable=False)
+    max_per_note = Column(Integer, nullable=False)
+    completed_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<SemanticEdgeRun user={self.owner_id} at {self.completed_at}>"
@@ -0,0 +1,222 @@
+"""
+Graph Feature - note_links Maintenance
+
+note_links stores resolved [[wikilink]] edges (source_note_id -> target_note_id).
+It is kept in sync by the notes service on every write so that backlinks,
+graph retrieval and NEXUS can use indexed joins instead of scanning content.
+
+Rules:
+- A note's outgoing links are fully replaced whenever its content changes
+- Creating, renaming or restoring a note re-resolves the notes that may
+  point at it (existing backlinks plus notes mentioning its title/slug)
+- Trashed notes have no links in either direction; deleted notes cascade
+
+Apart from backfill_note_links, these helpers do not commit; they run
+inside the caller's transaction.
+"""
+
+import logging
+from typing import Dict, Iterable, List, Set
+
+from sqlalchemy import delete, or_, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+import models
+from features.graph.batch_helpers import batch_resolve_wikilinks
+
+logger = logging.getLogger(__name__)
+
+
+def sync_note_links(db: Session, notes: List[models.Note], owner_id: int) -> int:
+    """
+    Replace the outgoing links of `notes` with their current wikilinks.
+
+    Resolution is batched (one lookup query for all notes). Trashed notes
+    and links to trashed notes are dropped.
+
+    Returns:
+        Number of links inserted
+    """
+    if not notes:
+        return 0
+
+    live = [n for n in notes if not n.is_trashed]
+    resolved = batch_resolve_wikilinks(db, live, owner_id, exclude_trashed=True)
+    source_ids = [n.id for n in notes]
+
+    existing: Dict[int, Set[int]] = {sid: set() for sid in source_ids}
+    for source_id, target_id in db.execute(
+        select(models.NoteLink.source_note_id, models.NoteLink.target_note_id)
+        .where(models.NoteLink.source_note_id.in_(source_ids))
+    ):
+        existing[source_id].add(target_id)
+
+    stale: List[tuple] = []
+    fresh: List[dict] = []
+    for source_id in source_ids:
+        wanted = set(resolved.get(source_id, []))
+        stale.extend((source_id, t) for t in existing[source_id] - wanted)
+        fresh.extend(
+            {"source_note_id": source_id, "target_note_id": t}
+            for t in wanted - existing[source_id]
+        )
+
+    if stale:
+        db.execute(delete(models.NoteLink).where(
+            tuple_(models.NoteLink.source_note_id, models.NoteLink.target_note_id).in_(stale)
+        ))
+    if fresh:
+        db.execute(insert(models.NoteLink).values(fresh).on_conflict_do_nothing())
+
+    return len(fresh)
+
+
+def relink_incoming(db: Session, note: models.Note) -> int:
+    """
+    Re-resolve every note that may link to `note` under its current title/slug.
+
+    Candidates are the current backlink sources (which may no longer resolve
+    after a rename) and notes whose content mentions [[title or [[slug.
+    """
+    terms = [t for t in (note.title, note.slug) if t]
+    conditions = [models.Note.content.icontains(f"[[{t}", autoescape=True) for t in terms]
+    conditions.append(models.Note.id.in_(
+        select(models.NoteLink.source_note_id)
+        .where(models.NoteLink.target_note_id == note.id)
+    ))
+
+    candidates = db.query(models.Note).filter(
+        models.Note.owner_id == note.owner_id,
+        models.Note.id != note.id,
+        models.Note.is_trashed == False,
+        or_(*conditions),
+    ).all()
+
+    return sync_note_links(db, candidates, note.owner_id)
+
+
+def clear_note_links(db: Session, note_id: int) -> None:
+    """Remove all links from and to a note (used on trash and delete)."""
+    db.execute(delete(models.NoteLink).where(or_(
+        models.NoteLink.source_note_id == note_id,
+        models.NoteLink.target_note_id == note_id,
+    )))
+
+
+def get_outgoing_link_ids(db: Session, note_ids: Iterable[int], owner_id: int) -> Dict[int, List[int]]:
+    """Map source note ID -> linked target note IDs via note_links."""
+    note_ids = list(note_ids)
+    result: Dict[int, List[int]] = {nid: [] for nid in note_ids}
+    if not note_ids:
+        return result
+
+    rows = db.execute(
+        select(models.NoteLink.source_note_id, models.NoteLink.target_note_id)
+        .join(models.Note, models.Note.id == models.NoteLink.target_note_id)
+        .where(
+            models.NoteLink.source_note_id.in_(note_ids),
+            models.Note.owner_id == owner_id,
+        )
+    )
+    for source_id, target_id in rows:
+        result[source_id].append(target_id)
+    return result
+
+
+def get_backlink_ids(db: Session, note_ids: Iterable[int], owner_id: int) -> Dict[int, List[int]]:
+    """Map target note ID -> IDs of notes linking to it via note_links."""
+    note_ids = list(note_ids)
+    result: Dict[int, List[int]] = {nid: [] for nid in note_ids}
+    if not note_ids:
+        return result
+
+    rows = db.execute(
+        select(models.NoteLink.target_note_id, models.NoteLink.source_note_id)
+        .join(models.Note, models.Note.id == models.NoteLink.source_note_id)
+        .where(
+            models.NoteLink.target_note_id.in_(note_ids),
+            models.Note.owner_id == owner_id,
+        )
+    )
+    for target_id, source_id in rows:
+        result[target_id].append(source_id)
+    return result
+
+
+def backfill_note_links(db: Session, owner_id: int, page_size: int = 200) -> int:
+    """
+    Rebuild note_links for all of a user's notes, one page at a time.
+
+    Commits after each page. Returns number of links inserted.
+    """
+    inserted = 0
+    last_id = 0
+    while True:
+        page = db.query(models.Note).filter(
+            models.Note.owner_id == owner_id,
+            models.Note.id > last_id,
+        ).order_by(models.Note.id).limit(page_size).all()
+        if not page:
+            break
+
+        inserted += sync_note_links(db, page, owner_id)
+        db.commit()
+        last_id = page[-1].id
+        db.expunge_all()
+
+    return inserted
+
+
+class WikilinkResolver:
+    """
+    Per-build cache of wikilink edges, read from note_links in bulk.
+
+    Shared by TypedGraphBuilder (full and local graphs) and ClusteringService
+    so a graph build costs one link query (load_all) or one per BFS level
+    (prefetch) instead of one query per wikilink per note.
+    """
+
+    def __init__(self, db: Session, user_id: int):
+        self.db = db
+        self.user_id = user_id
+        self._outgoing: Dict[int, List[int]] = {}
+        self._incoming: Dict[int, List[int]] = {}
+        self._complete = False
+
+    def load_all(self) -> None:
+        """Load every link whose source note belongs to the user."""
+        if self._complete:
+            return
+        self._outgoing.clear()
+        self._incoming.clear()
+
+        rows = self.db.execute(
+            select(models.NoteLink.source_note_id, models.NoteLink.target_note_id)
+            .join(models.Note, models.Note.id == models.NoteLink.source_note_id)
+            .where(models.Note.owner_id == self.user_id)
+        )
+        for source_id, target_id in rows:
+            self._outgoing.setdefault(source_id, []).append(target_id)
+            self._incoming.setdefault(target_id, []).append(source_id)
+        self._complete = True
+
+    def prefetch(self, note_ids: Iterable[int]) -> None:
+        """Load outgoing links and backlinks for notes not seen yet."""
+        if self._complete:
+            return
+        missing = [nid for nid in set(note_ids) if nid not in self._outgoing]
+        if not missing:
+            return
+        self._outgoing.update(get_outgoing_link_ids(self.db, missing, self.user_id))
+        self._incoming.update(get_backlink_ids(self.db, missing, self.user_id))
+
+    def outgoing(self, note_id: int) -> List[int]:
+        """Target note IDs linked from a note."""
+        self.prefetch([note_id])
+        return self._outgoing.get(note_id, [])
+
+    def backlinks(self, note_id: int) -> List[int]:
+        """Source note IDs linking to a note."""
+        self.prefetch([note_id])
+        return self._incoming.get(note_id, [])
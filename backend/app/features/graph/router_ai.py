@@ -33,6 +33,7 @@ router = APIRouter(prefix="/graph", tags=["Graph V2"])
 async def rebuild_semantic_edges(
     request: Request,
     threshold: float = Query(0.7, ge=0.3, le=0.95, description="Similarity threshold"),
+    incremental: bool = Query(False, description="Only recompute notes whose embedding changed"),
     background_tasks: BackgroundTasks = None,
     use_celery: bool = Query(True, description="Use Celery for async processing"),
     current_user: models.User = Depends(get_current_active_user),
@@ -48,7 +49,7 @@ async def rebuild_semantic_edges(
 
     if use_celery:
         from features.graph.tasks import generate_semantic_edges_task
-        task = generate_semantic_edges_task.delay(current_user.id, threshold)
+        task = generate_semantic_edges_task.delay(current_user.id, threshold, incremental)
 
         return {
             "status": "processing",
@@ -58,7 +59,7 @@ async def rebuild_semantic_edges(
 
     try:
         service = SemanticEdgesService(db, current_user.id)
-        result = service.generate_edges(threshold=threshold)
+        result = service.generate_edges(threshold=threshold, incremental=incremental)
 
         return {
             "status": "completed",
@@ -18,6 +18,7 @@ from features.graph.batch_helpers import (
     batch_backlink_counts,
     batch_tag_note_counts,
 )
+from features.graph.note_links import get_backlink_ids
 
 logger = logging.getLogger(__name__)
 
@@ -43,26 +44,8 @@ def resolve_wikilinks(
 
 
 def get_backlinks(db: Session, note_id: int, owner_id: int) -> List[int]:
-    """Find all notes that link TO this note via wikilinks (single-note)."""
-    current_note = db.query(models.Note).filter(
-        models.Note.id == note_id, models.Note.owner_id == owner_id
-    ).first()
-    if not current_note:
-        return []
-
-    patterns = [f"[[{current_note.title}]]", f"[[{current_note.title}|"]
-    if current_note.slug:
-        patterns.extend([f"[[{current_note.slug}]]", f"[[{current_note.slug}|"])
-
-    backlink_ids: Set[int] = set()
-    for pattern in patterns:
-        for note in db.query(models.Note).filter(
-            models.Note.owner_id == owner_id,
-            models.Note.id != note_id,
-            models.Note.content.contains(pattern)
-        ).all():
-            backlink_ids.add(note.id)
-    return list(backlink_ids)
+    """Find all notes that link TO this note via wikilinks (indexed note_links join)."""
+    return get_backlink_ids(db, [note_id], owner_id)[note_id]
 
 
 def get_or_create_note_by_wikilink(
@@ -86,6 +69,10 @@ def get_or_create_note_by_wikilink(
         db.add(new_note)
         db.commit()
         db.refresh(new_note)
+
+        # Notes already containing [[wikilink_target]] now resolve to the stub
+        from features.notes.service import refresh_note_links
+        refresh_note_links(db, new_note)
         return new_note
     return None
 
@@ -20,6 +20,11 @@ from .graph_index import (
 from .typed_graph import TypedGraphBuilder
 from .clustering import ClusteringService, ClusterResult
 from .semantic_edges import SemanticEdgesService, SemanticEdgeResult
+from .graph_snapshot import (
+    GraphSnapshot,
+    get_graph_snapshot_store,
+    invalidate_graph_snapshot,
+)
 
 __all__ = [
     # Main services
@@ -36,6 +41,10 @@ __all__ = [
     "PathResult",
     "ClusterResult",
     "SemanticEdgeResult",
+    "GraphSnapshot",
+    # Snapshot cache
+    "get_graph_snapshot_store",
+    "invalidate_graph_snapshot",
     # Enums
     "NodeType",
     "EdgeType",
@@ -7,12 +7,13 @@ Assigns community_id to notes for clustered visualization.
 
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 import math
 import random
 
 import models
 from core.logging_config import get_logger
+from features.graph.note_links import WikilinkResolver
 
 logger = get_logger(__name__)
 
@@ -90,8 +91,10 @@ class ClusteringService:
         """Build networkx graph from database."""
         graph = nx.Graph()
 
-        # Get all notes for user
-        notes = self.db.query(models.Note).filter(
+        # Get all notes for user (tags eager-loaded for tag edges)
+        notes = self.db.query(models.Note).options(
+            selectinload(models.Note.tags),
+        ).filter(
             models.Note.owner_id == self.user_id,
             models.Note.is_trashed == False
         ).all()
@@ -105,42 +108,24 @@ class ClusteringService:
         self._add_wikilink_edges(graph, notes)
 
         # Add tag edges (notes sharing tags are connected)
-        self._add_tag_edges(graph)
+        self._add_tag_edges(graph, notes)
 
         return graph
 
     def _add_wikilink_edges(self, graph: "nx.Graph", notes: List[models.Note]):
-        """Add edges for wikilinks between notes."""
-        from features.graph import extract_wikilinks
+        """Add edges for wikilinks between notes (one note_links query)."""
+        links = WikilinkResolver(self.db, self.user_id)
+        links.load_all()
 
         for note in notes:
-            if not note.content:
-                continue
-
             source_id = f"note-{note.id}"
-            wikilinks = extract_wikilinks(note.content)
-
-            for wikilink in wikilinks:
-                # Find target note by title (case-insensitive)
-                target = self.db.query(models.Note).filter(
-                    models.Note.owner_id == self.user_id,
-                    models.Note.title.ilike(wikilink),
-                    models.Note.is_trashed == False
-                ).first()
-
-                if target:
-                    target_id = f"note-{target.id}"
-                    if graph.has_node(target_id):
-                        graph.add_edge(source_id, target_id, weight=1.0, type="wikilink")
-
-    def _add_tag_edges(self, graph: "nx.Graph"):
-        """Add edges between notes sharing tags."""
-        # Get all note-tag relationships for user
-        notes = self.db.query(models.Note).filter(
-            models.Note.owner_id == self.user_id,
-            models.Note.is_trashed == False
-        ).all()
+            for target in links.outgoing(note.id):
+                target_id = f"note-{target}"
+                if graph.has_node(target_id):
+                    graph.add_edge(source_id, target_id, weight=1.0, type="wikilink")
 
+    def _add_tag_edges(self, graph: "nx.Graph", notes: List[models.Note]):
+        """Add edges between notes sharing tags."""
         # Build tag -> notes mapping
         tag_to_notes: Dict[int, List[int]] = {}
         for note in notes:
@@ -173,24 +158,28 @@ class ClusteringService:
         """
         updated = 0
 
-        for node_id, community_id in result.node_to_community.items():
-            if not node_id.startswith("note-"):
-                continue
-
-            note_id = int(node_id.replace("note-", ""))
+        assignments = {
+            int(node_id.replace("note-", "")): community_id
+            for node_id, community_id in result.node_to_community.items()
+            if node_id.startswith("note-")
+        }
 
-            note = self.db.query(models.Note).filter(
-                models.Note.id == note_id,
+        if assignments:
+            notes = self.db.query(models.Note).filter(
+                models.Note.id.in_(list(assignments)),
                 models.Note.owner_id == self.user_id
-            ).first()
-
-            if note:
-                note.community_id = community_id
+            ).all()
+            for note in notes:
+                note.community_id = assignments[note.id]
                 updated += 1
 
         self.db.commit()
         logger.info(f"Updated community_id for {updated} notes")
 
+        # community_id is node metadata on every note
+        from .graph_snapshot import invalidate_graph_snapshot
+        invalidate_graph_snapshot(self.user_id)
+
         return updated
 
     def compute_stable_positions(self, result: ClusterResult) -> Dict[str, Tuple[float, float]]:
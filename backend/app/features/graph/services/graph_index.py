@@ -7,10 +7,9 @@ Provides query surfaces for local/map/path views.
 Phase 1: Full implementation with actual queries.
 """
 
-from typing import List, Dict, Optional, Tuple, Any, Set
+from typing import List, Dict, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from enum import Enum
-from collections import deque
 from sqlalchemy.orm import Session
 
 import models
@@ -118,6 +117,7 @@ class GraphIndex:
         self.db = db
         self.user_id = user_id
         self._builder = None
+        self._snapshot = None
 
     @property
     def builder(self):
@@ -127,6 +127,14 @@ class GraphIndex:
             self._builder = TypedGraphBuilder(self.db, self.user_id)
         return self._builder
 
+    @property
+    def snapshot(self):
+        """Lazy-load the user's versioned GraphSnapshot (full graph, no semantic edges)."""
+        if self._snapshot is None:
+            from .graph_snapshot import load_graph_snapshot
+            self._snapshot = load_graph_snapshot(self.builder)
+        return self._snapshot
+
     def get_local(
         self,
         node_id: str,
@@ -173,8 +181,8 @@ class GraphIndex:
         Returns:
             ClusteredGraphData with community-clustered nodes
         """
-        # Build full graph
-        graph_data = self.builder.build_full_graph(include_semantic=False)
+        # Full graph from the cached snapshot
+        graph_data = self.snapshot.to_graph_data()
 
         # Group nodes by community
         communities = self._detect_communities(graph_data.nodes)
@@ -207,7 +215,7 @@ class GraphIndex:
         """
         Find path between two nodes with explanation.
 
-        Uses BFS to find shortest path through the graph.
+        Uses BFS over the cached graph snapshot (edges treated as undirected).
 
         Args:
             source: Source node ID
@@ -217,34 +225,8 @@ class GraphIndex:
         Returns:
             PathResult with path and explanation, or None if not connected
         """
-        # Build full graph for path finding
-        graph_data = self.builder.build_full_graph(include_semantic=False)
-
-        # Build node lookup map for converting IDs to full nodes
-        node_map: Dict[str, TypedNode] = {node.id: node for node in graph_data.nodes}
-
-        # Build adjacency list
-        adjacency: Dict[str, List[Tuple[str, TypedEdge]]] = {}
-        for edge in graph_data.edges:
-            if edge.source not in adjacency:
-                adjacency[edge.source] = []
-            adjacency[edge.source].append((edge.target, edge))
-
-            # Make edges bidirectional for path finding
-            if edge.target not in adjacency:
-                adjacency[edge.target] = []
-            # Create reverse edge
-            reverse_edge = TypedEdge(
-                source=edge.target,
-                target=edge.source,
-                type=edge.type,
-                weight=edge.weight,
-                evidence=edge.evidence
-            )
-            adjacency[edge.target].append((edge.source, reverse_edge))
-
-        # BFS to find shortest path (returns list of node IDs)
-        path_ids, edges = self._bfs_path(adjacency, source, target, limit)
+        # Shortest path over the snapshot's adjacency arrays
+        path_ids, edges = self.snapshot.shortest_path(source, target, limit)
 
         if not path_ids:
             return PathResult(
@@ -257,19 +239,7 @@ class GraphIndex:
             )
 
         # Convert path IDs to full node objects
-        path_nodes = []
-        for node_id in path_ids:
-            if node_id in node_map:
-                path_nodes.append(node_map[node_id])
-            else:
-                # Fallback: create minimal node if not found
-                node_type = node_id.split('-')[0] if '-' in node_id else 'unknown'
-                path_nodes.append(TypedNode(
-                    id=node_id,
-                    type=NodeType(node_type) if node_type in [e.value for e in NodeType] else NodeType.NOTE,
-                    title=node_id,
-                    metadata={}
-                ))
+        path_nodes = [self.snapshot.node(node_id) for node_id in path_ids]
 
         # Generate explanation
         explanation = self._generate_path_explanation(path_ids, edges)
@@ -283,38 +253,6 @@ class GraphIndex:
             found=True
         )
 
-    def _bfs_path(
-        self,
-        adjacency: Dict[str, List[Tuple[str, TypedEdge]]],
-        source: str,
-        target: str,
-        limit: int
-    ) -> Tuple[List[str], List[TypedEdge]]:
-        """BFS to find shortest path."""
-        if source == target:
-            return [source], []
-
-        # Queue: (current_node, path, edges)
-        queue: deque = deque([(source, [source], [])])
-        visited: Set[str] = {source}
-
-        while queue:
-            current, path, edges = queue.popleft()
-
-            if len(path) > limit:
-                continue
-
-            neighbors = adjacency.get(current, [])
-            for neighbor, edge in neighbors:
-                if neighbor == target:
-                    return path + [neighbor], edges + [edge]
-
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append((neighbor, path + [neighbor], edges + [edge]))
-
-        return [], []
-
     def _generate_path_explanation(
         self,
         path: List[str],
@@ -346,8 +284,8 @@ class GraphIndex:
         return descriptions.get(edge_type, "connects to")
 
     def _get_node_title(self, node_id: str) -> str:
-        """Get title for a node ID."""
-        node = self.get_node(node_id)
+        """Get title for a node ID (from the snapshot, no DB lookup)."""
+        node = self.snapshot.node(node_id)
         return node.title if node else node_id
 
     def get_node(self, node_id: str) -> Optional[TypedNode]:
@@ -364,7 +302,7 @@ class GraphIndex:
 
     def get_neighbors(self, node_id: str, depth: int = 1) -> List[str]:
         """
-        Get IDs of neighboring nodes.
+        Get IDs of neighboring notes and tags (the default local-view layers).
 
         Args:
             node_id: Center node ID
@@ -373,8 +311,9 @@ class GraphIndex:
         Returns:
             List of neighbor node IDs
         """
-        local_graph = self.get_local(node_id, depth=depth)
-        return [node.id for node in local_graph.nodes if node.id != node_id]
+        return self.snapshot.neighbors(
+            node_id, depth=depth, node_types=(NodeType.NOTE, NodeType.TAG)
+        )
 
     def _detect_communities(self, nodes: List[TypedNode]) -> List[CommunityInfo]:
         """
@@ -441,22 +380,4 @@ class GraphIndex:
 
     def get_stats(self) -> Dict[str, Any]:
         """Get graph statistics for the user."""
-        graph_data = self.builder.build_full_graph(include_semantic=False)
-
-        # Count by type
-        node_counts = {}
-        for node in graph_data.nodes:
-            node_type = node.type.value
-            node_counts[node_type] = node_counts.get(node_type, 0) + 1
-
-        edge_counts = {}
-        for edge in graph_data.edges:
-            edge_type = edge.type.value
-            edge_counts[edge_type] = edge_counts.get(edge_type, 0) + 1
-
-        return {
-            "total_nodes": len(graph_data.nodes),
-            "total_edges": len(graph_data.edges),
-            "node_counts": node_counts,
-            "edge_counts": edge_counts,
-        }
+        return self.snapshot.stats()
@@ -0,0 +1,640 @@
+"""
+Graph Snapshot Service
+
+Per-user in-memory graph in compact adjacency-array form, so map/path/stats
+and neighbour queries do not rebuild the full graph from the database.
+
+- Nodes are parallel lists; edges are NumPy arrays (source, target, type,
+  weight) with a CSR adjacency index for undirected traversal.
+- A per-user version counter in Redis is bumped on every note/tag/image/link
+  mutation (invalidate_graph_snapshot). Changed node IDs are recorded with
+  the version that changed them.
+- Snapshots are shared between web workers as a compressed pickle in Redis
+  and kept in a small in-process LRU.
+- When only a few notes changed since the cached snapshot, just those notes
+  are reloaded and patched in; anything else triggers a full rebuild.
+
+Without Redis there is no shared version, so nothing is cached across
+requests (GraphIndex still builds at most one snapshot per instance).
+"""
+
+import logging
+import pickle
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from core import config
+from .graph_index import TypedNode, TypedEdge, TypedGraphData, NodeType, EdgeType
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "graph"
+REDIS_RETRY_COOLDOWN_SECONDS = 30.0
+FULL_REBUILD = "*"
+
+NODE_TYPES: List[NodeType] = list(NodeType)
+EDGE_TYPES: List[EdgeType] = list(EdgeType)
+_NODE_TYPE_CODES = {t: i for i, t in enumerate(NODE_TYPES)}
+_EDGE_TYPE_CODES = {t: i for i, t in enumerate(EDGE_TYPES)}
+
+# Versions of change history kept in the dirty set; older snapshots rebuild
+DIRTY_HISTORY_VERSIONS = 1000
+
+# INCR the version and tag each changed node with it, atomically.
+# Entries older than the history window are trimmed and the floor key
+# records up to which version history is incomplete.
+# ARGV[1] is the TTL, ARGV[2] the history window, ARGV[3..] the node IDs.
+_BUMP_SCRIPT = """
+local version = redis.call('INCR', KEYS[1])
+for i = 3, #ARGV do
+    redis.call('ZADD', KEYS[2], version, ARGV[i])
+end
+local floor = version - tonumber(ARGV[2])
+if floor > 0 then
+    redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', floor)
+    redis.call('SET', KEYS[3], floor)
+end
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+redis.call('EXPIRE', KEYS[3], ARGV[1])
+return version
+"""
+
+
+class GraphSnapshot:
+    """
+    Immutable typed graph in adjacency-array form.
+
+    Attributes:
+        version: Graph version the snapshot was built at
+        node_ids: Node ID strings ('note-1', 'tag-2', ...)
+        node_types: uint8 codes into NODE_TYPES
+        titles / metadata: Per-node display data
+        edge_src / edge_dst: int32 node indices per edge
+        edge_type: uint8 codes into EDGE_TYPES
+        edge_weight: float32 per edge
+        indptr / adj_nodes / adj_edges: CSR index over both edge directions
+    """
+
+    def __init__(
+        self,
+        version: int,
+        node_ids: List[str],
+        node_types: np.ndarray,
+        titles: List[str],
+        metadata: List[Dict[str, Any]],
+        edge_src: np.ndarray,
+        edge_dst: np.ndarray,
+        edge_type: np.ndarray,
+        edge_weight: np.ndarray,
+    ) -> None:
+        self.version = version
+        self.node_ids = node_ids
+        self.node_types = node_types
+        self.titles = titles
+        self.metadata = metadata
+        self.edge_src = edge_src
+        self.edge_dst = edge_dst
+        self.edge_type = edge_type
+        self.edge_weight = edge_weight
+        self.index: Dict[str, int] = {nid: i for i, nid in enumerate(node_ids)}
+        self._build_adjacency()
+
+    # ── Construction ──────────────────────────────────────────────
+
+    @classmethod
+    def from_graph_data(cls, data: TypedGraphData, version: int) -> "GraphSnapshot":
+        """Compact a TypedGraphData (edges with unknown endpoints are dropped)."""
+        node_ids: List[str] = []
+        types: List[int] = []
+        titles: List[str] = []
+        metadata: List[Dict[str, Any]] = []
+        seen: Set[str] = set()
+        for node in data.nodes:
+            if node.id in seen:
+                continue
+            seen.add(node.id)
+            node_ids.append(node.id)
+            types.append(_NODE_TYPE_CODES[node.type])
+            titles.append(node.title)
+            metadata.append(node.metadata)
+
+        index = {nid: i for i, nid in enumerate(node_ids)}
+        src, dst, etype, weight = [], [], [], []
+        for edge in data.edges:
+            s, t = index.get(edge.source), index.get(edge.target)
+            if s is None or t is None:
+                continue
+            src.append(s)
+            dst.append(t)
+            etype.append(_EDGE_TYPE_CODES[edge.type])
+            weight.append(edge.weight)
+
+        return cls(
+            version=version,
+            node_ids=node_ids,
+            node_types=np.asarray(types, dtype=np.uint8),
+            titles=titles,
+            metadata=metadata,
+            edge_src=np.asarray(src, dtype=np.int32),
+            edge_dst=np.asarray(dst, dtype=np.int32),
+            edge_type=np.asarray(etype, dtype=np.uint8),
+            edge_weight=np.asarray(weight, dtype=np.float32),
+        )
+
+    def _build_adjacency(self) -> None:
+        """CSR index: for node i, adj_nodes/adj_edges[indptr[i]:indptr[i+1]]."""
+        n = len(self.node_ids)
+        m = len(self.edge_src)
+        ends = np.concatenate([self.edge_src, self.edge_dst])
+        others = np.concatenate([self.edge_dst, self.edge_src])
+        edge_ids = np.concatenate([np.arange(m, dtype=np.int32)] * 2)
+
+        order = np.argsort(ends, kind="stable")
+        self.adj_nodes = others[order].astype(np.int32)
+        self.adj_edges = edge_ids[order].astype(np.int32)
+        counts = np.bincount(ends, minlength=n) if m else np.zeros(n, dtype=np.int64)
+        self.indptr = np.zeros(n + 1, dtype=np.int32)
+        np.cumsum(counts, out=self.indptr[1:])
+
+    def replace_notes(
+        self,
+        note_ids: Set[str],
+        nodes: List[TypedNode],
+        edges: List[TypedEdge],
+        version: int,
+    ) -> Optional["GraphSnapshot"]:
+        """
+        Return a new snapshot with `note_ids` (and all their edges) replaced.
+
+        `nodes`/`edges` are the fresh state of the changed notes, including
+        incoming edges. Returns None if an edge points at a non-note node the
+        snapshot does not have (e.g. a tag created since), so the caller can
+        fall back to a full rebuild.
+        """
+        keep = np.array([nid not in note_ids for nid in self.node_ids], dtype=bool)
+        remap = np.full(len(self.node_ids), -1, dtype=np.int32)
+        remap[keep] = np.arange(int(keep.sum()), dtype=np.int32)
+
+        node_ids = [nid for nid, k in zip(self.node_ids, keep) if k]
+        titles = [t for t, k in zip(self.titles, keep) if k]
+        metadata = [m for m, k in zip(self.metadata, keep) if k]
+        types = list(self.node_types[keep])
+        for node in nodes:
+            node_ids.append(node.id)
+            types.append(_NODE_TYPE_CODES[node.type])
+            titles.append(node.title)
+            metadata.append(node.metadata)
+        index = {nid: i for i, nid in enumerate(node_ids)}
+
+        edge_keep = keep[self.edge_src] & keep[self.edge_dst] if len(self.edge_src) else np.zeros(0, dtype=bool)
+        src = list(remap[self.edge_src[edge_keep]])
+        dst = list(remap[self.edge_dst[edge_keep]])
+        etype = list(self.edge_type[edge_keep])
+        weight = list(self.edge_weight[edge_keep])
+
+        seen: Set[Tuple[str, str, EdgeType]] = set()
+        for edge in edges:
+            key = (edge.source, edge.target, edge.type)
+            if key in seen:
+                continue
+            seen.add(key)
+            s, t = index.get(edge.source), index.get(edge.target)
+            if s is None or t is None:
+                missing = edge.target if t is None else edge.source
+                if not missing.startswith("note-"):
+                    return None
+                continue  # target note is trashed or gone
+            src.append(s)
+            dst.append(t)
+            etype.append(_EDGE_TYPE_CODES[edge.type])
+            weight.append(edge.weight)
+
+        snapshot = GraphSnapshot(
+            version=version,
+            node_ids=node_ids,
+            node_types=np.asarray(types, dtype=np.uint8),
+            titles=titles,
+            metadata=metadata,
+            edge_src=np.asarray(src, dtype=np.int32),
+            edge_dst=np.asarray(dst, dtype=np.int32),
+            edge_type=np.asarray(etype, dtype=np.uint8),
+            edge_weight=np.asarray(weight, dtype=np.float32),
+        )
+        snapshot._refresh_tag_counts()
+        return snapshot
+
+    def _refresh_tag_counts(self) -> None:
+        """Recompute tag nodes' note_count from tag edges."""
+        tag_code = _EDGE_TYPE_CODES[EdgeType.TAG]
+        counts = np.bincount(
+            self.edge_dst[self.edge_type == tag_code], minlength=len(self.node_ids)
+        )
+        node_tag = _NODE_TYPE_CODES[NodeType.TAG]
+        for i in np.flatnonzero(self.node_types == node_tag):
+            if self.metadata[i].get("note_count") != int(counts[i]):
+                self.metadata[i] = {**self.metadata[i], "note_count": int(counts[i])}
+
+    # ── Queries ───────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self.node_ids)
+
+    def node(self, node_id: str) -> Optional[TypedNode]:
+        """Get a node by ID."""
+        i = self.index.get(node_id)
+        return self._node(i) if i is not None else None
+
+    def _node(self, i: int) -> TypedNode:
+        return TypedNode(
+            id=self.node_ids[i],
+            type=NODE_TYPES[self.node_types[i]],
+            title=self.titles[i],
+            metadata=self.metadata[i],
+        )
+
+    def _edge(self, e: int, reverse: bool = False) -> TypedEdge:
+        s, t = int(self.edge_src[e]), int(self.edge_dst[e])
+        if reverse:
+            s, t = t, s
+        return TypedEdge(
+            source=self.node_ids[s],
+            target=self.node_ids[t],
+            type=EDGE_TYPES[self.edge_type[e]],
+            weight=float(self.edge_weight[e]),
+        )
+
+    def to_graph_data(self) -> TypedGraphData:
+        """Expand back into TypedGraphData (for the map view)."""
+        return TypedGraphData(
+            nodes=[self._node(i) for i in range(len(self.node_ids))],
+            edges=[self._edge(e) for e in range(len(self.edge_src))],
+            metadata={
+                "snapshot_version": self.version,
+                "node_count": len(self.node_ids),
+                "edge_count": len(self.edge_src),
+            },
+        )
+
+    def neighbors(
+        self,
+        node_id: str,
+        depth: int = 1,
+        node_types: Optional[Iterable[NodeType]] = None,
+    ) -> List[str]:
+        """
+        IDs of nodes within `depth` hops (edges treated as undirected).
+
+        Only nodes of `node_types` are included and expanded, matching the
+        layer filter of the local graph view.
+        """
+        start = self.index.get(node_id)
+        if start is None:
+            return []
+        allowed = None
+        if node_types is not None:
+            allowed = {_NODE_TYPE_CODES[t] for t in node_types}
+            if self.node_types[start] not in allowed:
+                return []
+
+        visited = {start}
+        frontier = [start]
+        result: List[str] = []
+        for _ in range(depth):
+            next_frontier = []
+            for i in frontier:
+                for j in self.adj_nodes[self.indptr[i]:self.indptr[i + 1]]:
+                    j = int(j)
+                    if j in visited:
+                        continue
+                    visited.add(j)
+                    if allowed is not None and self.node_types[j] not in allowed:
+                        continue
+                    result.append(self.node_ids[j])
+                    next_frontier.append(j)
+            frontier = next_frontier
+        return result
+
+    def shortest_path(
+        self, source: str, target: str, limit: int
+    ) -> Tuple[List[str], List[TypedEdge]]:
+        """BFS shortest path (undirected); edges are oriented along the path."""
+        s, t = self.index.get(source), self.index.get(target)
+        if s is None or t is None:
+            return [], []
+        if s == t:
+            return [source], []
+
+        parent: Dict[int, Tuple[int, int]] = {s: (-1, -1)}
+        queue: deque = deque([(s, 1)])
+        while queue:
+            current, length = queue.popleft()
+            if length > limit:
+                continue
+            lo, hi = self.indptr[current], self.indptr[current + 1]
+            for j, e in zip(self.adj_nodes[lo:hi], self.adj_edges[lo:hi]):
+                j = int(j)
+                if j in parent:
+                    continue
+                parent[j] = (current, int(e))
+                if j == t:
+                    return self._unwind(parent, t)
+                queue.append((j, length + 1))
+        return [], []
+
+    def _unwind(
+        self, parent: Dict[int, Tuple[int, int]], t: int
+    ) -> Tuple[List[str], List[TypedEdge]]:
+        path = [t]
+        edges: List[TypedEdge] = []
+        while parent[path[-1]][0] != -1:
+            prev, e = parent[path[-1]]
+            edges.append(self._edge(e, reverse=int(self.edge_src[e]) != prev))
+            path.append(prev)
+        path.reverse()
+        edges.reverse()
+        return [self.node_ids[i] for i in path], edges
+
+    def stats(self) -> Dict[str, Any]:
+        """Node and edge counts by type."""
+        node_counts = np.bincount(self.node_types, minlength=len(NODE_TYPES))
+        edge_counts = np.bincount(self.edge_type, minlength=len(EDGE_TYPES))
+        return {
+            "total_nodes": len(self.node_ids),
+            "total_edges": len(self.edge_src),
+            "node_counts": {
+                NODE_TYPES[i].value: int(c) for i, c in enumerate(node_counts) if c
+            },
+            "edge_counts": {
+                EDGE_TYPES[i].value: int(c) for i, c in enumerate(edge_counts) if c
+            },
+        }
+
+
+class GraphSnapshotStore:
+    """
+    Versioned snapshot storage: in-process LRU plus shared Redis tier.
+
+    Redis keys per user:
+        graph:ver:{user_id}    version counter (INCR on every mutation)
+        graph:dirty:{user_id}  sorted set of changed node IDs, scored by version
+        graph:floor:{user_id}  version up to which dirty history was trimmed
+        graph:snap:{user_id}   zlib-compressed pickle of the latest snapshot
+
+    Args:
+        redis_url: Redis URL, or None to disable sharing (and caching)
+        ttl_seconds: Expiry for snapshot blobs and dirty sets
+        local_size: Users whose snapshot is kept in-process
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str],
+        ttl_seconds: int = config.GRAPH_SNAPSHOT_TTL_SECONDS,
+        local_size: int = config.GRAPH_SNAPSHOT_LOCAL_SIZE,
+    ) -> None:
+        self.redis_url = redis_url
+        self.ttl_seconds = ttl_seconds
+        self.local_size = local_size
+
+        self._local: "OrderedDict[int, GraphSnapshot]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_down_until = 0.0
+
+        self._hits = 0
+        self._patches = 0
+        self._rebuilds = 0
+        self._redis_errors = 0
+
+    # ── Versioning ────────────────────────────────────────────────
+
+    def version(self, user_id: int) -> Optional[int]:
+        """Current graph version, or None when Redis is unavailable."""
+        client = self._get_redis()
+        if client is None:
+            return None
+        try:
+            raw = client.get(self._key("ver", user_id))
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        return int(raw) if raw else 0
+
+    def invalidate(self, user_id: int, node_ids: Optional[Iterable[str]] = None) -> None:
+        """Bump the user's version; None marks everything as changed."""
+        members = list(node_ids) if node_ids is not None else [FULL_REBUILD]
+        client = self._get_redis()
+        if client is None:
+            with self._lock:
+                self._local.pop(user_id, None)
+            return
+        try:
+            client.eval(
+                _BUMP_SCRIPT, 3,
+                self._key("ver", user_id), self._key("dirty", user_id),
+                self._key("floor", user_id),
+                self.ttl_seconds, DIRTY_HISTORY_VERSIONS, *members,
+            )
+        except Exception as e:
+            self._redis_failed(e)
+            with self._lock:
+                self._local.pop(user_id, None)
+
+    def changed_since(self, user_id: int, since: int, until: int) -> Optional[Set[str]]:
+        """
+        Node IDs changed in versions (since, until], or None if unknown.
+
+        History is unknown when it was trimmed past `since` or the dirty set
+        expired (an empty result for a non-empty range).
+        """
+        client = self._get_redis()
+        if client is None:
+            return None
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.get(self._key("floor", user_id))
+            pipe.zrangebyscore(self._key("dirty", user_id), f"({since}", until)
+            floor, members = pipe.execute()
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        if (floor and since < int(floor)) or (not members and until > since):
+            return None
+        return {m.decode() if isinstance(m, bytes) else m for m in members}
+
+    # ── Snapshots ─────────────────────────────────────────────────
+
+    def get(self, user_id: int) -> Optional[GraphSnapshot]:
+        """Newest known snapshot for a user (local, else Redis), any version."""
+        with self._lock:
+            local = self._local.get(user_id)
+            if local is not None:
+                self._local.move_to_end(user_id)
+
+        shared = self._redis_get(user_id, newer_than=local.version if local else -1)
+        if shared is not None:
+            self._remember(user_id, shared)
+            return shared
+        return local
+
+    def put(self, user_id: int, snapshot: GraphSnapshot) -> None:
+        """Store a snapshot locally and in Redis."""
+        self._remember(user_id, snapshot)
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            blob = zlib.compress(pickle.dumps(snapshot, protocol=pickle.HIGHEST_PROTOCOL), 1)
+            client.set(self._key("snap", user_id), blob, ex=self.ttl_seconds)
+        except Exception as e:
+            self._redis_failed(e)
+
+    def record(self, outcome: str) -> None:
+        """Count a load outcome ('hit', 'patch', 'rebuild') for stats()."""
+        with self._lock:
+            if outcome == "hit":
+                self._hits += 1
+            elif outcome == "patch":
+                self._patches += 1
+            else:
+                self._rebuilds += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "local_snapshots": len(self._local),
+                "hits": self._hits,
+                "patches": self._patches,
+                "rebuilds": self._rebuilds,
+                "redis_enabled": self.redis_url is not None,
+                "redis_errors": self._redis_errors,
+            }
+
+    # ── Internals ─────────────────────────────────────────────────
+
+    @staticmethod
+    def _key(kind: str, user_id: int) -> str:
+        return f"{REDIS_KEY_PREFIX}:{kind}:{user_id}"
+
+    def _remember(self, user_id: int, snapshot: GraphSnapshot) -> None:
+        with self._lock:
+            current = self._local.get(user_id)
+            if current is None or current.version <= snapshot.version:
+                self._local[user_id] = snapshot
+            self._local.move_to_end(user_id)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def _redis_get(self, user_id: int, newer_than: int) -> Optional[GraphSnapshot]:
+        client = self._get_redis()
+        if client is None:
+            return None
+        try:
+            blob = client.get(self._key("snap", user_id))
+            if not blob:
+                return None
+            snapshot = pickle.loads(zlib.decompress(blob))
+        except Exception as e:
+            self._redis_failed(e)
+            return None
+        return snapshot if snapshot.version > newer_than else None
+
+    def _get_redis(self):
+        if self.redis_url is None or time.time() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            import redis
+            self._redis = redis.from_url(
+                self.redis_url,
+                socket_connect_timeout=0.5,
+                socket_timeout=2.0,
+            )
+        return self._redis
+
+    def _redis_failed(self, error: Exception) -> None:
+        logger.warning(f"Graph snapshot Redis tier unavailable: {error}")
+        with self._lock:
+            self._redis_errors += 1
+        self._redis_down_until = time.time() + REDIS_RETRY_COOLDOWN_SECONDS
+
+
+def load_graph_snapshot(builder) -> GraphSnapshot:
+    """
+    Get an up-to-date snapshot for the builder's user.
+
+    Serves the cached snapshot when its version is current, patches in a
+    few changed notes when possible, and otherwise rebuilds from the DB.
+    The version is read before any data is loaded, so writes that land
+    during a build bump the version past the stored snapshot.
+    """
+    store = get_graph_snapshot_store()
+    user_id = builder.user_id
+
+    version = store.version(user_id)
+    if version is None:
+        return GraphSnapshot.from_graph_data(builder.build_full_graph(include_semantic=False), 0)
+
+    cached = store.get(user_id)
+    if cached is not None and cached.version == version:
+        store.record("hit")
+        return cached
+
+    snapshot = None
+    if cached is not None and cached.version < version:
+        changed = store.changed_since(user_id, cached.version, version)
+        if (
+            changed
+            and FULL_REBUILD not in changed
+            and len(changed) <= config.GRAPH_SNAPSHOT_MAX_INCREMENTAL
+            and all(c.startswith("note-") for c in changed)
+        ):
+            note_ids = {int(c.split("-", 1)[1]) for c in changed}
+            nodes, edges = builder.build_note_patch(note_ids)
+            snapshot = cached.replace_notes(changed, nodes, edges, version)
+            if snapshot is not None:
+                store.record("patch")
+                logger.debug(f"Patched graph snapshot for user {user_id} ({len(changed)} notes)")
+
+    if snapshot is None:
+        store.record("rebuild")
+        snapshot = GraphSnapshot.from_graph_data(
+            builder.build_full_graph(include_semantic=False), version
+        )
+
+    store.put(user_id, snapshot)
+    return snapshot
+
+
+def invalidate_graph_snapshot(user_id: Optional[int], node_ids: Optional[Iterable[str]] = None) -> None:
+    """
+    Mark a user's graph as changed. Never raises.
+
+    Args:
+        user_id: Graph owner
+        node_ids: Changed nodes ('note-12'); None forces a full rebuild
+    """
+    if user_id is None:
+        return
+    try:
+        get_graph_snapshot_store().invalidate(user_id, node_ids)
+    except Exception as e:
+        logger.debug(f"Graph snapshot invalidation skipped: {e}")
+
+
+# Global store instance
+_snapshot_store: Optional[GraphSnapshotStore] = None
+
+
+def get_graph_snapshot_store() -> GraphSnapshotStore:
+    """Get or create the process-wide graph snapshot store."""
+    global _snapshot_store
+    if _snapshot_store is None:
+        _snapshot_store = GraphSnapshotStore(
+            redis_url=config.REDIS_URL if config.GRAPH_SNAPSHOT_ENABLED else None,
+        )
+    return _snapshot_store
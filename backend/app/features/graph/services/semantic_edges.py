@@ -5,13 +5,14 @@ Generates embedding-based similarity edges between notes.
 Uses cosine similarity on note embeddings to find semantically related content.
 """
 
+from datetime import datetime, timezone
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, text
+from sqlalchemy import insert, text
 
 import models
-from features.graph.models import SemanticEdge
+from features.graph.models import SemanticEdge, SemanticEdgeRun
 from core.logging_config import get_logger
 
 logger = get_logger(__name__)
@@ -38,12 +39,20 @@ class SemanticEdgesService:
     """
     Generate semantic similarity edges between notes.
 
-    Uses note embeddings (768-dim vectors from nomic-embed-text) to compute
-    pairwise cosine similarity. Creates edges where similarity > threshold.
+    Uses note embeddings (768-dim vectors from nomic-embed-text). Similarities
+    are computed in row blocks and only each note's top `max_per_note`
+    neighbours above the threshold are kept, so memory stays at
+    BLOCK_SIZE x n instead of n x n.
+
+    Incremental runs only recompute notes whose embedding changed since the
+    last run (see SemanticEdgeRun).
     """
 
     DEFAULT_THRESHOLD = 0.7  # Minimum similarity for edge creation
     MAX_EDGES_PER_NOTE = 10  # Limit edges per note to avoid clutter
+    EMBEDDING_DIM = 768
+    BLOCK_SIZE = 512  # Rows of the similarity matrix computed at once
+    INSERT_BATCH_SIZE = 5000
 
     def __init__(self, db: Session, user_id: int):
         self.db = db
@@ -52,7 +61,8 @@ class SemanticEdgesService:
     def generate_edges(
         self,
         threshold: float = DEFAULT_THRESHOLD,
-        max_per_note: int = MAX_EDGES_PER_NOTE
+        max_per_note: int = MAX_EDGES_PER_NOTE,
+        incremental: bool = False,
     ) -> SemanticEdgeResult:
         """
         Generate semantic edges for all notes with embeddings.
@@ -60,6 +70,9 @@ class SemanticEdgesService:
         Args:
             threshold: Minimum cosine similarity (0.0 - 1.0)
             max_per_note: Maximum edges to create per note
+            incremental: Only recompute notes whose embedding changed since
+                the last run (falls back to a full run if there was none or
+                its threshold/cap differ)
 
         Returns:
             SemanticEdgeResult with statistics
@@ -68,90 +81,172 @@ class SemanticEdgesService:
             logger.warning("numpy not available for semantic edge generation")
             return SemanticEdgeResult(0, 0, 0, threshold)
 
-        logger.info(f"Generating semantic edges for user {self.user_id} (threshold={threshold})")
+        logger.info(
+            f"Generating semantic edges for user {self.user_id} "
+            f"(threshold={threshold}, incremental={incremental})"
+        )
+        started_at = datetime.now(timezone.utc)
 
-        # Get notes with embeddings
-        notes = self._get_notes_with_embeddings()
+        note_ids, embeddings, changed_at = self._load_embeddings()
 
-        if len(notes) < 2:
+        if len(note_ids) < 2:
             logger.info("Not enough notes with embeddings for semantic edges")
-            return SemanticEdgeResult(0, 0, len(notes), threshold)
-
-        # Delete existing semantic edges for user
-        deleted = self._delete_existing_edges()
-
-        # Compute similarity matrix
-        similarity_pairs = self._compute_similarities(notes, threshold)
-
-        # Create edges for top similarities
-        created = self._create_edges(similarity_pairs, max_per_note)
-
+            return SemanticEdgeResult(0, 0, len(note_ids), threshold)
+
+        rows = None
+        if incremental:
+            rows = self._changed_rows(changed_at, threshold, max_per_note)
+
+        if rows is None:
+            rows = np.arange(len(note_ids))
+            deleted = self._delete_existing_edges()
+            existing = np.zeros(len(note_ids), dtype=np.int64)
+        else:
+            deleted = self._delete_edges_for(note_ids[rows].tolist())
+            existing = self._existing_edge_counts(note_ids)
+
+        if len(rows):
+            lo, hi, sims = self._top_k_pairs(embeddings, rows, threshold, max_per_note)
+            keep = self._apply_cap(lo, hi, existing, max_per_note)
+            created = self._create_edges(note_ids[lo[keep]], note_ids[hi[keep]], sims[keep])
+        else:
+            created = 0
+
+        self.db.merge(SemanticEdgeRun(
+            owner_id=self.user_id,
+            threshold=threshold,
+            max_per_note=max_per_note,
+            completed_at=started_at,
+        ))
         self.db.commit()
 
-        logger.info(f"Created {created} semantic edges, deleted {deleted}")
+        logger.info(
+            f"Created {created} semantic edges, deleted {deleted} "
+            f"({len(rows)}/{len(note_ids)} notes recomputed)"
+        )
         return SemanticEdgeResult(
             edges_created=created,
             edges_deleted=deleted,
-            notes_processed=len(notes),
+            notes_processed=len(rows),
             threshold=threshold
         )
 
-    def _get_notes_with_embeddings(self) -> List[Tuple[int, str, np.ndarray]]:
-        """Get all notes with valid embeddings."""
-        notes = self.db.query(models.Note).filter(
+    def _load_embeddings(self) -> Tuple["np.ndarray", "np.ndarray", list]:
+        """
+        Load (note_ids, L2-normalized float32 embeddings, embedding_updated_at).
+
+        Rows are ordered by note ID. Embeddings of the wrong dimension are skipped.
+        """
+        rows = self.db.query(
+            models.Note.id, models.Note.embedding, models.Note.embedding_updated_at
+        ).filter(
             models.Note.owner_id == self.user_id,
             models.Note.is_trashed == False,
             models.Note.embedding.isnot(None)
-        ).all()
-
-        result = []
-        for note in notes:
-            if note.embedding is not None:
-                # Convert from pgvector to numpy array
-                try:
-                    embedding = np.array(note.embedding)
-                    if embedding.shape == (768,):
-                        result.append((note.id, note.title, embedding))
-                except Exception as e:
-                    logger.warning(f"Failed to process embedding for note {note.id}: {e}")
-
-        logger.info(f"Found {len(result)} notes with valid embeddings")
-        return result
-
-    def _compute_similarities(
+        ).order_by(models.Note.id).all()
+
+        ids, vectors, changed_at = [], [], []
+        for note_id, embedding, updated_at in rows:
+            try:
+                vector = np.asarray(embedding, dtype=np.float32)
+            except Exception as e:
+                logger.warning(f"Failed to process embedding for note {note_id}: {e}")
+                continue
+            if vector.shape != (self.EMBEDDING_DIM,):
+                continue
+            ids.append(note_id)
+            vectors.append(vector)
+            changed_at.append(updated_at)
+
+        logger.info(f"Found {len(ids)} notes with valid embeddings")
+        if not ids:
+            return np.zeros(0, dtype=np.int64), np.zeros((0, self.EMBEDDING_DIM), dtype=np.float32), []
+
+        embeddings = np.vstack(vectors)
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-8
+        return np.asarray(ids, dtype=np.int64), embeddings, changed_at
+
+    def _changed_rows(
+        self, changed_at: list, threshold: float, max_per_note: int
+    ) -> Optional["np.ndarray"]:
+        """Rows whose embedding changed since the last run, or None for a full run."""
+        run = self.db.get(SemanticEdgeRun, self.user_id)
+        if run is None or run.threshold != threshold or run.max_per_note != max_per_note:
+            logger.info("No compatible previous run, doing a full semantic edge rebuild")
+            return None
+
+        return np.asarray([
+            i for i, updated_at in enumerate(changed_at)
+            if updated_at is not None and updated_at > run.completed_at
+        ], dtype=np.int64)
+
+    def _top_k_pairs(
         self,
-        notes: List[Tuple[int, str, np.ndarray]],
-        threshold: float
-    ) -> List[Tuple[int, int, float]]:
+        embeddings: "np.ndarray",
+        rows: "np.ndarray",
+        threshold: float,
+        k: int,
+    ) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
         """
-        Compute pairwise cosine similarities above threshold.
+        Top-k neighbours above threshold for each of `rows`, as unique pairs.
 
-        Returns list of (note1_id, note2_id, similarity) tuples.
+        Returns (lo, hi, similarity) row indices with lo < hi, sorted by
+        similarity descending.
         """
-        pairs = []
-
-        # Stack embeddings into matrix for efficient computation
-        embeddings = np.array([n[2] for n in notes])
-
-        # Normalize for cosine similarity
-        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
-        normalized = embeddings / (norms + 1e-8)
-
-        # Compute similarity matrix
-        similarity_matrix = np.dot(normalized, normalized.T)
+        n = len(embeddings)
+        k = min(k, n - 1)
+        lo_parts, hi_parts, sim_parts = [], [], []
+
+        for start in range(0, len(rows), self.BLOCK_SIZE):
+            block = rows[start:start + self.BLOCK_SIZE]
+            sims = embeddings[block] @ embeddings.T
+            sims[np.arange(len(block)), block] = -np.inf  # no self-edges
+
+            top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            top_sims = np.take_along_axis(sims, top, axis=1)
+            mask = top_sims >= threshold
+
+            sources = np.broadcast_to(block[:, None], top.shape)[mask]
+            targets = top[mask]
+            lo_parts.append(np.minimum(sources, targets))
+            hi_parts.append(np.maximum(sources, targets))
+            sim_parts.append(top_sims[mask])
+
+        lo = np.concatenate(lo_parts).astype(np.int64)
+        hi = np.concatenate(hi_parts).astype(np.int64)
+        sims = np.concatenate(sim_parts)
+
+        # Both ends may have picked the same pair
+        _, first = np.unique(lo * n + hi, return_index=True)
+        order = first[np.argsort(-sims[first], kind="stable")]
+
+        logger.info(f"Found {len(order)} similarity pairs above threshold {threshold}")
+        return lo[order], hi[order], sims[order]
+
+    @staticmethod
+    def _apply_cap(
+        lo: "np.ndarray",
+        hi: "np.ndarray",
+        existing: "np.ndarray",
+        max_per_note: int,
+    ) -> "np.ndarray":
+        """
+        Mask of pairs to keep so no note exceeds max_per_note edges.
 
-        # Extract pairs above threshold
-        for i in range(len(notes)):
-            for j in range(i + 1, len(notes)):
-                sim = similarity_matrix[i, j]
-                if sim >= threshold:
-                    pairs.append((notes[i][0], notes[j][0], float(sim)))
+        Greedy over pairs in similarity order: a pair is kept when both ends
+        are still under the cap (after `existing` edges). Rejected pairs do
+        not use up a slot at either end.
+        """
+        keep = np.zeros(len(lo), dtype=bool)
+        degree = existing.astype(np.int64).tolist()
 
-        # Sort by similarity descending
-        pairs.sort(key=lambda x: x[2], reverse=True)
+        for i, (a, b) in enumerate(zip(lo.tolist(), hi.tolist())):
+            if degree[a] < max_per_note and degree[b] < max_per_note:
+                keep[i] = True
+                degree[a] += 1
+                degree[b] += 1
 
-        logger.info(f"Found {len(pairs)} similarity pairs above threshold {threshold}")
-        return pairs
+        return keep
 
     def _delete_existing_edges(self) -> int:
         """Delete all existing semantic edges for user."""
@@ -161,44 +256,63 @@ class SemanticEdgesService:
 
         return deleted
 
+    def _delete_edges_for(self, note_ids: List[int]) -> int:
+        """Delete note edges touching `note_ids` or notes no longer embedded/live."""
+        result = self.db.execute(text("""
+            DELETE FROM semantic_edges e
+            WHERE e.owner_id = :owner_id
+              AND e.source_type = 'note' AND e.target_type = 'note'
+              AND (
+                e.source_id = ANY(:note_ids) OR e.target_id = ANY(:note_ids)
+                OR NOT EXISTS (
+                    SELECT 1 FROM notes n WHERE n.id = e.source_id
+                      AND n.is_trashed = false AND n.embedding IS NOT NULL)
+                OR NOT EXISTS (
+                    SELECT 1 FROM notes n WHERE n.id = e.target_id
+                      AND n.is_trashed = false AND n.embedding IS NOT NULL)
+              )
+        """), {"owner_id": self.user_id, "note_ids": note_ids})
+        return result.rowcount
+
+    def _existing_edge_counts(self, note_ids: "np.ndarray") -> "np.ndarray":
+        """Edges per note (by row index) among the user's remaining note edges."""
+        counts = np.zeros(len(note_ids), dtype=np.int64)
+        rows = self.db.query(SemanticEdge.source_id, SemanticEdge.target_id).filter(
+            SemanticEdge.owner_id == self.user_id,
+            SemanticEdge.source_type == "note",
+            SemanticEdge.target_type == "note",
+        ).all()
+        if not rows:
+            return counts
+
+        ends = np.asarray(rows, dtype=np.int64).ravel()
+        idx = np.searchsorted(note_ids, ends)
+        idx = idx[(idx < len(note_ids)) & (note_ids[np.minimum(idx, len(note_ids) - 1)] == ends)]
+        np.add.at(counts, idx, 1)
+        return counts
+
     def _create_edges(
         self,
-        pairs: List[Tuple[int, int, float]],
-        max_per_note: int
+        source_ids: "np.ndarray",
+        target_ids: "np.ndarray",
+        similarities: "np.ndarray",
     ) -> int:
-        """
-        Create semantic edge records in database.
-
-        Limits edges per note to avoid cluttering the graph.
-        """
-        # Track edges per note
-        edges_per_note: dict = {}
-        created = 0
-
-        for note1_id, note2_id, similarity in pairs:
-            # Check limits
-            count1 = edges_per_note.get(note1_id, 0)
-            count2 = edges_per_note.get(note2_id, 0)
-
-            if count1 >= max_per_note or count2 >= max_per_note:
-                continue
-
-            # Create edge
-            edge = SemanticEdge(
-                owner_id=self.user_id,
-                source_type="note",
-                source_id=note1_id,
-                target_type="note",
-                target_id=note2_id,
-                similarity_score=similarity
-            )
-            self.db.add(edge)
-
-            edges_per_note[note1_id] = count1 + 1
-            edges_per_note[note2_id] = count2 + 1
-            created += 1
-
-        return created
+        """Bulk-insert semantic edge rows (executemany, INSERT_BATCH_SIZE per round trip)."""
+        rows = [
+            {
+                "owner_id": self.user_id,
+                "source_type": "note",
+                "source_id": int(source_id),
+                "target_type": "note",
+                "target_id": int(target_id),
+                "similarity_score": float(similarity),
+            }
+            for source_id, target_id, similarity in zip(source_ids, target_ids, similarities)
+        ]
+        for start in range(0, len(rows), self.INSERT_BATCH_SIZE):
+            self.db.execute(insert(SemanticEdge), rows[start:start + self.INSERT_BATCH_SIZE])
+
+        return len(rows)
 
     def get_semantic_neighbors(
         self,
@@ -5,13 +5,12 @@ Builds typed graph data from database models.
 Converts notes, tags, images, and their relationships into TypedNode/TypedEdge format.
 """
 
-from typing import List, Dict, Optional, Set
-from collections import deque
-from sqlalchemy.orm import Session
+from typing import List, Dict, Optional, Set, Tuple
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import or_
 
 import models
-from features.graph.wikilink_parser import extract_wikilinks, parse_wikilink, create_slug
+from features.graph.note_links import WikilinkResolver
 from .graph_index import TypedNode, TypedEdge, TypedGraphData
 from .graph_factories import (
     note_to_typed_node,
@@ -49,7 +48,8 @@ class TypedGraphBuilder:
         """Initialize builder for a user."""
         self.db = db
         self.user_id = user_id
-        self._wikilink_cache: Dict[int, List[int]] = {}
+        self.links = WikilinkResolver(db, user_id)
+        self._note_cache: Dict[int, Optional[models.Note]] = {}
 
     def build_full_graph(
         self,
@@ -69,8 +69,11 @@ class TypedGraphBuilder:
         nodes: List[TypedNode] = []
         edges: List[TypedEdge] = []
 
-        # Load all data
-        notes = self.db.query(models.Note).filter(
+        # Load all data (relationships eager-loaded in one query each)
+        notes = self.db.query(models.Note).options(
+            selectinload(models.Note.tags),
+            selectinload(models.Note.images),
+        ).filter(
             models.Note.owner_id == self.user_id,
             models.Note.is_trashed == False
         ).all()
@@ -79,11 +82,16 @@ class TypedGraphBuilder:
             models.Tag.owner_id == self.user_id
         ).all()
 
-        images = self.db.query(models.Image).filter(
+        images = self.db.query(models.Image).options(
+            selectinload(models.Image.notes),
+        ).filter(
             models.Image.owner_id == self.user_id,
             models.Image.is_trashed == False
         ).all()
 
+        # All wikilink edges in one note_links query
+        self.links.load_all()
+
         # Build node lookup sets
         note_ids = {note.id for note in notes}
         tag_ids = {tag.id for tag in tags}
@@ -158,6 +166,60 @@ class TypedGraphBuilder:
             }
         )
 
+    def build_note_patch(self, note_ids: Set[int]) -> Tuple[List[TypedNode], List[TypedEdge]]:
+        """
+        Build the nodes and every edge touching `note_ids`, as build_full_graph would.
+
+        Used to patch a cached GraphSnapshot when only a few notes changed.
+        Trashed or deleted notes yield no node, so they drop out of the graph.
+
+        Returns:
+            (nodes, edges) for the live notes among `note_ids`
+        """
+        notes = self.db.query(models.Note).options(
+            selectinload(models.Note.tags),
+            selectinload(models.Note.images),
+        ).filter(
+            models.Note.id.in_(note_ids),
+            models.Note.owner_id == self.user_id,
+            models.Note.is_trashed == False
+        ).all()
+        live_ids = [note.id for note in notes]
+
+        nodes: List[TypedNode] = [note_to_typed_node(note) for note in notes]
+        edges: List[TypedEdge] = []
+        if not notes:
+            return nodes, edges
+
+        # Wikilinks in both directions (note_links never holds trashed notes)
+        self.links.prefetch(live_ids)
+        for note in notes:
+            for target_id in self.links.outgoing(note.id):
+                if target_id != note.id:
+                    edges.append(create_wikilink_edge(note.id, target_id))
+            for source_id in self.links.backlinks(note.id):
+                if source_id != note.id:
+                    edges.append(create_wikilink_edge(source_id, note.id))
+
+            for tag in note.tags:
+                edges.append(create_tag_edge(note.id, tag.id))
+
+            for image in note.images:
+                if image.owner_id == self.user_id and not image.is_trashed:
+                    edges.append(create_image_edge(note.id, image.id))
+                    edges.append(create_image_edge(note.id, image.id, reverse=True))
+
+        documents = self.db.query(models.Document.id, models.Document.summary_note_id).filter(
+            models.Document.owner_id == self.user_id,
+            models.Document.is_trashed == False,
+            models.Document.ai_analysis_status == "completed",
+            models.Document.summary_note_id.in_(live_ids),
+        ).all()
+        for doc_id, summary_note_id in documents:
+            edges.append(create_source_edge(doc_id, summary_note_id))
+
+        return nodes, edges
+
     def build_local_graph(
         self,
         center_node_id: str,
@@ -188,44 +250,45 @@ class TypedGraphBuilder:
                 metadata={"error": f"Invalid node ID: {center_node_id}"}
             )
 
-        # BFS traversal
+        # BFS traversal, one level at a time so each level's notes and
+        # wikilinks are loaded in bulk
         visited_nodes: Set[str] = set()
         nodes: List[TypedNode] = []
         edges: List[TypedEdge] = []
 
-        # Queue: (node_id, current_depth)
-        queue: deque = deque([(center_node_id, 0)])
-
-        while queue:
-            current_id, current_depth = queue.popleft()
-
-            if current_id in visited_nodes:
-                continue
-            if current_depth > depth:
-                continue
-
-            visited_nodes.add(current_id)
-
-            # Get node and its neighbors
-            node = self._get_node_by_id(current_id)
-            if node is None:
-                continue
-
-            # Check if layer is included
-            if not self._is_layer_included(node.type.value, layers):
-                continue
-
-            nodes.append(node)
-
-            # Get neighbors and add edges
-            if current_depth < depth:
-                neighbors = self._get_neighbors(current_id, layers, min_weight)
-                for neighbor_id, edge in neighbors:
-                    if neighbor_id not in visited_nodes:
-                        queue.append((neighbor_id, current_depth + 1))
-                    # Add edge if both nodes will be in result
-                    if edge.weight >= min_weight:
-                        edges.append(edge)
+        frontier: List[str] = [center_node_id]
+        for current_depth in range(depth + 1):
+            if not frontier:
+                break
+            self._prefetch_notes(frontier)
+
+            next_frontier: List[str] = []
+            for current_id in frontier:
+                if current_id in visited_nodes:
+                    continue
+                visited_nodes.add(current_id)
+
+                # Get node and its neighbors
+                node = self._get_node_by_id(current_id)
+                if node is None:
+                    continue
+
+                # Check if layer is included
+                if not self._is_layer_included(node.type.value, layers):
+                    continue
+
+                nodes.append(node)
+
+                # Get neighbors and add edges
+                if current_depth < depth:
+                    neighbors = self._get_neighbors(current_id, layers, min_weight)
+                    for neighbor_id, edge in neighbors:
+                        if neighbor_id not in visited_nodes:
+                            next_frontier.append(neighbor_id)
+                        # Add edge if both nodes will be in result
+                        if edge.weight >= min_weight:
+                            edges.append(edge)
+            frontier = next_frontier
 
         # Deduplicate edges
         seen_edges: Set[tuple] = set()
@@ -259,6 +322,35 @@ class TypedGraphBuilder:
         except ValueError:
             return None, None
 
+    def _prefetch_notes(self, node_ids: List[str]) -> None:
+        """Load uncached notes (with tags and images) and their wikilinks in bulk."""
+        note_ids = set()
+        for node_id in node_ids:
+            node_type, db_id = self._parse_node_id(node_id)
+            if node_type == "note" and db_id not in self._note_cache:
+                note_ids.add(db_id)
+        if not note_ids:
+            return
+
+        notes = self.db.query(models.Note).options(
+            selectinload(models.Note.tags),
+            selectinload(models.Note.images),
+        ).filter(
+            models.Note.id.in_(note_ids),
+            models.Note.owner_id == self.user_id
+        ).all()
+        for note_id in note_ids:
+            self._note_cache[note_id] = None
+        for note in notes:
+            self._note_cache[note.id] = note
+        self.links.prefetch(note_ids)
+
+    def _get_note(self, note_id: int) -> Optional[models.Note]:
+        """Get a user's note, using the per-build cache."""
+        if note_id not in self._note_cache:
+            self._prefetch_notes([f"note-{note_id}"])
+        return self._note_cache.get(note_id)
+
     def _get_node_by_id(self, node_id: str) -> Optional[TypedNode]:
         """Get a TypedNode by its ID string."""
         node_type, db_id = self._parse_node_id(node_id)
@@ -266,10 +358,7 @@ class TypedGraphBuilder:
             return None
 
         if node_type == "note":
-            note = self.db.query(models.Note).filter(
-                models.Note.id == db_id,
-                models.Note.owner_id == self.user_id
-            ).first()
+            note = self._get_note(db_id)
             return note_to_typed_node(note) if note else None
 
         elif node_type == "tag":
@@ -314,10 +403,7 @@ class TypedGraphBuilder:
         node_type, db_id = self._parse_node_id(node_id)
 
         if node_type == "note":
-            note = self.db.query(models.Note).filter(
-                models.Note.id == db_id,
-                models.Note.owner_id == self.user_id
-            ).first()
+            note = self._get_note(db_id)
             if not note:
                 return neighbors
 
@@ -452,58 +538,12 @@ class TypedGraphBuilder:
         return neighbors
 
     def _resolve_wikilinks(self, note: models.Note) -> List[int]:
-        """Resolve wikilinks in note content to note IDs."""
-        if note.id in self._wikilink_cache:
-            return self._wikilink_cache[note.id]
-
-        if not note.content:
-            return []
-
-        wikilinks = extract_wikilinks(note.content)
-        linked_ids: Set[int] = set()
-
-        for wikilink in wikilinks:
-            target, _ = parse_wikilink(wikilink)
-            if not target:
-                continue
-
-            target_slug = create_slug(target)
-            linked_note = self.db.query(models.Note).filter(
-                models.Note.owner_id == self.user_id,
-                or_(
-                    models.Note.slug == target_slug,
-                    models.Note.title.ilike(target)
-                )
-            ).first()
-
-            if linked_note and linked_note.id != note.id:
-                linked_ids.add(linked_note.id)
-
-        result = list(linked_ids)
-        self._wikilink_cache[note.id] = result
-        return result
+        """Resolve wikilinks of a note to target note IDs via the shared resolver."""
+        return self.links.outgoing(note.id)
 
     def _get_backlinks(self, note: models.Note) -> List[int]:
-        """Find notes that link TO this note."""
-        if not note.title:
-            return []
-
-        search_patterns = [f"[[{note.title}]]"]
-        if note.slug:
-            search_patterns.append(f"[[{note.slug}]]")
-
-        backlink_ids: Set[int] = set()
-
-        for pattern in search_patterns:
-            notes = self.db.query(models.Note).filter(
-                models.Note.owner_id == self.user_id,
-                models.Note.id != note.id,
-                models.Note.content.contains(pattern)
-            ).all()
-            for n in notes:
-                backlink_ids.add(n.id)
-
-        return list(backlink_ids)
+        """Find notes that link TO this note via the shared resolver."""
+        return self.links.backlinks(note.id)
 
     def _get_semantic_edges(self, min_weight: float) -> List[TypedEdge]:
         """Get semantic edges from the semantic_edges table."""
@@ -12,19 +12,20 @@ logger = get_logger(__name__)
 
 
 @celery_app.task(bind=True, name="features.graph.tasks.generate_semantic_edges")
-def generate_semantic_edges_task(self, user_id: int, threshold: float = 0.7):
+def generate_semantic_edges_task(self, user_id: int, threshold: float = 0.7, incremental: bool = False):
     """
     Generate semantic similarity edges for a user's notes.
 
     This task:
     1. Loads all note embeddings for the user
-    2. Computes pairwise cosine similarity
+    2. Computes blockwise top-k cosine similarity
     3. Creates edges where similarity > threshold
     4. Stores results in semantic_edges table
 
     Args:
         user_id: User ID to process
         threshold: Minimum similarity score (0.0 - 1.0)
+        incremental: Only recompute notes whose embedding changed since the last run
 
     Returns:
         Dict with task results
@@ -36,7 +37,7 @@ def generate_semantic_edges_task(self, user_id: int, threshold: float = 0.7):
         from features.graph.services.semantic_edges import SemanticEdgesService
 
         service = SemanticEdgesService(db, user_id)
-        result = service.generate_edges(threshold=threshold)
+        result = service.generate_edges(threshold=threshold, incremental=incremental)
 
         return {
             "status": "completed",
@@ -150,3 +151,52 @@ def rebuild_graph_index_task(
 
     logger.info(f"Graph index rebuild complete for user {user_id}")
     return results
+
+
+@celery_app.task(bind=True, name="features.graph.tasks.backfill_note_links")
+def backfill_note_links_task(self, user_id: int = None):
+    """
+    One-time rebuild of note_links from note content.
+
+    note_links is maintained on every note write; this fills it for notes
+    written before that (or repairs drift). Safe to re-run.
+
+    Args:
+        user_id: Only process this user's notes (default: all users)
+
+    Returns:
+        Dict with task results
+    """
+    logger.info(f"Starting note_links backfill (user={user_id or 'all'})")
+
+    db = SessionLocal()
+    try:
+        import models
+        from features.graph.note_links import backfill_note_links
+
+        if user_id is not None:
+            owner_ids = [user_id]
+        else:
+            owner_ids = [
+                row[0] for row in db.query(models.Note.owner_id).filter(
+                    models.Note.owner_id.isnot(None)
+                ).distinct().all()
+            ]
+
+        links_created = 0
+        for owner_id in owner_ids:
+            links_created += backfill_note_links(db, owner_id)
+
+        logger.info(f"note_links backfill complete: {links_created} links for {len(owner_ids)} users")
+        return {
+            "status": "completed",
+            "users_processed": len(owner_ids),
+            "links_created": links_created,
+        }
+
+    except Exception as e:
+        logger.error(f"note_links backfill failed: {e}")
+        raise
+
+    finally:
+        db.close()
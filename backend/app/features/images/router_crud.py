@@ -1,21 +1,26 @@
 """
 Images Feature - CRUD Endpoints
 
-Get images list, image metadata, and image file.
+Get images list, image metadata, image file, resized renditions and
+the duplicate report.
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
+from hashlib import md5
 import logging
+import os
 
 from core.database import get_db
 from core.auth import get_current_active_user
-from core import exceptions
+from core import config, exceptions
 import models
 
 from features.images import schemas
 from features.images.service import ImageService
+from features.images.services.image_renditions import etag_matches
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +56,49 @@ async def get_images(
         raise exceptions.DatabaseException("Failed to retrieve images")
 
 
+@router.get("/images/duplicates/", response_model=list[schemas.DuplicateGroupResponse])
+async def get_duplicate_images(
+    max_distance: int | None = Query(None, ge=0, le=32, description="Max differing perceptual hash bits"),
+    current_user: models.User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Report groups of exact and near-duplicate images.
+
+    Exact duplicates share a content hash; near duplicates (re-encoded,
+    resized or lightly edited copies) have perceptual hashes at most
+    max_distance bits apart. Largest groups first.
+    """
+    try:
+        return await run_in_threadpool(_duplicate_report, db, current_user.id, max_distance)
+    except Exception as e:
+        logger.error(f"Error building duplicate report for user {current_user.username}: {str(e)}", exc_info=True)
+        raise exceptions.DatabaseException("Failed to find duplicate images")
+
+
+def _duplicate_report(db: Session, owner_id: int, max_distance: int | None) -> list[schemas.DuplicateGroupResponse]:
+    """Group duplicates, then load all grouped images in one query."""
+    groups = ImageService.find_near_duplicates(db, owner_id=owner_id, max_distance=max_distance)
+    if not groups:
+        return []
+
+    image_ids = [image_id for group in groups for image_id in group.image_ids]
+    images = db.query(models.Image)\
+        .options(joinedload(models.Image.tags), joinedload(models.Image.notes))\
+        .filter(models.Image.id.in_(image_ids))\
+        .all()
+    by_id = {image.id: image for image in images}
+
+    return [
+        schemas.DuplicateGroupResponse(
+            exact=group.exact,
+            max_distance=group.max_distance,
+            images=[schemas.ImageResponse.model_validate(by_id[i]) for i in group.image_ids if i in by_id],
+        )
+        for group in groups
+    ]
+
+
 @router.get("/images/{image_id}", response_model=schemas.ImageResponse)
 async def get_image_metadata(
     image_id: int,
@@ -80,9 +128,66 @@ async def get_image_metadata(
         raise exceptions.DatabaseException("Failed to retrieve image")
 
 
+def _get_owned_image(db: Session, image_id: int, current_user: models.User) -> models.Image:
+    """Load an image the current user owns whose original exists on disk."""
+    image = ImageService.get_image(db, image_id=image_id)
+    if not image:
+        logger.warning(f"Image {image_id} not found")
+        raise exceptions.ResourceNotFoundException("Image", image_id)
+
+    if image.owner_id != current_user.id:
+        logger.warning(f"User {current_user.username} attempted to access image {image_id} owned by user {image.owner_id}")
+        raise exceptions.AuthorizationException("Not authorized to access this image")
+
+    if not ImageService.file_exists(image.filepath):
+        logger.error(f"Image file not found on disk: {image.filepath}")
+        raise exceptions.FileNotFoundException("Image file not found on disk")
+
+    return image
+
+
+def _original_etag(image: models.Image) -> str:
+    """ETag for an original: changes whenever the file is replaced or rewritten."""
+    stat = os.stat(image.filepath)
+    return md5(f"{image.id}:{stat.st_size}:{stat.st_mtime_ns}".encode()).hexdigest()
+
+
+def _serve_file(request: Request, path: str, etag: str, media_type: str | None = None, vary: bool = False):
+    """FileResponse with ETag, or an empty 304 when the client already has it."""
+    headers = {
+        "Cache-Control": "private, max-age=86400",
+        "ETag": f'"{etag}"',
+    }
+    if vary:
+        headers["Vary"] = "Accept"
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=media_type, headers=headers)
+
+
+def _serve_rendition(request: Request, db: Session, image_id: int, size: int, current_user: models.User):
+    """Serve the best rendition for a size, or the original until renditions exist."""
+    try:
+        image = _get_owned_image(db, image_id, current_user)
+
+        rendition = ImageService.find_rendition(image.id, size, request.headers.get("accept"))
+        if rendition is None:
+            logger.debug(f"No {size}px rendition for image {image_id} yet, serving original")
+            return _serve_file(request, image.filepath, _original_etag(image))
+
+        return _serve_file(request, rendition.path, rendition.etag, rendition.media_type, vary=True)
+
+    except exceptions.AppException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving rendition of image {image_id}: {str(e)}", exc_info=True)
+        raise exceptions.DatabaseException("Failed to retrieve image")
+
+
 @router.get("/image/{image_id}")
 async def get_image_file(
     image_id: int,
+    request: Request,
     db: Session = Depends(get_db),
     current_user: models.User = Depends(get_current_active_user)
 ):
@@ -90,35 +195,54 @@ async def get_image_file(
     Get an image file by ID.
 
     **Authentication required.** Returns the actual image file for display.
-    Only the owner of the image can access it.
+    Only the owner of the image can access it. For thumbnails and previews
+    use /images/{id}/thumbnail or /images/{id}/rendition/{size}.
     """
     logger.debug(f"Image {image_id} requested by user {current_user.username}")
 
     try:
-        image = ImageService.get_image(db, image_id=image_id)
-        if not image:
-            logger.warning(f"Image {image_id} not found")
-            raise exceptions.ResourceNotFoundException("Image", image_id)
-
-        if image.owner_id != current_user.id:
-            logger.warning(f"User {current_user.username} attempted to access image {image_id} owned by user {image.owner_id}")
-            raise exceptions.AuthorizationException("Not authorized to access this image")
-
-        if not ImageService.file_exists(image.filepath):
-            logger.error(f"Image file not found on disk: {image.filepath}")
-            raise exceptions.FileNotFoundException("Image file not found on disk")
+        image = _get_owned_image(db, image_id, current_user)
 
         logger.debug(f"Serving image {image_id} to user {current_user.username}")
-        from hashlib import md5
-        etag = md5(f"{image.id}".encode()).hexdigest()
-        headers = {
-            "Cache-Control": "private, max-age=86400",
-            "ETag": f'"{etag}"',
-        }
-        return FileResponse(image.filepath, headers=headers)
+        return _serve_file(request, image.filepath, _original_etag(image))
 
     except exceptions.AppException:
         raise
     except Exception as e:
         logger.error(f"Error retrieving image {image_id}: {str(e)}", exc_info=True)
         raise exceptions.DatabaseException("Failed to retrieve image")
+
+
+@router.get("/images/{image_id}/thumbnail")
+async def get_image_thumbnail(
+    image_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user)
+):
+    """
+    Get the smallest rendition of an image (gallery tiles, chat citations).
+
+    Served as AVIF when the client accepts it, otherwise WebP. Send the
+    returned ETag as If-None-Match to get an empty 304 when unchanged.
+    """
+    return _serve_rendition(request, db, image_id, config.IMAGE_RENDITION_SIZES[0], current_user)
+
+
+@router.get("/images/{image_id}/rendition/{size}")
+async def get_image_rendition(
+    image_id: int,
+    size: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: models.User = Depends(get_current_active_user)
+):
+    """
+    Get a resized rendition of an image.
+
+    **size** is the wanted longest side in pixels; the smallest stored
+    bucket covering it is served (see IMAGE_RENDITION_SIZES).
+    """
+    if size <= 0:
+        raise exceptions.ValidationException("Rendition size must be positive")
+    return _serve_rendition(request, db, image_id, size, current_user)
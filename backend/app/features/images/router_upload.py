@@ -5,6 +5,7 @@ Upload image, retry analysis, delete image, and task status.
 """
 
 from fastapi import APIRouter, UploadFile, File, Form, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 import os
 import uuid
@@ -12,12 +13,16 @@ import logging
 
 from core.database import get_db
 from core.auth import get_current_active_user
-from core import exceptions
+from core import config, exceptions
+from core.uploads import StoredUpload, stream_upload_to_disk
 import models
 
 from features.images import schemas
 from features.images.service import ImageService
+from features.images.services.image_dedup import compute_dhash
+from features.albums.service import AlbumService
 from features.images.tasks import analyze_image_task
+from features.images.tasks_renditions import generate_image_renditions_task
 
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -46,7 +51,9 @@ async def upload_image(
     Upload an image for AI analysis.
 
     The image is saved and AI analysis is queued as a background task.
-    Returns immediately with a task_id for polling status.
+    Returns immediately with a task_id for polling status. Re-uploading a
+    file you already have returns the existing image (deduplicated=true)
+    without re-running the analysis.
 
     **File Requirements:**
     - Max size: 10MB
@@ -64,77 +71,38 @@ async def upload_image(
         raise exceptions.ValidationException("File type could not be determined")
 
     try:
-        contents = await file.read()
+        # Stream to disk off the event loop; nothing below holds the whole file
+        stored = await stream_upload_to_disk(file, config.UPLOAD_DIR, max_bytes=config.MAX_UPLOAD_SIZE_BYTES)
 
         is_valid, error_msg = ImageService.validate_file(
             content_type=file.content_type,
-            file_size=len(contents),
+            file_size=stored.size,
             filename=file.filename
         )
 
         if not is_valid:
+            stored.discard()
             logger.warning(f"Upload rejected: {error_msg}")
             raise exceptions.ValidationException(error_msg)
 
         file_extension = os.path.splitext(file.filename)[1].lower()
         unique_filename = f"{uuid.uuid4()}{file_extension}"
 
-        file_path = ImageService.save_file(contents, unique_filename)
-
-        blur_hash, img_width, img_height = ImageService.generate_blur_hash(contents)
-        if blur_hash:
-            logger.debug(f"Generated blur hash for {unique_filename}: {blur_hash}")
-
-        image_data = ImageService.create_image(
-            db=db,
-            filename=unique_filename,
-            filepath=file_path,
-            prompt=prompt,
-            owner_id=current_user.id,
-            blur_hash=blur_hash,
-            width=img_width,
-            height=img_height,
-            file_size=len(contents)
+        # Decode/blurhash, database writes and task queueing all block - run them in the threadpool
+        image_data, task_id, deduplicated = await run_in_threadpool(
+            _register_upload,
+            db, current_user, stored, unique_filename,
+            prompt, album_id, auto_tagging, max_tags, auto_create_note,
         )
-        logger.info(f"Image saved: {unique_filename} (ID: {image_data.id}) for user {current_user.username}")
 
-        # Resolve user's vision model and custom prompt preferences
-        user_vision_model = None
-        user_system_prompt = None
-        try:
-            prefs = db.query(models.UserPreferences).filter(
-                models.UserPreferences.user_id == current_user.id
-            ).first()
-            if prefs:
-                if getattr(prefs, "vision_model", None):
-                    user_vision_model = prefs.vision_model
-                if getattr(prefs, "custom_vision_prompt", None):
-                    user_system_prompt = prefs.custom_vision_prompt
-        except Exception:
-            pass  # Fall back to defaults if preference lookup fails
-
-        task_id = None
-        try:
-            task = analyze_image_task.delay(
-                image_id=image_data.id,
-                image_path=file_path,
-                prompt=prompt,
-                album_id=album_id,
-                auto_tagging=auto_tagging,
-                max_tags=max_tags,
-                auto_create_note=auto_create_note,
-                vision_model=user_vision_model,
-                system_prompt_override=user_system_prompt,
-            )
-            logger.info(f"AI analysis task queued for image {image_data.id}, task_id: {task.id}, album_id: {album_id}")
-            task_id = task.id
-        except Exception as e:
-            logger.error(f"Failed to queue AI analysis task for image {image_data.id}: {str(e)}", exc_info=True)
-            ImageService.update_analysis_status(
-                db=db,
+        if deduplicated:
+            return schemas.UploadResponse(
+                message="Image already uploaded. Reusing its analysis.",
+                filename=image_data.filename,
                 image_id=image_data.id,
-                status="failed",
-                result="Failed to queue AI analysis task"
+                prompt=image_data.prompt,
+                analysis_status=image_data.ai_analysis_status,
+                deduplicated=True
             )
 
         return schemas.UploadResponse(
@@ -159,6 +127,135 @@ async def upload_image(
         raise exceptions.FileUploadException(f"Failed to upload image: {str(e)}")
 
 
+def _create_record(
+    db: Session,
+    current_user: models.User,
+    stored: StoredUpload,
+    unique_filename: str,
+    prompt: str | None,
+    album_id: int | None,
+) -> tuple[models.Image, bool]:
+    """Reuse an identical existing image, or commit the file and create its record."""
+    if config.UPLOAD_DEDUP_ENABLED:
+        existing = ImageService.find_exact_duplicate(
+            db, owner_id=current_user.id, content_hash=stored.sha256, prompt=prompt
+        )
+        if existing:
+            stored.discard()
+            if album_id:
+                AlbumService.add_images_to_album(
+                    db=db, album_id=album_id, owner_id=current_user.id, image_ids=[existing.id]
+                )
+            logger.info(
+                f"Duplicate upload from user {current_user.username}: reusing image {existing.id}"
+            )
+            return existing, True
+
+    file_path = stored.commit(unique_filename)
+
+    blur_hash, img_width, img_height = ImageService.generate_blur_hash(file_path)
+    if blur_hash:
+        logger.debug(f"Generated blur hash for {unique_filename}: {blur_hash}")
+    perceptual_hash = compute_dhash(file_path)
+
+    image_data = ImageService.create_image(
+        db=db,
+        filename=unique_filename,
+        filepath=file_path,
+        prompt=prompt,
+        owner_id=current_user.id,
+        blur_hash=blur_hash,
+        width=img_width,
+        height=img_height,
+        file_size=stored.size,
+        content_hash=stored.sha256,
+        perceptual_hash=perceptual_hash
+    )
+    logger.info(f"Image saved: {unique_filename} (ID: {image_data.id}) for user {current_user.username}")
+
+    return image_data, False
+
+
+def _register_upload(
+    db: Session,
+    current_user: models.User,
+    stored: StoredUpload,
+    unique_filename: str,
+    prompt: str | None,
+    album_id: int | None,
+    auto_tagging: bool,
+    max_tags: int,
+    auto_create_note: bool,
+) -> tuple[models.Image, str | None, bool]:
+    """
+    Blocking part of an upload: commit the file, create the record, queue tasks.
+
+    If the owner already has an image with the same content (and prompt),
+    the upload is discarded and the existing image - with its analysis,
+    note, tags and embeddings - is returned instead.
+
+    Returns:
+        (image, analysis task_id or None, whether an existing image was reused)
+    """
+    try:
+        image_data, deduplicated = _create_record(db, current_user, stored, unique_filename, prompt, album_id)
+    except Exception:
+        # Leave neither the temp file nor an orphaned committed file behind
+        stored.discard()
+        raise
+    if deduplicated:
+        return image_data, None, True
+
+    file_path = stored.path
+
+    try:
+        generate_image_renditions_task.delay(image_id=image_data.id, image_path=file_path)
+    except Exception as e:
+        # Rendition endpoints serve the original until renditions exist
+        logger.warning(f"Failed to queue renditions for image {image_data.id}: {str(e)}")
+
+    # Resolve user's vision model and custom prompt preferences
+    user_vision_model = None
+    user_system_prompt = None
+    try:
+        prefs = db.query(models.UserPreferences).filter(
+            models.UserPreferences.user_id == current_user.id
+        ).first()
+        if prefs:
+            if getattr(prefs, "vision_model", None):
+                user_vision_model = prefs.vision_model
+            if getattr(prefs, "custom_vision_prompt", None):
+                user_system_prompt = prefs.custom_vision_prompt
+    except Exception:
+        pass  # Fall back to defaults if preference lookup fails
+
+    task_id = None
+    try:
+        task = analyze_image_task.delay(
+            image_id=image_data.id,
+            image_path=file_path,
+            prompt=prompt,
+            album_id=album_id,
+            auto_tagging=auto_tagging,
+            max_tags=max_tags,
+            auto_create_note=auto_create_note,
+            vision_model=user_vision_model,
+            system_prompt_override=user_system_prompt,
+        )
+        logger.info(f"AI analysis task queued for image {image_data.id}, task_id: {task.id}, album_id: {album_id}")
+        task_id = task.id
+    except Exception as e:
+        logger.error(f"Failed to queue AI analysis task for image {image_data.id}: {str(e)}", exc_info=True)
+        ImageService.update_analysis_status(
+            db=db,
+            image_id=image_data.id,
+            status="failed",
+            result="Failed to queue AI analysis task"
+        )
+
+    return image_data, task_id, False
+
+
 @router.post("/retry-image/{image_id}", response_model=schemas.RetryResponse)
 @limiter.limit("10/minute")
 async def retry_image_analysis(
@@ -94,6 +94,13 @@ class ImageListResponse(BaseModel):
     limit: int
 
 
+class DuplicateGroupResponse(BaseModel):
+    """Images that are identical or visually near-identical."""
+    exact: bool = Field(..., description="All images have the same content hash")
+    max_distance: int = Field(..., description="Largest perceptual hash distance within the group (bits)")
+    images: List[ImageResponse]
+
+
 # ============================================================================
 # Upload Schemas
 # ============================================================================
@@ -106,6 +113,7 @@ class UploadResponse(BaseModel):
     task_id: Optional[str] = None
     prompt: Optional[str] = None
     analysis_status: str = "queued"
+    deduplicated: bool = False  # True if an identical existing image was reused
 
 
 class RetryResponse(BaseModel):
@@ -6,6 +6,8 @@ Provides:
 - File management
 - Analysis status updates
 - Blur hash generation for instant loading
+- Resized renditions (thumbnails, previews)
+- Duplicate detection (exact and perceptual)
 - Favorites, trash, and rename operations
 - Text and semantic search
 
@@ -14,7 +16,7 @@ for backward compatibility.
 """
 
 from sqlalchemy.orm import Session
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Union
 
 import models
 
@@ -22,6 +24,8 @@ import models
 from features.images.services.image_crud import ImageCRUDService
 from features.images.services.image_status import ImageStatusService
 from features.images.services.image_search import ImageSearchService
+from features.images.services.image_renditions import ImageRenditionService, Rendition
+from features.images.services.image_dedup import ImageDedupService, DuplicateGroup
 
 
 class ImageService:
@@ -36,9 +40,9 @@ class ImageService:
     # =========================================================================
 
     @staticmethod
-    def generate_blur_hash(image_bytes: bytes) -> Tuple[Optional[str], Optional[int], Optional[int]]:
-        """Generate a blur hash from image bytes for instant placeholder loading."""
-        return ImageCRUDService.generate_blur_hash(image_bytes)
+    def generate_blur_hash(image: Union[bytes, str]) -> Tuple[Optional[str], Optional[int], Optional[int]]:
+        """Generate a blur hash from image bytes or a file path for instant placeholder loading."""
+        return ImageCRUDService.generate_blur_hash(image)
 
     @staticmethod
     def create_image(
@@ -50,11 +54,14 @@ class ImageService:
         blur_hash: Optional[str] = None,
         width: Optional[int] = None,
         height: Optional[int] = None,
-        file_size: Optional[int] = None
+        file_size: Optional[int] = None,
+        content_hash: Optional[str] = None,
+        perceptual_hash: Optional[int] = None
     ) -> models.Image:
         """Create a new image record in the database."""
         return ImageCRUDService.create_image(
-            db, filename, filepath, prompt, owner_id, blur_hash, width, height, file_size
+            db, filename, filepath, prompt, owner_id, blur_hash, width, height, file_size,
+            content_hash, perceptual_hash
         )
 
     @staticmethod
@@ -117,6 +124,38 @@ class ImageService:
         """Check if an image file exists on disk."""
         return ImageCRUDService.file_exists(filepath)
 
+    # =========================================================================
+    # Renditions (delegated to ImageRenditionService)
+    # =========================================================================
+
+    @staticmethod
+    def find_rendition(image_id: int, size: int, accept: Optional[str] = None) -> Optional[Rendition]:
+        """Best stored rendition for a requested size and Accept header."""
+        return ImageRenditionService.find_rendition(image_id, size, accept)
+
+    # =========================================================================
+    # Duplicates (delegated to ImageDedupService)
+    # =========================================================================
+
+    @staticmethod
+    def find_exact_duplicate(
+        db: Session,
+        owner_id: int,
+        content_hash: str,
+        prompt: Optional[str] = None
+    ) -> Optional[models.Image]:
+        """Existing image with identical content whose analysis can be reused."""
+        return ImageDedupService.find_exact_duplicate(db, owner_id, content_hash, prompt)
+
+    @staticmethod
+    def find_near_duplicates(
+        db: Session,
+        owner_id: int,
+        max_distance: Optional[int] = None
+    ) -> List[DuplicateGroup]:
+        """Groups of an owner's exact and visually near-identical images."""
+        return ImageDedupService.find_near_duplicates(db, owner_id, max_distance)
+
     # =========================================================================
     # Status Operations (delegated to ImageStatusService)
     # =========================================================================
@@ -7,9 +7,13 @@ Provides modular service functions for image operations.
 from features.images.services.image_crud import ImageCRUDService
 from features.images.services.image_status import ImageStatusService
 from features.images.services.image_search import ImageSearchService
+from features.images.services.image_renditions import ImageRenditionService
+from features.images.services.image_dedup import ImageDedupService
 
 __all__ = [
     "ImageCRUDService",
     "ImageStatusService",
     "ImageSearchService",
+    "ImageRenditionService",
+    "ImageDedupService",
 ]
@@ -6,7 +6,7 @@ Handles create, read, update, delete operations for images.
 
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import IntegrityError
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Union
 import logging
 import os
 from io import BytesIO
@@ -17,6 +17,7 @@ import numpy as np
 
 import models
 from core import config
+from features.images.services.image_renditions import ImageRenditionService
 
 logger = logging.getLogger(__name__)
 
@@ -25,31 +26,37 @@ class ImageCRUDService:
     """Service class for image CRUD operations."""
 
     @staticmethod
-    def generate_blur_hash(image_bytes: bytes) -> Tuple[Optional[str], Optional[int], Optional[int]]:
+    def generate_blur_hash(image: Union[bytes, str]) -> Tuple[Optional[str], Optional[int], Optional[int]]:
         """
-        Generate a blur hash from image bytes for instant placeholder loading.
+        Generate a blur hash from image bytes or a file path for instant placeholder loading.
+
+        CPU-bound (decode, resize, encode) - call it from the threadpool in
+        async endpoints.
 
         Returns:
             Tuple of (blur_hash, width, height) or (None, None, None) on error
         """
         try:
-            img = PILImage.open(BytesIO(image_bytes))
-            width, height = img.size
+            with PILImage.open(BytesIO(image) if isinstance(image, bytes) else image) as img:
+                width, height = img.size
+
+                # JPEG decoders can scale down by 1/2..1/8 while decoding
+                img.draft("RGB", (100, 100))
 
-            # Resize for faster blur hash computation (max 100px on longest side)
-            max_size = 100
-            if width > max_size or height > max_size:
-                ratio = min(max_size / width, max_size / height)
-                new_size = (int(width * ratio), int(height * ratio))
-                img = img.resize(new_size, PILImage.Resampling.LANCZOS)
+                # Resize for faster blur hash computation (max 100px on longest side)
+                max_size = 100
+                if width > max_size or height > max_size:
+                    ratio = min(max_size / width, max_size / height)
+                    new_size = (int(width * ratio), int(height * ratio))
+                    img = img.resize(new_size, PILImage.Resampling.LANCZOS)
 
-            # Convert to RGB if necessary (blurhash requires RGB)
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
+                # Convert to RGB if necessary (blurhash requires RGB)
+                if img.mode != 'RGB':
+                    img = img.convert('RGB')
 
-            # Generate blur hash with 4x3 components
-            img_array = np.array(img)
-            hash_str = blurhash.encode(img_array, components_x=4, components_y=3)
+                # Generate blur hash with 4x3 components
+                img_array = np.array(img)
+                hash_str = blurhash.encode(img_array, components_x=4, components_y=3)
 
             logger.debug(f"Generated blur hash: {hash_str} for image {width}x{height}")
             return hash_str, width, height
@@ -68,7 +75,9 @@ class ImageCRUDService:
         blur_hash: Optional[str] = None,
         width: Optional[int] = None,
         height: Optional[int] = None,
-        file_size: Optional[int] = None
+        file_size: Optional[int] = None,
+        content_hash: Optional[str] = None,
+        perceptual_hash: Optional[int] = None
     ) -> models.Image:
         """Create a new image record in the database."""
         db_image = models.Image(
@@ -80,7 +89,9 @@ class ImageCRUDService:
             blur_hash=blur_hash,
             width=width,
             height=height,
-            file_size=file_size
+            file_size=file_size,
+            content_hash=content_hash,
+            perceptual_hash=perceptual_hash
         )
         db.add(db_image)
 
@@ -88,6 +99,8 @@ class ImageCRUDService:
             db.commit()
             db.refresh(db_image)
             logger.info(f"Image created: {filename} (ID: {db_image.id})")
+            from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+            invalidate_graph_snapshot(owner_id)
             return db_image
         except IntegrityError as e:
             db.rollback()
@@ -172,10 +185,14 @@ class ImageCRUDService:
             db.delete(image)
             db.commit()
             logger.info(f"Image {image_id} deleted from database")
+            from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+            invalidate_graph_snapshot(owner_id)
 
             if delete_file and filepath and os.path.exists(filepath):
                 os.remove(filepath)
                 logger.info(f"Image file deleted: {filepath}")
+            if delete_file:
+                ImageRenditionService.delete_renditions(image_id)
 
             return True
 
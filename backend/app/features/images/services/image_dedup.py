@@ -0,0 +1,179 @@
+"""
+Image Deduplication Service.
+
+Exact duplicates: uploads are hashed (SHA-256) while streamed to disk; a
+re-upload of a file the owner already has reuses the existing image, its
+analysis, note, tags and embeddings instead of re-running the models.
+
+Near duplicates: a 64-bit difference hash (dHash) per image survives
+re-encoding, resizing and small edits. The report groups images whose
+hashes differ in at most config.IMAGE_NEAR_DUPLICATE_DISTANCE bits.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+import logging
+
+import numpy as np
+from PIL import Image as PILImage, ImageOps
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+import models
+from core import config
+
+logger = logging.getLogger(__name__)
+
+# Set bits per byte value
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def compute_dhash(image: Union[str, PILImage.Image]) -> Optional[int]:
+    """
+    64-bit difference hash as a signed integer (fits a BIGINT column).
+
+    Compares horizontally adjacent pixels of a 9x8 grayscale thumbnail.
+    Returns None if the image cannot be decoded.
+    """
+    try:
+        img = PILImage.open(image) if isinstance(image, str) else image
+        try:
+            img.draft("L", (64, 64))
+            small = ImageOps.exif_transpose(img).convert("L").resize((9, 8), PILImage.Resampling.LANCZOS)
+        finally:
+            if isinstance(image, str):
+                img.close()
+    except Exception as e:
+        logger.warning(f"Failed to compute perceptual hash: {str(e)}")
+        return None
+
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    value = int("".join("1" if bit else "0" for bit in bits), 2)
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+@dataclass
+class DuplicateGroup:
+    """Images of one owner that are identical or visually near-identical."""
+    image_ids: List[int]
+    exact: bool
+    max_distance: int
+
+
+class _DisjointSet:
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, a: int, b: int) -> None:
+        self.parent[self.find(a)] = self.find(b)
+
+
+class ImageDedupService:
+    """Service class for duplicate image detection."""
+
+    @staticmethod
+    def find_exact_duplicate(
+        db: Session,
+        owner_id: int,
+        content_hash: str,
+        prompt: Optional[str] = None
+    ) -> Optional[models.Image]:
+        """
+        Existing image with the same content whose analysis can be reused.
+
+        Trashed images and failed analyses are not reused, and neither is an
+        image analysed with a different prompt (or with one, when the new
+        upload has none).
+        """
+        query = db.query(models.Image).filter(
+            models.Image.owner_id == owner_id,
+            models.Image.content_hash == content_hash,
+            models.Image.is_trashed == False,
+            models.Image.ai_analysis_status != "failed",
+        )
+        if prompt:
+            query = query.filter(models.Image.prompt == prompt)
+        else:
+            query = query.filter(or_(models.Image.prompt.is_(None), models.Image.prompt == ""))
+        return query.order_by(models.Image.id).first()
+
+    @staticmethod
+    def find_near_duplicates(
+        db: Session,
+        owner_id: int,
+        max_distance: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[DuplicateGroup]:
+        """
+        Group an owner's images that are exact or near duplicates.
+
+        Compares the most recent `limit` images; pairwise Hamming distances
+        are computed one row at a time with a byte popcount table.
+        """
+        max_distance = config.IMAGE_NEAR_DUPLICATE_DISTANCE if max_distance is None else max_distance
+        limit = limit or config.IMAGE_DUPLICATE_SCAN_LIMIT
+
+        rows = (
+            db.query(models.Image.id, models.Image.content_hash, models.Image.perceptual_hash)
+            .filter(
+                models.Image.owner_id == owner_id,
+                models.Image.is_trashed == False,
+            )
+            .order_by(models.Image.id.desc())
+            .limit(limit)
+            .all()
+        )
+        if not rows:
+            return []
+
+        ids = [row.id for row in rows]
+        groups = _DisjointSet(len(rows))
+        group_distance: Dict[int, int] = {}
+
+        first_with_hash: Dict[str, int] = {}
+        for i, row in enumerate(rows):
+            if row.content_hash:
+                if row.content_hash in first_with_hash:
+                    groups.union(i, first_with_hash[row.content_hash])
+                else:
+                    first_with_hash[row.content_hash] = i
+
+        hashed = [i for i, row in enumerate(rows) if row.perceptual_hash is not None]
+        hashes = np.array([rows[i].perceptual_hash for i in hashed], dtype=np.int64).view(np.uint64)
+        pair_distances = []
+        for a in range(len(hashed) - 1):
+            xor = (hashes[a + 1:] ^ hashes[a]).view(np.uint8).reshape(-1, 8)
+            distances = _POPCOUNT[xor].sum(axis=1)
+            for offset in np.nonzero(distances <= max_distance)[0]:
+                b = a + 1 + int(offset)
+                groups.union(hashed[a], hashed[b])
+                pair_distances.append((hashed[a], int(distances[offset])))
+
+        for i, distance in pair_distances:
+            root = groups.find(i)
+            group_distance[root] = max(group_distance.get(root, 0), distance)
+
+        members: Dict[int, List[int]] = {}
+        for i in range(len(rows)):
+            members.setdefault(groups.find(i), []).append(i)
+
+        result = []
+        for root, indexes in members.items():
+            if len(indexes) < 2:
+                continue
+            content_hashes = {rows[i].content_hash for i in indexes}
+            result.append(DuplicateGroup(
+                image_ids=sorted(ids[i] for i in indexes),
+                exact=len(content_hashes) == 1 and None not in content_hashes,
+                max_distance=group_distance.get(root, 0),
+            ))
+
+        result.sort(key=lambda group: (-len(group.image_ids), group.image_ids[0]))
+        return result
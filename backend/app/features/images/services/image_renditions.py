@@ -0,0 +1,220 @@
+"""
+Image Renditions Service.
+
+Generates and locates resized copies of uploaded images so the gallery,
+previews and chat citations never download full-size originals.
+
+Renditions are bucketed by longest side (config.IMAGE_RENDITION_SIZES),
+encoded as WebP (plus AVIF when Pillow can encode it) and stored as
+    {IMAGE_RENDITION_DIR}/{image_id}/{bucket}.{content_hash}.{format}
+The content hash in the filename doubles as a strong ETag, so serving a
+rendition never has to read or hash the file.
+"""
+
+from dataclasses import dataclass
+from hashlib import sha256
+from io import BytesIO
+from typing import List, Optional
+import logging
+import os
+import shutil
+
+from PIL import Image as PILImage, ImageOps
+
+from core import config
+
+logger = logging.getLogger(__name__)
+
+MEDIA_TYPES = {"webp": "image/webp", "avif": "image/avif"}
+
+
+@dataclass(frozen=True)
+class Rendition:
+    """A rendition file on disk."""
+    path: str
+    size: int
+    format: str
+    etag: str
+
+    @property
+    def media_type(self) -> str:
+        return MEDIA_TYPES[self.format]
+
+
+def avif_supported() -> bool:
+    """Whether the installed Pillow (or pillow-avif plugin) can encode AVIF."""
+    PILImage.init()
+    return "AVIF" in PILImage.SAVE
+
+
+def rendition_formats() -> List[str]:
+    """Formats written for every bucket, WebP first."""
+    if config.IMAGE_RENDITION_AVIF and avif_supported():
+        return ["webp", "avif"]
+    return ["webp"]
+
+
+def bucket_sizes(width: int, height: int) -> List[int]:
+    """
+    Buckets worth generating for an image.
+
+    Every bucket smaller than the longest side, plus the first bucket that
+    is not (stored at original size) - larger buckets would only repeat it.
+    """
+    longest = max(width, height)
+    sizes = []
+    for size in config.IMAGE_RENDITION_SIZES:
+        sizes.append(size)
+        if size >= longest:
+            break
+    return sizes
+
+
+def _parse_filename(name: str) -> Optional[tuple]:
+    """'768.<hash>.webp' -> (768, '<hash>', 'webp'); None for anything else."""
+    parts = name.split(".")
+    if len(parts) != 3 or not parts[0].isdigit() or parts[2] not in MEDIA_TYPES:
+        return None
+    return int(parts[0]), parts[1], parts[2]
+
+
+def _prepare(img: PILImage.Image) -> PILImage.Image:
+    """Apply EXIF orientation and convert to a mode WebP/AVIF can encode."""
+    img = ImageOps.exif_transpose(img)
+    has_alpha = img.mode in ("RGBA", "LA", "PA") or (img.mode == "P" and "transparency" in img.info)
+    return img.convert("RGBA" if has_alpha else "RGB")
+
+
+def _encode(img: PILImage.Image, fmt: str) -> bytes:
+    buffer = BytesIO()
+    if fmt == "webp":
+        img.save(buffer, "WEBP", quality=config.IMAGE_RENDITION_QUALITY, method=4)
+    else:
+        img.save(buffer, "AVIF", quality=config.IMAGE_RENDITION_QUALITY)
+    return buffer.getvalue()
+
+
+def _write(directory: str, size: int, fmt: str, data: bytes) -> Rendition:
+    """Write a rendition atomically (temp file + rename)."""
+    etag = sha256(data).hexdigest()[:32]
+    path = os.path.join(directory, f"{size}.{etag}.{fmt}")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as buffer:
+        buffer.write(data)
+    os.replace(tmp_path, path)
+    return Rendition(path=path, size=size, format=fmt, etag=etag)
+
+
+class ImageRenditionService:
+    """Service class for image rendition generation and lookup."""
+
+    @staticmethod
+    def rendition_dir(image_id: int) -> str:
+        """Directory holding an image's renditions."""
+        return os.path.join(config.IMAGE_RENDITION_DIR, str(image_id))
+
+    @staticmethod
+    def bucket_for(size: int) -> int:
+        """Smallest configured bucket covering the requested size."""
+        for bucket in config.IMAGE_RENDITION_SIZES:
+            if bucket >= size:
+                return bucket
+        return config.IMAGE_RENDITION_SIZES[-1]
+
+    @staticmethod
+    def generate_renditions(image_id: int, source_path: str) -> List[Rendition]:
+        """
+        Generate all renditions for an image, replacing any previous set.
+
+        Raises:
+            FileNotFoundError: If the original is missing
+            OSError: If the original cannot be decoded or files cannot be written
+        """
+        directory = ImageRenditionService.rendition_dir(image_id)
+        os.makedirs(directory, exist_ok=True)
+        formats = rendition_formats()
+
+        with PILImage.open(source_path) as original:
+            largest = config.IMAGE_RENDITION_SIZES[-1]
+            # JPEG decoders can scale down by 1/2..1/8 while decoding
+            original.draft("RGB", (largest, largest))
+            img = _prepare(original)
+
+        renditions = []
+        for size in bucket_sizes(*img.size):
+            resized = img.copy()
+            resized.thumbnail((size, size), PILImage.Resampling.LANCZOS)
+            for fmt in formats:
+                renditions.append(_write(directory, size, fmt, _encode(resized, fmt)))
+
+        current = {os.path.basename(r.path) for r in renditions}
+        for name in os.listdir(directory):
+            if name not in current:
+                os.remove(os.path.join(directory, name))
+
+        logger.debug(f"Generated {len(renditions)} renditions for image {image_id}")
+        return renditions
+
+    @staticmethod
+    def list_renditions(image_id: int) -> List[Rendition]:
+        """Renditions on disk for an image (empty if not generated yet)."""
+        directory = ImageRenditionService.rendition_dir(image_id)
+        try:
+            names = os.listdir(directory)
+        except FileNotFoundError:
+            return []
+
+        renditions = []
+        for name in names:
+            parsed = _parse_filename(name)
+            if parsed:
+                size, etag, fmt = parsed
+                renditions.append(Rendition(os.path.join(directory, name), size, fmt, etag))
+        return renditions
+
+    @staticmethod
+    def find_rendition(image_id: int, size: int, accept: Optional[str] = None) -> Optional[Rendition]:
+        """
+        Best rendition for a requested size and Accept header.
+
+        Picks the smallest bucket covering the size (or the largest one for
+        images smaller than the bucket), preferring AVIF when the client
+        accepts it.
+        """
+        accepted = {"webp"}
+        if accept and "image/avif" in accept:
+            accepted.add("avif")
+        candidates = [
+            r for r in ImageRenditionService.list_renditions(image_id)
+            if r.format in accepted
+        ]
+        if not candidates:
+            return None
+
+        bucket = ImageRenditionService.bucket_for(size)
+        covering = [r for r in candidates if r.size >= bucket]
+        chosen_size = min(r.size for r in covering) if covering else max(r.size for r in candidates)
+        return max(
+            (r for r in candidates if r.size == chosen_size),
+            key=lambda r: r.format == "avif",
+        )
+
+    @staticmethod
+    def delete_renditions(image_id: int) -> None:
+        """Remove an image's renditions (after the image itself was deleted)."""
+        shutil.rmtree(ImageRenditionService.rendition_dir(image_id), ignore_errors=True)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for GET)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate.strip('"') == etag:
+            return True
+    return False
@@ -26,18 +26,17 @@ class ImageSearchService:
         if not query or not query.strip():
             return []
 
-        # Parse query for tsquery (simple AND between words)
-        words = query.strip().split()
-        tsquery = " & ".join(word.replace("'", "''") for word in words)
+        # websearch_to_tsquery: words are AND-ed, supports "phrases", or, -exclusion
+        tsquery = " ".join(query.split())
 
         # Use raw SQL for full-text search with ranking
         sql = text("""
             SELECT i.id,
-                   ts_rank(i.search_vector, to_tsquery('english', :tsquery)) as score
-            FROM images i
+                   ts_rank(i.search_vector, query) as score
+            FROM images i, websearch_to_tsquery('english', :tsquery) AS query
             WHERE i.owner_id = :owner_id
               AND i.is_trashed = false
-              AND i.search_vector @@ to_tsquery('english', :tsquery)
+              AND i.search_vector @@ query
             ORDER BY score DESC
             LIMIT :limit
         """)
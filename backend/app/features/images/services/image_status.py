@@ -11,6 +11,7 @@ import logging
 import os
 
 import models
+from features.images.services.image_renditions import ImageRenditionService
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +75,8 @@ class ImageStatusService:
             db.commit()
             db.refresh(image)
             logger.info(f"Image {image_id} moved to trash")
+            from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+            invalidate_graph_snapshot(owner_id)
             return image
         except Exception as e:
             db.rollback()
@@ -99,6 +102,8 @@ class ImageStatusService:
             db.commit()
             db.refresh(image)
             logger.info(f"Image {image_id} restored from trash")
+            from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+            invalidate_graph_snapshot(owner_id)
             return image
         except Exception as e:
             db.rollback()
@@ -137,10 +142,13 @@ class ImageStatusService:
             db.delete(image)
             db.commit()
             logger.info(f"Image {image_id} permanently deleted from database")
+            from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+            invalidate_graph_snapshot(owner_id)
 
             if filepath and os.path.exists(filepath):
                 os.remove(filepath)
                 logger.info(f"Image file deleted: {filepath}")
+            ImageRenditionService.delete_renditions(image_id)
 
             return True
 
@@ -167,6 +175,8 @@ class ImageStatusService:
             db.commit()
             db.refresh(image)
             logger.info(f"Image {image_id} renamed to '{display_name}'")
+            from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+            invalidate_graph_snapshot(owner_id)
             return image
         except Exception as e:
             db.rollback()
@@ -0,0 +1,68 @@
+"""
+Celery tasks for image deduplication.
+
+Tasks:
+- backfill_image_hashes: Compute content and perceptual hashes for images
+  uploaded before upload deduplication existed
+
+New uploads are hashed while they are streamed to disk.
+"""
+
+import logging
+import os
+
+from core.celery_app import celery_app
+from core.database import SessionLocal
+from core.uploads import hash_file
+from features.images.services.image_dedup import compute_dhash
+from models import Image
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="features.images.tasks_dedup.backfill_image_hashes")
+def backfill_image_hashes(batch_size: int = 200):
+    """
+    Hash existing images that have no content hash yet.
+
+    Walks images by ID in batches and commits after each batch, so the
+    task can be stopped and re-run safely.
+
+    Returns:
+        dict with counts of hashed, skipped and failed images
+    """
+    db = SessionLocal()
+    hashed = skipped = failed = 0
+    last_id = 0
+
+    try:
+        while True:
+            batch = (
+                db.query(Image)
+                .filter(Image.id > last_id, Image.content_hash.is_(None))
+                .order_by(Image.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            for image in batch:
+                if not image.filepath or not os.path.exists(image.filepath):
+                    skipped += 1
+                    continue
+                try:
+                    image.content_hash = hash_file(image.filepath)
+                    image.perceptual_hash = compute_dhash(image.filepath)
+                    hashed += 1
+                except Exception as e:
+                    failed += 1
+                    logger.warning(f"Hash backfill failed for image {image.id}: {str(e)}")
+            db.commit()
+
+        logger.info(f"Image hash backfill: {hashed} hashed, {skipped} skipped, {failed} failed")
+        return {"hashed": hashed, "skipped": skipped, "failed": failed}
+
+    finally:
+        db.close()
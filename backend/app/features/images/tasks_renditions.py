@@ -0,0 +1,104 @@
+"""
+Celery tasks for image renditions.
+
+Tasks:
+- generate_image_renditions: Resize one image into its WebP/AVIF buckets (queued after upload)
+- backfill_image_renditions: Generate renditions for images uploaded before renditions existed
+
+Rendition failures never affect the image itself - the rendition
+endpoints fall back to the original until renditions exist.
+"""
+
+import logging
+import os
+
+from core.celery_app import celery_app
+from core.database import SessionLocal
+from features.images.services.image_renditions import ImageRenditionService
+from models import Image
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(
+    bind=True,
+    name="features.images.tasks_renditions.generate_image_renditions",
+    max_retries=2,
+    default_retry_delay=30,
+)
+def generate_image_renditions_task(self, image_id: int, image_path: str):
+    """
+    Generate renditions for one image.
+
+    Args:
+        image_id: Image ID (names the rendition directory)
+        image_path: Path of the original on disk
+
+    Returns:
+        dict with the number of rendition files written
+    """
+    try:
+        renditions = ImageRenditionService.generate_renditions(image_id, image_path)
+        return {"image_id": image_id, "renditions": len(renditions)}
+    except FileNotFoundError:
+        logger.warning(f"Renditions skipped for image {image_id}: original {image_path} not found")
+        return {"image_id": image_id, "renditions": 0}
+    except OSError as e:
+        # Undecodable originals will not get better on retry
+        logger.warning(f"Renditions failed for image {image_id}: {str(e)}")
+        return {"image_id": image_id, "renditions": 0}
+    except Exception as e:
+        logger.error(f"Unexpected rendition error for image {image_id}: {str(e)}", exc_info=True)
+        raise self.retry(exc=e)
+
+
+@celery_app.task(name="features.images.tasks_renditions.backfill_image_renditions")
+def backfill_image_renditions_task(batch_size: int = 200, regenerate: bool = False):
+    """
+    Generate renditions for existing images that have none.
+
+    Walks all images by ID in batches so memory stays flat on large
+    libraries. Set regenerate=True after changing IMAGE_RENDITION_SIZES
+    or the encoder settings.
+
+    Returns:
+        dict with counts of generated, skipped and failed images
+    """
+    db = SessionLocal()
+    generated = skipped = failed = 0
+    last_id = 0
+
+    try:
+        while True:
+            batch = (
+                db.query(Image.id, Image.filepath)
+                .filter(Image.id > last_id)
+                .order_by(Image.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            for image_id, filepath in batch:
+                if not regenerate and ImageRenditionService.list_renditions(image_id):
+                    skipped += 1
+                    continue
+                if not filepath or not os.path.exists(filepath):
+                    skipped += 1
+                    continue
+                try:
+                    ImageRenditionService.generate_renditions(image_id, filepath)
+                    generated += 1
+                except Exception as e:
+                    failed += 1
+                    logger.warning(f"Rendition backfill failed for image {image_id}: {str(e)}")
+
+        logger.info(
+            f"Rendition backfill: {generated} generated, {skipped} skipped, {failed} failed"
+        )
+        return {"generated": generated, "skipped": skipped, "failed": failed}
+
+    finally:
+        db.close()
@@ -22,11 +22,8 @@ from features.mnemosyne_brain.models.brain_file import BrainFile
 from features.mnemosyne_brain.models.brain_build_log import BrainBuildLog
 from features.mnemosyne_brain import schemas
 from features.mnemosyne_brain.services.topic_generator import compute_content_hash
-from features.mnemosyne_brain.services.topic_selector import (
-    select_topics,
-    _compute_keyword_score,
-    _compute_embedding_score,
-)
+from features.mnemosyne_brain.services.topic_selector import select_topics
+from features.mnemosyne_brain.services.topic_index import get_topic_index, invalidate_topic_index
 from features.mnemosyne_brain.services.memory_evolver import get_memory_stats, prune_memory
 
 logger = logging.getLogger(__name__)
@@ -213,6 +210,7 @@ async def update_brain_file(
 
     db.commit()
     db.refresh(brain_file)
+    invalidate_topic_index(current_user.id)
 
     logger.info(f"Brain file '{file_key}' updated by user {current_user.id}")
     return brain_file
@@ -346,15 +344,8 @@ async def get_topic_scores(
 
     Returns topics sorted by score, indicating which would be auto-selected.
     """
-    # Get all topic files
-    topics = (
-        db.query(BrainFile)
-        .filter(
-            BrainFile.owner_id == current_user.id,
-            BrainFile.file_type == "topic",
-        )
-        .all()
-    )
+    # Get all topics (cached selection index, no content)
+    index = get_topic_index(db, current_user.id)
 
     # Get pinned topics
     prefs = _get_user_preferences(db, current_user.id)
@@ -369,26 +360,21 @@ async def get_topic_scores(
         except Exception:
             pass
 
-    # Score each topic
-    scored_topics = []
-    query_lower = (query or "").lower()
-    query_words = set(query_lower.split()) if query else set()
-
-    for topic in topics:
-        if query:
-            keyword_score = _compute_keyword_score(query_words, query_lower, topic)
-            embedding_score = _compute_embedding_score(query_embedding, topic)
-            score = (keyword_score * 0.3) + (embedding_score * 0.7)
-        else:
-            score = 0.0
+    # Score all topics
+    scores = None
+    if query:
+        scores = (index.keyword_scores(query) * 0.3) + (index.embedding_scores(query_embedding) * 0.7)
 
+    scored_topics = []
+    for i, file_key in enumerate(index.file_keys):
+        score = float(scores[i]) if scores is not None else 0.0
         scored_topics.append(schemas.TopicScoreItem(
-            file_key=topic.file_key,
-            title=topic.title or topic.file_key,
-            token_count=topic.token_count_approx or len(topic.content or "") // 4,
+            file_key=file_key,
+            title=index.titles[i] or file_key,
+            token_count=index.token_counts[i],
             score=round(score, 3),
             is_auto_selected=score >= 0.05 if query else False,
-            is_pinned=topic.file_key in pinned,
+            is_pinned=file_key in pinned,
         ))
 
     # Sort by score (pinned first, then by score)
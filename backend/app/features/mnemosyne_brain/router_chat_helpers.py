@@ -161,6 +161,51 @@ def call_ollama_stream(
         )
 
 
+async def call_ollama_stream_async(
+    prompt: str, system_prompt: str, model: str = None, context_window: int = None,
+):
+    """Async version of call_ollama_stream for the SSE endpoint.
+
+    Yields LLMStreamChunk objects without blocking the event loop.
+    """
+    from core.llm.base import LLMStreamChunk as Chunk
+
+    if model is None:
+        model = getattr(config, "BRAIN_MODEL", "llama3.2:3b")
+    temperature = getattr(config, "BRAIN_TEMPERATURE", 0.7)
+
+    logger.info(
+        f"Brain stream: model={model}, "
+        f"system_prompt_len={len(system_prompt)}, prompt_len={len(prompt)}"
+    )
+
+    messages = [
+        LLMMessage(role="system", content=system_prompt),
+        LLMMessage(role="user", content=prompt),
+    ]
+
+    try:
+        provider = get_default_provider()
+        async for chunk in provider.astream(
+            messages=messages,
+            model=model,
+            temperature=temperature,
+            max_tokens=2048,
+            context_window=context_window,
+            timeout=180,
+        ):
+            yield chunk
+            if chunk.done:
+                break
+    except Exception as e:
+        logger.error(f"Brain stream failed: {e}")
+        error_type, user_msg = classify_llm_error(e)
+        yield Chunk(
+            content=user_msg, done=True,
+            is_error=True, error_type=error_type,
+        )
+
+
 def get_previous_topics(db: Session, user_id: int, conversation_id) -> list:
     """Extract topic file keys from the last assistant message in a conversation."""
     if not conversation_id:
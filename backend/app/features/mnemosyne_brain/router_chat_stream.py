@@ -9,6 +9,7 @@ import logging
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from slowapi import Limiter
@@ -42,7 +43,7 @@ from features.mnemosyne_brain.router_chat_helpers import (
     is_brain_stale,
     get_query_embedding,
     get_previous_topics,
-    call_ollama_stream,
+    call_ollama_stream_async,
 )
 
 logger = logging.getLogger(__name__)
@@ -65,7 +66,7 @@ async def brain_query_stream(
 
     query = body.query
     user_id = current_user.id
-    query_embedding = get_query_embedding(query)
+    query_embedding = await run_in_threadpool(get_query_embedding, query)
 
     # Compute dynamic context budget based on user's brain model
     context_budget = get_effective_context_budget(db, user_id)
@@ -102,40 +103,89 @@ async def brain_query_stream(
     # Extract previously loaded topics before stream starts
     prev_topics_stream = get_previous_topics(db, user_id, conversation_id)
 
+    def prepare_context():
+        """Topic selection, context assembly and history (blocking DB work)."""
+        topic_scores = select_topics(
+            db, user_id, query, query_embedding,
+            token_budget=context_budget,
+            pinned_topics=pinned_topics_list,
+            previously_loaded_topics=prev_topics_stream,
+        )
+        context = assemble_context(
+            db, user_id, topic_scores,
+            context_budget=context_budget,
+            query=query,
+        )
+
+        prompt = query
+        if conversation:
+            messages = (
+                db.query(BrainMessage)
+                .filter(BrainMessage.conversation_id == conversation.id)
+                .order_by(BrainMessage.created_at)
+                .limit(20)
+                .all()
+            )
+            if messages:
+                history = format_conversation_history_tiered(
+                    [{"role": m.role, "content": m.content} for m in messages],
+                    conversation_summary=conversation.conversation_summary,
+                )
+                prompt = f"Conversation so far:\n{history}\n\nUser: {query}"
+        return context, prompt
+
+    def save_conversation(context, full_response):
+        """Persist the exchange and queue follow-up tasks (blocking)."""
+        if conversation:
+            try:
+                user_msg = BrainMessage(
+                    conversation_id=conversation.id,
+                    role="user",
+                    content=query,
+                )
+                db.add(user_msg)
+
+                assistant_msg = BrainMessage(
+                    conversation_id=conversation.id,
+                    role="assistant",
+                    content=full_response,
+                    brain_files_loaded=context.brain_files_used,
+                    topics_matched=context.topics_matched,
+                )
+                db.add(assistant_msg)
+
+                conversation.brain_files_used = context.brain_files_used
+                conversation.updated_at = datetime.utcnow()
+
+                increment_message_counter(db, conversation)
+                db.commit()
+
+                if should_update_summary(conversation):
+                    try:
+                        from features.mnemosyne_brain.tasks import update_conversation_summary_task
+                        update_conversation_summary_task.delay(conversation.id)
+                    except Exception as e:
+                        logger.warning(f"Failed to queue summary update: {e}")
+            except Exception as e:
+                logger.error(f"Failed to save brain stream conversation: {e}")
+                db.rollback()
+
+        try:
+            if conversation:
+                from features.mnemosyne_brain.tasks import evolve_memory_task
+                evolve_memory_task.delay(user_id, conversation.id)
+        except Exception as e:
+            logger.warning(f"Failed to queue memory evolution: {e}")
+
     async def generate_stream():
         try:
-            topic_scores = select_topics(
-                db, user_id, query, query_embedding,
-                token_budget=context_budget,
-                pinned_topics=pinned_topics_list,
-                previously_loaded_topics=prev_topics_stream,
-            )
-            context = assemble_context(
-                db, user_id, topic_scores,
-                context_budget=context_budget,
-                query=query,
-            )
+            context, prompt = await run_in_threadpool(prepare_context)
 
             # Emit topics-matched count so frontend can show indicator
             yield f"data: {json.dumps({'type': 'sources_found', 'sources_found': len(context.topics_matched)})}\n\n"
 
-            prompt = query
-            if conversation:
-                messages = (
-                    db.query(BrainMessage)
-                    .filter(BrainMessage.conversation_id == conversation.id)
-                    .order_by(BrainMessage.created_at)
-                    .limit(20)
-                    .all()
-                )
-                if messages:
-                    history = format_conversation_history_tiered(
-                        [{"role": m.role, "content": m.content} for m in messages],
-                        conversation_summary=conversation.conversation_summary,
-                    )
-                    prompt = f"Conversation so far:\n{history}\n\nUser: {query}"
-
-            provider, user_model, provider_name = get_provider_for_user(db, user_id, "brain")
+            # Settings lookups and usage logging hit the database - keep them off the loop
+            provider, user_model, provider_name = await run_in_threadpool(get_provider_for_user, db, user_id, "brain")
 
             full_response = ""
             stream_input_tokens = 0
@@ -148,7 +198,7 @@ async def brain_query_stream(
                     LLMMessage(role="user", content=prompt),
                 ]
                 try:
-                    for chunk in provider.stream(
+                    async for chunk in provider.astream(
                         messages=messages, model=user_model, temperature=0.7, max_tokens=2048,
                     ):
                         if chunk.is_error:
@@ -165,13 +215,16 @@ async def brain_query_stream(
                     if not had_error:
                         from core.llm.base import ProviderType as PT
                         ptype = {"anthropic": PT.ANTHROPIC, "openai": PT.OPENAI, "custom": PT.CUSTOM}.get(provider_name, PT.OLLAMA)
-                        log_stream_usage(db, user_id, ptype, user_model, stream_input_tokens, stream_output_tokens, "brain")
+                        await run_in_threadpool(
+                            log_stream_usage, db, user_id, ptype, user_model,
+                            stream_input_tokens, stream_output_tokens, "brain",
+                        )
                 except Exception as cloud_err:
                     logger.warning(f"Cloud stream failed, falling back to Ollama: {cloud_err}")
-                    user_model = get_effective_brain_model(db, user_id)
+                    user_model = await run_in_threadpool(get_effective_brain_model, db, user_id)
                     model_info = get_model_info(user_model)
                     ctx_window = model_info.context_length if model_info else 4096
-                    for chunk in call_ollama_stream(prompt, context.system_prompt, model=user_model, context_window=ctx_window):
+                    async for chunk in call_ollama_stream_async(prompt, context.system_prompt, model=user_model, context_window=ctx_window):
                         if chunk.is_error:
                             had_error = True
                             yield f"data: {json.dumps({'type': 'error', 'content': chunk.content, 'error_type': chunk.error_type})}\n\n"
@@ -184,7 +237,7 @@ async def brain_query_stream(
             else:
                 model_info = get_model_info(user_model)
                 ctx_window = model_info.context_length if model_info else 4096
-                for chunk in call_ollama_stream(prompt, context.system_prompt, model=user_model, context_window=ctx_window):
+                async for chunk in call_ollama_stream_async(prompt, context.system_prompt, model=user_model, context_window=ctx_window):
                     if chunk.is_error:
                         had_error = True
                         yield f"data: {json.dumps({'type': 'error', 'content': chunk.content, 'error_type': chunk.error_type})}\n\n"
@@ -198,46 +251,7 @@ async def brain_query_stream(
             yield f"data: {json.dumps({'type': 'brain_meta', 'brain_files_used': context.brain_files_used, 'topics_matched': context.topics_matched, 'model_used': user_model, 'brain_is_stale': stale})}\n\n"
             yield f"data: {json.dumps({'type': 'metadata', 'metadata': {'conversation_id': conversation_id, 'model_used': user_model}})}\n\n"
 
-            if conversation:
-                try:
-                    user_msg = BrainMessage(
-                        conversation_id=conversation.id,
-                        role="user",
-                        content=query,
-                    )
-                    db.add(user_msg)
-
-                    assistant_msg = BrainMessage(
-                        conversation_id=conversation.id,
-                        role="assistant",
-                        content=full_response,
-                        brain_files_loaded=context.brain_files_used,
-                        topics_matched=context.topics_matched,
-                    )
-                    db.add(assistant_msg)
-
-                    conversation.brain_files_used = context.brain_files_used
-                    conversation.updated_at = datetime.utcnow()
-
-                    increment_message_counter(db, conversation)
-                    db.commit()
-
-                    if should_update_summary(conversation):
-                        try:
-                            from features.mnemosyne_brain.tasks import update_conversation_summary_task
-                            update_conversation_summary_task.delay(conversation.id)
-                        except Exception as e:
-                            logger.warning(f"Failed to queue summary update: {e}")
-                except Exception as e:
-                    logger.error(f"Failed to save brain stream conversation: {e}")
-                    db.rollback()
-
-            try:
-                if conversation:
-                    from features.mnemosyne_brain.tasks import evolve_memory_task
-                    evolve_memory_task.delay(user_id, conversation.id)
-            except Exception as e:
-                logger.warning(f"Failed to queue memory evolution: {e}")
+            await run_in_threadpool(save_conversation, context, full_response)
 
             yield f"data: {json.dumps({'type': 'done'})}\n\n"
 
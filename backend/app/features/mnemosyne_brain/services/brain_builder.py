@@ -31,6 +31,7 @@ from features.mnemosyne_brain.services.brain_helpers import (
     run_community_detection,
     upsert_brain_file,
 )
+from features.mnemosyne_brain.services.topic_index import invalidate_topic_index
 
 logger = logging.getLogger(__name__)
 
@@ -143,6 +144,7 @@ def build_brain(db: Session, user_id: int, build_log: BrainBuildLog) -> None:
         build_log.current_step = "Complete"
         build_log.completed_at = datetime.utcnow()
         db.commit()
+        invalidate_topic_index(user_id)
 
         logger.info(f"Brain build complete for user {user_id}: {len(topic_results)} topics, {total_tokens} tokens")
 
@@ -10,7 +10,7 @@ import logging
 from typing import List, Dict, Optional
 from dataclasses import dataclass, field
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 
 from features.mnemosyne_brain.models.brain_file import BrainFile
 from features.mnemosyne_brain.services.topic_selector import TopicScore
@@ -67,9 +67,13 @@ def assemble_context(
             files_used.append("memory")
             core_tokens += len(content) // 4
 
-    # 2. Load ALL compressed summaries (Knowledge Map)
+    # 2. Load ALL compressed summaries (Knowledge Map); full content is deferred
     all_topics = (
         db.query(BrainFile)
+        .options(load_only(
+            BrainFile.file_key, BrainFile.title, BrainFile.token_count_approx,
+            BrainFile.compressed_content, BrainFile.compressed_token_count,
+        ))
         .filter(BrainFile.owner_id == user_id, BrainFile.file_type == "topic")
         .all()
     )
@@ -114,13 +118,16 @@ def assemble_context(
         if llm_scores:
             topic_scores = llm_scores
 
+    topic_contents = _load_topic_contents(
+        db, user_id, [ts.file_key for ts in topic_scores if ts.file_key in topic_file_map],
+    )
     for ts in topic_scores:
         if topic_tokens >= deep_budget:
             break
         topic_file = topic_file_map.get(ts.file_key)
         if not topic_file:
             continue
-        content = _truncate_to_budget(topic_file.content, deep_budget - topic_tokens)
+        content = _truncate_to_budget(topic_contents.get(ts.file_key, ""), deep_budget - topic_tokens)
         topic_parts.append(f"## {topic_file.title}\n{content}")
         files_used.append(ts.file_key)
         topic_tokens += len(content) // 4
@@ -183,6 +190,22 @@ def assemble_context(
     )
 
 
+def _load_topic_contents(db: Session, user_id: int, file_keys: List[str]) -> Dict[str, str]:
+    """Fetch full content for the selected deep topics only."""
+    if not file_keys:
+        return {}
+    rows = (
+        db.query(BrainFile.file_key, BrainFile.content)
+        .filter(
+            BrainFile.owner_id == user_id,
+            BrainFile.file_type == "topic",
+            BrainFile.file_key.in_(file_keys),
+        )
+        .all()
+    )
+    return {row.file_key: row.content or "" for row in rows}
+
+
 def _truncate_to_budget(content: str, token_budget: int) -> str:
     """Truncate content to fit within token budget (approx 4 chars/token)."""
     char_budget = token_budget * 4
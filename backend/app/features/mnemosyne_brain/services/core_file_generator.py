@@ -54,7 +54,7 @@ def generate_askimap(topics: List[Dict], model: str = None) -> Dict:
         topic_entries="\n\n".join(topic_entries),
     )
 
-    content = call_ollama_generate(prompt, model=model)
+    content = call_ollama_generate(prompt, model=model, cache=True)
     if not content:
         content = _build_fallback_askimap(topics)
 
@@ -17,6 +17,7 @@ from features.mnemosyne_brain.services.topic_updater import (
     create_micro_topic,
     update_master_map,
 )
+from features.mnemosyne_brain.services.topic_index import invalidate_topic_index
 
 logger = logging.getLogger(__name__)
 
@@ -56,6 +57,7 @@ def incremental_update(db: Session, user_id: int, note_id: int, change_type: str
         _check_rebuild_recommendation(db, user_id)
 
     db.commit()
+    invalidate_topic_index(user_id)
     return {"status": "updated", "topics_updated": updated}
 
 
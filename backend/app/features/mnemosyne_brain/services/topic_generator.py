@@ -40,8 +40,13 @@ def compute_content_hash(content: str) -> str:
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
 
-def call_ollama_generate(prompt: str, system: str = "", model: str = None) -> str:
-    """Call LLM provider for generation (non-streaming)."""
+def call_ollama_generate(prompt: str, system: str = "", model: str = None, cache: bool = False) -> str:
+    """
+    Call LLM provider for generation (non-streaming).
+
+    cache=True serves repeated prompts from the LLM response cache; use it
+    for outputs that only depend on the prompt (compression, askimap).
+    """
     model = model or getattr(config, "BRAIN_MODEL", "llama3.2:3b")
     temperature = getattr(config, "BRAIN_TEMPERATURE", 0.7)
 
@@ -52,7 +57,8 @@ def call_ollama_generate(prompt: str, system: str = "", model: str = None) -> st
 
     try:
         provider = get_default_provider()
-        response = provider.generate(
+        generate = provider.generate_cached if cache else provider.generate
+        response = generate(
             messages=messages,
             model=model,
             temperature=temperature,
@@ -183,7 +189,7 @@ def compress_topic_content(
         topic_content=topic_result.content[:2000],
     )
 
-    compressed = call_ollama_generate(prompt, model=model)
+    compressed = call_ollama_generate(prompt, model=model, cache=True)
 
     if compressed:
         topic_result.compressed_content = compressed.strip()
@@ -0,0 +1,193 @@
+"""
+Topic Index - In-memory view of a user's brain topics for topic selection.
+
+Holds only what selection needs, never topic content:
+- Normalized topic embeddings as one float32 matrix (zero row = no embedding)
+- Lowercased keywords and title words per topic
+- Token counts for budget fitting
+
+Embedding scores for all topics are one matrix-vector product. Indexes are
+cached per user and dropped by invalidate_topic_index() when a brain build,
+incremental update or user edit changes topics. Builds usually run in a
+Celery worker, so every lookup also compares a cheap fingerprint (topic
+count, latest updated_at) and rebuilds when it moved on.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from features.mnemosyne_brain.models.brain_file import BrainFile
+from core import config
+
+logger = logging.getLogger(__name__)
+
+
+class TopicIndex:
+    """
+    Selection data for one user's topic files.
+
+    Attributes:
+        file_keys / titles / token_counts: Per-topic values, position = matrix row
+        position: file_key -> row
+        matrix: (topics, dim) float32 unit vectors
+        version: Fingerprint of the topic rows the index was built from
+    """
+
+    def __init__(
+        self,
+        file_keys: Sequence[str],
+        titles: Sequence[Optional[str]],
+        token_counts: Sequence[Optional[int]],
+        keywords: Sequence[Optional[List[str]]],
+        embeddings: Sequence[Optional[Sequence[float]]],
+        version: Optional[Tuple] = None,
+    ) -> None:
+        self.file_keys = list(file_keys)
+        self.titles = list(titles)
+        self.token_counts = [count or 0 for count in token_counts]
+        self.position: Dict[str, int] = {key: i for i, key in enumerate(self.file_keys)}
+        self.keywords = [[str(kw).lower() for kw in kws or []] for kws in keywords]
+        self.title_words = [set((title or "").lower().split()) for title in self.titles]
+        self.matrix = _normalized_matrix(embeddings)
+        self.version = version
+
+    def __len__(self) -> int:
+        return len(self.file_keys)
+
+    def keyword_scores(self, query: str) -> np.ndarray:
+        """
+        Keyword overlap per topic.
+
+        Share of topic keywords found in the query; without any keyword
+        hit, half the share of query words found in the title. Topics
+        without keywords score 0.
+        """
+        query_lower = query.lower()
+        query_words = set(query_lower.split())
+        scores = np.zeros(len(self))
+
+        for i, keywords in enumerate(self.keywords):
+            if not keywords:
+                continue
+            matches = sum(1 for kw in keywords if kw in query_lower)
+            if matches:
+                scores[i] = min(matches / len(keywords), 1.0)
+                continue
+            overlap = len(query_words & self.title_words[i])
+            if overlap:
+                scores[i] = min(overlap / max(len(query_words), 1), 1.0) * 0.5
+        return scores
+
+    def embedding_scores(self, query_embedding: Optional[Sequence[float]]) -> np.ndarray:
+        """Cosine similarity of every topic to the query, negatives clipped to 0."""
+        dim = self.matrix.shape[1]
+        if query_embedding is None or not dim:
+            return np.zeros(len(self))
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = np.linalg.norm(query) if query.shape == (dim,) else 0.0
+        if not norm:
+            return np.zeros(len(self))
+        return np.maximum(self.matrix @ (query / norm), 0.0).astype(np.float64)
+
+
+def _normalized_matrix(embeddings: Sequence[Optional[Sequence[float]]]) -> np.ndarray:
+    """Stack embeddings as unit rows; missing or mis-sized embeddings stay zero."""
+    dim = next((len(e) for e in embeddings if e is not None), 0)
+    matrix = np.zeros((len(embeddings), dim), dtype=np.float32)
+    for i, embedding in enumerate(embeddings):
+        if embedding is not None and len(embedding) == dim:
+            matrix[i] = embedding
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def _topic_filter(user_id: int):
+    """Filter clauses for a user's topic files."""
+    return (BrainFile.owner_id == user_id, BrainFile.file_type == "topic")
+
+
+def topic_version(db: Session, user_id: int) -> Tuple:
+    """Fingerprint of a user's topic rows: (count, latest updated_at)."""
+    count, latest = (
+        db.query(func.count(BrainFile.id), func.max(BrainFile.updated_at))
+        .filter(*_topic_filter(user_id))
+        .one()
+    )
+    return count, latest
+
+
+def build_topic_index(db: Session, user_id: int, version: Optional[Tuple] = None) -> TopicIndex:
+    """Load the selection columns of a user's topics (no content) into a TopicIndex."""
+    rows = (
+        db.query(
+            BrainFile.file_key,
+            BrainFile.title,
+            BrainFile.token_count_approx,
+            BrainFile.topic_keywords,
+            BrainFile.embedding,
+        )
+        .filter(*_topic_filter(user_id))
+        .order_by(BrainFile.file_key)
+        .all()
+    )
+    return TopicIndex(
+        file_keys=[row.file_key for row in rows],
+        titles=[row.title for row in rows],
+        token_counts=[row.token_count_approx for row in rows],
+        keywords=[row.topic_keywords for row in rows],
+        embeddings=[row.embedding for row in rows],
+        version=version,
+    )
+
+
+# Per-user cache
+_indexes: "OrderedDict[int, TopicIndex]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_topic_index(db: Session, user_id: int) -> TopicIndex:
+    """Get the cached TopicIndex for a user, rebuilding it when topics changed."""
+    version = topic_version(db, user_id)
+
+    with _lock:
+        cached = _indexes.get(user_id)
+        if cached is not None:
+            _indexes.move_to_end(user_id)
+    if cached is not None and cached.version == version:
+        return cached
+
+    started = time.perf_counter()
+    index = build_topic_index(db, user_id, version)
+    logger.info(
+        f"Built topic index for user {user_id}: {len(index)} topics "
+        f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+    )
+
+    with _lock:
+        _indexes[user_id] = index
+        _indexes.move_to_end(user_id)
+        while len(_indexes) > config.BRAIN_TOPIC_INDEX_CACHE_SIZE:
+            _indexes.popitem(last=False)
+    return index
+
+
+def invalidate_topic_index(user_id: int) -> None:
+    """Drop a user's cached index after a brain build/update."""
+    with _lock:
+        _indexes.pop(user_id, None)
+
+
+def clear_topic_index_cache() -> None:
+    """Drop all cached indexes (tests, admin)."""
+    with _lock:
+        _indexes.clear()
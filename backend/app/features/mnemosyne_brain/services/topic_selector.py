@@ -2,7 +2,8 @@
 Topic Selector - Matches a query to relevant brain topic files.
 
 Uses keyword matching (0.3 weight) + embedding similarity (0.7 weight)
-to select the most relevant topics within a token budget.
+to select the most relevant topics within a token budget. Scores come
+from the per-user TopicIndex (see topic_index).
 """
 
 import logging
@@ -11,7 +12,7 @@ from dataclasses import dataclass
 
 from sqlalchemy.orm import Session
 
-from features.mnemosyne_brain.models.brain_file import BrainFile
+from features.mnemosyne_brain.services.topic_index import get_topic_index
 from core import config
 
 logger = logging.getLogger(__name__)
@@ -75,69 +76,51 @@ def select_topics(
     pinned_topics = pinned_topics or []
     prev_set = set(previously_loaded_topics) if previously_loaded_topics else set()
 
-    # Fetch all topic files
-    topic_files = (
-        db.query(BrainFile)
-        .filter(
-            BrainFile.owner_id == user_id,
-            BrainFile.file_type == "topic",
-        )
-        .all()
-    )
-
-    if not topic_files:
+    # Score every topic at once (cached per user, no topic content loaded)
+    index = get_topic_index(db, user_id)
+    if not len(index):
         return []
 
-    # Build topic map
-    topic_map = {tf.file_key: tf for tf in topic_files}
-
-    # Score each topic
-    query_lower = query.lower()
-    query_words = set(query_lower.split())
+    keyword_scores = index.keyword_scores(query)
+    embedding_scores = index.embedding_scores(query_embedding)
+    combined_scores = (keyword_scores * 0.3) + (embedding_scores * 0.7)
 
     # FIRST: Always include pinned topics
     selected: List[TopicScore] = []
     tokens_used = 0
 
     for key in pinned_topics:
-        tf = topic_map.get(key)
-        if not tf:
+        i = index.position.get(key)
+        if i is None:
             continue
 
-        token_count = tf.token_count_approx or 0
+        token_count = index.token_counts[i]
         if tokens_used + token_count > token_budget:
             continue
 
-        keyword_score = _compute_keyword_score(query_words, query_lower, tf)
-        embedding_score = _compute_embedding_score(query_embedding, tf)
-        combined = (keyword_score * 0.3) + (embedding_score * 0.7)
-
         selected.append(TopicScore(
-            file_key=tf.file_key,
-            title=tf.title,
-            score=max(combined, 1.0),  # Pinned topics get max score
-            keyword_score=keyword_score,
-            embedding_score=embedding_score,
+            file_key=key,
+            title=index.titles[i],
+            score=max(float(combined_scores[i]), 1.0),  # Pinned topics get max score
+            keyword_score=float(keyword_scores[i]),
+            embedding_score=float(embedding_scores[i]),
             match_method="pinned",
             token_count=token_count,
         ))
         tokens_used += token_count
 
     # THEN: Score and select remaining topics
-    remaining_budget = token_budget - tokens_used
-    remaining_slots = max_topics - len(selected)
-
     scored: List[TopicScore] = []
-    for tf in topic_files:
-        if tf.file_key in pinned_topics:
+    for i, file_key in enumerate(index.file_keys):
+        if file_key in pinned_topics:
             continue  # Already included
 
-        keyword_score = _compute_keyword_score(query_words, query_lower, tf)
-        embedding_score = _compute_embedding_score(query_embedding, tf)
-        combined = (keyword_score * 0.3) + (embedding_score * 0.7)
+        keyword_score = float(keyword_scores[i])
+        embedding_score = float(embedding_scores[i])
+        combined = float(combined_scores[i])
 
         # Persistence bonus: previously loaded topics stay relevant
-        if tf.file_key in prev_set:
+        if file_key in prev_set:
             combined += 0.3
 
         if combined < 0.05:
@@ -148,17 +131,17 @@ def select_topics(
             method = "keyword"
         elif embedding_score > 0 and keyword_score == 0:
             method = "embedding"
-        if tf.file_key in prev_set and method != "pinned":
+        if file_key in prev_set and method != "pinned":
             method = f"{method}+persistent"
 
         scored.append(TopicScore(
-            file_key=tf.file_key,
-            title=tf.title,
+            file_key=file_key,
+            title=index.titles[i],
             score=combined,
             keyword_score=keyword_score,
             embedding_score=embedding_score,
             match_method=method,
-            token_count=tf.token_count_approx or 0,
+            token_count=index.token_counts[i],
         ))
 
     # Sort by score descending
@@ -179,46 +162,3 @@ def select_topics(
     )
     return selected
 
-
-def _compute_keyword_score(
-    query_words: set,
-    query_lower: str,
-    brain_file: BrainFile,
-) -> float:
-    """Score based on keyword overlap with topic keywords and title."""
-    keywords = brain_file.topic_keywords or []
-    if not keywords:
-        return 0.0
-
-    # Check keyword presence in query
-    keyword_matches = 0
-    for kw in keywords:
-        kw_lower = kw.lower()
-        if kw_lower in query_lower:
-            keyword_matches += 1
-
-    if keyword_matches == 0:
-        # Check query words in title
-        title_words = set((brain_file.title or "").lower().split())
-        title_overlap = len(query_words & title_words)
-        if title_overlap > 0:
-            return min(title_overlap / max(len(query_words), 1), 1.0) * 0.5
-        return 0.0
-
-    return min(keyword_matches / max(len(keywords), 1), 1.0)
-
-
-def _compute_embedding_score(
-    query_embedding: Optional[List[float]],
-    brain_file: BrainFile,
-) -> float:
-    """Compute cosine similarity between query and topic embeddings."""
-    if query_embedding is None or brain_file.embedding is None:
-        return 0.0
-
-    try:
-        from embeddings import cosine_similarity
-        topic_emb = list(brain_file.embedding)
-        return max(cosine_similarity(query_embedding, topic_emb), 0.0)
-    except Exception:
-        return 0.0
@@ -9,6 +9,7 @@ GET  /nexus/cache/stats           - Navigation cache statistics
 """
 
 import logging
+from html import escape
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from slowapi import Limiter
@@ -16,7 +17,8 @@ from slowapi.util import get_remote_address
 
 from core.database import get_db
 from core.auth import get_current_user
-from models import User
+from models import User, Note
+from features.graph.note_links import sync_note_links
 from features.nexus import schemas
 from features.nexus.models import NexusLinkSuggestion, NexusNavigationCache
 from features.nexus.services.missing_links import get_pending_suggestions
@@ -65,7 +67,7 @@ async def accept_suggestion(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    """Accept a link suggestion (creates wikilink)."""
+    """Accept a link suggestion (appends a [[wikilink]] to the source note)."""
     suggestion = db.query(NexusLinkSuggestion).filter(
         NexusLinkSuggestion.id == suggestion_id,
         NexusLinkSuggestion.owner_id == current_user.id,
@@ -77,24 +79,42 @@ async def accept_suggestion(
     if suggestion.status != "pending":
         raise HTTPException(400, f"Suggestion already {suggestion.status}")
 
-    # Create wikilink
-    from sqlalchemy import text
+    source = db.query(Note).filter(
+        Note.id == suggestion.source_note_id, Note.owner_id == current_user.id,
+    ).first()
+    target = db.query(Note).filter(
+        Note.id == suggestion.target_note_id, Note.owner_id == current_user.id,
+    ).first()
+    if not source or not target:
+        raise HTTPException(404, "Linked note not found")
+
+    # Write the [[wikilink]] into the source note; note_links follows content
     try:
-        db.execute(text("""
-            INSERT INTO note_links (source_note_id, target_note_id)
-            VALUES (:source, :target)
-            ON CONFLICT DO NOTHING
-        """), {
-            "source": suggestion.source_note_id,
-            "target": suggestion.target_note_id,
-        })
+        _append_wikilink(source, target.title)
+        sync_note_links(db, [source], current_user.id)
         suggestion.status = "accepted"
         db.commit()
-        return {"status": "accepted", "wikilink_created": True}
     except Exception as e:
         db.rollback()
         raise HTTPException(500, f"Failed to create wikilink: {str(e)}")
 
+    from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+    invalidate_graph_snapshot(current_user.id, [
+        f"note-{suggestion.source_note_id}", f"note-{suggestion.target_note_id}",
+    ])
+    return {"status": "accepted", "wikilink_created": True}
+
+
+def _append_wikilink(note: Note, title: str) -> None:
+    """Append [[title]] to a note's markdown and, if present, its editor HTML."""
+    note.content = f"{(note.content or '').rstrip()}\n\n[[{title}]]"
+    if note.html_content:
+        chip = escape(title)
+        note.html_content += (
+            f'<p><span data-wikilink-title="{chip}" class="wikilink-chip" '
+            f'contenteditable="false">[[{chip}]]</span></p>'
+        )
+
 
 @router.post("/suggestions/{suggestion_id}/dismiss")
 @limiter.limit("20/minute")
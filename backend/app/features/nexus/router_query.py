@@ -10,6 +10,7 @@ import logging
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from slowapi import Limiter
@@ -29,7 +30,7 @@ from features.nexus import schemas
 from features.nexus.services.query_router import route_query
 from features.nexus.services.response_generator import (
     generate_nexus_response,
-    stream_nexus_response,
+    stream_nexus_response_async,
 )
 from features.nexus.services.pipeline import (
     run_nexus_pipeline,
@@ -153,23 +154,55 @@ async def nexus_query_stream(
         db.refresh(conversation)
         conversation_id = conversation.id
 
+    def retrieve(route):
+        """Retrieval pipeline and history lookup (blocking DB/embedding work)."""
+        ranked_results, context, strategies = run_nexus_pipeline(
+            db, query, owner_id, body, route
+        )
+        conversation_history = get_conversation_history(
+            db, conversation_id, owner_id
+        )
+        user_model = get_effective_nexus_model(db, owner_id)
+        return context, strategies, conversation_history, user_model
+
+    def save_messages(full_response, confidence, rich_citations):
+        """Persist the exchange; returns the assistant message id (blocking)."""
+        try:
+            user_msg = ChatMessage(
+                conversation_id=conversation.id, role="user", content=query
+            )
+            db.add(user_msg)
+            db.flush()
+
+            assistant_msg = ChatMessage(
+                conversation_id=conversation.id, role="assistant",
+                content=full_response,
+                confidence_score=confidence["confidence_score"],
+            )
+            db.add(assistant_msg)
+            db.flush()
+
+            save_nexus_citations(db, assistant_msg.id, rich_citations)
+            conversation.updated_at = datetime.utcnow()
+            db.commit()
+            return assistant_msg.id
+        except Exception as e:
+            logger.error(f"Failed to save NEXUS conversation: {e}")
+            db.rollback()
+            return None
+
     async def generate_stream():
         try:
             mode_str = body.mode.value if body.mode != schemas.QueryMode.AUTO else None
             route = route_query(query, mode_str)
 
-            ranked_results, context, strategies = run_nexus_pipeline(
-                db, query, owner_id, body, route
-            )
-
-            conversation_history = get_conversation_history(
-                db, conversation_id, owner_id
+            context, strategies, conversation_history, user_model = (
+                await run_in_threadpool(retrieve, route)
             )
-            user_model = get_effective_nexus_model(db, owner_id)
             fallback = config.RAG_MODEL if user_model != config.RAG_MODEL else None
             full_response = ""
 
-            for token in stream_nexus_response(
+            async for token in stream_nexus_response_async(
                 query, context, user_model, conversation_history,
                 fallback_model=fallback,
             ):
@@ -195,28 +228,9 @@ async def nexus_query_stream(
 
             message_id = None
             if conversation:
-                try:
-                    user_msg = ChatMessage(
-                        conversation_id=conversation.id, role="user", content=query
-                    )
-                    db.add(user_msg)
-                    db.flush()
-
-                    assistant_msg = ChatMessage(
-                        conversation_id=conversation.id, role="assistant",
-                        content=full_response,
-                        confidence_score=confidence["confidence_score"],
-                    )
-                    db.add(assistant_msg)
-                    db.flush()
-                    message_id = assistant_msg.id
-
-                    save_nexus_citations(db, message_id, context.rich_citations)
-                    conversation.updated_at = datetime.utcnow()
-                    db.commit()
-                except Exception as e:
-                    logger.error(f"Failed to save NEXUS conversation: {e}")
-                    db.rollback()
+                message_id = await run_in_threadpool(
+                    save_messages, full_response, confidence, context.rich_citations
+                )
 
             meta = {
                 "mode": route.mode,
@@ -4,7 +4,11 @@ from .query_router import QueryRoute, route_query
 from .vector_search import nexus_vector_search
 from .source_chain import resolve_source_chains
 from .context_builder import build_nexus_context
-from .response_generator import generate_nexus_response, stream_nexus_response
+from .response_generator import (
+    generate_nexus_response,
+    stream_nexus_response,
+    stream_nexus_response_async,
+)
 from .prompts import NEXUS_SYSTEM_PROMPT
 
 __all__ = [
@@ -15,5 +19,6 @@ __all__ = [
     "build_nexus_context",
     "generate_nexus_response",
     "stream_nexus_response",
+    "stream_nexus_response_async",
     "NEXUS_SYSTEM_PROMPT",
 ]
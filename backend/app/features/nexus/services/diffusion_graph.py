@@ -0,0 +1,277 @@
+"""
+Diffusion Graph: sparse note graph for personalized PageRank (DEEP mode)
+
+Holds a user's whole note graph as NumPy arrays:
+- Wikilinks and semantic edges as a CSR matrix (rows = targets)
+- Shared tags as a note-tag incidence list. Tag edges are applied as
+  B @ (B.T @ x) on the fly, so a popular tag costs O(notes) instead of
+  O(notes^2) materialized pairs.
+
+Column sums are precomputed, so one PageRank step is a few bincounts over
+the edge arrays. Graphs are cached per user and reused until the graph
+snapshot version changes (note/tag/link writes, see graph_snapshot) or the
+TTL expires (semantic edges are rebuilt by a background task).
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from core import config
+
+logger = logging.getLogger(__name__)
+
+WIKILINK_WEIGHT = 1.0
+BACKLINK_WEIGHT = 0.5  # Reverse direction of a wikilink
+SEMANTIC_WEIGHT = 0.6
+TAG_WEIGHT = 0.5
+
+
+class DiffusionGraph:
+    """
+    Column-normalized transition operator over a user's notes.
+
+    Attributes:
+        note_ids: int64 note IDs, position = matrix index
+        indptr / indices / data: CSR of wikilink + semantic weights
+        tag_notes / tag_index: note-tag incidence pairs
+        last_scores: Previous PageRank solution, used as warm start
+    """
+
+    def __init__(
+        self,
+        note_ids: np.ndarray,
+        edge_src: np.ndarray,
+        edge_dst: np.ndarray,
+        edge_weight: np.ndarray,
+        tag_notes: np.ndarray,
+        tag_index: np.ndarray,
+        version: Optional[int] = None,
+    ) -> None:
+        self.note_ids = note_ids
+        self.index: Dict[int, int] = {int(nid): i for i, nid in enumerate(note_ids)}
+        self.version = version
+        self.built_at = time.time()
+        self.last_scores: Optional[np.ndarray] = None
+        n = len(note_ids)
+
+        # CSR with rows = target, so (A @ x)[t] sums weights of t's sources
+        order = np.argsort(edge_dst, kind="stable")
+        self.indices = edge_src[order].astype(np.int32)
+        self.data = edge_weight[order].astype(np.float64)
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edge_dst, minlength=n), out=self.indptr[1:])
+        self._rows = np.repeat(np.arange(n, dtype=np.int32), np.diff(self.indptr))
+
+        self.tag_notes = tag_notes.astype(np.int32)
+        self.tag_index = tag_index.astype(np.int32)
+        n_tags = int(tag_index.max()) + 1 if len(tag_index) else 0
+        tag_sizes = np.bincount(self.tag_index, minlength=n_tags).astype(np.float64)
+        self._n_tags = n_tags
+        # Tags per note: the self-loop B @ B.T adds, removed in matvec
+        self._tag_degree = np.bincount(self.tag_notes, minlength=n).astype(np.float64)
+
+        # Column sums of the combined matrix; empty columns stay unnormalized
+        col_sums = np.bincount(self.indices, weights=self.data, minlength=n)
+        if len(self.tag_notes):
+            col_sums += TAG_WEIGHT * np.bincount(
+                self.tag_notes, weights=tag_sizes[self.tag_index] - 1, minlength=n
+            )
+        col_sums[col_sums == 0] = 1.0
+        self._inv_col_sums = 1.0 / col_sums
+
+    def __len__(self) -> int:
+        return len(self.note_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.data)
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        """Apply the column-normalized transition matrix to x."""
+        n = len(self.note_ids)
+        z = x * self._inv_col_sums
+        y = np.bincount(self._rows, weights=self.data * z[self.indices], minlength=n)
+        if len(self.tag_notes):
+            per_tag = np.bincount(self.tag_index, weights=z[self.tag_notes], minlength=self._n_tags)
+            shared = np.bincount(self.tag_notes, weights=per_tag[self.tag_index], minlength=n)
+            y += TAG_WEIGHT * (shared - self._tag_degree * z)
+        return y
+
+    def pagerank(
+        self,
+        personalization: np.ndarray,
+        damping: float = 0.85,
+        max_iterations: int = 20,
+        convergence_threshold: float = 1e-6,
+    ) -> np.ndarray:
+        """Power iteration, warm-started from the previous solution."""
+        n = len(self.note_ids)
+        if self.last_scores is not None and len(self.last_scores) == n:
+            scores = self.last_scores
+        else:
+            scores = np.full(n, 1.0 / n)
+
+        teleport = (1 - damping) * personalization
+        for iteration in range(max_iterations):
+            new_scores = teleport + damping * self.matvec(scores)
+            delta = np.abs(new_scores - scores).sum()
+            scores = new_scores
+            if delta < convergence_threshold:
+                logger.debug(f"Diffusion converged at iteration {iteration + 1}")
+                break
+
+        self.last_scores = scores
+        return scores
+
+
+def build_diffusion_graph(db: Session, owner_id: int, version: Optional[int] = None) -> DiffusionGraph:
+    """Load a user's notes, links, semantic edges and tags into a DiffusionGraph."""
+    note_ids = np.fromiter(
+        (row[0] for row in db.execute(text("""
+            SELECT id FROM notes
+            WHERE owner_id = :owner_id AND is_trashed = false
+            ORDER BY id
+        """), {"owner_id": owner_id})),
+        dtype=np.int64,
+    )
+
+    sources: List[np.ndarray] = []
+    targets: List[np.ndarray] = []
+    weights: List[np.ndarray] = []
+
+    links = _index_pairs(note_ids, db.execute(text("""
+        SELECT l.source_note_id, l.target_note_id
+        FROM note_links l
+        JOIN notes n ON n.id = l.source_note_id
+        WHERE n.owner_id = :owner_id
+    """), {"owner_id": owner_id}).fetchall())
+    if links is not None:
+        src, dst, _ = links
+        sources += [src, dst]
+        targets += [dst, src]
+        weights += [np.full(len(src), WIKILINK_WEIGHT), np.full(len(src), BACKLINK_WEIGHT)]
+
+    try:
+        semantic = _index_pairs(note_ids, db.execute(text("""
+            SELECT source_id, target_id, similarity_score
+            FROM semantic_edges
+            WHERE owner_id = :owner_id
+              AND source_type = 'note' AND target_type = 'note'
+        """), {"owner_id": owner_id}).fetchall())
+    except Exception as e:
+        logger.debug(f"Semantic edges query failed (may not exist): {e}")
+        db.rollback()
+        semantic = None
+    if semantic is not None:
+        src, dst, sim = semantic
+        sources += [src, dst]
+        targets += [dst, src]
+        weights += [sim * SEMANTIC_WEIGHT] * 2
+
+    tags = _index_pairs(note_ids, db.execute(text("""
+        SELECT nt.note_id, nt.tag_id
+        FROM note_tags nt
+        JOIN notes n ON n.id = nt.note_id
+        WHERE n.owner_id = :owner_id AND n.is_trashed = false
+    """), {"owner_id": owner_id}).fetchall(), second_is_note=False)
+    if tags is not None:
+        tag_notes, tag_ids, _ = tags
+        _, tag_index = np.unique(tag_ids, return_inverse=True)
+    else:
+        tag_notes = tag_index = np.zeros(0, dtype=np.int32)
+
+    def _concat(parts, dtype):
+        return np.concatenate(parts).astype(dtype) if parts else np.zeros(0, dtype=dtype)
+
+    return DiffusionGraph(
+        note_ids=note_ids,
+        edge_src=_concat(sources, np.int32),
+        edge_dst=_concat(targets, np.int32),
+        edge_weight=_concat(weights, np.float64),
+        tag_notes=tag_notes,
+        tag_index=tag_index,
+        version=version,
+    )
+
+
+def _index_pairs(note_ids: np.ndarray, rows, second_is_note: bool = True):
+    """
+    Map (note_id, other_id[, weight]) rows to matrix indices.
+
+    Rows whose note IDs are not in `note_ids` (trashed, other owner) are
+    dropped. Returns (first_idx, second, weights) or None when empty.
+    """
+    if not rows or not len(note_ids):
+        return None
+    arr = np.asarray([tuple(r) for r in rows], dtype=np.float64)
+    first = arr[:, 0].astype(np.int64)
+    second = arr[:, 1].astype(np.int64)
+    weights = arr[:, 2] if arr.shape[1] > 2 else np.ones(len(arr))
+
+    first_idx = np.searchsorted(note_ids, first)
+    valid = (first_idx < len(note_ids)) & (note_ids[np.minimum(first_idx, len(note_ids) - 1)] == first)
+    if second_is_note:
+        second_idx = np.searchsorted(note_ids, second)
+        valid &= (second_idx < len(note_ids)) & (note_ids[np.minimum(second_idx, len(note_ids) - 1)] == second)
+        valid &= first != second
+        second = second_idx
+    if not valid.any():
+        return None
+    return first_idx[valid], second[valid], weights[valid]
+
+
+# Per-user cache
+_graphs: "OrderedDict[int, DiffusionGraph]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_diffusion_graph(db: Session, owner_id: int) -> DiffusionGraph:
+    """
+    Get the cached DiffusionGraph for a user, rebuilding it when stale.
+
+    Stale means the graph snapshot version moved on (note/tag/link writes)
+    or the entry is older than NEXUS_DIFFUSION_CACHE_TTL. Without Redis
+    there is no version, so only the TTL applies.
+    """
+    from features.graph.services.graph_snapshot import get_graph_snapshot_store
+
+    version = get_graph_snapshot_store().version(owner_id)
+
+    with _lock:
+        cached = _graphs.get(owner_id)
+        if cached is not None:
+            _graphs.move_to_end(owner_id)
+    if (
+        cached is not None
+        and (version is None or cached.version == version)
+        and time.time() - cached.built_at < config.NEXUS_DIFFUSION_CACHE_TTL
+    ):
+        return cached
+
+    started = time.perf_counter()
+    graph = build_diffusion_graph(db, owner_id, version)
+    logger.info(
+        f"Built diffusion graph for user {owner_id}: {len(graph)} notes, "
+        f"{graph.edge_count} edges, {len(graph.tag_notes)} tag links "
+        f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+    )
+
+    with _lock:
+        _graphs[owner_id] = graph
+        _graphs.move_to_end(owner_id)
+        while len(_graphs) > config.NEXUS_DIFFUSION_CACHE_SIZE:
+            _graphs.popitem(last=False)
+    return graph
+
+
+def clear_diffusion_cache() -> None:
+    """Drop all cached graphs (tests, admin)."""
+    with _lock:
+        _graphs.clear()
@@ -1,10 +1,13 @@
 """
 Stage 2c: Personalized PageRank Diffusion Ranker (DEEP mode)
 
-Builds a sparse adjacency matrix from wikilinks, semantic edges, and shared tags,
-then runs personalized PageRank with query-based seed distribution.
+Runs personalized PageRank over the user's whole note graph (wikilinks,
+semantic edges and shared tags; see diffusion_graph). The graph is cached
+per user as sparse arrays, and each query warm-starts from the previous
+solution. The personalization vector is seeded from the notes nearest to
+the query embedding (HNSW index).
 
-Complexity: O(edges x iterations), ~10ms for 500 notes.
+Complexity: O(edges x iterations) per query, tens of ms for 50k notes.
 """
 
 import logging
@@ -12,9 +15,15 @@ from typing import Dict, List, Optional
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from core import config
+from core.vector_index import (
+    apply_ann_search_params,
+    similarity_from_distance,
+    to_vector_literal,
+)
+
 logger = logging.getLogger(__name__)
 
-# Try scipy for sparse matrix operations
 try:
     import numpy as np
     NUMPY_AVAILABLE = True
@@ -22,6 +31,9 @@ except ImportError:
     NUMPY_AVAILABLE = False
     logger.warning("numpy not available, diffusion ranker disabled")
 
+# Teleport weight for notes outside the query's nearest seeds
+SEED_FLOOR = 0.01
+
 
 def diffusion_rank(
     db: Session,
@@ -30,7 +42,7 @@ def diffusion_rank(
     damping: float = 0.85,
     max_iterations: int = 20,
     convergence_threshold: float = 1e-6,
-    max_candidates: int = 500,
+    max_results: int = 1000,
 ) -> Dict[int, float]:
     """
     Run personalized PageRank on the user's knowledge graph.
@@ -42,7 +54,7 @@ def diffusion_rank(
         damping: PageRank damping factor
         max_iterations: Max iterations
         convergence_threshold: Convergence threshold
-        max_candidates: Max notes to include
+        max_results: Max notes to return (highest scores)
 
     Returns:
         Dict mapping note_id -> importance score (0-1)
@@ -52,171 +64,69 @@ def diffusion_rank(
         return {}
 
     try:
-        # Step 1: Load notes with embeddings
-        notes = _load_note_ids(db, owner_id, max_candidates)
-        if len(notes) < 2:
-            return {}
+        from features.nexus.services.diffusion_graph import get_diffusion_graph
 
-        note_ids = [n["id"] for n in notes]
-        id_to_idx = {nid: i for i, nid in enumerate(note_ids)}
-        n = len(note_ids)
-
-        # Step 2: Build adjacency matrix
-        adj = np.zeros((n, n), dtype=np.float32)
-        _add_wikilink_edges(db, note_ids, id_to_idx, adj, weight=1.0)
-        _add_semantic_edges(db, owner_id, note_ids, id_to_idx, adj, weight=0.6)
-        _add_shared_tag_edges(db, note_ids, id_to_idx, adj, weight=0.5)
-
-        # Normalize columns
-        col_sums = adj.sum(axis=0)
-        col_sums[col_sums == 0] = 1.0
-        adj = adj / col_sums
+        graph = get_diffusion_graph(db, owner_id)
+        n = len(graph)
+        if n < 2:
+            return {}
 
-        # Step 3: Build personalization vector
         if query_embedding:
-            personalization = _build_personalization(notes, query_embedding)
+            personalization = _build_personalization(db, owner_id, graph, query_embedding)
         else:
-            personalization = np.ones(n, dtype=np.float32) / n
-
-        # Step 4: Power iteration
-        scores = np.ones(n, dtype=np.float32) / n
-        for iteration in range(max_iterations):
-            new_scores = (1 - damping) * personalization + damping * adj @ scores
-            delta = np.abs(new_scores - scores).sum()
-            scores = new_scores
-            if delta < convergence_threshold:
-                logger.info(f"Diffusion converged at iteration {iteration + 1}")
-                break
+            personalization = np.full(n, 1.0 / n)
+
+        scores = graph.pagerank(
+            personalization,
+            damping=damping,
+            max_iterations=max_iterations,
+            convergence_threshold=convergence_threshold,
+        )
 
         # Normalize to 0-1
         max_score = scores.max()
         if max_score > 0:
             scores = scores / max_score
 
-        return {note_ids[i]: float(scores[i]) for i in range(n) if scores[i] > 0.01}
+        top = np.argpartition(-scores, min(max_results, n) - 1)[:max_results]
+        return {
+            int(graph.note_ids[i]): float(scores[i])
+            for i in top if scores[i] > 0.01
+        }
 
     except Exception as e:
         logger.error(f"Diffusion ranker failed: {e}")
         return {}
 
 
-def _load_note_ids(db: Session, owner_id: int, limit: int) -> List[Dict]:
-    """Load note IDs and embeddings for the user."""
-    result = db.execute(text("""
-        SELECT id, embedding
+def _build_personalization(
+    db: Session, owner_id: int, graph, query_embedding: List[float]
+) -> "np.ndarray":
+    """
+    Teleport distribution from cosine similarity to the query.
+
+    The NEXUS_DIFFUSION_SEED_COUNT nearest notes get their similarity
+    (at least SEED_FLOOR); every other note gets SEED_FLOOR.
+    """
+    n = len(graph)
+    personalization = np.full(n, SEED_FLOOR)
+
+    apply_ann_search_params(db)
+    rows = db.execute(text("""
+        SELECT id, embedding <=> CAST(:query_embedding AS vector) AS distance
         FROM notes
         WHERE owner_id = :owner_id AND is_trashed = false
             AND embedding IS NOT NULL
-        ORDER BY updated_at DESC
+        ORDER BY embedding <=> CAST(:query_embedding AS vector)
         LIMIT :limit
-    """), {"owner_id": owner_id, "limit": limit})
-
-    notes = []
-    for row in result:
-        embedding = None
-        if row.embedding:
-            try:
-                embedding = list(row.embedding)
-            except (TypeError, ValueError):
-                pass
-        notes.append({"id": row.id, "embedding": embedding})
-    return notes
-
-
-def _add_wikilink_edges(
-    db: Session, note_ids: List[int], id_to_idx: Dict,
-    adj: "np.ndarray", weight: float,
-):
-    """Add wikilink edges to adjacency matrix."""
-    result = db.execute(text("""
-        SELECT source_note_id, target_note_id
-        FROM note_links
-        WHERE source_note_id = ANY(:ids) AND target_note_id = ANY(:ids)
-    """), {"ids": note_ids})
-
-    for row in result:
-        src_idx = id_to_idx.get(row.source_note_id)
-        tgt_idx = id_to_idx.get(row.target_note_id)
-        if src_idx is not None and tgt_idx is not None:
-            adj[tgt_idx, src_idx] += weight
-            adj[src_idx, tgt_idx] += weight * 0.5  # Backlink at half weight
-
-
-def _add_semantic_edges(
-    db: Session, owner_id: int, note_ids: List[int],
-    id_to_idx: Dict, adj: "np.ndarray", weight: float,
-):
-    """Add semantic similarity edges to adjacency matrix."""
-    try:
-        result = db.execute(text("""
-            SELECT source_note_id, target_note_id, similarity
-            FROM semantic_edges
-            WHERE owner_id = :owner_id
-              AND source_note_id = ANY(:ids) AND target_note_id = ANY(:ids)
-        """), {"owner_id": owner_id, "ids": note_ids})
-
-        for row in result:
-            src_idx = id_to_idx.get(row.source_note_id)
-            tgt_idx = id_to_idx.get(row.target_note_id)
-            if src_idx is not None and tgt_idx is not None:
-                edge_weight = row.similarity * weight
-                adj[tgt_idx, src_idx] += edge_weight
-                adj[src_idx, tgt_idx] += edge_weight
-    except Exception as e:
-        logger.debug(f"Semantic edges query failed (may not exist): {e}")
-        db.rollback()
-
-
-def _add_shared_tag_edges(
-    db: Session, note_ids: List[int], id_to_idx: Dict,
-    adj: "np.ndarray", weight: float,
-):
-    """Add edges between notes sharing tags."""
-    try:
-        result = db.execute(text("""
-            SELECT a.note_id as note_a, b.note_id as note_b
-            FROM note_tags a
-            JOIN note_tags b ON a.tag_id = b.tag_id AND a.note_id < b.note_id
-            WHERE a.note_id = ANY(:ids) AND b.note_id = ANY(:ids)
-        """), {"ids": note_ids})
-
-        for row in result:
-            a_idx = id_to_idx.get(row.note_a)
-            b_idx = id_to_idx.get(row.note_b)
-            if a_idx is not None and b_idx is not None:
-                adj[a_idx, b_idx] += weight
-                adj[b_idx, a_idx] += weight
-    except Exception as e:
-        logger.debug(f"Shared tag edges query failed: {e}")
-        db.rollback()
-
-
-def _build_personalization(
-    notes: List[Dict], query_embedding: List[float]
-) -> "np.ndarray":
-    """Build personalization vector from cosine similarity to query."""
-    n = len(notes)
-    personalization = np.ones(n, dtype=np.float32)
-    query_arr = np.array(query_embedding, dtype=np.float32)
-    query_norm = np.linalg.norm(query_arr)
-
-    if query_norm == 0:
-        return personalization / n
-
-    for i, note in enumerate(notes):
-        if note.get("embedding"):
-            try:
-                note_arr = np.array(note["embedding"], dtype=np.float32)
-                note_norm = np.linalg.norm(note_arr)
-                if note_norm > 0:
-                    sim = np.dot(query_arr, note_arr) / (query_norm * note_norm)
-                    personalization[i] = max(sim, 0.01)
-            except (ValueError, TypeError):
-                pass
-
-    # Normalize to probability distribution
-    total = personalization.sum()
-    if total > 0:
-        personalization /= total
-
-    return personalization
+    """), {
+        "query_embedding": to_vector_literal(query_embedding),
+        "owner_id": owner_id,
+        "limit": config.NEXUS_DIFFUSION_SEED_COUNT,
+    })
+    for row in rows:
+        idx = graph.index.get(row.id)
+        if idx is not None:
+            personalization[idx] = max(similarity_from_distance(row.distance), SEED_FLOOR)
+
+    return personalization / personalization.sum()
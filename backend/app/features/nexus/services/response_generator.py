@@ -2,15 +2,16 @@
 Stage 3: LLM Response Generator
 
 Generates NEXUS responses using the graph-aware context.
-Supports both blocking and streaming modes.
+Supports blocking, streaming and async streaming modes.
 """
 
 import logging
-from typing import Generator, Optional
+from typing import AsyncGenerator, Generator, Optional
 
 from features.rag_chat.services.ollama_client import (
     call_ollama_generate,
     call_ollama_stream,
+    call_ollama_stream_async,
 )
 from features.rag_chat.services.prompts import extract_confidence_signals
 from features.rag_chat.services.context_builder import extract_citations_from_response
@@ -116,6 +117,47 @@ def stream_nexus_response(
             break
 
 
+async def stream_nexus_response_async(
+    query: str,
+    context: NexusAssembledContext,
+    model: str,
+    conversation_history: str = "",
+    fallback_model: str = None,
+) -> AsyncGenerator[str, None]:
+    """
+    Async version of stream_nexus_response for the SSE endpoint.
+    """
+    if not context.rich_citations:
+        system_prompt = NEXUS_SYSTEM_PROMPT_CONCISE
+        user_message = query
+    else:
+        system_prompt = NEXUS_SYSTEM_PROMPT
+        user_message = format_nexus_user_message(
+            query=query,
+            context=context.formatted_context,
+            conversation_history=conversation_history,
+        )
+
+    async for chunk in call_ollama_stream_async(
+        prompt=user_message, system_prompt=system_prompt, model=model,
+    ):
+        if chunk.is_error and fallback_model and fallback_model != model:
+            logger.warning(f"Model {model} failed, falling back to {fallback_model}")
+            async for fb_chunk in call_ollama_stream_async(
+                prompt=user_message, system_prompt=system_prompt,
+                model=fallback_model,
+            ):
+                if fb_chunk.content:
+                    yield fb_chunk.content
+                if fb_chunk.done:
+                    break
+            return
+        if chunk.content:
+            yield chunk.content
+        if chunk.done:
+            break
+
+
 def _citation_to_source(citation):
     """Convert NexusRichCitation to a duck-typed object with .index."""
     class _Source:
@@ -7,10 +7,11 @@ from co-retrieval patterns.
 
 import re
 import logging
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy import text as sql_text
 from sqlalchemy.orm import Session
 
+from core.config import RAG_HYBRID_SEARCH, TITLE_SIMILARITY_THRESHOLD
 from embeddings import generate_embedding
 from features.rag_chat.services.retrieval import (
     RetrievalResult,
@@ -19,6 +20,11 @@ from features.rag_chat.services.retrieval import (
     semantic_search_chunks,
     fulltext_search_notes,
 )
+from features.rag_chat.services.hybrid_search import (
+    HybridSearchConfig,
+    hybrid_search,
+    results_for_method,
+)
 from features.rag_chat.services.image_retrieval import combined_image_retrieval
 from features.rag_chat.services.graph_retrieval import (
     GraphTraversalConfig,
@@ -47,55 +53,92 @@ _TITLE_STOP_WORDS = {
 }
 
 
+def _apply_title_threshold(db: Session) -> None:
+    """Set pg_trgm.word_similarity_threshold (used by <%) for the current transaction."""
+    try:
+        db.execute(
+            sql_text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+            {"threshold": str(TITLE_SIMILARITY_THRESHOLD)},
+        )
+    except Exception as e:
+        logger.debug(f"Could not set pg_trgm.word_similarity_threshold: {e}")
+
+
+def _title_condition(params: dict, key: str, search_str: str) -> str:
+    """
+    Bind one title search string as :key and return its match condition.
+
+    A title matches when it contains the string (ILIKE) or contains a close
+    variant of it (pg_trgm word similarity at or above the threshold). Both
+    operators are served by the trigram index on notes.title; rank matches
+    with _title_score(key).
+    """
+    params[key] = search_str
+    params[f"{key}_like"] = f"%{search_str}%"
+    return f"(title ILIKE :{key}_like OR :{key} <% title)"
+
+
+def _title_score(key: str) -> str:
+    """Trigram word similarity of the search string bound as :key to the title."""
+    return f"word_similarity(:{key}, title)"
+
+
 def _title_query_exact(
-    db: Session, search_str: str, owner_id: int, limit: int
+    db: Session, search_str: str, owner_id: int, limit: int, raise_errors: bool = False
 ) -> List[RetrievalResult]:
-    """Execute exact ILIKE title search, prioritizing perfect matches."""
+    """Execute trigram title search for one string, prioritizing perfect matches."""
+    params = {"owner_id": owner_id, "limit": limit}
+    condition = _title_condition(params, "search", search_str)
     try:
-        result = db.execute(sql_text("""
-            SELECT id, title, content
+        _apply_title_threshold(db)
+        result = db.execute(sql_text(f"""
+            SELECT id, title, content,
+                   title ILIKE :search_like AS contains,
+                   {_title_score("search")} AS score
             FROM notes
             WHERE owner_id = :owner_id AND is_trashed = false
               AND LENGTH(TRIM(COALESCE(content, ''))) > 10
-              AND title ILIKE :search
+              AND {condition}
             ORDER BY
-              CASE WHEN LOWER(title) = LOWER(:exact) THEN 0 ELSE 1 END,
+              CASE WHEN LOWER(title) = LOWER(:search) THEN 0 ELSE 1 END,
+              score DESC,
               LENGTH(title) ASC
             LIMIT :limit
-        """), {
-            "owner_id": owner_id,
-            "search": f"%{search_str}%",
-            "exact": search_str,
-            "limit": limit,
-        })
+        """), params)
         results = []
         for row in result:
             results.append(RetrievalResult(
                 source_type='note', source_id=row.id,
                 title=row.title or 'Untitled', content=row.content or '',
-                similarity=0.95, retrieval_method='direct',
-                metadata={'full_note': True, 'title_match': True, 'exact_match': True}
+                similarity=0.95 if row.contains else round(0.95 * float(row.score), 3),
+                retrieval_method='direct',
+                metadata={'full_note': True, 'title_match': True, 'exact_match': bool(row.contains)}
             ))
         if results:
             logger.info(f"Title search found {len(results)} notes (exact: '{search_str}')")
         return results
     except Exception as e:
+        db.rollback()  # e.g. pg_trgm missing: don't leave the session aborted
+        if raise_errors:
+            raise
         logger.error(f"Exact title search failed: {e}")
         return []
 
 
-def _title_search(db: Session, query: str, owner_id: int, limit: int = 5) -> List[RetrievalResult]:
+def _title_search_terms(query: str) -> Tuple[List[str], List[str]]:
     """
-    Find notes whose title matches the query using tiered strategy.
+    Split a query into title search tiers.
 
-    Tiers: quoted string > exact cleaned query > date pattern > AND tokens.
+    Returns (exact_strings, tokens): title strings tried in order
+    (quoted string > cleaned query > date pattern), then the tokens that
+    must all appear in the title for the AND fallback.
     """
+    exact_strings = []
+
     # Tier 0: Quoted string detection
     quoted = re.findall(r'"([^"]+)"', query)
     if quoted:
-        results = _title_query_exact(db, quoted[0], owner_id, limit)
-        if results:
-            return results
+        exact_strings.append(quoted[0])
 
     # Tier 1: Clean filler words for exact title match
     cleaned = re.sub(
@@ -104,39 +147,54 @@ def _title_search(db: Session, query: str, owner_id: int, limit: int = 5) -> Lis
     )
     cleaned = re.sub(r'\s*(about|\?)\s*$', '', cleaned, flags=re.IGNORECASE).strip()
     if len(cleaned) >= 3:
-        results = _title_query_exact(db, cleaned, owner_id, limit)
-        if results:
-            return results
+        exact_strings.append(cleaned)
 
     # Tier 2: Date pattern detection (e.g. "2025-12-10")
     date_match = re.search(r'\d{4}-\d{2}-\d{2}', query)
     if date_match:
-        results = _title_query_exact(db, date_match.group(), owner_id, limit)
-        if results:
-            return results
+        exact_strings.append(date_match.group())
 
     # Tier 3: AND-based multi-token fallback
     tokens = re.findall(r'[\w-]{3,}', query)
     tokens = [t for t in tokens if t.lower() not in _TITLE_STOP_WORDS]
+
+    return exact_strings, tokens
+
+
+def _title_search(
+    db: Session, query: str, owner_id: int, limit: int = 5, raise_errors: bool = False
+) -> List[RetrievalResult]:
+    """
+    Find notes whose title matches the query using tiered strategy.
+
+    Tiers: quoted string > exact cleaned query > date pattern > AND tokens.
+    Each tier matches titles containing the string or a close variant of
+    it (pg_trgm, TITLE_SIMILARITY_THRESHOLD) and ranks by word similarity.
+    Failed queries return [] unless raise_errors is set.
+    """
+    exact_strings, tokens = _title_search_terms(query)
+
+    for search_str in exact_strings:
+        results = _title_query_exact(db, search_str, owner_id, limit, raise_errors)
+        if results:
+            return results
+
     if not tokens:
         return []
 
-    conditions = []
     params = {"owner_id": owner_id, "limit": limit}
-    for i, token in enumerate(tokens):
-        key = f"t{i}"
-        conditions.append(f"title ILIKE :{key}")
-        params[key] = f"%{token}%"
-
-    where = " AND ".join(conditions)
+    keys = [f"t{i}" for i in range(len(tokens))]
+    where = " AND ".join(_title_condition(params, key, token) for key, token in zip(keys, tokens))
+    score = " + ".join(_title_score(key) for key in keys)
     try:
+        _apply_title_threshold(db)
         result = db.execute(sql_text(f"""
             SELECT id, title, content
             FROM notes
             WHERE owner_id = :owner_id AND is_trashed = false
               AND LENGTH(TRIM(COALESCE(content, ''))) > 10
-              AND ({where})
-            ORDER BY LENGTH(title) ASC
+              AND {where}
+            ORDER BY {score} DESC, LENGTH(title) ASC
             LIMIT :limit
         """), params)
         results = []
@@ -151,6 +209,9 @@ def _title_search(db: Session, query: str, owner_id: int, limit: int = 5) -> Lis
             logger.info(f"Title search found {len(results)} notes (AND-match)")
         return results
     except Exception as e:
+        db.rollback()  # e.g. pg_trgm missing: don't leave the session aborted
+        if raise_errors:
+            raise
         logger.error(f"Title search AND-fallback failed: {e}")
         return []
 
@@ -163,11 +224,14 @@ def nexus_vector_search(
     min_similarity: float = 0.4,
     include_images: bool = True,
     include_graph: bool = True,
+    hybrid: bool = RAG_HYBRID_SEARCH,
 ) -> List[RankedResult]:
     """
     Run the full vector search + graph traversal pipeline.
 
-    Reuses existing RAG retrieval, ranking, and graph traversal.
+    Reuses existing RAG retrieval, ranking, and graph traversal. With
+    `hybrid`, semantic, chunk, fulltext and title search are fused in one
+    statement (hybrid_search); if that fails the per-method searches run.
     """
     query_embedding = generate_embedding(query)
     if not query_embedding:
@@ -175,28 +239,49 @@ def nexus_vector_search(
         fulltext_results = fulltext_search_notes(db, query, owner_id, limit=max_sources)
         return _wrap_as_ranked(fulltext_results)
 
+    config = get_dynamic_config(query, RankingConfig(max_results=max_sources))
+
     # Note-level search uses a lower threshold (notes compress full docs into
     # one embedding, losing specificity). Chunk search keeps the user threshold.
-    note_config = RetrievalConfig(
-        min_similarity=max(0.3, min_similarity - 0.15),
-        max_results=max_sources,
-        include_notes=True,
-        include_chunks=False,
-        include_images=include_images,
-    )
-    chunk_config = RetrievalConfig(
-        min_similarity=min_similarity,
-        max_results=max_sources,
-        include_notes=False,
-        include_chunks=True,
-        include_images=False,
-    )
+    note_min_similarity = max(0.3, min_similarity - 0.15)
+
+    fused = None
+    if hybrid:
+        fused = hybrid_search(
+            db, query, query_embedding, owner_id,
+            HybridSearchConfig(
+                note_min_similarity=note_min_similarity,
+                chunk_min_similarity=min_similarity,
+                max_results=max_sources,
+                top_k=max_sources * 2,
+            ),
+            config,
+        )
 
-    # Multi-source retrieval
-    semantic_results = semantic_search_notes(db, query_embedding, owner_id, note_config)
-    chunk_results = semantic_search_chunks(db, query_embedding, owner_id, chunk_config)
-    fulltext_results = fulltext_search_notes(db, query, owner_id, limit=10)
-    title_results = _title_search(db, query, owner_id)
+    if fused is not None:
+        semantic_results = results_for_method(fused, 'semantic')
+        title_results = results_for_method(fused, 'direct')
+    else:
+        note_config = RetrievalConfig(
+            min_similarity=note_min_similarity,
+            max_results=max_sources,
+            include_notes=True,
+            include_chunks=False,
+            include_images=include_images,
+        )
+        chunk_config = RetrievalConfig(
+            min_similarity=min_similarity,
+            max_results=max_sources,
+            include_notes=False,
+            include_chunks=True,
+            include_images=False,
+        )
+
+        # Multi-source retrieval
+        semantic_results = semantic_search_notes(db, query_embedding, owner_id, note_config)
+        chunk_results = semantic_search_chunks(db, query_embedding, owner_id, chunk_config)
+        fulltext_results = fulltext_search_notes(db, query, owner_id, limit=10)
+        title_results = _title_search(db, query, owner_id)
 
     image_results = []
     if include_images:
@@ -213,16 +298,19 @@ def nexus_vector_search(
                 GraphTraversalConfig(max_hops=2, max_results_per_hop=3)
             )
 
-    # Build result lists with title as its own method (weight=1.0 for 'direct')
-    config = get_dynamic_config(query, RankingConfig(max_results=max_sources))
-    result_lists = {
-        'semantic': semantic_results,
-        'chunk_semantic': chunk_results,
-        'wikilink': graph_results,
-        'fulltext': fulltext_results,
-    }
-    if title_results:
-        result_lists['direct'] = title_results
+    if fused is not None:
+        # Semantic, chunk, fulltext and title scores are already in `fused`
+        result_lists = {'wikilink': graph_results}
+    else:
+        # Build result lists with title as its own method (weight=1.0 for 'direct')
+        result_lists = {
+            'semantic': semantic_results,
+            'chunk_semantic': chunk_results,
+            'wikilink': graph_results,
+            'fulltext': fulltext_results,
+        }
+        if title_results:
+            result_lists['direct'] = title_results
     for img in image_results:
         method = img.retrieval_method
         if method not in result_lists:
@@ -230,16 +318,21 @@ def nexus_vector_search(
         result_lists[method].append(img)
     result_lists = {k: v for k, v in result_lists.items() if v}
 
-    ranked = reciprocal_rank_fusion(result_lists, config)
+    ranked = reciprocal_rank_fusion(result_lists, config, prefused=fused)
     ranked = deduplicate_results(ranked)
     ranked = ensure_image_slots(ranked, config)
     ranked = enforce_source_diversity(ranked)
 
+    if fused is not None:
+        counts = f"hybrid={len(fused)}"
+    else:
+        counts = (
+            f"sem={len(semantic_results)}, chunk={len(chunk_results)}, "
+            f"ft={len(fulltext_results)}, title={len(title_results)}"
+        )
     logger.info(
         f"NEXUS vector search: {len(ranked)} results "
-        f"(sem={len(semantic_results)}, chunk={len(chunk_results)}, "
-        f"ft={len(fulltext_results)}, title={len(title_results)}, "
-        f"img={len(image_results)}, graph={len(graph_results)})"
+        f"({counts}, img={len(image_results)}, graph={len(graph_results)})"
     )
 
     return ranked
@@ -10,6 +10,7 @@ from typing import List, Dict
 from sqlalchemy.orm import Session
 
 from core import config
+from core.ollama_transport import get_ollama_transport
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +22,7 @@ RAG_TIMEOUT = 60
 def call_ollama(prompt: str, system_prompt: str, max_tokens: int = 256) -> str:
     """Call Ollama API for text generation."""
     try:
-        response = requests.post(
+        response = get_ollama_transport().post(
             f"{OLLAMA_HOST}/api/generate",
             json={
                 "model": RAG_MODEL,
@@ -12,6 +12,6 @@ For now, we re-export to avoid circular imports and model conflicts.
 # Re-export from main models
 # This allows features/notes to be self-contained in its API
 # while avoiding SQLAlchemy table definition conflicts
-from models import Note, NoteTag, NoteChunk
+from models import Note, NoteTag, NoteLink, NoteChunk
 
-__all__ = ["Note", "NoteTag", "NoteChunk"]
+__all__ = ["Note", "NoteTag", "NoteLink", "NoteChunk"]
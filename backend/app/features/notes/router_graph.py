@@ -5,9 +5,9 @@ Endpoints for notes with graph relationships: wikilinks, backlinks, etc.
 """
 
 import logging
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from core.database import get_db
 from core.auth import get_current_active_user
@@ -18,6 +18,8 @@ from slowapi.util import get_remote_address
 from features.notes import service
 from features.notes.models import Note
 from features.graph import service as graph_service
+from features.graph.batch_helpers import batch_resolve_wikilinks
+from features.graph.note_links import get_backlink_ids
 import models
 import schemas as main_schemas
 
@@ -27,47 +29,60 @@ limiter = Limiter(key_func=get_remote_address)
 router = APIRouter(tags=["Notes"])
 
 
+def _enhanced_note(note: Note, linked_note_ids: List[int], backlink_ids: List[int]) -> dict:
+    """NoteEnhanced payload for a note and its resolved links."""
+    return {
+        "id": note.id,
+        "title": note.title,
+        "content": note.content,
+        "html_content": note.html_content,
+        "slug": note.slug,
+        "created_at": note.created_at,
+        "updated_at": note.updated_at,
+        "owner_id": note.owner_id,
+        "tags": note.tags,
+        "linked_notes": linked_note_ids,
+        "backlinks": backlink_ids,
+        "image_ids": [img.id for img in note.images],
+        "is_favorite": note.is_favorite,
+        "is_reviewed": note.is_reviewed,
+        "is_trashed": note.is_trashed,
+        "is_standalone": getattr(note, 'is_standalone', True),
+        "source": getattr(note, 'source', 'manual'),
+    }
+
+
 @router.get("/notes-enhanced/", response_model=List[main_schemas.NoteEnhanced])
 async def get_notes_enhanced(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get all notes with enhanced graph data (tags, wikilinks, backlinks, images)."""
-    logger.debug(f"Fetching enhanced notes for user {current_user.username}, skip={skip}, limit={limit}")
+    """
+    Get notes with enhanced graph data (tags, wikilinks, backlinks, images).
+
+    Newest first. Pass the X-Next-Cursor header of a full page as `cursor`
+    to fetch the next one; `skip` is still accepted for offset paging.
+    A page costs a fixed number of queries regardless of its size.
+    """
+    logger.debug(f"Fetching enhanced notes for user {current_user.username}, skip={skip}, limit={limit}, cursor={cursor}")
 
     try:
-        notes = db.query(Note).filter(
-            Note.owner_id == current_user.id,
-            Note.is_trashed == False
-        ).order_by(Note.created_at.desc()).offset(skip).limit(limit).all()
-
-        result = []
-        for note in notes:
-            linked_note_ids = graph_service.resolve_wikilinks(db, note.id, note.content, current_user.id)
-            backlink_ids = graph_service.get_backlinks(db, note.id, current_user.id)
-            image_ids = [img.id for img in note.images]
-
-            result.append({
-                "id": note.id,
-                "title": note.title,
-                "content": note.content,
-                "html_content": note.html_content,
-                "slug": note.slug,
-                "created_at": note.created_at,
-                "updated_at": note.updated_at,
-                "owner_id": note.owner_id,
-                "tags": note.tags,
-                "linked_notes": linked_note_ids,
-                "backlinks": backlink_ids,
-                "image_ids": image_ids,
-                "is_favorite": note.is_favorite,
-                "is_reviewed": note.is_reviewed,
-                "is_trashed": note.is_trashed,
-                "is_standalone": getattr(note, 'is_standalone', True),
-                "source": getattr(note, 'source', 'manual'),
-            })
+        after = service.decode_note_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise exceptions.ValidationException(str(e))
+
+    try:
+        notes = service.get_notes_page(db, current_user.id, limit=limit, skip=skip, after=after)
+        linked = batch_resolve_wikilinks(db, notes, current_user.id)
+        backlinks = get_backlink_ids(db, [n.id for n in notes], current_user.id)
+
+        result = [_enhanced_note(n, linked[n.id], backlinks[n.id]) for n in notes]
+        if len(notes) == limit:
+            response.headers["X-Next-Cursor"] = service.encode_note_cursor(notes[-1])
 
         logger.info(f"Retrieved {len(result)} enhanced notes for user {current_user.username}")
         return result
@@ -97,27 +112,8 @@ async def get_note_enhanced(
 
         linked_note_ids = graph_service.resolve_wikilinks(db, note.id, note.content, current_user.id)
         backlink_ids = graph_service.get_backlinks(db, note.id, current_user.id)
-        image_ids = [img.id for img in note.images]
-
-        return {
-            "id": note.id,
-            "title": note.title,
-            "content": note.content,
-            "html_content": note.html_content,
-            "slug": note.slug,
-            "created_at": note.created_at,
-            "updated_at": note.updated_at,
-            "owner_id": note.owner_id,
-            "tags": note.tags,
-            "linked_notes": linked_note_ids,
-            "backlinks": backlink_ids,
-            "image_ids": image_ids,
-            "is_favorite": note.is_favorite,
-            "is_reviewed": note.is_reviewed,
-            "is_trashed": note.is_trashed,
-            "is_standalone": getattr(note, 'is_standalone', True),
-            "source": getattr(note, 'source', 'manual'),
-        }
+
+        return _enhanced_note(note, linked_note_ids, backlink_ids)
 
     except exceptions.AppException:
         raise
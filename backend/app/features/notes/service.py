@@ -4,10 +4,13 @@ Notes Feature - Business Logic / Service Layer
 CRUD operations and business logic for notes.
 """
 
+import base64
 import logging
+import re
 from datetime import datetime, timezone
 from typing import Optional, List, Tuple
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import or_, tuple_
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.exc import IntegrityError
 from fastapi import HTTPException
 
@@ -17,6 +20,42 @@ from wikilink_parser import create_slug, extract_hashtags
 logger = logging.getLogger(__name__)
 
 
+_NUMERIC_SUFFIX = re.compile(r"[0-9]+")
+
+
+def next_free_slug(
+    db: Session, base_slug: str, owner_id: int, exclude_note_id: Optional[int] = None
+) -> str:
+    """
+    First free slug among base_slug, base_slug-2, base_slug-3, ...
+
+    One query fetches the owner's slugs that could collide (the base slug
+    and every base_slug-* slug, served by the slug trigram index); the
+    lowest unused suffix is picked from that set.
+    """
+    escaped = base_slug.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    query = db.query(Note.slug).filter(
+        Note.owner_id == owner_id,
+        or_(Note.slug == base_slug, Note.slug.like(f"{escaped}-%", escape="\\")),
+    )
+    if exclude_note_id is not None:
+        query = query.filter(Note.id != exclude_note_id)
+    taken = {slug for (slug,) in query}
+
+    if base_slug not in taken:
+        return base_slug
+
+    prefix = f"{base_slug}-"
+    suffixes = {
+        int(slug[len(prefix):]) for slug in taken
+        if _NUMERIC_SUFFIX.fullmatch(slug[len(prefix):])
+    }
+    counter = 2
+    while counter in suffixes:
+        counter += 1
+    return f"{prefix}{counter}"
+
+
 def get_note(db: Session, note_id: int) -> Optional[Note]:
     """Get a note by ID with eager loading of relationships."""
     return db.query(Note).options(
@@ -39,6 +78,72 @@ def get_notes_by_user(db: Session, owner_id: int, skip: int = 0, limit: int = 10
     ).order_by(Note.created_at.desc()).offset(skip).limit(limit).all()
 
 
+def encode_note_cursor(note: Note) -> str:
+    """Opaque keyset cursor for the position right after `note`."""
+    raw = f"{note.created_at.isoformat()}|{note.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_note_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor from encode_note_cursor. Raises ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, note_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(note_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+def get_notes_page(
+    db: Session,
+    owner_id: int,
+    limit: int = 100,
+    skip: int = 0,
+    after: Optional[Tuple[datetime, int]] = None,
+) -> List[Note]:
+    """
+    One page of a user's non-trashed notes, newest first, ordered by (created_at, id).
+
+    With `after` (a decoded cursor) the page starts right after that note
+    (keyset pagination, stable under inserts and cheap at any depth) and
+    `skip` is ignored. Tags and images are loaded with one extra query each.
+    """
+    query = db.query(Note).options(
+        selectinload(Note.tags),
+        selectinload(Note.images),
+    ).filter(
+        Note.owner_id == owner_id,
+        Note.is_trashed == False
+    )
+
+    if after:
+        query = query.filter(tuple_(Note.created_at, Note.id) < tuple_(*after))
+    query = query.order_by(Note.created_at.desc(), Note.id.desc())
+    if skip and not after:
+        query = query.offset(skip)
+
+    return query.limit(limit).all()
+
+
+def refresh_note_links(db: Session, note: Note, incoming: bool = True) -> None:
+    """
+    Update note_links for a committed note and commit.
+
+    Syncs the note's outgoing wikilinks and, if `incoming`, re-resolves notes
+    that may link to it. Failures are logged; the note write itself stands.
+    """
+    from features.graph.note_links import sync_note_links, relink_incoming
+
+    try:
+        sync_note_links(db, [note], note.owner_id)
+        if incoming:
+            relink_incoming(db, note)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to update note_links for note {note.id}: {e}", exc_info=True)
+
+
 def create_note(
     db: Session,
     title: str,
@@ -67,17 +172,7 @@ def create_note(
     from crud import get_or_create_tag
 
     # Generate unique slug
-    base_slug = create_slug(title)
-    slug = base_slug
-    counter = 2
-
-    # Check for existing slug and append suffix if needed
-    while db.query(Note).filter(
-        Note.slug == slug,
-        Note.owner_id == owner_id
-    ).first() is not None:
-        slug = f"{base_slug}-{counter}"
-        counter += 1
+    slug = next_free_slug(db, create_slug(title), owner_id)
 
     db_note = Note(
         title=title,
@@ -121,6 +216,12 @@ def create_note(
                 db.rollback()
                 logger.exception(f"Error committing tags for note {db_note.id}: {e}")
 
+    # Record wikilinks from and to the new note
+    refresh_note_links(db, db_note)
+
+    from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+    invalidate_graph_snapshot(owner_id, [f"note-{db_note.id}"])
+
     # Trigger embedding generation (async, non-blocking)
     try:
         generate_note_embedding_task.delay(db_note.id)
@@ -173,25 +274,14 @@ def update_note(
 
     # Track if content changed (for embedding regeneration)
     content_changed = False
+    title_changed = False
 
     if title is not None and title != note.title:
         note.title = title
+        title_changed = True
 
-        # Generate unique slug for the new title
-        base_slug = create_slug(title)
-        slug = base_slug
-        counter = 2
-
-        # Check for existing slug (excluding current note)
-        while db.query(Note).filter(
-            Note.slug == slug,
-            Note.owner_id == note.owner_id,
-            Note.id != note_id
-        ).first() is not None:
-            slug = f"{base_slug}-{counter}"
-            counter += 1
-
-        note.slug = slug
+        # Generate unique slug for the new title (excluding current note)
+        note.slug = next_free_slug(db, create_slug(title), note.owner_id, exclude_note_id=note_id)
         content_changed = True  # Title change affects embedding
 
     if content is not None:
@@ -224,6 +314,13 @@ def update_note(
     note.html_content = html_content
 
     try:
+        # Keep note_links in the same transaction as the content/title change
+        if content_changed:
+            from features.graph.note_links import sync_note_links, relink_incoming
+            db.flush()
+            sync_note_links(db, [note], note.owner_id)
+            if title_changed:
+                relink_incoming(db, note)
         db.commit()
         db.refresh(note)
     except Exception as e:
@@ -231,6 +328,10 @@ def update_note(
         logger.exception(f"Error updating note {note_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to update note")
 
+    # A rename can re-point other notes' links, so it needs a full graph rebuild
+    from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+    invalidate_graph_snapshot(note.owner_id, None if title_changed else [f"note-{note_id}"])
+
     # Trigger embedding regeneration if content changed (async, non-blocking)
     if content_changed:
         try:
@@ -269,15 +370,20 @@ def delete_note(db: Session, note_id: int, owner_id: Optional[int] = None) -> bo
     if owner_id and note.owner_id != owner_id:
         return False
 
+    from features.graph.note_links import clear_note_links
+    clear_note_links(db, note_id)
     db.delete(note)
     try:
         db.commit()
-        return True
     except Exception as e:
         db.rollback()
         logger.exception(f"Error deleting note {note_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to delete note")
 
+    from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+    invalidate_graph_snapshot(note.owner_id, [f"note-{note_id}"])
+    return True
+
 
 def add_image_to_note(db: Session, image_id: int, note_id: int):
     """Link an image to a note."""
@@ -288,7 +394,6 @@ def add_image_to_note(db: Session, image_id: int, note_id: int):
     try:
         db.commit()
         db.refresh(db_relation)
-        return db_relation
     except IntegrityError as e:
         db.rollback()
         logger.error(f"Integrity error linking image {image_id} to note {note_id}: {e}")
@@ -298,6 +403,12 @@ def add_image_to_note(db: Session, image_id: int, note_id: int):
         logger.exception(f"Error linking image {image_id} to note {note_id}: {e}")
         raise HTTPException(status_code=500, detail="Failed to link image to note")
 
+    note = db.query(Note.owner_id).filter(Note.id == note_id).first()
+    if note:
+        from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+        invalidate_graph_snapshot(note.owner_id, [f"note-{note_id}"])
+    return db_relation
+
 
 # ============================================
 # Favorites and Trash Operations
@@ -328,15 +439,22 @@ def move_to_trash(db: Session, note_id: int, owner_id: int) -> Optional[Note]:
 
     note.is_trashed = True
     note.trashed_at = datetime.now(timezone.utc)
+
+    # Trashed notes drop out of the link graph in both directions
+    from features.graph.note_links import clear_note_links
+    clear_note_links(db, note_id)
     try:
         db.commit()
         db.refresh(note)
-        return note
     except Exception as e:
         db.rollback()
         logger.exception(f"Error moving note {note_id} to trash: {e}")
         raise HTTPException(status_code=500, detail="Failed to move note to trash")
 
+    from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+    invalidate_graph_snapshot(owner_id, [f"note-{note_id}"])
+    return note
+
 
 def restore_from_trash(db: Session, note_id: int, owner_id: int) -> Optional[Note]:
     """Restore a note from trash."""
@@ -349,12 +467,17 @@ def restore_from_trash(db: Session, note_id: int, owner_id: int) -> Optional[Not
     try:
         db.commit()
         db.refresh(note)
-        return note
     except Exception as e:
         db.rollback()
         logger.exception(f"Error restoring note {note_id} from trash: {e}")
         raise HTTPException(status_code=500, detail="Failed to restore note")
 
+    refresh_note_links(db, note)
+
+    from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+    invalidate_graph_snapshot(owner_id, [f"note-{note_id}"])
+    return note
+
 
 def get_favorites(db: Session, owner_id: int, skip: int = 0, limit: int = 100) -> List[Note]:
     """Get all favorite notes for a user with eager loading."""
@@ -390,6 +513,8 @@ def permanent_delete(db: Session, note_id: int, owner_id: int) -> bool:
     if not note:
         return False
 
+    from features.graph.note_links import clear_note_links
+    clear_note_links(db, note_id)
     db.delete(note)
     try:
         db.commit()
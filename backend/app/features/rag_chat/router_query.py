@@ -9,6 +9,7 @@ import logging
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from slowapi import Limiter
@@ -35,7 +36,7 @@ from features.rag_chat.services import (
     detect_query_type,
     get_query_specific_instructions,
 )
-from features.rag_chat.services.ollama_client import call_ollama_generate, call_ollama_stream
+from features.rag_chat.services.ollama_client import call_ollama_generate, call_ollama_stream_async
 from features.rag_chat.services.title_generator import generate_conversation_title
 from features.rag_chat.services.query_executor import (
     QueryExecutionConfig,
@@ -247,9 +248,10 @@ async def rag_query_stream(
     """
     Execute a streaming RAG query with SSE.
 
-    Phase 1 (sync): Runs the full execute_query pipeline
+    Phase 1 (worker thread): Runs the full execute_query pipeline
     (intent detection, cache, title search, retrieval, ranking).
-    Phase 2 (SSE): Streams the LLM generation token-by-token.
+    Phase 2 (SSE): Streams the LLM generation token-by-token on the
+    async provider client, so other requests keep being served.
 
     **Rate limit:** 20 requests/minute
     """
@@ -276,7 +278,7 @@ async def rag_query_stream(
         db.refresh(conversation)
         conversation_id = conversation.id
 
-    # Phase 1: Retrieval (sync) - reuses full execute_query pipeline
+    # Phase 1: Retrieval (blocking, off the event loop) - reuses full execute_query pipeline
     try:
         config = QueryExecutionConfig(
             min_similarity=body.min_similarity,
@@ -284,7 +286,9 @@ async def rag_query_stream(
             include_images=body.include_images,
             include_graph=body.include_graph
         )
-        result = execute_query(db, query, user_id, config, body.conversation_id)
+        result = await run_in_threadpool(
+            execute_query, db, query, user_id, config, body.conversation_id
+        )
     except Exception as e:
         logger.exception(f"Streaming RAG retrieval failed: {e}")
         async def error_stream():
@@ -319,7 +323,8 @@ async def rag_query_stream(
             # Emit source count before tokens so frontend can show indicator
             yield f"data: {json.dumps({'type': 'sources_found', 'sources_found': source_count})}\n\n"
 
-            provider, user_model, provider_name = get_provider_for_user(db, user_id, "rag")
+            # Settings lookups and usage logging hit the database - keep them off the loop
+            provider, user_model, provider_name = await run_in_threadpool(get_provider_for_user, db, user_id, "rag")
             full_response = ""
             had_error = False
 
@@ -330,7 +335,7 @@ async def rag_query_stream(
                 ]
                 try:
                     stream_in, stream_out = 0, 0
-                    for chunk in provider.stream(
+                    async for chunk in provider.astream(
                         messages=messages, model=user_model, temperature=0.3, max_tokens=2048,
                     ):
                         if chunk.is_error:
@@ -347,11 +352,13 @@ async def rag_query_stream(
                     if not had_error:
                         from core.llm.base import ProviderType as PT
                         ptype = {"anthropic": PT.ANTHROPIC, "openai": PT.OPENAI, "custom": PT.CUSTOM}.get(provider_name, PT.OLLAMA)
-                        log_stream_usage(db, user_id, ptype, user_model, stream_in, stream_out, "rag")
+                        await run_in_threadpool(
+                            log_stream_usage, db, user_id, ptype, user_model, stream_in, stream_out, "rag"
+                        )
                 except Exception as cloud_err:
                     logger.warning(f"Cloud stream failed, falling back to Ollama: {cloud_err}")
-                    user_model = get_effective_rag_model(db, user_id)
-                    for chunk in call_ollama_stream(user_message, system_prompt, model=user_model):
+                    user_model = await run_in_threadpool(get_effective_rag_model, db, user_id)
+                    async for chunk in call_ollama_stream_async(user_message, system_prompt, model=user_model):
                         if chunk.is_error:
                             had_error = True
                             yield f"data: {json.dumps({'type': 'error', 'content': chunk.content, 'error_type': chunk.error_type})}\n\n"
@@ -362,7 +369,7 @@ async def rag_query_stream(
                         if chunk.done:
                             break
             else:
-                for chunk in call_ollama_stream(user_message, system_prompt, model=user_model):
+                async for chunk in call_ollama_stream_async(user_message, system_prompt, model=user_model):
                     if chunk.is_error:
                         had_error = True
                         yield f"data: {json.dumps({'type': 'error', 'content': chunk.content, 'error_type': chunk.error_type})}\n\n"
@@ -391,8 +398,9 @@ async def rag_query_stream(
             yield f"data: {json.dumps({'type': 'citations', 'citations': citations, 'used_indices': used_indices})}\n\n"
 
             # Save conversation
-            message_id = _save_streaming_conversation(
-                db, conversation, query, full_response, citations, confidence
+            message_id = await run_in_threadpool(
+                _save_streaming_conversation,
+                db, conversation, query, full_response, citations, confidence,
             )
 
             metadata = {
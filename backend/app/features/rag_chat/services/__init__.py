@@ -10,6 +10,7 @@ This module provides citation-aware, explainable AI chat with:
 Components:
 - chunking: Paragraph-based text chunking for notes and images
 - retrieval: Semantic and full-text retrieval with pgvector
+- hybrid_search: Semantic, full-text and title search fused in one SQL statement
 - image_retrieval: Image-based context retrieval
 - graph_retrieval: Multi-hop wikilink graph traversal
 - ranking: Reciprocal Rank Fusion (RRF) for result merging
@@ -33,10 +34,18 @@ from .retrieval import (
     semantic_search_images,
     fulltext_search_notes,
     combined_semantic_search,
+    hydrate_note_content,
     get_note_by_id,
     get_image_by_id,
 )
 
+# Hybrid Search
+from .hybrid_search import (
+    HybridSearchConfig,
+    hybrid_search,
+    results_for_method,
+)
+
 # Image Retrieval
 from .image_retrieval import (
     get_images_by_tags,
@@ -107,6 +116,7 @@ from .intent_detector import (
 from .ollama_client import (
     call_ollama_generate,
     call_ollama_stream,
+    call_ollama_stream_async,
     check_ollama_health,
 )
 
@@ -137,9 +147,15 @@ __all__ = [
     "semantic_search_images",
     "fulltext_search_notes",
     "combined_semantic_search",
+    "hydrate_note_content",
     "get_note_by_id",
     "get_image_by_id",
 
+    # Hybrid Search
+    "HybridSearchConfig",
+    "hybrid_search",
+    "results_for_method",
+
     # Image Retrieval
     "get_images_by_tags",
     "get_images_linked_to_notes",
@@ -197,6 +213,7 @@ __all__ = [
     # Ollama Client
     "call_ollama_generate",
     "call_ollama_stream",
+    "call_ollama_stream_async",
     "check_ollama_health",
 
     # Title Generator
@@ -2,19 +2,17 @@
 Graph-based retrieval module for RAG system.
 
 Implements multi-hop traversal through wikilink connections:
-- BFS expansion from seed notes
+- Recursive CTE expansion from seed notes over note_links
 - Relevance decay with hop distance
 - Relationship chain tracking for explainability
 """
 
 import logging
-from collections import deque
 from dataclasses import dataclass, field
-from typing import List, Dict, Set, Optional, Any
+from typing import List, Dict, Optional, Any
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from models import Note
 from .retrieval import RetrievalResult
 
 logger = logging.getLogger(__name__)
@@ -37,6 +35,7 @@ class GraphTraversalConfig:
     max_results_per_hop: int = 5
     relevance_decay: float = 0.5  # Multiply by this each hop
     include_backlinks: bool = True
+    snippet_chars: Optional[int] = None  # Content prefix only; hydrate after ranking
 
 
 def get_outgoing_wikilinks(db: Session, note_id: int, owner_id: int) -> List[Dict[str, Any]]:
@@ -137,6 +136,72 @@ def get_incoming_backlinks(db: Session, note_id: int, owner_id: int) -> List[Dic
         return []
 
 
+# Walks note_links from the seeds in one statement. Each step follows
+# outgoing links and (optionally) backlinks, capped per node by :fanout, and
+# never revisits a note already on its path. Each reached note keeps its
+# shortest path (ties go to the seed listed first in :seed_ids), and each
+# seed keeps at most :per_seed_limit notes per hop (path[1] is the seed).
+GRAPH_WALK_SQL = """
+    WITH RECURSIVE walk(note_id, hop, path, link_types) AS (
+        SELECT n.id, 0, ARRAY[n.id], ARRAY[]::text[]
+        FROM notes n
+        WHERE n.id = ANY(:seed_ids)
+          AND n.owner_id = :owner_id
+        UNION ALL
+        SELECT step.next_id, w.hop + 1, w.path || step.next_id, w.link_types || step.link_type
+        FROM walk w
+        CROSS JOIN LATERAL (
+            (SELECT l.target_note_id AS next_id, 'wikilink'::text AS link_type
+             FROM note_links l
+             WHERE l.source_note_id = w.note_id
+             ORDER BY l.target_note_id
+             LIMIT :fanout)
+            UNION ALL
+            (SELECT l.source_note_id, 'backlink'::text
+             FROM note_links l
+             WHERE l.target_note_id = w.note_id
+               AND :include_backlinks
+             ORDER BY l.source_note_id
+             LIMIT :fanout)
+        ) AS step
+        WHERE w.hop < :max_hops
+          AND step.next_id <> ALL(w.path)
+    ),
+    nearest AS (
+        SELECT DISTINCT ON (w.note_id) w.note_id, w.hop, w.path, w.link_types
+        FROM walk w
+        JOIN notes n ON n.id = w.note_id AND n.owner_id = :owner_id
+        WHERE w.hop > 0
+          AND w.note_id <> ALL(:seed_ids)
+        ORDER BY w.note_id, w.hop, array_position(:seed_ids, w.path[1]), w.path
+    ),
+    ranked AS (
+        SELECT nearest.*,
+               ROW_NUMBER() OVER (PARTITION BY hop, path[1] ORDER BY path) AS rank_in_hop
+        FROM nearest
+    )
+    SELECT note_id, hop, path, link_types
+    FROM ranked
+    WHERE rank_in_hop <= :per_seed_limit
+    ORDER BY hop, array_position(:seed_ids, path[1]), path
+"""
+
+
+def _build_chain(path: List[int], link_types: List[str], titles: Dict[int, str]) -> List[RelationshipLink]:
+    """Turn a walked path into relationship links (backlinks point at the earlier note)."""
+    chain = []
+    for current_id, next_id, link_type in zip(path, path[1:], link_types):
+        from_id, to_id = (current_id, next_id) if link_type == 'wikilink' else (next_id, current_id)
+        chain.append(RelationshipLink(
+            link_type=link_type,
+            from_note_id=from_id,
+            to_note_id=to_id,
+            from_title=titles.get(from_id) or 'Untitled',
+            to_title=titles.get(to_id) or 'Untitled'
+        ))
+    return chain
+
+
 def graph_traversal(
     db: Session,
     seed_note_ids: List[int],
@@ -144,13 +209,18 @@ def graph_traversal(
     config: GraphTraversalConfig = None
 ) -> List[RetrievalResult]:
     """
-    Perform BFS traversal from seed notes through wikilink graph.
+    Traverse the wikilink graph outward from seed notes.
 
     Strategy:
     1. Start from seed notes (semantic matches)
-    2. BFS through outgoing wikilinks and incoming backlinks
-    3. Track relationship chains for explainability
-    4. Apply relevance decay with hop distance
+    2. Walk outgoing wikilinks and incoming backlinks in a single recursive
+       CTE over note_links (ids only), keeping each note's shortest path
+    3. Keep at most max_results_per_hop notes per seed at each hop; a note
+       reached from several seeds at the same hop counts for the seed
+       listed first (seeds arrive in semantic rank order)
+    4. Fetch titles for the path notes, and content (or a snippet, see
+       snippet_chars) only for the notes kept
+    5. Apply relevance decay with hop distance
 
     Args:
         db: Database session
@@ -167,81 +237,59 @@ def graph_traversal(
     if not seed_note_ids:
         return []
 
-    results: List[RetrievalResult] = []
-    visited: Set[int] = set(seed_note_ids)  # Don't revisit seed notes
-
-    # BFS queue: (note_id, hop_count, relationship_chain, from_note_title)
-    queue = deque()
-
-    # Initialize queue with neighbors of seed notes
-    for seed_id in seed_note_ids:
-        seed_note = db.query(Note).filter(
-            Note.id == seed_id,
-            Note.owner_id == owner_id
-        ).first()
-
-        if not seed_note:
-            continue
-
-        seed_title = seed_note.title or 'Untitled'
-
-        # Add outgoing wikilinks
-        outgoing = get_outgoing_wikilinks(db, seed_id, owner_id)
-        for linked in outgoing:
-            if linked['id'] not in visited:
-                chain = [RelationshipLink(
-                    link_type='wikilink',
-                    from_note_id=seed_id,
-                    to_note_id=linked['id'],
-                    from_title=seed_title,
-                    to_title=linked['title'] or 'Untitled'
-                )]
-                queue.append((linked['id'], 1, chain, seed_title))
-
-        # Add incoming backlinks
-        if config.include_backlinks:
-            incoming = get_incoming_backlinks(db, seed_id, owner_id)
-            for linked in incoming:
-                if linked['id'] not in visited:
-                    chain = [RelationshipLink(
-                        link_type='backlink',
-                        from_note_id=linked['id'],
-                        to_note_id=seed_id,
-                        from_title=linked['title'] or 'Untitled',
-                        to_title=seed_title
-                    )]
-                    queue.append((linked['id'], 1, chain, seed_title))
-
-    # BFS traversal
-    hop_counts = {1: 0, 2: 0}  # Track results per hop level
-
-    while queue:
-        note_id, hop_count, chain, _ = queue.popleft()
-
-        # Check limits
-        if hop_count > config.max_hops:
-            continue
-
-        if hop_counts.get(hop_count, 0) >= config.max_results_per_hop * len(seed_note_ids):
-            continue
+    # Links followed per note; headroom for neighbours already reached elsewhere
+    fanout = config.max_results_per_hop * len(seed_note_ids)
 
-        if note_id in visited:
-            continue
+    try:
+        walked = db.execute(text(GRAPH_WALK_SQL), {
+            "seed_ids": list(seed_note_ids),
+            "owner_id": owner_id,
+            "max_hops": config.max_hops,
+            "include_backlinks": config.include_backlinks,
+            "fanout": fanout,
+            "per_seed_limit": config.max_results_per_hop,
+        }).fetchall()
+
+        if not walked:
+            return []
+
+        hit_ids = [row.note_id for row in walked]
+        content = "LEFT(n.content, :snippet_chars)" if config.snippet_chars else "n.content"
+        path_ids = {note_id for row in walked for note_id in row.path}
+        notes = {
+            row.id: row
+            for row in db.execute(text(f"""
+                SELECT
+                    n.id,
+                    n.title,
+                    CASE WHEN n.id = ANY(:hit_ids) THEN {content} END AS content
+                FROM notes n
+                WHERE n.id = ANY(:note_ids)
+                  AND n.owner_id = :owner_id
+            """), {
+                "hit_ids": hit_ids,
+                "note_ids": list(path_ids),
+                "owner_id": owner_id,
+                "snippet_chars": config.snippet_chars
+            })
+        }
 
-        visited.add(note_id)
+    except Exception as e:
+        logger.error(f"Error during graph traversal: {e}")
+        # Rollback to clean up failed transaction state
+        db.rollback()
+        return []
 
-        # Fetch the note
-        note = db.query(Note).filter(
-            Note.id == note_id,
-            Note.owner_id == owner_id
-        ).first()
+    titles = {note_id: row.title for note_id, row in notes.items()}
+    results: List[RetrievalResult] = []
+    hop_counts: Dict[int, int] = {}
 
-        if not note:
+    for row in walked:
+        note = notes.get(row.note_id)
+        if note is None:
             continue
 
-        # Calculate relevance based on hop distance
-        # hop 1: 0.5, hop 2: 0.25
-        relevance = config.relevance_decay ** hop_count
+        chain = _build_chain(row.path, row.link_types, titles)
 
         # Convert chain to serializable format
         chain_data = [
@@ -260,47 +308,17 @@ def graph_traversal(
             source_id=note.id,
             title=note.title or 'Untitled',
             content=note.content or '',
-            similarity=relevance,
+            # hop 1: 0.5, hop 2: 0.25
+            similarity=config.relevance_decay ** row.hop,
             retrieval_method='wikilink',
             metadata={
-                'hop_count': hop_count,
+                'hop_count': row.hop,
                 'relationship_chain': chain_data,
-                'full_note': True
+                'full_note': True,
+                'snippet': bool(config.snippet_chars)
             }
         ))
-
-        hop_counts[hop_count] = hop_counts.get(hop_count, 0) + 1
-
-        # Add neighbors for next hop (if within limit)
-        if hop_count < config.max_hops:
-            note_title = note.title or 'Untitled'
-
-            # Outgoing wikilinks
-            outgoing = get_outgoing_wikilinks(db, note_id, owner_id)
-            for linked in outgoing:
-                if linked['id'] not in visited:
-                    new_chain = chain + [RelationshipLink(
-                        link_type='wikilink',
-                        from_note_id=note_id,
-                        to_note_id=linked['id'],
-                        from_title=note_title,
-                        to_title=linked['title'] or 'Untitled'
-                    )]
-                    queue.append((linked['id'], hop_count + 1, new_chain, note_title))
-
-            # Incoming backlinks
-            if config.include_backlinks:
-                incoming = get_incoming_backlinks(db, note_id, owner_id)
-                for linked in incoming:
-                    if linked['id'] not in visited:
-                        new_chain = chain + [RelationshipLink(
-                            link_type='backlink',
-                            from_note_id=linked['id'],
-                            to_note_id=note_id,
-                            from_title=linked['title'] or 'Untitled',
-                            to_title=note_title
-                        )]
-                        queue.append((linked['id'], hop_count + 1, new_chain, note_title))
+        hop_counts[row.hop] = hop_counts.get(row.hop, 0) + 1
 
     # Sort by relevance (higher hop count = lower relevance)
     results.sort(key=lambda x: x.similarity, reverse=True)
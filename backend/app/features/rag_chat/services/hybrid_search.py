@@ -0,0 +1,330 @@
+"""
+Single-statement hybrid search for RAG.
+
+Runs the note-level candidate generators (note embeddings, chunk
+embeddings, full-text and title match) as CTEs of one SQL statement and
+fuses them with Reciprocal Rank Fusion in the database, so a query costs
+one statement on one connection instead of four searches on four
+(hnsw.ef_search and the title similarity threshold are still set first).
+
+The scoring mirrors the Python pipeline: each generator ranks its own
+candidates, contributes weight / (rrf_k + rank) per source, and the best
+hit (highest similarity) decides the retrieval method reported for the
+source. The fused rows come back as RankedResults that
+reciprocal_rank_fusion(prefused=...) can extend with image and graph
+results.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from core.vector_index import to_vector_literal, apply_ann_search_params
+from .retrieval import RetrievalResult, _extract_search_terms
+from .ranking import RankingConfig, RankedResult
+
+logger = logging.getLogger(__name__)
+
+# RRF method name -> RetrievalResult.retrieval_method of the per-method searches
+RETRIEVAL_METHODS = {
+    'semantic': 'semantic',
+    'chunk_semantic': 'semantic',
+    'fulltext': 'fulltext',
+    'direct': 'direct',
+}
+
+TITLE_EXACT_SIMILARITY = 0.95
+TITLE_TOKEN_SIMILARITY = 0.85
+
+
+@dataclass
+class HybridSearchConfig:
+    """Configuration for hybrid search."""
+    note_min_similarity: float = 0.5
+    chunk_min_similarity: float = 0.5
+    max_results: int = 10  # Candidates per vector generator
+    fulltext_limit: int = 10
+    title_limit: int = 5
+    chunk_boost: float = 1.1
+    snippet_chars: Optional[int] = None  # Note content prefix only; hydrate after ranking
+    top_k: int = 20  # Fused rows returned
+
+
+def _title_candidates(query: str, params: dict) -> str:
+    """
+    SELECT for the title CTE, one UNION ALL branch per tier.
+
+    Adds its bind parameters to `params`. Rows carry their tier so the
+    caller can keep only the first tier that matched, like _title_search,
+    and use the same trigram conditions and word-similarity score.
+    """
+    from features.nexus.services.vector_search import (
+        _title_condition,
+        _title_score,
+        _title_search_terms,
+    )
+
+    exact_strings, tokens = _title_search_terms(query)
+    base = """
+            SELECT id, {tier} AS tier, {exact} AS exact, {score} AS score,
+                   LENGTH(title) AS title_length, {similarity} AS similarity
+            FROM notes
+            WHERE owner_id = :owner_id AND is_trashed = false
+              AND LENGTH(TRIM(COALESCE(content, ''))) > 10
+              AND {where}"""
+
+    branches = []
+    for tier, search_str in enumerate(exact_strings):
+        key = f"title_exact_{tier}"
+        where = _title_condition(params, key, search_str)
+        branches.append(base.format(
+            tier=tier,
+            exact=f"CASE WHEN LOWER(title) = LOWER(:{key}) THEN 0 ELSE 1 END",
+            score=_title_score(key),
+            similarity=(
+                f"CASE WHEN title ILIKE :{key}_like THEN {TITLE_EXACT_SIMILARITY} "
+                f"ELSE {TITLE_EXACT_SIMILARITY} * {_title_score(key)} END"
+            ),
+            where=where,
+        ))
+
+    if tokens:
+        keys = [f"title_token_{i}" for i in range(len(tokens))]
+        where = " AND ".join(_title_condition(params, key, token) for key, token in zip(keys, tokens))
+        branches.append(base.format(
+            tier=len(exact_strings), exact=1,
+            score=" + ".join(_title_score(key) for key in keys),
+            similarity=TITLE_TOKEN_SIMILARITY,
+            where=where,
+        ))
+
+    if not branches:
+        return (
+            "SELECT NULL::integer AS id, 0 AS tier, 0 AS exact, 0.0 AS score, "
+            "0 AS title_length, 0.0 AS similarity WHERE false"
+        )
+    return "\n            UNION ALL".join(branches)
+
+
+def _build_statement(query: str, snippet_chars: Optional[int], params: dict) -> str:
+    """Assemble the hybrid statement; adds title parameters to `params`."""
+    note_content = "LEFT(n.content, :snippet_chars)" if snippet_chars else "n.content"
+
+    return f"""
+        WITH semantic AS (
+            SELECT id, 1 - distance AS similarity,
+                   ROW_NUMBER() OVER (ORDER BY distance, id) AS method_rank
+            FROM (
+                SELECT id, embedding <=> CAST(:query_embedding AS vector) AS distance
+                FROM notes
+                WHERE owner_id = :owner_id
+                  AND embedding IS NOT NULL
+                  AND is_trashed = false
+                  AND LENGTH(TRIM(COALESCE(content, ''))) > 10
+                ORDER BY embedding <=> CAST(:query_embedding AS vector)
+                LIMIT :max_results
+            ) nearest
+            WHERE 1 - distance >= :note_min_similarity
+        ),
+        chunks AS (
+            SELECT id, note_id, LEAST(1.0, (1 - distance) * :chunk_boost) AS similarity,
+                   ROW_NUMBER() OVER (ORDER BY distance, id) AS method_rank
+            FROM (
+                SELECT nc.id, nc.note_id,
+                       nc.embedding <=> CAST(:query_embedding AS vector) AS distance
+                FROM note_chunks nc
+                JOIN notes n ON nc.note_id = n.id
+                WHERE n.owner_id = :owner_id
+                  AND n.is_trashed = false
+                  AND nc.embedding IS NOT NULL
+                  AND LENGTH(TRIM(nc.content)) > 10
+                ORDER BY nc.embedding <=> CAST(:query_embedding AS vector)
+                LIMIT :max_results
+            ) nearest
+            WHERE 1 - distance >= :chunk_min_similarity
+        ),
+        fulltext AS (
+            SELECT id, LEAST(1.0, rank / 10.0 + 0.3) AS similarity,
+                   ROW_NUMBER() OVER (ORDER BY rank DESC, id) AS method_rank
+            FROM (
+                SELECT id, ts_rank(search_vector, query) AS rank
+                FROM notes, websearch_to_tsquery('english', :processed_query) AS query
+                WHERE owner_id = :owner_id
+                  AND is_trashed = false
+                  AND search_vector @@ query
+                ORDER BY rank DESC
+                LIMIT :fulltext_limit
+            ) matched
+        ),
+        title_candidates AS ({_title_candidates(query, params)}
+        ),
+        title_match AS (
+            SELECT id, similarity, method_rank
+            FROM (
+                SELECT id, similarity,
+                       ROW_NUMBER() OVER (ORDER BY exact, score DESC, title_length, id) AS method_rank
+                FROM title_candidates
+                WHERE tier = (SELECT MIN(tier) FROM title_candidates)
+            ) first_tier
+            WHERE method_rank <= :title_limit
+        ),
+        hits AS (
+            SELECT 'semantic' AS method, 'note' AS source_type, id AS source_id,
+                   similarity, :semantic_weight / (:rrf_k + method_rank) AS score
+            FROM semantic
+            UNION ALL
+            SELECT 'chunk_semantic', 'chunk', id,
+                   similarity, :chunk_weight / (:rrf_k + method_rank)
+            FROM chunks
+            UNION ALL
+            SELECT 'fulltext', 'note', id,
+                   similarity, :fulltext_weight / (:rrf_k + method_rank)
+            FROM fulltext
+            UNION ALL
+            SELECT 'direct', 'note', id,
+                   similarity, :direct_weight / (:rrf_k + method_rank)
+            FROM title_match
+        ),
+        fused AS (
+            SELECT source_type, source_id,
+                   SUM(score) AS rrf_score,
+                   MAX(similarity) AS similarity,
+                   (ARRAY_AGG(method ORDER BY similarity DESC))[1] AS best_method,
+                   ARRAY_AGG(method) AS methods,
+                   ARRAY_AGG(score) AS scores
+            FROM hits
+            GROUP BY source_type, source_id
+            ORDER BY rrf_score DESC, source_type, source_id
+            LIMIT :top_k
+        )
+        SELECT
+            f.source_type, f.source_id, f.rrf_score, f.similarity,
+            f.best_method, f.methods, f.scores,
+            COALESCE(n.title, cn.title) AS title,
+            CASE WHEN f.source_type = 'note' THEN {note_content} ELSE nc.content END AS content,
+            nc.note_id, nc.chunk_type, nc.char_start, nc.char_end
+        FROM fused f
+        LEFT JOIN notes n ON f.source_type = 'note' AND n.id = f.source_id
+        LEFT JOIN note_chunks nc ON f.source_type = 'chunk' AND nc.id = f.source_id
+        LEFT JOIN notes cn ON cn.id = nc.note_id
+        ORDER BY f.rrf_score DESC, f.source_type, f.source_id
+    """
+
+
+def _row_to_ranked(row, snippet: bool) -> RankedResult:
+    """Build a RankedResult from one fused row."""
+    method_scores = {m: float(s) for m, s in zip(row.methods, row.scores)}
+
+    if row.source_type == 'chunk':
+        metadata = {
+            'note_id': row.note_id,
+            'chunk_type': row.chunk_type,
+            'char_start': row.char_start,
+            'char_end': row.char_end,
+        }
+    else:
+        metadata = {'full_note': True, 'snippet': snippet}
+        if 'direct' in method_scores:
+            metadata['title_match'] = True
+
+    rrf_score = float(row.rrf_score)
+    return RankedResult(
+        result=RetrievalResult(
+            source_type=row.source_type,
+            source_id=row.source_id,
+            title=row.title or 'Untitled',
+            content=row.content or '',
+            similarity=float(row.similarity),
+            retrieval_method=RETRIEVAL_METHODS[row.best_method],
+            metadata=metadata,
+        ),
+        rrf_score=rrf_score,
+        method_scores=method_scores,
+        final_score=rrf_score,
+    )
+
+
+def hybrid_search(
+    db: Session,
+    query: str,
+    query_embedding: List[float],
+    owner_id: int,
+    config: HybridSearchConfig = None,
+    ranking_config: RankingConfig = None,
+) -> Optional[List[RankedResult]]:
+    """
+    Semantic, chunk, full-text and title search fused in one statement.
+
+    Args:
+        db: Database session
+        query: Search query text
+        query_embedding: Query embedding vector
+        owner_id: User ID for filtering
+        config: Hybrid search configuration
+        ranking_config: RRF constant and method weights
+
+    Returns:
+        Fused results sorted by RRF score, or None if the statement failed
+        (callers fall back to the per-method searches)
+    """
+    if config is None:
+        config = HybridSearchConfig()
+    if ranking_config is None:
+        ranking_config = RankingConfig()
+
+    params = {
+        "query_embedding": to_vector_literal(query_embedding),
+        "owner_id": owner_id,
+        "max_results": config.max_results,
+        "note_min_similarity": config.note_min_similarity,
+        "chunk_min_similarity": config.chunk_min_similarity,
+        "chunk_boost": config.chunk_boost,
+        "processed_query": _extract_search_terms(query),
+        "fulltext_limit": config.fulltext_limit,
+        "title_limit": config.title_limit,
+        "snippet_chars": config.snippet_chars,
+        "top_k": config.top_k,
+        "rrf_k": ranking_config.rrf_k,
+        "semantic_weight": ranking_config.semantic_weight,
+        "chunk_weight": ranking_config.chunk_weight,
+        "fulltext_weight": ranking_config.fulltext_weight,
+        "direct_weight": 1.0,  # Same as reciprocal_rank_fusion
+    }
+
+    from features.nexus.services.vector_search import _apply_title_threshold
+
+    try:
+        apply_ann_search_params(db)
+        _apply_title_threshold(db)
+        statement = _build_statement(query, config.snippet_chars, params)
+        rows = db.execute(text(statement), params).fetchall()
+    except Exception as e:
+        logger.error(f"Hybrid search failed: {e}")
+        db.rollback()
+        return None
+
+    ranked = [_row_to_ranked(row, bool(config.snippet_chars)) for row in rows]
+    for i, rr in enumerate(ranked):
+        rr.rank = i + 1
+
+    logger.info(f"Hybrid search: {len(ranked)} fused results in one statement")
+    return ranked
+
+
+def results_for_method(ranked: List[RankedResult], method: str) -> List[RetrievalResult]:
+    """
+    Results one generator contributed, in that generator's rank order.
+
+    A higher RRF contribution from the same method means a better rank, so
+    e.g. results_for_method(fused, 'semantic') gives the semantic seeds the
+    image and graph stages expect.
+    """
+    contributed: List[Tuple[float, RetrievalResult]] = [
+        (rr.method_scores[method], rr.result)
+        for rr in ranked if method in rr.method_scores
+    ]
+    contributed.sort(key=lambda item: item[0], reverse=True)
+    return [result for _, result in contributed]
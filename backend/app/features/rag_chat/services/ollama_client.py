@@ -2,10 +2,11 @@
 Ollama API client functions for RAG text generation.
 
 Provides synchronous and streaming interfaces via the LLM provider abstraction.
+The async streaming variant is used by SSE endpoints.
 """
 
 import logging
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from fastapi import HTTPException
 import requests
@@ -118,6 +119,47 @@ def call_ollama_stream(
         )
 
 
+async def call_ollama_stream_async(
+    prompt: str,
+    system_prompt: str,
+    model: str = None,
+    timeout: int = None
+) -> AsyncGenerator[LLMStreamChunk, None]:
+    """
+    Async version of call_ollama_stream for SSE endpoints.
+
+    Same arguments and chunks, but never blocks the event loop.
+    """
+    model = model or RAG_MODEL
+    timeout = timeout or RAG_TIMEOUT
+
+    messages = [
+        LLMMessage(role="system", content=system_prompt),
+        LLMMessage(role="user", content=prompt),
+    ]
+
+    try:
+        provider = get_default_provider()
+        async for chunk in provider.astream(
+            messages=messages,
+            model=model,
+            temperature=RAG_TEMPERATURE,
+            max_tokens=1024,
+            timeout=timeout,
+        ):
+            yield chunk
+            if chunk.done:
+                break
+
+    except Exception as e:
+        logger.error(f"LLM streaming failed: {e}")
+        error_type, user_msg = classify_llm_error(e)
+        yield LLMStreamChunk(
+            content=user_msg, done=True,
+            is_error=True, error_type=error_type,
+        )
+
+
 def check_ollama_health() -> dict:
     """
     Check LLM service health and model availability.
@@ -2,16 +2,26 @@
 RAG Query execution service.
 
 Handles the retrieval, ranking, and context building for RAG queries.
-Uses ThreadPoolExecutor for parallel retrieval from multiple sources.
+Uses ThreadPoolExecutor for parallel retrieval from multiple sources,
+with one short-lived database session per search.
+
+Note searches return snippets only; content is loaded after ranking for
+the results that made the cut, truncated to what build_context keeps.
+
+With hybrid_search enabled (RAG_HYBRID_SEARCH), semantic, chunk, fulltext
+and title candidates are fused in one SQL statement instead of four
+parallel searches; image and graph stages run afterwards as usual.
 """
 
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional, Callable
 
 from sqlalchemy.orm import Session
 
+from core.config import RAG_HYBRID_SEARCH
+from core.database import SessionLocal
 from models import Note, Image
 from embeddings import generate_embedding
 
@@ -20,6 +30,10 @@ from features.rag_chat.services import (
     semantic_search_notes,
     semantic_search_chunks,
     fulltext_search_notes,
+    hydrate_note_content,
+    HybridSearchConfig,
+    hybrid_search,
+    results_for_method,
     combined_image_retrieval,
     GraphTraversalConfig,
     graph_traversal,
@@ -48,6 +62,8 @@ class QueryExecutionConfig:
     include_graph: bool = True
     max_context_tokens: int = 4000
     max_content_per_source: int = 800
+    snippet_chars: int = 200  # Note content carried through ranking
+    hybrid_search: bool = RAG_HYBRID_SEARCH  # One fused statement instead of four searches
 
 
 @dataclass
@@ -106,6 +122,20 @@ def load_conversation_history(
     return conversation_history, previous_citations
 
 
+def _run_with_session(search_fn: Callable, *args, **kwargs):
+    """
+    Run one search on its own short-lived session.
+
+    SQLAlchemy sessions (and their pooled connection) are not thread-safe,
+    so parallel searches must never share the request's session.
+    """
+    session = SessionLocal()
+    try:
+        return search_fn(session, *args, **kwargs)
+    finally:
+        session.close()
+
+
 def execute_retrieval(
     db: Session,
     query: str,
@@ -117,8 +147,13 @@ def execute_retrieval(
     """
     Execute multi-source retrieval in parallel using ThreadPoolExecutor.
 
-    Runs semantic, chunk, fulltext, and title searches concurrently.
-    Image and graph searches depend on semantic results, so run sequentially after.
+    Every search runs on its own session from SessionLocal (the request's
+    `db` is not shared across threads). Semantic, chunk, fulltext, and title
+    searches start immediately (with raise_errors, so a failed search is
+    logged here with its traceback); image and graph searches depend on semantic
+    results, so they are submitted to the same pool as soon as the semantic
+    search finishes, while the other searches are still running. Latency is
+    roughly max(search) rather than the sum.
 
     Returns:
         Tuple of (semantic, chunk, fulltext, image, graph, title) results
@@ -131,61 +166,147 @@ def execute_retrieval(
         max_results=config.max_sources,
         include_notes=True,
         include_chunks=True,
-        include_images=config.include_images
+        include_images=config.include_images,
+        snippet_chars=config.snippet_chars
     )
 
     logger = logging.getLogger(__name__)
 
-    # Run primary searches in parallel (including title search)
-    semantic_results = []
-    chunk_results = []
-    fulltext_results = []
-    title_results = []
-
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        futures = {
-            executor.submit(semantic_search_notes, db, query_embedding, user_id, retrieval_config): 'semantic',
-            executor.submit(semantic_search_chunks, db, query_embedding, user_id, retrieval_config): 'chunk',
-            executor.submit(fulltext_search_notes, db, query, user_id, 10): 'fulltext',
-            executor.submit(_title_search, db, query, user_id): 'title',
+    results: Dict[str, List] = {
+        'semantic': [], 'chunk': [], 'fulltext': [], 'image': [], 'graph': [], 'title': [],
+    }
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        pending = {
+            executor.submit(
+                _run_with_session, semantic_search_notes,
+                query_embedding, user_id, retrieval_config, raise_errors=True
+            ): 'semantic',
+            executor.submit(
+                _run_with_session, semantic_search_chunks,
+                query_embedding, user_id, retrieval_config, raise_errors=True
+            ): 'chunk',
+            executor.submit(
+                _run_with_session, fulltext_search_notes,
+                query, user_id, 10, config.snippet_chars, raise_errors=True
+            ): 'fulltext',
+            executor.submit(_run_with_session, _title_search, query, user_id, raise_errors=True): 'title',
         }
 
-        for future in as_completed(futures):
-            search_type = futures[future]
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                search_type = pending.pop(future)
+                try:
+                    results[search_type] = future.result() or []
+                except Exception as e:
+                    logger.warning(f"Parallel {search_type} search failed: {e}", exc_info=True)
+                    continue
+
+                if search_type != 'semantic' or not results['semantic']:
+                    continue
+
+                # Fan out the stages that need semantic results
+                semantic_results = results['semantic']
+                if config.include_images:
+                    semantic_note_ids = [r.source_id for r in semantic_results if r.source_type == 'note']
+                    pending[executor.submit(
+                        _run_with_session, combined_image_retrieval,
+                        query, user_id, semantic_note_ids, limit=5
+                    )] = 'image'
+
+                if config.include_graph:
+                    seed_ids = [r.source_id for r in semantic_results[:3] if r.source_type == 'note']
+                    if seed_ids:
+                        graph_config = GraphTraversalConfig(
+                            max_hops=2, max_results_per_hop=3, relevance_decay=0.5,
+                            snippet_chars=config.snippet_chars
+                        )
+                        pending[executor.submit(
+                            _run_with_session, graph_traversal, seed_ids, user_id, graph_config
+                        )] = 'graph'
+
+    return (
+        results['semantic'], results['chunk'], results['fulltext'],
+        results['image'], results['graph'], results['title'],
+    )
+
+
+def execute_hybrid_retrieval(
+    db: Session,
+    query: str,
+    query_embedding: List[float],
+    user_id: int,
+    config: QueryExecutionConfig
+) -> Optional[tuple[List, List, List]]:
+    """
+    Execute retrieval with one fused statement, then the dependent stages.
+
+    hybrid_search fuses semantic, chunk, fulltext, and title candidates on
+    the request's session in a single round-trip. Image and graph searches
+    need the semantic results as seeds, so they run next, in parallel, each
+    on its own session.
+
+    Returns:
+        Tuple of (fused, image, graph) results, or None if the hybrid
+        statement failed and execute_retrieval should be used instead
+    """
+    logger = logging.getLogger(__name__)
+
+    hybrid_config = HybridSearchConfig(
+        note_min_similarity=config.min_similarity,
+        chunk_min_similarity=config.min_similarity,
+        max_results=config.max_sources,
+        snippet_chars=config.snippet_chars,
+        top_k=config.max_sources * 2,  # Headroom for image/graph results merged later
+    )
+    fused = hybrid_search(
+        db, query, query_embedding, user_id, hybrid_config,
+        RankingConfig(max_results=config.max_sources)
+    )
+    if fused is None:
+        return None
+
+    semantic_note_ids = [r.source_id for r in results_for_method(fused, 'semantic')]
+    results: Dict[str, List] = {'image': [], 'graph': []}
+    if not semantic_note_ids:
+        return fused, results['image'], results['graph']
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        pending = {}
+        if config.include_images:
+            pending[executor.submit(
+                _run_with_session, combined_image_retrieval,
+                query, user_id, semantic_note_ids, limit=5
+            )] = 'image'
+        if config.include_graph:
+            graph_config = GraphTraversalConfig(
+                max_hops=2, max_results_per_hop=3, relevance_decay=0.5,
+                snippet_chars=config.snippet_chars
+            )
+            pending[executor.submit(
+                _run_with_session, graph_traversal, semantic_note_ids[:3], user_id, graph_config
+            )] = 'graph'
+
+        for future, search_type in pending.items():
             try:
-                result = future.result()
-                if search_type == 'semantic':
-                    semantic_results = result
-                elif search_type == 'chunk':
-                    chunk_results = result
-                elif search_type == 'fulltext':
-                    fulltext_results = result
-                elif search_type == 'title':
-                    title_results = result
+                results[search_type] = future.result() or []
             except Exception as e:
-                logger.warning(f"Parallel {search_type} search failed: {e}")
+                logger.warning(f"Parallel {search_type} search failed: {e}", exc_info=True)
 
-    # Image and graph searches depend on semantic results, run sequentially
-    image_results = []
-    graph_results = []
+    return fused, results['image'], results['graph']
 
-    if config.include_images and semantic_results:
-        try:
-            semantic_note_ids = [r.source_id for r in semantic_results if r.source_type == 'note']
-            image_results = combined_image_retrieval(db, query, user_id, semantic_note_ids, limit=5)
-        except Exception as e:
-            logger.warning(f"Image retrieval failed: {e}")
 
-    if config.include_graph and semantic_results:
-        try:
-            seed_ids = [r.source_id for r in semantic_results[:3] if r.source_type == 'note']
-            if seed_ids:
-                graph_config = GraphTraversalConfig(max_hops=2, max_results_per_hop=3, relevance_decay=0.5)
-                graph_results = graph_traversal(db, seed_ids, user_id, graph_config)
-        except Exception as e:
-            logger.warning(f"Graph traversal failed: {e}")
+def _unpack_retrieval(results: tuple) -> Dict[str, List]:
+    """
+    Name the parts of a retrieval tuple.
 
-    return semantic_results, chunk_results, fulltext_results, image_results, graph_results, title_results
+    Handles hybrid (fused, image, graph) tuples as well as per-method
+    tuples, including cache entries from before title search was added.
+    """
+    if len(results) == 3:
+        return dict(zip(('fused', 'image', 'graph'), results))
+    return dict(zip(('semantic', 'chunk', 'fulltext', 'image', 'graph', 'title'), results))
 
 
 def build_context_from_previous_citations(
@@ -262,50 +383,57 @@ def execute_query(
     skip_rag = should_skip_rag_search(intent_result) and bool(previous_citations)
 
     # Check cache first for non-skip queries
-    cached_results = None
+    retrieved = None
     if not skip_rag:
-        cached_results = get_cached_retrieval_results(user_id, query, config)
-        if cached_results:
+        retrieved = get_cached_retrieval_results(user_id, query, config)
+        if retrieved:
             logger.info(f"Cache hit for query: {query[:50]}...")
-            if len(cached_results) == 6:
-                semantic_results, chunk_results, fulltext_results, image_results, graph_results, title_results = cached_results
-            else:
-                semantic_results, chunk_results, fulltext_results, image_results, graph_results = cached_results
-                title_results = []
         else:
             logger.debug(f"Cache miss for query: {query[:50]}...")
 
     # Execute retrieval if not cached
-    if cached_results is None:
+    if not retrieved:
         # Generate embedding
         query_embedding = generate_embedding(query)
         if not query_embedding:
             raise ValueError("Failed to generate query embedding")
 
-        # Execute retrieval
-        semantic_results, chunk_results, fulltext_results, image_results, graph_results, title_results = execute_retrieval(
-            db, query, query_embedding, user_id, config, skip_rag
-        )
+        # Execute retrieval (hybrid falls back to per-method searches on failure)
+        retrieved = None
+        if config.hybrid_search and not skip_rag:
+            retrieved = execute_hybrid_retrieval(db, query, query_embedding, user_id, config)
+        if retrieved is None:
+            retrieved = execute_retrieval(
+                db, query, query_embedding, user_id, config, skip_rag
+            )
 
         # Cache results for future queries (only if not skipping RAG)
         if not skip_rag:
-            cache_retrieval_results(
-                user_id, query, config,
-                (semantic_results, chunk_results, fulltext_results, image_results, graph_results, title_results)
-            )
+            cache_retrieval_results(user_id, query, config, retrieved)
 
     # Rank results
+    parts = _unpack_retrieval(retrieved)
     ranking_config = RankingConfig(max_results=config.max_sources)
     ranked_results = merge_and_rank(
-        semantic_results=semantic_results,
-        chunk_results=chunk_results,
-        graph_results=graph_results,
-        fulltext_results=fulltext_results,
-        image_results=image_results,
+        semantic_results=parts.get('semantic', []),
+        chunk_results=parts.get('chunk', []),
+        graph_results=parts['graph'],
+        fulltext_results=parts.get('fulltext', []),
+        image_results=parts['image'],
         config=ranking_config,
         query=query,
-        title_results=title_results
+        title_results=parts.get('title', []),
+        fused_results=parts.get('fused')
+    )
+
+    # Load content for the notes that survived ranking. One extra character
+    # lets truncate_content() see that the note continues.
+    hydrated = hydrate_note_content(
+        db, [rr.result for rr in ranked_results], user_id,
+        max_chars=config.max_content_per_source + 1
     )
+    for rr, result in zip(ranked_results, hydrated):
+        rr.result = result
 
     # Build context
     if skip_rag and previous_citations:
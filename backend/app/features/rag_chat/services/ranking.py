@@ -168,7 +168,8 @@ class RankedResult:
 
 def reciprocal_rank_fusion(
     result_lists: Dict[str, List[RetrievalResult]],
-    config: RankingConfig = None
+    config: RankingConfig = None,
+    prefused: Optional[List[RankedResult]] = None
 ) -> List[RankedResult]:
     """
     Combine multiple ranked result lists using Reciprocal Rank Fusion.
@@ -179,6 +180,8 @@ def reciprocal_rank_fusion(
     Args:
         result_lists: Dictionary mapping method names to result lists
         config: Ranking configuration
+        prefused: Results already fused elsewhere (e.g. hybrid_search in SQL);
+            their method scores are the starting point for the lists above
 
     Returns:
         List of RankedResult objects sorted by combined score
@@ -192,6 +195,11 @@ def reciprocal_rank_fusion(
     # Track the actual results for each source
     source_results: Dict[Tuple[str, int], RetrievalResult] = {}
 
+    for rr in prefused or []:
+        source_key = (rr.result.source_type, rr.result.source_id)
+        source_scores[source_key].update(rr.method_scores)
+        source_results[source_key] = rr.result
+
     # Get method weights
     method_weights = {
         'semantic': config.semantic_weight,
@@ -249,7 +257,10 @@ def reciprocal_rank_fusion(
     # Limit results
     ranked_results = ranked_results[:config.max_results]
 
-    logger.info(f"RRF fusion: {len(ranked_results)} combined results from {len(result_lists)} methods")
+    logger.info(
+        f"RRF fusion: {len(ranked_results)} combined results from {len(result_lists)} methods"
+        + (f" + {len(prefused)} prefused" if prefused else "")
+    )
     return ranked_results
 
 
@@ -501,7 +512,8 @@ def merge_and_rank(
     image_results: List[RetrievalResult],
     config: RankingConfig = None,
     query: str = None,
-    title_results: List[RetrievalResult] = None
+    title_results: List[RetrievalResult] = None,
+    fused_results: List[RankedResult] = None
 ) -> List[RankedResult]:
     """
     Convenience function to merge all result types and rank.
@@ -514,6 +526,8 @@ def merge_and_rank(
         image_results: Results from image retrieval
         config: Ranking configuration
         query: Original query (for dynamic weight adjustment)
+        title_results: Results from title matching
+        fused_results: Results already fused by hybrid_search
 
     Returns:
         Combined and ranked results
@@ -546,7 +560,7 @@ def merge_and_rank(
     result_lists = {k: v for k, v in result_lists.items() if v}
 
     # Apply RRF
-    ranked = reciprocal_rank_fusion(result_lists, config)
+    ranked = reciprocal_rank_fusion(result_lists, config, prefused=fused_results)
 
     # Deduplicate (allow up to 3 chunks per document for better recall)
     ranked = deduplicate_results(ranked, max_chunks_per_source=3)
@@ -6,18 +6,30 @@ Provides multi-level retrieval:
 - Chunk-level embeddings (more precise)
 - Image-level embeddings (AI analysis content)
 
-Uses pgvector cosine similarity for semantic search.
+Uses pgvector cosine similarity for semantic search. Queries order by the
+raw distance operator with a LIMIT so the HNSW indexes are used; the
+min_similarity threshold is applied to the returned rows.
+
+Note searches can run in two phases: with snippet_chars set they return
+ids, scores and a short snippet (metadata['snippet'] = True), and
+hydrate_note_content() loads content for the few results that survive
+ranking.
 """
 
 import re
 import logging
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import List, Optional, Dict, Any
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from models import Note, NoteChunk, Image, ImageChunk
 from embeddings import generate_embedding
+from core.vector_index import (
+    to_vector_literal,
+    similarity_from_distance,
+    apply_ann_search_params,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -44,13 +56,20 @@ class RetrievalConfig:
     include_images: bool = True
     include_documents: bool = True
     chunk_boost: float = 1.1  # Boost chunk results slightly (more precise)
+    snippet_chars: Optional[int] = None  # Note content prefix only; hydrate after ranking
+
+
+def _note_content_column(snippet_chars: Optional[int]) -> str:
+    """SELECT expression for note content: full text or a snippet."""
+    return "LEFT(content, :snippet_chars) AS content" if snippet_chars else "content"
 
 
 def semantic_search_notes(
     db: Session,
     query_embedding: List[float],
     owner_id: int,
-    config: RetrievalConfig = None
+    config: RetrievalConfig = None,
+    raise_errors: bool = False
 ) -> List[RetrievalResult]:
     """
     Search notes by semantic similarity using note-level embeddings.
@@ -60,6 +79,8 @@ def semantic_search_notes(
         query_embedding: Query embedding vector (768 dimensions)
         owner_id: User ID for filtering
         config: Retrieval configuration
+        raise_errors: Re-raise errors instead of returning [] (for callers
+            that log failures themselves)
 
     Returns:
         List of RetrievalResult objects sorted by similarity
@@ -71,47 +92,51 @@ def semantic_search_notes(
         return []
 
     try:
-        # Convert embedding to PostgreSQL array format
-        embedding_str = '[' + ','.join(map(str, query_embedding)) + ']'
+        apply_ann_search_params(db)
 
-        # Note: Use \: to escape the :: type cast so SQLAlchemy doesn't interpret it as a parameter
-        result = db.execute(text("""
+        # Order by the raw distance operator so the HNSW index is used;
+        # the similarity threshold is applied to the returned rows.
+        result = db.execute(text(f"""
             SELECT
                 id,
                 title,
-                content,
-                1 - (embedding <=> CAST(:query_embedding AS vector)) AS similarity
+                {_note_content_column(config.snippet_chars)},
+                embedding <=> CAST(:query_embedding AS vector) AS distance
             FROM notes
             WHERE owner_id = :owner_id
               AND embedding IS NOT NULL
               AND is_trashed = false
               AND LENGTH(TRIM(COALESCE(content, ''))) > 10
-              AND (1 - (embedding <=> CAST(:query_embedding AS vector))) >= :min_similarity
-            ORDER BY similarity DESC
+            ORDER BY embedding <=> CAST(:query_embedding AS vector)
             LIMIT :max_results
         """), {
-            "query_embedding": embedding_str,
+            "query_embedding": to_vector_literal(query_embedding),
             "owner_id": owner_id,
-            "min_similarity": config.min_similarity,
-            "max_results": config.max_results
+            "max_results": config.max_results,
+            "snippet_chars": config.snippet_chars
         })
 
         results = []
         for row in result:
+            similarity = similarity_from_distance(row.distance)
+            if similarity < config.min_similarity:
+                break  # Rows arrive nearest-first
             results.append(RetrievalResult(
                 source_type='note',
                 source_id=row.id,
                 title=row.title or 'Untitled',
                 content=row.content or '',
-                similarity=float(row.similarity),
+                similarity=similarity,
                 retrieval_method='semantic',
-                metadata={'full_note': True}
+                metadata={'full_note': True, 'snippet': bool(config.snippet_chars)}
             ))
 
         logger.debug(f"Found {len(results)} notes via semantic search")
         return results
 
     except Exception as e:
+        if raise_errors:
+            raise
         logger.error(f"Error in semantic note search: {e}")
         return []
 
@@ -120,7 +145,8 @@ def semantic_search_chunks(
     db: Session,
     query_embedding: List[float],
     owner_id: int,
-    config: RetrievalConfig = None
+    config: RetrievalConfig = None,
+    raise_errors: bool = False
 ) -> List[RetrievalResult]:
     """
     Search note chunks by semantic similarity for precise retrieval.
@@ -130,6 +156,8 @@ def semantic_search_chunks(
         query_embedding: Query embedding vector
         owner_id: User ID for filtering
         config: Retrieval configuration
+        raise_errors: Re-raise errors instead of returning [] (for callers
+            that log failures themselves)
 
     Returns:
         List of RetrievalResult objects sorted by similarity
@@ -141,7 +169,7 @@ def semantic_search_chunks(
         return []
 
     try:
-        embedding_str = '[' + ','.join(map(str, query_embedding)) + ']'
+        apply_ann_search_params(db)
 
         result = db.execute(text("""
             SELECT
@@ -152,27 +180,29 @@ def semantic_search_chunks(
                 nc.char_start,
                 nc.char_end,
                 n.title AS note_title,
-                1 - (nc.embedding <=> CAST(:query_embedding AS vector)) AS similarity
+                nc.embedding <=> CAST(:query_embedding AS vector) AS distance
             FROM note_chunks nc
             JOIN notes n ON nc.note_id = n.id
             WHERE n.owner_id = :owner_id
               AND n.is_trashed = false
               AND nc.embedding IS NOT NULL
               AND LENGTH(TRIM(nc.content)) > 10
-              AND (1 - (nc.embedding <=> CAST(:query_embedding AS vector))) >= :min_similarity
-            ORDER BY similarity DESC
+            ORDER BY nc.embedding <=> CAST(:query_embedding AS vector)
             LIMIT :max_results
         """), {
-            "query_embedding": embedding_str,
+            "query_embedding": to_vector_literal(query_embedding),
             "owner_id": owner_id,
-            "min_similarity": config.min_similarity,
             "max_results": config.max_results
         })
 
         results = []
         for row in result:
+            similarity = similarity_from_distance(row.distance)
+            if similarity < config.min_similarity:
+                break  # Rows arrive nearest-first
+
             # Apply chunk boost for more precise matches
-            boosted_similarity = min(1.0, float(row.similarity) * config.chunk_boost)
+            boosted_similarity = min(1.0, similarity * config.chunk_boost)
 
             results.append(RetrievalResult(
                 source_type='chunk',
@@ -193,6 +223,8 @@ def semantic_search_chunks(
         return results
 
     except Exception as e:
+        if raise_errors:
+            raise
         logger.error(f"Error in semantic chunk search: {e}")
         return []
 
@@ -222,7 +254,7 @@ def semantic_search_images(
         return []
 
     try:
-        embedding_str = '[' + ','.join(map(str, query_embedding)) + ']'
+        apply_ann_search_params(db)
 
         result = db.execute(text("""
             SELECT
@@ -231,29 +263,30 @@ def semantic_search_images(
                 ic.content,
                 i.filename,
                 i.filepath,
-                1 - (ic.embedding <=> CAST(:query_embedding AS vector)) AS similarity
+                ic.embedding <=> CAST(:query_embedding AS vector) AS distance
             FROM image_chunks ic
             JOIN images i ON ic.image_id = i.id
             WHERE i.owner_id = :owner_id
               AND ic.embedding IS NOT NULL
-              AND (1 - (ic.embedding <=> CAST(:query_embedding AS vector))) >= :min_similarity
-            ORDER BY similarity DESC
+            ORDER BY ic.embedding <=> CAST(:query_embedding AS vector)
             LIMIT :max_results
         """), {
-            "query_embedding": embedding_str,
+            "query_embedding": to_vector_literal(query_embedding),
             "owner_id": owner_id,
-            "min_similarity": config.min_similarity,
             "max_results": config.max_results
         })
 
         results = []
         for row in result:
+            similarity = similarity_from_distance(row.distance)
+            if similarity < config.min_similarity:
+                break  # Rows arrive nearest-first
             results.append(RetrievalResult(
                 source_type='image',
                 source_id=row.image_id,
                 title=row.filename or 'Image',
                 content=row.content,
-                similarity=float(row.similarity),
+                similarity=similarity,
                 retrieval_method='semantic',
                 metadata={
                     'chunk_id': row.id,
@@ -295,7 +328,7 @@ def semantic_search_document_chunks(
         return []
 
     try:
-        embedding_str = '[' + ','.join(map(str, query_embedding)) + ']'
+        apply_ann_search_params(db)
 
         result = db.execute(text("""
             SELECT
@@ -305,24 +338,26 @@ def semantic_search_document_chunks(
                 dc.page_number,
                 d.filename,
                 d.display_name,
-                1 - (dc.embedding <=> CAST(:query_embedding AS vector)) AS similarity
+                dc.embedding <=> CAST(:query_embedding AS vector) AS distance
             FROM document_chunks dc
             JOIN documents d ON dc.document_id = d.id
             WHERE d.owner_id = :owner_id
               AND d.is_trashed = false
               AND dc.embedding IS NOT NULL
-              AND (1 - (dc.embedding <=> CAST(:query_embedding AS vector))) >= :min_similarity
-            ORDER BY similarity DESC
+            ORDER BY dc.embedding <=> CAST(:query_embedding AS vector)
             LIMIT :max_results
         """), {
-            "query_embedding": embedding_str,
+            "query_embedding": to_vector_literal(query_embedding),
             "owner_id": owner_id,
-            "min_similarity": config.min_similarity,
             "max_results": config.max_results
         })
 
         results = []
         for row in result:
+            similarity = similarity_from_distance(row.distance)
+            if similarity < config.min_similarity:
+                break  # Rows arrive nearest-first
+
             doc_name = row.display_name or row.filename or 'Document'
             page_info = f" (p.{row.page_number})" if row.page_number else ""
 
@@ -331,7 +366,7 @@ def semantic_search_document_chunks(
                 source_id=row.id,
                 title=f"{doc_name}{page_info}",
                 content=row.content,
-                similarity=float(row.similarity),
+                similarity=similarity,
                 retrieval_method='document_chunk',
                 metadata={
                     'document_id': row.document_id,
@@ -351,8 +386,9 @@ def semantic_search_document_chunks(
 def _extract_search_terms(query: str) -> str:
     """Extract meaningful search terms from natural language query, joined with OR.
 
-    Preserves date patterns (YYYY-MM-DD) as AND-grouped terms so fulltext
-    search can match notes containing those date components.
+    Returns websearch_to_tsquery syntax. Date patterns (YYYY-MM-DD) are kept
+    as adjacent (AND-ed) words so fulltext search can match notes containing
+    those date components.
     """
     STOP_WORDS = {
         'tell', 'about', 'what', 'note', 'notes', 'show', 'find', 'give',
@@ -360,34 +396,36 @@ def _extract_search_terms(query: str) -> str:
         'how', 'does', 'can', 'could', 'would', 'should', 'which', 'where',
         'know', 'anything', 'something', 'everything', 'related', 'me',
         'any', 'all', 'some', 'your', 'you', 'my', 'its', 'are', 'is',
-        'do', 'did', 'was', 'were', 'been', 'being', 'get', 'got',
+        'do', 'did', 'was', 'were', 'been', 'being', 'get', 'got', 'or',
     }
 
     terms = []
     remaining = query
 
-    # Preserve date patterns as AND-grouped terms for tsquery
+    # Preserve date patterns as AND-grouped terms
     dates = re.findall(r'\d{4}-\d{2}-\d{2}', query)
     for date in dates:
         remaining = remaining.replace(date, '')
-        parts = date.split('-')
-        terms.append('(' + ' & '.join(parts) + ')')
+        terms.append(' '.join(date.split('-')))
 
-    # Extract regular tokens from remaining text
-    tokens = remaining.lower().split()
+    # Extract regular tokens from remaining text; quotes and a leading '-'
+    # are websearch operators (phrase, NOT), not part of the word
+    tokens = (t.strip('"').lstrip('-') for t in remaining.lower().split())
     terms.extend(t for t in tokens if t not in STOP_WORDS and len(t) >= 2)
 
-    return ' | '.join(terms) if terms else query
+    return ' or '.join(terms) if terms else query
 
 
 def fulltext_search_notes(
     db: Session,
     query: str,
     owner_id: int,
-    limit: int = 10
+    limit: int = 10,
+    snippet_chars: Optional[int] = None,
+    raise_errors: bool = False
 ) -> List[RetrievalResult]:
     """
-    Full-text search using PostgreSQL tsvector with OR logic.
+    Full-text search on the stored notes.search_vector with OR logic.
 
     Extracts meaningful terms from natural language queries and uses
     OR logic so "give me notes about cars" matches any note containing "cars".
@@ -397,6 +435,9 @@ def fulltext_search_notes(
         query: Search query text
         owner_id: User ID for filtering
         limit: Maximum results
+        snippet_chars: Return only this much content (hydrate after ranking)
+        raise_errors: Re-raise errors instead of returning [] (for callers
+            that log failures themselves)
 
     Returns:
         List of RetrievalResult objects
@@ -404,26 +445,24 @@ def fulltext_search_notes(
     try:
         processed_query = _extract_search_terms(query)
 
-        result = db.execute(text("""
+        # search_vector is the stored, weighted (title A, content B) tsvector
+        result = db.execute(text(f"""
             SELECT
                 id,
                 title,
-                content,
-                ts_rank(
-                    to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(content, '')),
-                    to_tsquery('english', :processed_query)
-                ) AS rank
-            FROM notes
+                {_note_content_column(snippet_chars)},
+                ts_rank(search_vector, query) AS rank
+            FROM notes, websearch_to_tsquery('english', :processed_query) AS query
             WHERE owner_id = :owner_id
               AND is_trashed = false
-              AND to_tsvector('english', COALESCE(title, '') || ' ' || COALESCE(content, ''))
-                  @@ to_tsquery('english', :processed_query)
+              AND search_vector @@ query
             ORDER BY rank DESC
             LIMIT :limit
         """), {
             "processed_query": processed_query,
             "owner_id": owner_id,
-            "limit": limit
+            "limit": limit,
+            "snippet_chars": snippet_chars
         })
 
         results = []
@@ -438,13 +477,15 @@ def fulltext_search_notes(
                 content=row.content or '',
                 similarity=normalized_rank,
                 retrieval_method='fulltext',
-                metadata={'full_note': True}
+                metadata={'full_note': True, 'snippet': bool(snippet_chars)}
             ))
 
         logger.debug(f"Found {len(results)} notes via full-text search")
         return results
 
     except Exception as e:
+        if raise_errors:
+            raise
         logger.error(f"Error in full-text search: {e}")
         return []
 
@@ -508,6 +549,66 @@ def combined_semantic_search(
     return results
 
 
+def hydrate_note_content(
+    db: Session,
+    results: List[RetrievalResult],
+    owner_id: int,
+    max_chars: int
+) -> List[RetrievalResult]:
+    """
+    Phase two of note retrieval: load content for snippet-only note results.
+
+    One query for all notes, fetching at most max_chars characters each
+    (callers pass what the context builder will keep). Results are copied,
+    not mutated, because phase-one results may be held by the query cache.
+
+    Args:
+        db: Database session
+        results: Final results (after ranking and deduplication)
+        owner_id: User ID for filtering
+        max_chars: Characters of content to load per note
+
+    Returns:
+        Results in the same order, with note content filled in
+    """
+    note_ids = list({
+        r.source_id for r in results
+        if r.source_type == 'note' and r.metadata.get('snippet')
+    })
+    if not note_ids:
+        return list(results)
+
+    try:
+        rows = db.execute(text("""
+            SELECT id, LEFT(content, :max_chars) AS content
+            FROM notes
+            WHERE id = ANY(:note_ids)
+              AND owner_id = :owner_id
+        """), {
+            "note_ids": note_ids,
+            "owner_id": owner_id,
+            "max_chars": max_chars
+        })
+        contents = {row.id: row.content or '' for row in rows}
+    except Exception as e:
+        logger.error(f"Error hydrating note content: {e}")
+        db.rollback()
+        return list(results)
+
+    hydrated = []
+    for r in results:
+        if r.source_type == 'note' and r.metadata.get('snippet') and r.source_id in contents:
+            r = replace(
+                r,
+                content=contents[r.source_id],
+                metadata={**r.metadata, 'snippet': False}
+            )
+        hydrated.append(r)
+
+    logger.debug(f"Hydrated content for {len(contents)} notes")
+    return hydrated
+
+
 def get_note_by_id(db: Session, note_id: int, owner_id: int) -> Optional[RetrievalResult]:
     """
     Get a specific note as a RetrievalResult.
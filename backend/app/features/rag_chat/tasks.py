@@ -7,19 +7,163 @@ Background tasks for:
 - Backfilling existing content
 """
 
+import hashlib
 import logging
-from typing import Optional
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Tuple
 
 from celery_app import celery_app
 from database import SessionLocal
 from models import Note, Image
 from features.rag_chat.models import NoteChunk, ImageChunk
-from embeddings import generate_embedding
+from embeddings import batch_generate_embeddings
 from features.rag_chat.services.chunking import chunk_note_content, chunk_image_analysis
-from sqlalchemy import select, delete
+from sqlalchemy import select, delete, update
 
 logger = logging.getLogger(__name__)
 
+# Notes/images processed per backfill page (their chunks share embedding batches)
+BACKFILL_PAGE_SIZE = 50
+
+
+def _embed_texts(texts: List[str], generate_embeddings: bool) -> List[Optional[List[float]]]:
+    """Embed texts through the batched client, or return placeholders."""
+    if not generate_embeddings or not texts:
+        return [None] * len(texts)
+    return batch_generate_embeddings(texts)
+
+
+def _chunk_hash(content: str) -> str:
+    """SHA-256 of chunk text, used to recognise unchanged chunks."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _rechunk_notes(db, notes: List[Note], generate_embeddings: bool) -> Dict[str, int]:
+    """
+    Incrementally re-chunk a group of notes.
+
+    Existing rows whose text is unchanged are kept together with their
+    embedding; only their position columns are updated, in one bulk UPDATE.
+    Changed chunks recycle leftover rows, genuinely new chunks are inserted
+    and surplus rows are deleted. Everything that needs an embedding is
+    embedded in shared batches.
+
+    Returns:
+        Counts: total, reused, reembedded, inserted, deleted
+    """
+    stats = {"total": 0, "reused": 0, "reembedded": 0, "inserted": 0, "deleted": 0}
+
+    existing = db.execute(
+        select(NoteChunk)
+        .where(NoteChunk.note_id.in_([n.id for n in notes]))
+        .order_by(NoteChunk.note_id, NoteChunk.chunk_index)
+    ).scalars().all()
+    rows_by_note: Dict[int, List[NoteChunk]] = defaultdict(list)
+    for row in existing:
+        rows_by_note[row.note_id].append(row)
+
+    position_updates: List[dict] = []
+    to_embed: List[Tuple[NoteChunk, str]] = []
+
+    for note in notes:
+        chunks = chunk_note_content(note.content, note.id) if note.content else []
+        stats["total"] += len(chunks)
+
+        # Rows from before the content_hash column are hashed on the fly
+        rows_by_hash: Dict[str, deque] = defaultdict(deque)
+        for row in rows_by_note[note.id]:
+            rows_by_hash[row.content_hash or _chunk_hash(row.content)].append(row)
+
+        changed = []
+        for chunk in chunks:
+            digest = _chunk_hash(chunk.content)
+            if not rows_by_hash.get(digest):
+                changed.append((chunk, digest))
+                continue
+
+            row = rows_by_hash[digest].popleft()
+            stats["reused"] += 1
+            position = {
+                "chunk_index": chunk.chunk_index,
+                "chunk_type": chunk.chunk_type,
+                "char_start": chunk.char_start,
+                "char_end": chunk.char_end,
+                "content_hash": digest,
+            }
+            if any(getattr(row, k) != v for k, v in position.items()):
+                position_updates.append({"id": row.id, **position})
+            if generate_embeddings and row.embedding is None:
+                to_embed.append((row, chunk.content))
+
+        leftovers = [row for queue in rows_by_hash.values() for row in queue]
+        for chunk, digest in changed:
+            if leftovers:
+                row = leftovers.pop(0)
+            else:
+                row = NoteChunk(note_id=note.id)
+                db.add(row)
+                stats["inserted"] += 1
+            row.content = chunk.content
+            row.content_hash = digest
+            row.chunk_index = chunk.chunk_index
+            row.chunk_type = chunk.chunk_type
+            row.char_start = chunk.char_start
+            row.char_end = chunk.char_end
+            row.embedding = None
+            if generate_embeddings:
+                to_embed.append((row, chunk.content))
+
+        for row in leftovers:
+            db.delete(row)
+            stats["deleted"] += 1
+
+    if position_updates:
+        db.execute(update(NoteChunk), position_updates)
+
+    embeddings = _embed_texts([content for _, content in to_embed], generate_embeddings)
+    for (row, _), embedding in zip(to_embed, embeddings):
+        if embedding:
+            row.embedding = embedding
+            stats["reembedded"] += 1
+
+    db.commit()
+    return stats
+
+
+def _rechunk_images(db, images: List[Image], generate_embeddings: bool) -> Tuple[int, int]:
+    """
+    Replace chunks for a group of images, embedding all chunks in shared batches.
+
+    Returns:
+        (chunks_created, embeddings_generated)
+    """
+    image_chunks = [
+        (image, chunk_image_analysis(image.ai_analysis_result, image.id))
+        for image in images
+    ]
+    all_chunks = [chunk for _, chunks in image_chunks for chunk in chunks]
+    embeddings = iter(_embed_texts([c.content for c in all_chunks], generate_embeddings))
+
+    db.execute(delete(ImageChunk).where(ImageChunk.image_id.in_([i.id for i in images])))
+
+    chunks_created = 0
+    embeddings_generated = 0
+    for image, chunks in image_chunks:
+        for chunk in chunks:
+            embedding = next(embeddings)
+            db.add(ImageChunk(
+                image_id=image.id,
+                content=chunk.content,
+                chunk_index=chunk.chunk_index,
+                embedding=embedding,
+            ))
+            chunks_created += 1
+            if embedding:
+                embeddings_generated += 1
+
+    db.commit()
+    return chunks_created, embeddings_generated
+
 
 @celery_app.task(
     name="tasks_rag.generate_note_chunks",
@@ -34,15 +178,15 @@ def generate_note_chunks_task(self, note_id: int, generate_embeddings: bool = Tr
     This task:
     1. Fetches the note content
     2. Chunks it into paragraphs
-    3. Stores chunks in note_chunks table
-    4. Optionally generates embeddings for each chunk
+    3. Keeps stored chunks whose text hash is unchanged (with their embedding)
+    4. Embeds only new or changed chunks, in batched requests
 
     Args:
         note_id: ID of the note to chunk
         generate_embeddings: Whether to generate embeddings for chunks
 
     Returns:
-        dict with status and chunk count
+        dict with status, chunk count and reused vs re-embedded counts
     """
     db = SessionLocal()
 
@@ -70,15 +214,10 @@ def generate_note_chunks_task(self, note_id: int, generate_embeddings: bool = Tr
                 "reason": "No content"
             }
 
-        # Delete existing chunks for this note (re-chunking)
-        delete_stmt = delete(NoteChunk).where(NoteChunk.note_id == note_id)
-        db.execute(delete_stmt)
-        db.commit()
+        # Re-chunk incrementally; only new or changed chunks are re-embedded
+        stats = _rechunk_notes(db, [note], generate_embeddings)
 
-        # Generate chunks
-        chunks = chunk_note_content(note.content, note_id)
-
-        if not chunks:
+        if not stats["total"]:
             logger.warning(f"No chunks generated for note {note_id}")
             return {
                 "status": "skipped",
@@ -86,46 +225,20 @@ def generate_note_chunks_task(self, note_id: int, generate_embeddings: bool = Tr
                 "reason": "No chunks generated"
             }
 
-        # Store chunks
-        chunks_created = 0
-        embeddings_generated = 0
-
-        for chunk in chunks:
-            db_chunk = NoteChunk(
-                note_id=note_id,
-                content=chunk.content,
-                chunk_index=chunk.chunk_index,
-                chunk_type=chunk.chunk_type,
-                char_start=chunk.char_start,
-                char_end=chunk.char_end,
-                embedding=None
-            )
-
-            # Generate embedding if requested
-            if generate_embeddings:
-                try:
-                    embedding = generate_embedding(chunk.content)
-                    if embedding:
-                        db_chunk.embedding = embedding
-                        embeddings_generated += 1
-                except Exception as e:
-                    logger.warning(f"Failed to generate embedding for chunk: {e}")
-
-            db.add(db_chunk)
-            chunks_created += 1
-
-        db.commit()
-
         logger.info(
-            f"Created {chunks_created} chunks for note {note_id} "
-            f"({embeddings_generated} embeddings generated)"
+            f"Re-chunked note {note_id}: {stats['total']} chunks "
+            f"({stats['reused']} reused, {stats['reembedded']} re-embedded, "
+            f"{stats['inserted']} inserted, {stats['deleted']} deleted)"
         )
 
         return {
             "status": "success",
             "note_id": note_id,
-            "chunks_created": chunks_created,
-            "embeddings_generated": embeddings_generated
+            "chunks_created": stats["total"],
+            "chunks_reused": stats["reused"],
+            "chunks_reembedded": stats["reembedded"],
+            "chunks_deleted": stats["deleted"],
+            "embeddings_generated": stats["reembedded"]
         }
 
     except Exception as e:
@@ -159,8 +272,8 @@ def generate_image_chunks_task(self, image_id: int, generate_embeddings: bool =
     This task:
     1. Fetches the image's AI analysis result
     2. Chunks it into sections
-    3. Stores chunks in image_chunks table
-    4. Optionally generates embeddings for each chunk
+    3. Optionally embeds all chunks in batched requests
+    4. Stores chunks in image_chunks table
 
     Args:
         image_id: ID of the image to chunk
@@ -195,15 +308,10 @@ def generate_image_chunks_task(self, image_id: int, generate_embeddings: bool =
                 "reason": "No AI analysis"
             }
 
-        # Delete existing chunks for this image (re-chunking)
-        delete_stmt = delete(ImageChunk).where(ImageChunk.image_id == image_id)
-        db.execute(delete_stmt)
-        db.commit()
-
-        # Generate chunks
-        chunks = chunk_image_analysis(image.ai_analysis_result, image_id)
+        # Re-chunk; all chunk embeddings go out in batched /api/embed calls
+        chunks_created, embeddings_generated = _rechunk_images(db, [image], generate_embeddings)
 
-        if not chunks:
+        if not chunks_created:
             logger.warning(f"No chunks generated for image {image_id}")
             return {
                 "status": "skipped",
@@ -211,33 +319,6 @@ def generate_image_chunks_task(self, image_id: int, generate_embeddings: bool =
                 "reason": "No chunks generated"
             }
 
-        # Store chunks
-        chunks_created = 0
-        embeddings_generated = 0
-
-        for chunk in chunks:
-            db_chunk = ImageChunk(
-                image_id=image_id,
-                content=chunk.content,
-                chunk_index=chunk.chunk_index,
-                embedding=None
-            )
-
-            # Generate embedding if requested
-            if generate_embeddings:
-                try:
-                    embedding = generate_embedding(chunk.content)
-                    if embedding:
-                        db_chunk.embedding = embedding
-                        embeddings_generated += 1
-                except Exception as e:
-                    logger.warning(f"Failed to generate embedding for image chunk: {e}")
-
-            db.add(db_chunk)
-            chunks_created += 1
-
-        db.commit()
-
         logger.info(
             f"Created {chunks_created} chunks for image {image_id} "
             f"({embeddings_generated} embeddings generated)"
@@ -276,50 +357,68 @@ def backfill_note_chunks_task(self, owner_id: Optional[int] = None) -> dict:
     """
     Backfill chunks for all existing notes.
 
-    This batch task queues individual chunk generation tasks for all notes.
-    Useful for initial population after migration.
+    Processes notes in pages of BACKFILL_PAGE_SIZE. Chunks from every note
+    in a page are embedded together through the batched embedding client,
+    so a backfill costs a handful of /api/embed round-trips per page
+    instead of one request per chunk.
 
     Args:
         owner_id: If provided, only process this user's notes
 
     Returns:
-        dict with count of queued tasks
+        dict with processed/failed counts
     """
     db = SessionLocal()
 
     try:
         logger.info("Starting note chunks backfill")
 
-        # Query all notes
-        stmt = select(Note.id)
+        # Query all notes with content
+        stmt = select(Note.id).where(Note.content.isnot(None), Note.content != "")
         if owner_id:
             stmt = stmt.where(Note.owner_id == owner_id)
             logger.info(f"Filtering notes for owner_id={owner_id}")
 
-        result = db.execute(stmt)
-        note_ids = [row[0] for row in result.fetchall()]
+        note_ids = [row[0] for row in db.execute(stmt.order_by(Note.id)).fetchall()]
 
         logger.info(f"Found {len(note_ids)} notes to process")
 
-        # Queue individual tasks
-        queued = 0
+        processed = 0
         failed = 0
+        chunks_created = 0
+        chunks_reused = 0
+        embeddings_generated = 0
 
-        for note_id in note_ids:
+        for i in range(0, len(note_ids), BACKFILL_PAGE_SIZE):
+            page_ids = note_ids[i:i + BACKFILL_PAGE_SIZE]
             try:
-                generate_note_chunks_task.delay(note_id, generate_embeddings=True)
-                queued += 1
+                notes = db.execute(
+                    select(Note).where(Note.id.in_(page_ids))
+                ).scalars().all()
+                stats = _rechunk_notes(db, notes, generate_embeddings=True)
+                processed += len(notes)
+                chunks_created += stats["total"]
+                chunks_reused += stats["reused"]
+                embeddings_generated += stats["reembedded"]
             except Exception as e:
-                logger.error(f"Failed to queue task for note {note_id}: {e}")
-                failed += 1
+                logger.error(f"Failed to backfill note page starting at {page_ids[0]}: {e}")
+                db.rollback()
+                failed += len(page_ids)
 
-        logger.info(f"Note chunks backfill: {queued} queued, {failed} failed")
+        logger.info(
+            f"Note chunks backfill: {processed} processed, {failed} failed, "
+            f"{chunks_created} chunks ({chunks_reused} reused, "
+            f"{embeddings_generated} embeddings)"
+        )
 
         return {
             "status": "completed",
             "total_notes": len(note_ids),
-            "queued": queued,
+            "processed": processed,
             "failed": failed,
+            "chunks_created": chunks_created,
+            "chunks_reused": chunks_reused,
+            "embeddings_generated": embeddings_generated,
             "owner_id": owner_id
         }
 
@@ -339,14 +438,14 @@ def backfill_image_chunks_task(self, owner_id: Optional[int] = None) -> dict:
     """
     Backfill chunks for all existing images with AI analysis.
 
-    This batch task queues individual chunk generation tasks for all images
-    that have completed AI analysis.
+    Processes images in pages of BACKFILL_PAGE_SIZE, embedding every chunk
+    of a page together through the batched embedding client.
 
     Args:
         owner_id: If provided, only process this user's images
 
     Returns:
-        dict with count of queued tasks
+        dict with processed/failed counts
     """
     db = SessionLocal()
 
@@ -362,30 +461,42 @@ def backfill_image_chunks_task(self, owner_id: Optional[int] = None) -> dict:
             stmt = stmt.where(Image.owner_id == owner_id)
             logger.info(f"Filtering images for owner_id={owner_id}")
 
-        result = db.execute(stmt)
-        image_ids = [row[0] for row in result.fetchall()]
+        image_ids = [row[0] for row in db.execute(stmt.order_by(Image.id)).fetchall()]
 
         logger.info(f"Found {len(image_ids)} images to process")
 
-        # Queue individual tasks
-        queued = 0
+        processed = 0
         failed = 0
+        chunks_created = 0
+        embeddings_generated = 0
 
-        for image_id in image_ids:
+        for i in range(0, len(image_ids), BACKFILL_PAGE_SIZE):
+            page_ids = image_ids[i:i + BACKFILL_PAGE_SIZE]
             try:
-                generate_image_chunks_task.delay(image_id, generate_embeddings=True)
-                queued += 1
+                images = db.execute(
+                    select(Image).where(Image.id.in_(page_ids))
+                ).scalars().all()
+                created, embedded = _rechunk_images(db, images, generate_embeddings=True)
+                processed += len(images)
+                chunks_created += created
+                embeddings_generated += embedded
             except Exception as e:
-                logger.error(f"Failed to queue task for image {image_id}: {e}")
-                failed += 1
+                logger.error(f"Failed to backfill image page starting at {page_ids[0]}: {e}")
+                db.rollback()
+                failed += len(page_ids)
 
-        logger.info(f"Image chunks backfill: {queued} queued, {failed} failed")
+        logger.info(
+            f"Image chunks backfill: {processed} processed, {failed} failed, "
+            f"{chunks_created} chunks ({embeddings_generated} embeddings)"
+        )
 
         return {
             "status": "completed",
             "total_images": len(image_ids),
-            "queued": queued,
+            "processed": processed,
             "failed": failed,
+            "chunks_created": chunks_created,
+            "embeddings_generated": embeddings_generated,
             "owner_id": owner_id
         }
 
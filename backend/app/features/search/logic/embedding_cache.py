@@ -0,0 +1,205 @@
+"""
+Content-addressed embedding cache.
+
+Two tiers, keyed on (embedding model, SHA-256 of the normalized text):
+- In-process LRU of float32 vectors (~3 KB per 768-dim entry)
+- Redis, shared by all web and Celery workers, with a TTL
+
+EmbeddingClient consults the cache before calling Ollama, so repeated chat
+queries and re-chunks of unchanged paragraphs skip the model round-trip.
+Redis failures degrade to memory-only and are retried after a cooldown.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core import config
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "emb"
+REDIS_RETRY_COOLDOWN_SECONDS = 30.0
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text before hashing and embedding (NFC, stripped)."""
+    return unicodedata.normalize("NFC", text).strip()
+
+
+def make_cache_key(model: str, text: str) -> str:
+    """Cache key for a (model, normalized text) pair."""
+    digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+
+class EmbeddingCache:
+    """
+    Thread-safe two-tier embedding cache.
+
+    Args:
+        max_size: Max entries kept in the in-process LRU
+        ttl_seconds: Expiry for Redis entries
+        redis_url: Redis URL for the shared tier, or None for memory only
+    """
+
+    def __init__(
+        self,
+        max_size: int = config.EMBEDDING_CACHE_SIZE,
+        ttl_seconds: int = config.EMBEDDING_CACHE_TTL_SECONDS,
+        redis_url: Optional[str] = None,
+    ) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.redis_url = redis_url
+
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self._redis_down_until = 0.0
+
+        self._memory_hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._redis_errors = 0
+
+    # ── Public API ────────────────────────────────────────────────
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Look up keys in memory, then Redis. Returns only the hits."""
+        found: Dict[str, List[float]] = {}
+        missing: List[str] = []
+
+        with self._lock:
+            for key in keys:
+                vec = self._memory.get(key)
+                if vec is None:
+                    missing.append(key)
+                else:
+                    self._memory.move_to_end(key)
+                    found[key] = vec.tolist()
+            self._memory_hits += len(found)
+
+        if missing:
+            from_redis = self._redis_get_many(missing)
+            with self._lock:
+                for key, vec in from_redis.items():
+                    self._remember(key, vec)
+                    found[key] = vec.tolist()
+                self._redis_hits += len(from_redis)
+                self._misses += len(missing) - len(from_redis)
+
+        return found
+
+    def set_many(self, items: Dict[str, List[float]]) -> None:
+        """Store vectors in both tiers."""
+        if not items:
+            return
+        arrays = {k: np.asarray(v, dtype=np.float32) for k, v in items.items()}
+        with self._lock:
+            for key, vec in arrays.items():
+                self._remember(key, vec)
+            self._stores += len(arrays)
+        self._redis_set_many(arrays)
+
+    def clear(self) -> None:
+        """Clear the in-process tier and reset counters (Redis is left intact)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_hits = 0
+            self._redis_hits = 0
+            self._misses = 0
+            self._stores = 0
+            self._redis_errors = 0
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process."""
+        with self._lock:
+            hits = self._memory_hits + self._redis_hits
+            total = hits + self._misses
+            return {
+                "size": len(self._memory),
+                "max_size": self.max_size,
+                "memory_hits": self._memory_hits,
+                "redis_hits": self._redis_hits,
+                "misses": self._misses,
+                "stores": self._stores,
+                "hit_rate": round(hits / total, 3) if total > 0 else 0,
+                "redis_enabled": self.redis_url is not None,
+                "redis_errors": self._redis_errors,
+            }
+
+    # ── Internals ─────────────────────────────────────────────────
+
+    def _remember(self, key: str, vec: np.ndarray) -> None:
+        """Insert into the LRU. Caller holds the lock."""
+        self._memory[key] = vec
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_size:
+            self._memory.popitem(last=False)
+
+    def _get_redis(self):
+        if self.redis_url is None or time.time() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            import redis
+            self._redis = redis.from_url(
+                self.redis_url,
+                socket_connect_timeout=0.5,
+                socket_timeout=0.5,
+            )
+        return self._redis
+
+    def _redis_failed(self, error: Exception) -> None:
+        logger.warning(f"Embedding cache Redis tier unavailable: {error}")
+        with self._lock:
+            self._redis_errors += 1
+        self._redis_down_until = time.time() + REDIS_RETRY_COOLDOWN_SECONDS
+
+    def _redis_get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        client = self._get_redis()
+        if client is None:
+            return {}
+        try:
+            values = client.mget([f"{REDIS_KEY_PREFIX}:{k}" for k in keys])
+        except Exception as e:
+            self._redis_failed(e)
+            return {}
+        return {
+            key: np.frombuffer(raw, dtype=np.float32)
+            for key, raw in zip(keys, values)
+            if raw
+        }
+
+    def _redis_set_many(self, arrays: Dict[str, np.ndarray]) -> None:
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, vec in arrays.items():
+                pipe.set(f"{REDIS_KEY_PREFIX}:{key}", vec.tobytes(), ex=self.ttl_seconds)
+            pipe.execute()
+        except Exception as e:
+            self._redis_failed(e)
+
+
+# Global cache instance
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get or create the process-wide embedding cache."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(
+            redis_url=config.REDIS_URL if config.EMBEDDING_CACHE_REDIS else None,
+        )
+    return _embedding_cache
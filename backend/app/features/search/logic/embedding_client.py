@@ -0,0 +1,266 @@
+"""
+Batched embedding client for Ollama.
+
+Replaces one-connection-per-chunk `requests.post` calls with:
+- Pooled keep-alive connections from the shared Ollama transport
+- True batch requests via POST /api/embed (`input` accepts a list of strings)
+- Bounded concurrency across batches (ThreadPoolExecutor)
+- Per-batch retry with exponential backoff on transient failures
+- Content-addressed cache lookups before any request (see embedding_cache.py)
+
+Older Ollama builds without /api/embed fall back to per-text
+POST /api/embeddings over the same pooled session.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import requests
+
+from core import config
+from core.ollama_transport import OllamaTransport, get_ollama_transport
+from features.search.logic.embedding_cache import (
+    EmbeddingCache,
+    get_embedding_cache,
+    make_cache_key,
+    normalize_text,
+)
+
+logger = logging.getLogger(__name__)
+
+# Status codes worth retrying (Ollama returns 503 while a model is loading)
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRY_BACKOFF_SECONDS = 1.0
+
+
+class EmbeddingClient:
+    """
+    Thread-safe, pooled embedding client.
+
+    Args:
+        host: Ollama base URL
+        model: Embedding model name
+        dimension: Expected embedding dimension (mismatches are dropped)
+        max_text_length: Characters kept per input before sending
+        batch_size: Inputs per /api/embed request
+        max_concurrency: Batches in flight at once
+        max_retries: Retries per batch after the first attempt
+        timeout: Seconds per batch request
+        cache: Optional embedding cache consulted before calling Ollama
+        transport: Ollama transport (defaults to the shared process pool)
+    """
+
+    def __init__(
+        self,
+        host: str,
+        model: str,
+        dimension: int,
+        max_text_length: int,
+        batch_size: int = config.EMBEDDING_BATCH_SIZE,
+        max_concurrency: int = config.EMBEDDING_MAX_CONCURRENCY,
+        max_retries: int = config.EMBEDDING_MAX_RETRIES,
+        timeout: int = config.EMBEDDING_TIMEOUT,
+        cache: Optional[EmbeddingCache] = None,
+        transport: Optional[OllamaTransport] = None,
+    ) -> None:
+        self.host = host.rstrip("/")
+        self.model = model
+        self.dimension = dimension
+        self.max_text_length = max_text_length
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.timeout = timeout
+        self.cache = cache
+
+        self._batch_supported = True
+        self._transport = transport or get_ollama_transport()
+
+    # ── Public API ────────────────────────────────────────────────
+
+    def embed(self, text: str) -> Optional[List[float]]:
+        """Embed a single text. Returns None on empty input or failure."""
+        return self.embed_batch([text])[0]
+
+    def embed_batch(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Embed many texts, preserving input order.
+
+        Empty texts and texts whose batch fails after all retries map to None.
+        """
+        results: List[Optional[List[float]]] = [None] * len(texts)
+
+        # Only non-empty inputs are sent; remember where they came from
+        prepared = [self._prepare(t) for t in texts]
+        positions = [i for i, t in enumerate(prepared) if t]
+        if not positions:
+            return results
+
+        # Serve cache hits; send each distinct miss to Ollama once
+        keys = {i: make_cache_key(self.model, prepared[i]) for i in positions}
+        hits = self.cache.get_many(list(set(keys.values()))) if self.cache else {}
+        pending: Dict[str, List[int]] = {}
+        for i in positions:
+            if keys[i] in hits:
+                results[i] = hits[keys[i]]
+            else:
+                pending.setdefault(prepared[i], []).append(i)
+
+        unique_texts = list(pending)
+        batches = [
+            unique_texts[i:i + self.batch_size]
+            for i in range(0, len(unique_texts), self.batch_size)
+        ]
+
+        def run(inputs: List[str]) -> None:
+            vectors = self._embed_with_retry(inputs)
+            for text, vec in zip(inputs, vectors):
+                for pos in pending[text]:
+                    results[pos] = vec
+
+        if len(batches) == 1:
+            run(batches[0])
+        elif batches:
+            workers = min(self.max_concurrency, len(batches))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                list(executor.map(run, batches))
+
+        if self.cache and unique_texts:
+            self.cache.set_many({
+                keys[pending[text][0]]: results[pending[text][0]]
+                for text in unique_texts
+                if results[pending[text][0]] is not None
+            })
+
+        embedded = sum(1 for r in results if r is not None)
+        logger.debug(
+            f"Embedded {embedded}/{len(positions)} texts "
+            f"({len(positions) - sum(len(p) for p in pending.values())} cached, "
+            f"{len(batches)} batch(es)) with {self.model}"
+        )
+        return results
+
+    def close(self) -> None:
+        """Close pooled connections (the transport reopens them on next use)."""
+        self._transport.close()
+
+    # ── Internals ─────────────────────────────────────────────────
+
+    def _prepare(self, text: Optional[str]) -> str:
+        if not text:
+            return ""
+        return normalize_text(text[:self.max_text_length])
+
+    def _embed_with_retry(self, inputs: List[str]) -> List[Optional[List[float]]]:
+        """Send one batch, retrying transient errors with exponential backoff."""
+        last_error: Optional[Exception] = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                if self._batch_supported:
+                    vectors = self._post_embed(inputs)
+                else:
+                    vectors = [self._post_legacy(text) for text in inputs]
+                return [self._validate(v) for v in vectors]
+
+            except requests.exceptions.HTTPError as e:
+                status = e.response.status_code if e.response is not None else None
+                if status == 404 and self._batch_supported and self._is_missing_route(e):
+                    logger.warning(
+                        "Ollama /api/embed not available, "
+                        "falling back to per-text /api/embeddings"
+                    )
+                    self._batch_supported = False
+                    return self._embed_with_retry(inputs)
+                if status not in RETRYABLE_STATUS_CODES:
+                    logger.error(f"Embedding batch failed (HTTP {status}): {e}")
+                    break
+                last_error = e
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                last_error = e
+            except Exception as e:
+                logger.error(f"Unexpected embedding batch error: {e}", exc_info=True)
+                break
+
+            if attempt < self.max_retries:
+                delay = RETRY_BACKOFF_SECONDS * (2 ** attempt)
+                logger.warning(
+                    f"Embedding batch of {len(inputs)} failed ({last_error}), "
+                    f"retry {attempt + 1}/{self.max_retries} in {delay:.0f}s"
+                )
+                time.sleep(delay)
+            else:
+                logger.error(
+                    f"Embedding batch of {len(inputs)} failed after "
+                    f"{self.max_retries} retries: {last_error}"
+                )
+
+        return [None] * len(inputs)
+
+    @staticmethod
+    def _is_missing_route(error: requests.exceptions.HTTPError) -> bool:
+        """Ollama answers 404 both for unknown routes and unknown models."""
+        return "model" not in (error.response.text or "").lower()
+
+    def _post_embed(self, inputs: List[str]) -> List[List[float]]:
+        response = self._transport.post(
+            f"{self.host}/api/embed",
+            json={"model": self.model, "input": inputs},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        embeddings = response.json().get("embeddings") or []
+        if len(embeddings) != len(inputs):
+            raise ValueError(
+                f"Embedding count mismatch: got {len(embeddings)}, sent {len(inputs)}"
+            )
+        return embeddings
+
+    def _post_legacy(self, text: str) -> Optional[List[float]]:
+        response = self._transport.post(
+            f"{self.host}/api/embeddings",
+            json={"model": self.model, "prompt": text},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json().get("embedding")
+
+    def _validate(self, vector: Optional[List[float]]) -> Optional[List[float]]:
+        if not vector:
+            return None
+        if len(vector) != self.dimension:
+            logger.error(
+                f"Unexpected embedding dimension: {len(vector)} "
+                f"(expected {self.dimension})"
+            )
+            return None
+        return vector
+
+
+# Global client instance (one pool per process)
+_embedding_client: Optional[EmbeddingClient] = None
+_client_lock = threading.Lock()
+
+
+def get_embedding_client() -> EmbeddingClient:
+    """Get or create the process-wide embedding client."""
+    global _embedding_client
+    if _embedding_client is None:
+        with _client_lock:
+            if _embedding_client is None:
+                from features.search.logic.embeddings import (
+                    OLLAMA_HOST,
+                    EMBEDDING_MODEL,
+                    EMBEDDING_DIMENSION,
+                    MAX_TEXT_LENGTH,
+                )
+                _embedding_client = EmbeddingClient(
+                    host=OLLAMA_HOST,
+                    model=EMBEDDING_MODEL,
+                    dimension=EMBEDDING_DIMENSION,
+                    max_text_length=MAX_TEXT_LENGTH,
+                    cache=get_embedding_cache(),
+                )
+    return _embedding_client
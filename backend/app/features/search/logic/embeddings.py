@@ -5,9 +5,9 @@ This module provides functions to generate embeddings using Ollama's nomic-embed
 Embeddings are 768-dimensional vectors used for semantic similarity search via pgvector.
 
 Ollama API:
-- Endpoint: POST /api/embeddings
+- Endpoint: POST /api/embed (batched, via EmbeddingClient in embedding_client.py)
 - Model: nomic-embed-text (274MB, 768 dimensions)
-- Timeout: 30 seconds per request
+- Pooled keep-alive session with per-batch retry
 
 pgvector Integration:
 - Embeddings stored in Note.embedding column (vector(768))
@@ -16,10 +16,11 @@ pgvector Integration:
 """
 
 import os
-import requests
 import logging
 from typing import List, Optional
 
+from core.ollama_transport import get_ollama_transport
+
 logger = logging.getLogger(__name__)
 
 # Get Ollama host from environment
@@ -41,9 +42,6 @@ def generate_embedding(text: str) -> Optional[List[float]]:
 
     Returns:
         List of 768 floats representing the embedding vector, or None if generation fails
-
-    Raises:
-        requests.exceptions.RequestException: If the Ollama API request fails
     """
     if not text or not text.strip():
         logger.warning("Empty text provided for embedding generation")
@@ -56,47 +54,10 @@ def generate_embedding(text: str) -> Optional[List[float]]:
         logger.warning("Text became empty after truncation and stripping")
         return None
 
-    try:
-        logger.info(f"Generating embedding for text (length: {len(text_to_embed)} chars)")
-
-        # Call Ollama embedding API
-        response = requests.post(
-            f"{OLLAMA_HOST}/api/embeddings",
-            json={
-                "model": EMBEDDING_MODEL,
-                "prompt": text_to_embed
-            },
-            timeout=30  # 30 second timeout
-        )
-
-        response.raise_for_status()
-        data = response.json()
-
-        embedding = data.get("embedding")
-
-        if not embedding:
-            logger.error(f"No embedding in response: {data}")
-            return None
+    from features.search.logic.embedding_client import get_embedding_client
 
-        if len(embedding) != EMBEDDING_DIMENSION:
-            logger.error(
-                f"Unexpected embedding dimension: {len(embedding)} "
-                f"(expected {EMBEDDING_DIMENSION})"
-            )
-            return None
-
-        logger.info(f"Successfully generated {len(embedding)}-dimensional embedding")
-        return embedding
-
-    except requests.exceptions.Timeout:
-        logger.error(f"Timeout while generating embedding (>{30}s)")
-        return None
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to generate embedding: {str(e)}", exc_info=True)
-        return None
-    except Exception as e:
-        logger.error(f"Unexpected error generating embedding: {str(e)}", exc_info=True)
-        return None
+    logger.debug(f"Generating embedding for text (length: {len(text_to_embed)} chars)")
+    return get_embedding_client().embed(text_to_embed)
 
 
 def prepare_note_text(title: str, content: str) -> str:
@@ -158,7 +119,7 @@ def check_ollama_health() -> bool:
     """
     try:
         # Check if Ollama is reachable
-        response = requests.get(f"{OLLAMA_HOST}/api/tags", timeout=5)
+        response = get_ollama_transport().get(f"{OLLAMA_HOST}/api/tags", timeout=5)
         response.raise_for_status()
 
         # Check if required model is available
@@ -186,25 +147,20 @@ def batch_generate_embeddings(texts: List[str]) -> List[Optional[List[float]]]:
     """
     Generate embeddings for multiple texts.
 
-    Processes texts sequentially (Ollama doesn't support batch requests).
+    Sends texts to Ollama's /api/embed in batches over a pooled session,
+    with bounded concurrency and per-batch retry (see EmbeddingClient).
     Returns None for any text that fails to generate an embedding.
 
     Args:
         texts: List of texts to generate embeddings for
 
     Returns:
-        List of embeddings (or None for failed generations)
+        List of embeddings (or None for failed generations), in input order
     """
-    embeddings = []
-    for i, text in enumerate(texts):
-        try:
-            embedding = generate_embedding(text)
-            embeddings.append(embedding)
-            if embedding:
-                logger.debug(f"Generated embedding {i+1}/{len(texts)}")
-            else:
-                logger.warning(f"Failed to generate embedding {i+1}/{len(texts)}")
-        except Exception as e:
-            logger.error(f"Error generating embedding {i+1}/{len(texts)}: {e}")
-            embeddings.append(None)
+    from features.search.logic.embedding_client import get_embedding_client
+
+    embeddings = get_embedding_client().embed_batch(texts)
+    failed = sum(1 for e in embeddings if e is None)
+    if failed:
+        logger.warning(f"Failed to generate {failed}/{len(texts)} embeddings")
     return embeddings
@@ -8,7 +8,8 @@ This module provides functions for:
 - Combined search across all entities
 
 PostgreSQL Extensions Used:
-- tsvector/tsquery: Full-text search with ranking
+- tsvector/tsquery: Full-text search with ranking on the stored, weighted
+  search_vector columns (websearch_to_tsquery query syntax)
 - pg_trgm: Trigram similarity for fuzzy tag matching
 - GIN indexes: Fast full-text search indexing
 """
@@ -23,6 +24,10 @@ from features.search.logic.fulltext_helpers import parse_search_query
 
 logger = logging.getLogger(__name__)
 
+# Note results carry a content preview, not the whole note; clients open
+# the note by id. Keeps wide result pages from shipping full note bodies.
+NOTE_SNIPPET_CHARS = 300
+
 
 def search_notes_fulltext(
     db: Session,
@@ -39,7 +44,7 @@ def search_notes_fulltext(
     Uses ts_rank for relevance scoring based on term frequency.
 
     PostgreSQL Query:
-    - Uses search_vector column (pre-computed tsvector)
+    - Uses search_vector column (pre-computed tsvector, title weighted above content)
     - Ranks results using ts_rank algorithm
     - Supports date filtering and multiple sort orders
 
@@ -52,7 +57,8 @@ def search_notes_fulltext(
         limit: Maximum results to return
 
     Returns:
-        List of note dictionaries with relevance scores
+        List of note dictionaries with relevance scores; content is the
+        first NOTE_SNIPPET_CHARS characters of the note
     """
     if not query or not query.strip():
         return []
@@ -64,11 +70,11 @@ def search_notes_fulltext(
         SELECT
             n.id,
             n.title,
-            n.content,
+            LEFT(n.content, :snippet_chars) AS content,
             n.slug,
             n.created_at,
             n.updated_at,
-            ts_rank(n.search_vector, to_tsquery('english', :tsquery)) as score,
+            ts_rank(n.search_vector, query) as score,
             ARRAY(
                 SELECT json_build_object('id', t.id, 'name', t.name)
                 FROM tags t
@@ -77,10 +83,10 @@ def search_notes_fulltext(
                 ORDER BY t.name
                 LIMIT 10
             ) as tags
-        FROM notes n
+        FROM notes n, websearch_to_tsquery('english', :tsquery) AS query
         WHERE
             n.owner_id = :owner_id
-            AND n.search_vector @@ to_tsquery('english', :tsquery)
+            AND n.search_vector @@ query
             AND (:date_range = 'all' OR
                  (:date_range = 'today' AND n.created_at >= CURRENT_DATE) OR
                  (:date_range = 'week' AND n.created_at >= CURRENT_DATE - INTERVAL '7 days') OR
@@ -88,7 +94,7 @@ def search_notes_fulltext(
                  (:date_range = 'year' AND n.created_at >= CURRENT_DATE - INTERVAL '365 days'))
         ORDER BY
             CASE
-                WHEN :sort_by = 'relevance' THEN ts_rank(n.search_vector, to_tsquery('english', :tsquery))
+                WHEN :sort_by = 'relevance' THEN ts_rank(n.search_vector, query)
                 ELSE 0
             END DESC,
             CASE
@@ -107,7 +113,8 @@ def search_notes_fulltext(
         "owner_id": owner_id,
         "date_range": date_range,
         "sort_by": sort_by,
-        "limit": limit
+        "limit": limit,
+        "snippet_chars": NOTE_SNIPPET_CHARS
     })
 
     notes = []
@@ -166,7 +173,7 @@ def search_images_fulltext(
             i.ai_analysis_status,
             i.ai_analysis_result,
             i.uploaded_at,
-            ts_rank(i.search_vector, to_tsquery('english', :tsquery)) as score,
+            ts_rank(i.search_vector, query) as score,
             ARRAY(
                 SELECT json_build_object('id', t.id, 'name', t.name)
                 FROM tags t
@@ -175,10 +182,10 @@ def search_images_fulltext(
                 ORDER BY t.name
                 LIMIT 10
             ) as tags
-        FROM images i
+        FROM images i, websearch_to_tsquery('english', :tsquery) AS query
         WHERE
             i.owner_id = :owner_id
-            AND i.search_vector @@ to_tsquery('english', :tsquery)
+            AND i.search_vector @@ query
             AND (:date_range = 'all' OR
                  (:date_range = 'today' AND i.uploaded_at >= CURRENT_DATE) OR
                  (:date_range = 'week' AND i.uploaded_at >= CURRENT_DATE - INTERVAL '7 days') OR
@@ -186,7 +193,7 @@ def search_images_fulltext(
                  (:date_range = 'year' AND i.uploaded_at >= CURRENT_DATE - INTERVAL '365 days'))
         ORDER BY
             CASE
-                WHEN :sort_by = 'relevance' THEN ts_rank(i.search_vector, to_tsquery('english', :tsquery))
+                WHEN :sort_by = 'relevance' THEN ts_rank(i.search_vector, query)
                 ELSE 0
             END DESC,
             CASE
@@ -10,32 +10,25 @@ from sqlalchemy import text
 
 def parse_search_query(query: str) -> str:
     """
-    Parse user search query into PostgreSQL tsquery format.
+    Normalize a user search query for PostgreSQL websearch_to_tsquery.
 
-    Handles:
-    - Multiple words: "machine learning" -> "machine & learning"
-    - Quoted phrases: '"exact phrase"' -> "exact <-> phrase"
-    - Single words: "python" -> "python"
+    websearch_to_tsquery understands the usual search-box syntax and never
+    raises on malformed input:
+    - Multiple words: "machine learning" -> 'machin' & 'learn'
+    - Quoted phrases: '"exact phrase"' -> 'exact' <-> 'phrase'
+    - OR / exclusion: "cats or dogs -birds" -> 'cat' | 'dog' & !'bird'
 
     Args:
         query: Raw search query from user
 
     Returns:
-        PostgreSQL tsquery-compatible string
+        Query string for websearch_to_tsquery('english', ...)
     """
     if not query or not query.strip():
         return ""
 
-    # Remove extra whitespace
-    query = query.strip()
-
-    # For now, use simple AND logic between words
-    # Future: Could add support for OR, NOT, phrase matching
-    words = query.split()
-
-    # Escape special characters and join with &
-    escaped_words = [word.replace("'", "''") for word in words]
-    return " & ".join(escaped_words)
+    # Collapse whitespace; operators are interpreted by PostgreSQL
+    return " ".join(query.split())
 
 
 def apply_date_filter(query_base, date_range: str, date_column: str):
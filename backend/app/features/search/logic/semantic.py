@@ -9,8 +9,8 @@ This module provides functions for:
 pgvector Integration:
 - Uses cosine distance operator (<=>)
 - Similarity = 1 - distance (so higher = more similar)
-- Threshold filtering for quality control
-- ivfflat index for efficient nearest neighbor search
+- Threshold filtering for quality control (applied after the ANN scan)
+- HNSW index for efficient nearest neighbor search
 
 Typical thresholds:
 - 0.5: Very loose matching (exploratory)
@@ -26,6 +26,11 @@ import logging
 
 from models import Note
 from features.search.logic.embeddings import generate_embedding
+from core.vector_index import (
+    to_vector_literal,
+    similarity_from_distance,
+    apply_ann_search_params,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -67,12 +72,11 @@ def semantic_search(
         logger.error("Failed to generate query embedding")
         raise ValueError("Failed to generate query embedding. Ollama service may be unavailable.")
 
-    # Convert embedding list to pgvector string format: '[0.1,0.2,...]'
-    embedding_str = '[' + ','.join(str(x) for x in query_embedding) + ']'
-
     try:
-        # Use pgvector's cosine similarity operator (<=>)
-        # Lower distance = higher similarity, so we use 1 - distance
+        apply_ann_search_params(db)
+
+        # Order by pgvector's cosine distance operator (<=>) so the HNSW index
+        # is used; similarity = 1 - distance, thresholded on the returned rows
         query_text = text("""
             SELECT
                 id,
@@ -80,28 +84,29 @@ def semantic_search(
                 content,
                 slug,
                 created_at,
-                1 - (embedding <=> CAST(:query_embedding AS vector)) AS similarity,
+                embedding <=> CAST(:query_embedding AS vector) AS distance,
                 SUBSTRING(content, 1, 200) AS snippet
             FROM notes
             WHERE
                 owner_id = :owner_id
                 AND embedding IS NOT NULL
-                AND (1 - (embedding <=> CAST(:query_embedding AS vector))) >= :threshold
-            ORDER BY similarity DESC
+            ORDER BY embedding <=> CAST(:query_embedding AS vector)
             LIMIT :limit
         """)
 
         result = db.execute(
             query_text,
             {
-                "query_embedding": embedding_str,
+                "query_embedding": to_vector_literal(query_embedding),
                 "owner_id": owner_id,
-                "threshold": threshold,
                 "limit": limit
             }
         )
 
-        rows = result.fetchall()
+        rows = [
+            row for row in result.fetchall()
+            if similarity_from_distance(row[5]) >= threshold
+        ]
 
         results = [
             {
@@ -110,7 +115,7 @@ def semantic_search(
                 "content": row[2],
                 "slug": row[3],
                 "created_at": row[4].isoformat() if row[4] else None,
-                "similarity": float(row[5]),
+                "similarity": similarity_from_distance(row[5]),
                 "snippet": row[6] + ("..." if len(row[2] or "") > 200 else "")
             }
             for row in rows
@@ -173,29 +178,31 @@ def find_similar_notes(
                 content,
                 slug,
                 created_at,
-                1 - (embedding <=> (SELECT embedding FROM notes WHERE id = :note_id)) AS similarity,
+                embedding <=> (SELECT embedding FROM notes WHERE id = :note_id) AS distance,
                 SUBSTRING(content, 1, 200) AS snippet
             FROM notes
             WHERE
                 owner_id = :owner_id
                 AND id != :note_id
                 AND embedding IS NOT NULL
-                AND (1 - (embedding <=> (SELECT embedding FROM notes WHERE id = :note_id))) >= :threshold
-            ORDER BY similarity DESC
+            ORDER BY embedding <=> (SELECT embedding FROM notes WHERE id = :note_id)
             LIMIT :limit
         """)
 
+        apply_ann_search_params(db)
         result = db.execute(
             query_text,
             {
                 "note_id": note_id,
                 "owner_id": owner_id,
-                "threshold": threshold,
                 "limit": limit
             }
         )
 
-        rows = result.fetchall()
+        rows = [
+            row for row in result.fetchall()
+            if similarity_from_distance(row[5]) >= threshold
+        ]
 
         results = [
             {
@@ -204,7 +211,7 @@ def find_similar_notes(
                 "content": row[2],
                 "slug": row[3],
                 "created_at": row[4].isoformat() if row[4] else None,
-                "similarity": float(row[5]),
+                "similarity": similarity_from_distance(row[5]),
                 "snippet": row[6] + ("..." if len(row[2] or "") > 200 else "")
             }
             for row in rows
@@ -353,9 +360,9 @@ def semantic_search_document_chunks(
         logger.error("Failed to generate query embedding for document search")
         return []
 
-    embedding_str = '[' + ','.join(str(x) for x in query_embedding) + ']'
-
     try:
+        apply_ann_search_params(db)
+
         query_text = text("""
             SELECT
                 dc.id,
@@ -366,29 +373,30 @@ def semantic_search_document_chunks(
                 d.filename,
                 d.display_name,
                 d.ai_summary,
-                1 - (dc.embedding <=> CAST(:query_embedding AS vector)) AS similarity
+                dc.embedding <=> CAST(:query_embedding AS vector) AS distance
             FROM document_chunks dc
             JOIN documents d ON dc.document_id = d.id
             WHERE
                 d.owner_id = :owner_id
                 AND d.is_trashed = false
                 AND dc.embedding IS NOT NULL
-                AND (1 - (dc.embedding <=> CAST(:query_embedding AS vector))) >= :threshold
-            ORDER BY similarity DESC
+            ORDER BY dc.embedding <=> CAST(:query_embedding AS vector)
             LIMIT :limit
         """)
 
         result = db.execute(
             query_text,
             {
-                "query_embedding": embedding_str,
+                "query_embedding": to_vector_literal(query_embedding),
                 "owner_id": owner_id,
-                "threshold": threshold,
                 "limit": limit,
             }
         )
 
-        rows = result.fetchall()
+        rows = [
+            row for row in result.fetchall()
+            if similarity_from_distance(row[8]) >= threshold
+        ]
         results = [
             {
                 "id": row[0],
@@ -399,7 +407,7 @@ def semantic_search_document_chunks(
                 "filename": row[5],
                 "display_name": row[6] or row[5],
                 "document_summary": row[7],
-                "similarity": float(row[8]),
+                "similarity": similarity_from_distance(row[8]),
                 "type": "document_chunk",
             }
             for row in rows
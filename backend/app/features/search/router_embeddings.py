@@ -79,3 +79,18 @@ async def regenerate_note_embedding_endpoint(
             status_code=500,
             detail=f"Failed to queue embedding generation: {str(e)}"
         )
+
+
+@router.get("/embeddings/cache/stats", response_model=schemas.EmbeddingCacheStatsResponse)
+async def get_embedding_cache_stats_endpoint(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get embedding cache hit/miss counters for this worker process.
+
+    Hits are split between the in-process LRU and the shared Redis tier.
+    Misses are texts that had to be sent to the embedding model.
+    """
+    from features.search.logic.embedding_cache import get_embedding_cache
+
+    return schemas.EmbeddingCacheStatsResponse(**get_embedding_cache().stats())
@@ -143,6 +143,19 @@ class EmbeddingCoverageResponse(BaseModel):
     coverage_percent: float
 
 
+class EmbeddingCacheStatsResponse(BaseModel):
+    """Response for embedding cache statistics (per worker process)."""
+    size: int
+    max_size: int
+    memory_hits: int
+    redis_hits: int
+    misses: int
+    stores: int
+    hit_rate: float
+    redis_enabled: bool
+    redis_errors: int
+
+
 class EmbeddingRegenerateResponse(BaseModel):
     """Response for embedding regeneration request."""
     status: str = Field(..., description="Status: 'queued' or 'error'")
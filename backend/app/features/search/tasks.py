@@ -7,6 +7,7 @@ Tasks:
 """
 
 import logging
+from datetime import datetime, timezone
 from typing import Optional
 
 from core.celery_app import celery_app
@@ -83,6 +84,7 @@ def generate_note_embedding_task(self, note_id: int) -> dict:
 
             # Store embedding in database
             note.embedding = embedding
+            note.embedding_updated_at = datetime.now(timezone.utc)
             db.commit()
 
             logger.info(
@@ -14,6 +14,15 @@ from core.llm.base import ProviderType
 logger = logging.getLogger(__name__)
 
 
+def _forget_cached_credentials(user_id: int) -> None:
+    """Drop the user's cached AI settings and pooled cloud clients after a key change."""
+    from core.model_service import invalidate_user_ai_settings
+    from core.llm.registry import evict_cloud_providers
+
+    invalidate_user_ai_settings(user_id)
+    evict_cloud_providers(user_id)
+
+
 def save_api_key(
     db: Session,
     user_id: int,
@@ -51,6 +60,7 @@ def save_api_key(
 
     db.commit()
     db.refresh(existing)
+    _forget_cached_credentials(user_id)
     logger.info(f"Saved API key for user {user_id}, provider {provider}")
     return {"provider": provider, "key_hint": hint}
 
@@ -107,6 +117,7 @@ def delete_api_key(db: Session, user_id: int, provider: str) -> bool:
     ).delete()
 
     db.commit()
+    _forget_cached_credentials(user_id)
     logger.info(f"Deleted API key for user {user_id}, provider {provider}")
     return deleted > 0
 
@@ -102,7 +102,7 @@ def update_user_preferences(
     Returns:
         Tuple of (updated preferences, error message if any)
     """
-    from core.model_service import validate_model_id
+    from core.model_service import validate_model_id, invalidate_user_ai_settings
 
     preferences = get_user_preferences(db, user)
 
@@ -186,6 +186,7 @@ def update_user_preferences(
     try:
         db.commit()
         db.refresh(preferences)
+        invalidate_user_ai_settings(user.id)
         logger.info(f"Updated preferences for user {user.username}")
         return preferences, None
     except Exception as e:
@@ -205,6 +206,8 @@ def reset_user_preferences(db: Session, user: models.User) -> models.UserPrefere
     Returns:
         Reset UserPreferences object
     """
+    from core.model_service import invalidate_user_ai_settings
+
     preferences = db.query(models.UserPreferences).filter(
         models.UserPreferences.user_id == user.id
     ).first()
@@ -223,6 +226,7 @@ def reset_user_preferences(db: Session, user: models.User) -> models.UserPrefere
 
         db.commit()
         db.refresh(preferences)
+        invalidate_user_ai_settings(user.id)
         logger.info(f"Reset preferences for user {user.username}")
     else:
         preferences = create_default_preferences(db, user)
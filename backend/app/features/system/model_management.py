@@ -10,6 +10,7 @@ import requests
 from typing import Generator
 
 from core import config
+from core.ollama_transport import get_ollama_transport
 
 logger = logging.getLogger(__name__)
 
@@ -34,67 +35,66 @@ def pull_model_stream(model_name: str) -> Generator[str, None, None]:
     logger.info(f"Starting model pull: {model_name}")
 
     try:
-        response = requests.post(
+        with get_ollama_transport().post(
             url,
             json={"name": model_name, "stream": True},
             stream=True,
             timeout=600,
-        )
-
-        if response.status_code != 200:
-            error = {"status": "error", "error": f"Ollama returned {response.status_code}"}
-            yield f"data: {json.dumps(error)}\n\n"
-            return
-
-        ollama_success = False
-        ollama_error = False
+        ) as response:
+            if response.status_code != 200:
+                error = {"status": "error", "error": f"Ollama returned {response.status_code}"}
+                yield f"data: {json.dumps(error)}\n\n"
+                return
+
+            ollama_success = False
+            ollama_error = False
+
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                try:
+                    data = json.loads(line)
+
+                    # Ollama sends status "success" when pull is fully complete
+                    if data.get("status") == "success":
+                        ollama_success = True
+
+                    if data.get("error"):
+                        ollama_error = True
+                        event = {
+                            "status": "error",
+                            "error": data["error"],
+                            "percent": 0,
+                        }
+                        yield f"data: {json.dumps(event)}\n\n"
+                        return
+
+                    total = data.get("total", 0)
+                    completed = data.get("completed", 0)
+                    percent = round((completed / total) * 100, 1) if total > 0 else 0
 
-        for line in response.iter_lines():
-            if not line:
-                continue
-            try:
-                data = json.loads(line)
-
-                # Ollama sends status "success" when pull is fully complete
-                if data.get("status") == "success":
-                    ollama_success = True
-
-                if data.get("error"):
-                    ollama_error = True
                     event = {
-                        "status": "error",
-                        "error": data["error"],
-                        "percent": 0,
+                        "status": data.get("status", ""),
+                        "total": total,
+                        "completed": completed,
+                        "percent": percent,
                     }
+
                     yield f"data: {json.dumps(event)}\n\n"
-                    return
-
-                total = data.get("total", 0)
-                completed = data.get("completed", 0)
-                percent = round((completed / total) * 100, 1) if total > 0 else 0
-
-                event = {
-                    "status": data.get("status", ""),
-                    "total": total,
-                    "completed": completed,
-                    "percent": percent,
-                }
-
-                yield f"data: {json.dumps(event)}\n\n"
-            except json.JSONDecodeError:
-                continue
-
-        # Only send success if Ollama actually confirmed the pull completed
-        if ollama_success and not ollama_error:
-            from core.models_registry_helpers import invalidate_ollama_cache
-            from features.system.update_checker import invalidate_update_cache
-            invalidate_ollama_cache()
-            invalidate_update_cache(model_name)
-            yield f"data: {json.dumps({'status': 'success', 'percent': 100})}\n\n"
-        elif not ollama_error:
-            logger.warning(f"Model pull stream ended without success for {model_name}")
-            error = {"status": "error", "error": "Pull stream ended unexpectedly"}
-            yield f"data: {json.dumps(error)}\n\n"
+                except json.JSONDecodeError:
+                    continue
+
+            # Only send success if Ollama actually confirmed the pull completed
+            if ollama_success and not ollama_error:
+                from core.models_registry_helpers import invalidate_ollama_cache
+                from features.system.update_checker import invalidate_update_cache
+                invalidate_ollama_cache()
+                invalidate_update_cache(model_name)
+                yield f"data: {json.dumps({'status': 'success', 'percent': 100})}\n\n"
+            elif not ollama_error:
+                logger.warning(f"Model pull stream ended without success for {model_name}")
+                error = {"status": "error", "error": "Pull stream ended unexpectedly"}
+                yield f"data: {json.dumps(error)}\n\n"
 
     except requests.exceptions.Timeout:
         error = {"status": "error", "error": "Ollama pull timed out after 600s"}
@@ -119,7 +119,7 @@ def delete_model(model_name: str) -> dict:
     logger.info(f"Deleting model: {model_name}")
 
     try:
-        response = requests.delete(
+        response = get_ollama_transport().delete(
             url,
             json={"name": model_name},
             timeout=30,
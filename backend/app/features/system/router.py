@@ -5,6 +5,8 @@ FastAPI endpoints for system operations:
 - GET / - Root endpoint (API info)
 - GET /health - Health check for all services
 - GET /system/stuck-tasks - View items stuck in processing
+- GET /system/ollama-transport - Ollama connection pool metrics
+- GET /system/llm-cache - LLM response cache statistics
 - GET /models - List available AI models
 - GET /models/config - Get current model configuration
 """
@@ -109,6 +111,40 @@ async def get_gpu_info(
     return info
 
 
+@router.get("/system/ollama-transport")
+async def get_ollama_transport_stats(
+    current_user=Depends(get_current_user),
+):
+    """
+    Get Ollama request metrics for this worker process.
+
+    Per endpoint (/api/chat, /api/embed, ...): request and error counts,
+    a latency histogram in seconds and a response-size histogram in bytes.
+    """
+    from core.ollama_transport import get_ollama_transport
+
+    transport = get_ollama_transport()
+    return {
+        "pool_size": transport.pool_size,
+        "max_connections": transport.max_connections,
+        "endpoints": transport.stats(),
+    }
+
+
+@router.get("/system/llm-cache")
+async def get_llm_cache_stats(
+    current_user=Depends(get_current_user),
+):
+    """Get LLM response cache hit/miss statistics for this worker process."""
+    from core.llm.response_cache import get_llm_response_cache
+
+    return {
+        "enabled": config.LLM_CACHE_ENABLED,
+        "ttl_seconds": config.LLM_CACHE_TTL_SECONDS,
+        **get_llm_response_cache().stats(),
+    }
+
+
 @router.get("/models", response_model=schemas.ModelsListResponse)
 async def list_models(
     db: Session = Depends(get_db),
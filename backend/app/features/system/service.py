@@ -13,6 +13,7 @@ from sqlalchemy import text
 
 from core import config
 from core.database import SessionLocal
+from core.ollama_transport import get_ollama_transport
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +29,7 @@ def check_ollama_health() -> Tuple[str, str]:
         - 'timeout': Service timed out
     """
     try:
-        response = requests.get(
+        response = get_ollama_transport().get(
             f"{config.OLLAMA_HOST}/api/tags",
             timeout=2
         )
@@ -177,7 +178,7 @@ def get_gpu_info() -> Dict[str, any]:
         Dictionary with gpu_detected, loaded_models list, and total_vram.
     """
     try:
-        response = requests.get(
+        response = get_ollama_transport().get(
             f"{config.OLLAMA_HOST}/api/ps",
             timeout=5
         )
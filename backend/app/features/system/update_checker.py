@@ -13,6 +13,7 @@ from typing import Optional
 import requests
 
 from core import config
+from core.ollama_transport import get_ollama_transport
 
 logger = logging.getLogger(__name__)
 
@@ -44,7 +45,7 @@ def parse_model_name(name: str) -> tuple[str, str, str]:
 def get_local_model_digests() -> dict[str, str]:
     """Fetch installed models from Ollama /api/tags, return {name: digest}."""
     try:
-        resp = requests.get(f"{config.OLLAMA_HOST}/api/tags", timeout=10)
+        resp = get_ollama_transport().get(f"{config.OLLAMA_HOST}/api/tags", timeout=10)
         resp.raise_for_status()
         models = resp.json().get("models", [])
         result = {}
@@ -61,7 +61,6 @@ class TagService:
         try:
             db.commit()
             db.refresh(tag)
-            return tag
         except IntegrityError as e:
             db.rollback()
             logger.error(f"Integrity error creating tag '{tag_name}': {e}")
@@ -78,6 +77,11 @@ class TagService:
             logger.exception(f"Error creating tag '{tag_name}': {e}")
             raise HTTPException(status_code=500, detail="Failed to create tag")
 
+        # New tag node: cached graph snapshots need a full rebuild
+        from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+        invalidate_graph_snapshot(owner_id)
+        return tag
+
     @staticmethod
     def get_tags_by_user(db: Session, owner_id: int) -> List[models.Tag]:
         """
@@ -149,6 +153,9 @@ class TagService:
                 logger.exception(f"Error adding tag '{tag_name}' to note {note_id}: {e}")
                 raise HTTPException(status_code=500, detail="Failed to add tag to note")
 
+            from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+            invalidate_graph_snapshot(owner_id, [f"note-{note_id}"])
+
         return tag
 
     @staticmethod
@@ -187,12 +194,15 @@ class TagService:
             note.tags.remove(tag)
             try:
                 db.commit()
-                return True
             except Exception as e:
                 db.rollback()
                 logger.exception(f"Error removing tag {tag_id} from note {note_id}: {e}")
                 raise HTTPException(status_code=500, detail="Failed to remove tag from note")
 
+            from features.graph.services.graph_snapshot import invalidate_graph_snapshot
+            invalidate_graph_snapshot(owner_id, [f"note-{note_id}"])
+            return True
+
         return False
 
     @staticmethod
@@ -26,6 +26,7 @@ from core.auth import get_current_user, get_current_active_user, get_current_use
 from core.security_headers import SecurityHeadersMiddleware
 from core.csrf import CSRFMiddleware
 from core.llm import initialize_providers
+from core.ollama_transport import get_ollama_transport
 
 # Feature routers (fractal architecture)
 from features.auth.router import router as auth_router
@@ -164,6 +165,62 @@ try:
 except Exception as e:
     logger.warning(f"Vision model preference migration skipped: {str(e)}")
 
+# Run note chunk content hash migration
+try:
+    from migrations.add_chunk_content_hash import upgrade as add_chunk_content_hash
+    add_chunk_content_hash()
+    logger.info("Note chunk content hash migration completed")
+except Exception as e:
+    logger.warning(f"Note chunk content hash migration skipped: {str(e)}")
+
+# Build HNSW embedding indexes in the background (can take minutes on large tables)
+try:
+    from migrations.add_hnsw_indexes import upgrade_in_background as add_hnsw_indexes
+    add_hnsw_indexes()
+    logger.info("HNSW index migration started in background")
+except Exception as e:
+    logger.warning(f"HNSW index migration skipped: {str(e)}")
+
+# Run note_links migration (queues one-time backfill)
+try:
+    from migrations.add_note_links import upgrade as add_note_links
+    add_note_links()
+    logger.info("Note links migration completed")
+except Exception as e:
+    logger.warning(f"Note links migration skipped: {str(e)}")
+
+# Run note embedding timestamp migration (incremental semantic edges)
+try:
+    from migrations.add_semantic_edge_tracking import upgrade as add_semantic_edge_tracking
+    add_semantic_edge_tracking()
+    logger.info("Semantic edge tracking migration completed")
+except Exception as e:
+    logger.warning(f"Semantic edge tracking migration skipped: {str(e)}")
+
+# Run weighted search_vector migration in the background (stored tsvector + GIN; backfills every row)
+try:
+    from migrations.add_weighted_search_vectors import upgrade_in_background as add_weighted_search_vectors
+    add_weighted_search_vectors()
+    logger.info("Weighted search vector migration started in background")
+except Exception as e:
+    logger.warning(f"Weighted search vector migration skipped: {str(e)}")
+
+# Run title trigram index migration (pg_trgm GIN on notes.title/slug for title search and slugs)
+try:
+    from migrations.add_title_trigram_indexes import upgrade as add_title_trigram_indexes
+    add_title_trigram_indexes()
+    logger.info("Title trigram index migration completed")
+except Exception as e:
+    logger.warning(f"Title trigram index migration skipped: {str(e)}")
+
+# Run upload content hash migration (SHA-256/perceptual hash columns for upload dedup)
+try:
+    from migrations.add_upload_content_hashes import upgrade as add_upload_content_hashes
+    add_upload_content_hashes()
+    logger.info("Upload content hash migration completed")
+except Exception as e:
+    logger.warning(f"Upload content hash migration skipped: {str(e)}")
+
 # Initialize LLM provider registry
 try:
     initialize_providers()
@@ -180,6 +237,13 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 # Register exception handlers
 register_exception_handlers(app)
 
+
+@app.on_event("shutdown")
+async def close_ollama_transport():
+    """Close pooled Ollama connections (sync session and async client)."""
+    await get_ollama_transport().aclose()
+
+
 # Include feature routers (fractal architecture)
 app.include_router(auth_router)
 app.include_router(auth_account_router)  # Phase 2: Account management endpoints
@@ -218,7 +282,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=config.CORS_ALLOW_METHODS,
     allow_headers=config.CORS_ALLOW_HEADERS + ["X-CSRF-Token"],  # Include CSRF header
-    expose_headers=["X-Request-ID", "X-CSRF-Token"],  # Allow frontend to read CSRF token
+    expose_headers=["X-Request-ID", "X-CSRF-Token", "X-Next-Cursor"],  # Allow frontend to read CSRF token and page cursors
     max_age=600,  # Cache preflight requests for 10 minutes
 )
 
@@ -304,7 +368,7 @@ async def chat_with_ai(
         full_prompt = f"Context (recent notes):\n{context}\n\nUser question: {chat_request.text}\n\nPlease answer based on the context if relevant, or provide general assistance."
 
         logger.debug("Sending chat request to Ollama")
-        response = requests.post(
+        response = get_ollama_transport().post(
             f"{config.OLLAMA_HOST}/api/generate",
             json={
                 "model": "llama3.2-vision:11b",
@@ -7,12 +7,14 @@ Implements Strangler Fig Pattern for gradual migration.
 
 import random
 import logging
+import time
 from typing import Dict, Optional
 from enum import Enum
 
 from adapters.llama_vision_adapter import LlamaVisionAdapter
 from adapters.qwen_vision_adapter import QwenVisionAdapter
 from adapters.generic_vision_adapter import GenericVisionAdapter
+from adapters.image_preprocessor import try_prepare_image
 from prompts.adaptive_vision_prompt import AdaptiveVisionPrompt, ADAPTIVE_VISION_PROMPT_V1, LEGACY_PROMPT_TEXT
 from core import config
 
@@ -274,20 +276,12 @@ Please incorporate this context into your analysis while following all the instr
 
         try:
             if use_new:
-                result = self.qwen_adapter.analyze_image(
-                    image_path=image_path,
-                    prompt=prompt,
-                    timeout=timeout
-                )
+                result = self._run_adapter(self.qwen_adapter, image_path, prompt, timeout)
                 # Check for error result (model crash returns status="error")
                 if result.get("status") == "error":
                     raise RuntimeError(result.get("error", "Qwen returned error"))
             else:
-                result = self.llama_adapter.analyze_image(
-                    image_path=image_path,
-                    prompt=prompt,
-                    timeout=timeout
-                )
+                result = self._run_adapter(self.llama_adapter, image_path, prompt, timeout)
 
         except Exception as primary_error:
             # Fallback: if Qwen failed, retry with Llama
@@ -301,11 +295,7 @@ Please incorporate this context into your analysis while following all the instr
                     if custom_prompt and custom_prompt.strip():
                         fallback_prompt = f"{base_prompt}\n\nADDITIONAL CONTEXT FROM USER:\n{custom_prompt.strip()}"
 
-                    result = self.llama_adapter.analyze_image(
-                        image_path=image_path,
-                        prompt=fallback_prompt,
-                        timeout=timeout
-                    )
+                    result = self._run_adapter(self.llama_adapter, image_path, fallback_prompt, timeout)
                     if result.get("status") == "error":
                         raise RuntimeError(result.get("error", "Llama fallback returned error"))
                     fell_back = True
@@ -355,6 +345,36 @@ Please incorporate this context into your analysis while following all the instr
 
         return result
 
+    def _run_adapter(self, adapter, image_path: str, prompt: str, timeout: int) -> Dict[str, any]:
+        """
+        Call an adapter with the image pre-processed for its model.
+
+        Adds latency_ms and, when the image was prepared, a preprocessing
+        dict (original/prepared bytes, bytes saved, cache hit) to the result.
+        """
+        prepared = try_prepare_image(image_path, adapter.model_name)
+
+        started = time.perf_counter()
+        result = adapter.analyze_image(
+            image_path=prepared.path if prepared else image_path,
+            prompt=prompt,
+            timeout=timeout
+        )
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        result["latency_ms"] = round(latency_ms)
+        if prepared:
+            result["preprocessing"] = prepared.to_dict()
+            logger.info(
+                f"Vision call {adapter.model_name}: {latency_ms:.0f}ms, "
+                f"image {prepared.original_bytes} -> {prepared.prepared_bytes} bytes "
+                f"({prepared.bytes_saved} saved, max_edge={prepared.max_edge}, "
+                f"{'cached' if prepared.cache_hit else f'prepared in {prepared.prepare_ms:.0f}ms'})"
+            )
+        else:
+            logger.info(f"Vision call {adapter.model_name}: {latency_ms:.0f}ms, original image")
+        return result
+
     def _analyze_with_generic(
         self, image_path: str, custom_prompt: Optional[str], timeout: int,
     ) -> Dict[str, any]:
@@ -366,7 +386,7 @@ Please incorporate this context into your analysis while following all the instr
             prompt = base_prompt
 
         logger.info(f"Using user-selected vision model: {self.generic_adapter.model_name}")
-        result = self.generic_adapter.analyze_image(image_path, prompt, timeout)
+        result = self._run_adapter(self.generic_adapter, image_path, prompt, timeout)
 
         result["model_selection"] = "user_override"
         result["prompt_selection"] = prompt_selection.value
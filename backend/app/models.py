@@ -1,4 +1,4 @@
-﻿from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Float, UniqueConstraint
+﻿from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Boolean, Float, UniqueConstraint, BigInteger
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -55,6 +55,9 @@ class Image(Base):
     width = Column(Integer, nullable=True)  # Original image width
     height = Column(Integer, nullable=True)  # Original image height
     file_size = Column(Integer, nullable=True)  # File size in bytes
+    # Upload deduplication
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the file
+    perceptual_hash = Column(BigInteger, nullable=True)  # 64-bit dHash (signed) for near-duplicates
     # Favorites and Trash (Phase 4)
     is_favorite = Column(Boolean, default=False, nullable=False)
     is_trashed = Column(Boolean, default=False, nullable=False)
@@ -79,6 +82,7 @@ class Note(Base):
     is_standalone = Column(Boolean, default=True, nullable=False)  # True if note created independently
     source = Column(String, default='manual', nullable=False, index=True)  # 'manual' | 'image_analysis' | 'document_analysis'
     embedding = Column(Vector(768), nullable=True)  # Semantic search embedding (768-dim from nomic-embed-text)
+    embedding_updated_at = Column(DateTime(timezone=True), nullable=True)  # Drives incremental semantic edges
     # Favorites, Trash, and Review Status (Notes Section)
     is_favorite = Column(Boolean, default=False, nullable=False, index=True)
     is_trashed = Column(Boolean, default=False, nullable=False, index=True)
@@ -121,6 +125,15 @@ class NoteTag(Base):
     tag_id = Column(Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True)
 
 
+class NoteLink(Base):
+    """Resolved [[wikilink]] from one note to another (maintained on note writes)."""
+    __tablename__ = "note_links"
+
+    source_note_id = Column(Integer, ForeignKey("notes.id", ondelete="CASCADE"), primary_key=True)
+    target_note_id = Column(Integer, ForeignKey("notes.id", ondelete="CASCADE"), primary_key=True, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class ImageTag(Base):
     """Junction table for image-to-tag many-to-many relationship."""
     __tablename__ = "image_tags"
@@ -197,6 +210,7 @@ class NoteChunk(Base):
     chunk_type = Column(String(20), nullable=True)  # 'paragraph', 'heading', 'list', 'code'
     char_start = Column(Integer, nullable=False)  # Start position in original note
     char_end = Column(Integer, nullable=False)  # End position in original note
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of content (reuse on re-chunk)
     embedding = Column(Vector(768), nullable=True)  # Chunk-level embedding
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -485,6 +499,8 @@ class Document(Base):
     filepath = Column(String, nullable=False)
     display_name = Column(String(255), nullable=True)
     file_size = Column(Integer, nullable=True)
+    content_hash = Column(String(64), nullable=True)  # SHA-256 of the file (upload dedup)
+    analysis_instructions = Column(Text, nullable=True)  # Custom instructions the analysis ran with
     page_count = Column(Integer, nullable=True)
     document_type = Column(String(50), nullable=True)
     thumbnail_path = Column(String(500), nullable=True)
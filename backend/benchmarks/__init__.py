@@ -0,0 +1 @@
+"""Standalone performance benchmarks. Not imported by the application."""
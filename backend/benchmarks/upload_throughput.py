@@ -0,0 +1,140 @@
+"""
+Benchmark: concurrent image uploads, in-loop vs. streamed + threadpool.
+
+Serves two upload endpoints from one in-process FastAPI app:
+
+    /legacy    await file.read(); write bytes; blurhash - all on the event loop
+    /streamed  core.uploads.stream_upload_to_disk(); blurhash in the threadpool
+
+and fires --concurrency simultaneous uploads of a synthetic JPEG at each,
+while a probe requests a trivial /ping endpoint every 10 ms. Reports upload
+throughput and how late each ping completes (event-loop lag), which is
+what every other user sees while the uploads run. Database writes are left
+out so only the request path differs. Client, server and multipart parsing
+share one process, so absolute numbers are pessimistic; compare the rows.
+
+Run (from backend/, no services needed):
+    python benchmarks/upload_throughput.py --uploads 40 --concurrency 8 --megapixels 12
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from typing import List
+
+import httpx
+from fastapi import FastAPI, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from PIL import Image as PILImage
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "app"))
+
+from core.uploads import stream_upload_to_disk  # noqa: E402
+from features.images.services.image_crud import ImageCRUDService  # noqa: E402
+
+MAX_BYTES = 50 * 1024 * 1024
+
+
+def _make_app(upload_dir: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    @app.post("/legacy")
+    async def legacy(file: UploadFile):
+        contents = await file.read()
+        path = os.path.join(upload_dir, f"{uuid.uuid4()}.jpg")
+        with open(path, "wb") as f:
+            f.write(contents)
+        return {"blur_hash": ImageCRUDService.generate_blur_hash(contents)[0]}
+
+    @app.post("/streamed")
+    async def streamed(file: UploadFile):
+        stored = await stream_upload_to_disk(file, upload_dir, max_bytes=MAX_BYTES)
+        path = stored.commit(f"{uuid.uuid4()}.jpg")
+        blur_hash, _, _ = await run_in_threadpool(ImageCRUDService.generate_blur_hash, path)
+        return {"blur_hash": blur_hash}
+
+    return app
+
+
+def _jpeg(megapixels: float) -> bytes:
+    width = int((megapixels * 1_000_000 * 4 / 3) ** 0.5)
+    buffer = io.BytesIO()
+    PILImage.effect_noise((width, width * 3 // 4), 48).convert("RGB").save(buffer, "JPEG", quality=90)
+    return buffer.getvalue()
+
+
+def _percentiles(timings: List[float]) -> str:
+    ordered = sorted(timings)
+    p50 = statistics.median(ordered)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"p50={p50:8.2f} ms  p95={p95:8.2f} ms  max={ordered[-1]:8.2f} ms"
+
+
+async def _run(client: httpx.AsyncClient, endpoint: str, image: bytes, uploads: int, concurrency: int,
+               report: bool = True) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    done = asyncio.Event()
+    pings: List[float] = []
+
+    async def upload():
+        async with semaphore:
+            response = await client.post(endpoint, files={"file": ("photo.jpg", image, "image/jpeg")})
+            response.raise_for_status()
+
+    async def probe():
+        # Delay past the 10 ms schedule, so event-loop stalls count too
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            await client.get("/ping")
+            pings.append((time.perf_counter() - started) * 1000 - 10)
+
+    prober = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(upload() for _ in range(uploads)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await prober
+
+    if not report:
+        return
+    megabytes = uploads * len(image) / 1024 / 1024
+    print(f"{endpoint:10} {uploads / elapsed:6.1f} uploads/s  {megabytes / elapsed:7.1f} MB/s")
+    print(f"{'':10} ping lag during uploads: {_percentiles(pings)}  ({len(pings)} probes)")
+
+
+async def run(uploads: int, concurrency: int, megapixels: float) -> None:
+    image = _jpeg(megapixels)
+    print(f"{uploads} uploads of a {megapixels:g} MP JPEG ({len(image) / 1024 / 1024:.1f} MB), "
+          f"concurrency {concurrency}\n")
+
+    with tempfile.TemporaryDirectory() as upload_dir:
+        transport = httpx.ASGITransport(app=_make_app(upload_dir))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await _run(client, "/streamed", image, 2, 2, report=False)  # warm-up
+            for endpoint in ("/legacy", "/streamed"):
+                await _run(client, endpoint, image, uploads, concurrency)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--uploads", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--megapixels", type=float, default=12)
+    args = parser.parse_args()
+
+    asyncio.run(run(uploads=args.uploads, concurrency=args.concurrency, megapixels=args.megapixels))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Migration: Add content_hash column to note_chunks table.
+
+Adds:
+- content_hash VARCHAR(64) NULL: SHA-256 of the chunk text, used by
+  incremental re-chunking to keep unchanged chunks (and their embeddings)
+
+Existing rows are left NULL; the chunk task hashes their content on the fly
+and fills the column the next time the note is re-chunked.
+
+Run: docker-compose exec backend python -m migrations.add_chunk_content_hash
+"""
+
+import logging
+from sqlalchemy import text
+from core.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade():
+    """Add content_hash to note_chunks."""
+    with engine.connect() as conn:
+        result = conn.execute(text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_name = 'note_chunks' AND column_name = 'content_hash'"
+        ))
+        if result.fetchone():
+            logger.info("note_chunks.content_hash already exists, skipping")
+            return
+
+        logger.info("Adding content_hash column to note_chunks...")
+        conn.execute(text(
+            "ALTER TABLE note_chunks ADD COLUMN content_hash VARCHAR(64) NULL"
+        ))
+
+        conn.commit()
+        logger.info("Note chunk content hash migration completed successfully")
+
+
+if __name__ == "__main__":
+    upgrade()
@@ -0,0 +1,169 @@
+"""
+Migration: Replace IVFFlat embedding indexes with HNSW indexes.
+
+Creates an HNSW index (vector_cosine_ops) on the embedding column of:
+- notes
+- note_chunks
+- image_chunks
+- document_chunks
+- brain_files
+
+Once an HNSW index is built and valid, drops the IVFFlat index it replaces
+(idx_notes_embedding, idx_note_chunks_embedding, idx_image_chunks_embedding).
+If a build fails the IVFFlat index is kept. IVFFlat with a fixed
+lists=100 built on an almost empty table gave poor recall; HNSW needs no
+training data and keeps recall high as tables grow.
+
+Build parameters come from core.config (PGVECTOR_HNSW_M,
+PGVECTOR_HNSW_EF_CONSTRUCTION). Query-time hnsw.ef_search is set per
+transaction by core.vector_index.apply_ann_search_params.
+
+Indexes are built CONCURRENTLY so writes are not blocked. An interrupted
+concurrent build leaves an INVALID index behind; those are dropped and
+rebuilt on the next run. A Postgres advisory lock keeps concurrent runs
+from racing. Requires pgvector >= 0.5.0; older versions are detected and
+skipped.
+
+Builds can take minutes on large tables, so startup runs this in a
+background thread (upgrade_in_background) and searches use the IVFFlat
+indexes, or a sequential scan, until it finishes.
+
+Run: docker-compose exec backend python -m migrations.add_hnsw_indexes
+"""
+
+import logging
+import threading
+from sqlalchemy import text
+
+from core import config
+from core.database import engine
+
+logger = logging.getLogger(__name__)
+
+# (table, new HNSW index, legacy IVFFlat index to drop)
+EMBEDDING_TABLES = [
+    ("notes", "idx_notes_embedding_hnsw", "idx_notes_embedding"),
+    ("note_chunks", "idx_note_chunks_embedding_hnsw", "idx_note_chunks_embedding"),
+    ("image_chunks", "idx_image_chunks_embedding_hnsw", "idx_image_chunks_embedding"),
+    ("document_chunks", "idx_document_chunks_embedding_hnsw", None),
+    ("brain_files", "idx_brain_files_embedding_hnsw", None),
+]
+
+MIN_PGVECTOR_VERSION = (0, 5, 0)
+
+# pg_try_advisory_lock key ("hnsw") so concurrent workers do not race the build
+ADVISORY_LOCK_KEY = 0x686E7377
+
+
+def _pgvector_version(conn):
+    row = conn.execute(text(
+        "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+    )).fetchone()
+    if not row:
+        return None
+    return tuple(int(p) for p in row[0].split(".")[:3])
+
+
+def _index_valid(conn, index_name: str):
+    """True/False for a valid/invalid index, None if it does not exist."""
+    row = conn.execute(text("""
+        SELECT i.indisvalid
+        FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid
+        WHERE c.relname = :name AND pg_catalog.pg_table_is_visible(c.oid)
+    """), {"name": index_name}).fetchone()
+    return None if row is None else bool(row[0])
+
+
+def _drop_index(conn, index_name: str) -> None:
+    conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}"))
+
+
+def _build_hnsw(conn, table: str, index_name: str, m: int, ef_construction: int) -> bool:
+    """Build (or rebuild an invalid) HNSW index. Returns whether a valid index exists."""
+    valid = _index_valid(conn, index_name)
+    if valid:
+        logger.info(f"{index_name} already exists, skipping")
+        return True
+    if valid is False:
+        # Left behind by a failed or interrupted CREATE INDEX CONCURRENTLY
+        logger.warning(f"{index_name} is invalid, rebuilding")
+        _drop_index(conn, index_name)
+
+    logger.info(
+        f"Creating HNSW index {index_name} on {table}.embedding "
+        f"(m={m}, ef_construction={ef_construction})..."
+    )
+    try:
+        conn.execute(text(
+            f"CREATE INDEX CONCURRENTLY {index_name} "
+            f"ON {table} USING hnsw (embedding vector_cosine_ops) "
+            f"WITH (m = {int(m)}, ef_construction = {int(ef_construction)})"
+        ))
+    except Exception as e:
+        logger.error(f"Building {index_name} failed: {str(e)}")
+        _drop_index(conn, index_name)
+        return False
+    return bool(_index_valid(conn, index_name))
+
+
+def upgrade(m: int = None, ef_construction: int = None):
+    """Create HNSW indexes on all embedding columns and drop IVFFlat ones."""
+    m = m or config.PGVECTOR_HNSW_M
+    ef_construction = ef_construction or config.PGVECTOR_HNSW_EF_CONSTRUCTION
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        version = _pgvector_version(conn)
+        if version is None:
+            logger.info("pgvector extension not installed, skipping HNSW indexes")
+            return
+        if version < MIN_PGVECTOR_VERSION:
+            logger.warning(
+                f"pgvector {'.'.join(map(str, version))} has no HNSW support "
+                f"(needs >= 0.5.0), keeping IVFFlat indexes"
+            )
+            return
+
+        # One builder at a time across API workers
+        if not conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY}).scalar():
+            logger.info("HNSW indexes are being built by another process, skipping")
+            return
+
+        try:
+            for table, index_name, legacy_index in EMBEDDING_TABLES:
+                exists = conn.execute(
+                    text("SELECT to_regclass(:table)"), {"table": table}
+                ).scalar()
+                if not exists:
+                    logger.info(f"Table {table} does not exist yet, skipping")
+                    continue
+
+                if not _build_hnsw(conn, table, index_name, m, ef_construction):
+                    if legacy_index:
+                        logger.warning(f"Keeping IVFFlat index {legacy_index} until {index_name} builds")
+                    continue
+
+                if legacy_index and _index_valid(conn, legacy_index) is not None:
+                    logger.info(f"Dropping IVFFlat index {legacy_index}...")
+                    _drop_index(conn, legacy_index)
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+
+        logger.info("HNSW index migration completed successfully")
+
+
+def upgrade_in_background() -> threading.Thread:
+    """Run upgrade() in a daemon thread so startup does not wait for index builds."""
+    def run():
+        try:
+            upgrade()
+        except Exception as e:
+            logger.warning(f"HNSW index migration failed: {str(e)}")
+
+    thread = threading.Thread(target=run, name="hnsw-index-migration", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    upgrade()
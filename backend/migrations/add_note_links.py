@@ -0,0 +1,59 @@
+"""
+Migration: Create note_links table and queue its one-time backfill.
+
+Adds:
+- note_links (source_note_id, target_note_id) primary key, both columns
+  referencing notes(id) ON DELETE CASCADE
+- ix_note_links_target_note_id for backlink lookups
+
+The table is normally created by Base.metadata.create_all; this migration
+covers databases where it already existed without the target index. When
+the table is empty but notes contain wikilinks, the backfill Celery task
+(features.graph.tasks.backfill_note_links) is queued once.
+
+Run: docker-compose exec backend python -m migrations.add_note_links
+"""
+
+import logging
+from sqlalchemy import text
+from core.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade():
+    """Ensure note_links and its index exist, then queue the backfill if needed."""
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS note_links (
+                source_note_id INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+                target_note_id INTEGER NOT NULL REFERENCES notes(id) ON DELETE CASCADE,
+                created_at TIMESTAMPTZ DEFAULT now(),
+                PRIMARY KEY (source_note_id, target_note_id)
+            )
+        """))
+        conn.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_note_links_target_note_id "
+            "ON note_links (target_note_id)"
+        ))
+        conn.commit()
+
+        has_links = conn.execute(text("SELECT 1 FROM note_links LIMIT 1")).fetchone()
+        if has_links:
+            logger.info("note_links already populated, skipping backfill")
+            return
+
+        has_wikilinks = conn.execute(text(
+            "SELECT 1 FROM notes WHERE content LIKE '%[[%' LIMIT 1"
+        )).fetchone()
+        if not has_wikilinks:
+            logger.info("No wikilinks found, note_links backfill not needed")
+            return
+
+    from features.graph.tasks import backfill_note_links_task
+    backfill_note_links_task.delay()
+    logger.info("Queued note_links backfill task")
+
+
+if __name__ == "__main__":
+    upgrade()
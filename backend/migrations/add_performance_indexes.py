@@ -3,6 +3,7 @@ Migration: Add Performance Indexes
 
 Adds composite indexes for common query patterns to improve performance:
 1. Notes: (owner_id, is_trashed, created_at DESC) - primary list query
+   plus (owner_id, is_trashed, created_at DESC, id DESC) - keyset pages
 2. Notes: (owner_id, is_favorite) partial - favorites query
 3. Images: (owner_id, is_trashed, uploaded_at DESC) - primary list query
 4. Conversations: (owner_id, created_at DESC) - user's conversations
@@ -38,6 +39,14 @@ def upgrade():
                 ON notes(owner_id, is_trashed, created_at DESC)
                 """
             ),
+            # Notes: Keyset pagination on (created_at, id) for /notes-enhanced/
+            (
+                "idx_notes_owner_trashed_created_id",
+                """
+                CREATE INDEX IF NOT EXISTS idx_notes_owner_trashed_created_id
+                ON notes(owner_id, is_trashed, created_at DESC, id DESC)
+                """
+            ),
             # Notes: Favorites query (partial index for efficiency)
             (
                 "idx_notes_owner_favorite_partial",
@@ -141,6 +150,7 @@ def downgrade():
     with engine.connect() as conn:
         indexes = [
             "idx_notes_owner_trashed_created",
+            "idx_notes_owner_trashed_created_id",
             "idx_notes_owner_favorite_partial",
             "idx_notes_owner_review_partial",
             "idx_images_owner_trashed_uploaded",
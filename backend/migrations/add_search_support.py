@@ -196,6 +196,8 @@ def run_migration():
                 # Trigger for notes table
                 if check_trigger_exists(conn, 'notes_search_vector_update', 'notes'):
                     logger.info("  ✓ notes_search_vector_update trigger already exists, skipping")
+                elif check_trigger_exists(conn, 'notes_search_vector_weighted', 'notes'):
+                    logger.info("  ✓ weighted notes trigger installed (add_weighted_search_vectors), skipping")
                 else:
                     logger.info("  + Creating trigger for notes.search_vector auto-update")
                     conn.execute(text("""
@@ -211,6 +213,8 @@ def run_migration():
                 # Trigger for images table
                 if check_trigger_exists(conn, 'images_search_vector_update', 'images'):
                     logger.info("  ✓ images_search_vector_update trigger already exists, skipping")
+                elif check_trigger_exists(conn, 'images_search_vector_weighted', 'images'):
+                    logger.info("  ✓ weighted images trigger installed (add_weighted_search_vectors), skipping")
                 else:
                     logger.info("  + Creating trigger for images.search_vector auto-update")
                     conn.execute(text("""
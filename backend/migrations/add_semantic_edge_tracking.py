@@ -0,0 +1,53 @@
+"""
+Migration: Track note embedding changes for incremental semantic edges.
+
+Adds:
+- notes.embedding_updated_at TIMESTAMPTZ NULL: set whenever the note's
+  embedding is (re)generated
+- semantic_edge_runs: last semantic edge run per user (threshold, cap,
+  completion time)
+
+Incremental runs recompute edges only for notes whose embedding changed
+after the last run. Existing notes keep a NULL timestamp and are treated
+as covered by the last full run.
+
+Run: docker-compose exec backend python -m migrations.add_semantic_edge_tracking
+"""
+
+import logging
+from sqlalchemy import text
+from core.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade():
+    """Add notes.embedding_updated_at and the semantic_edge_runs table."""
+    with engine.connect() as conn:
+        result = conn.execute(text(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_name = 'notes' AND column_name = 'embedding_updated_at'"
+        ))
+        if result.fetchone():
+            logger.info("notes.embedding_updated_at already exists, skipping")
+        else:
+            logger.info("Adding embedding_updated_at column to notes...")
+            conn.execute(text(
+                "ALTER TABLE notes ADD COLUMN embedding_updated_at TIMESTAMPTZ NULL"
+            ))
+
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS semantic_edge_runs (
+                owner_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+                threshold DOUBLE PRECISION NOT NULL,
+                max_per_note INTEGER NOT NULL,
+                completed_at TIMESTAMPTZ NOT NULL
+            )
+        """))
+
+        conn.commit()
+        logger.info("Semantic edge tracking migration completed successfully")
+
+
+if __name__ == "__main__":
+    upgrade()
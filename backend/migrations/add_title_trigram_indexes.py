@@ -0,0 +1,45 @@
+"""
+Migration: pg_trgm GIN indexes on notes.title and notes.slug.
+
+Title search matches `title ILIKE '%...%'` and fuzzy `:query <% title`
+(word similarity); slug allocation looks up `slug LIKE 'base-%'`. Without
+trigram indexes each of these scans every note of the table.
+
+Run: docker-compose exec backend python -m migrations.add_title_trigram_indexes
+"""
+
+import logging
+from sqlalchemy import text
+
+from core.database import engine
+
+logger = logging.getLogger(__name__)
+
+TRIGRAM_INDEXES = {
+    "idx_notes_title_trgm": "title",
+    "idx_notes_slug_trgm": "slug",
+}
+
+
+def upgrade():
+    """Create pg_trgm and the title/slug trigram indexes."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        exists = conn.execute(text("SELECT to_regclass('notes')")).scalar()
+        if not exists:
+            logger.info("Table notes does not exist yet, skipping")
+            return
+
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for index_name, column in TRIGRAM_INDEXES.items():
+            logger.info(f"Creating {index_name}...")
+            conn.execute(text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+                f"ON notes USING GIN ({column} gin_trgm_ops)"
+            ))
+
+        logger.info("Title trigram index migration completed successfully")
+
+
+if __name__ == "__main__":
+    upgrade()
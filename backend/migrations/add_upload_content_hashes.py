@@ -0,0 +1,58 @@
+"""
+Migration: content hashes for upload deduplication.
+
+Adds:
+- images.content_hash VARCHAR(64) NULL: SHA-256 of the uploaded file
+- images.perceptual_hash BIGINT NULL: 64-bit dHash for near-duplicate detection
+- documents.content_hash VARCHAR(64) NULL: SHA-256 of the uploaded file
+- documents.analysis_instructions TEXT NULL: custom instructions used for the
+  analysis, so uploads are only deduplicated against matching analyses
+- (owner_id, content_hash) indexes on both tables for the upload-time lookup
+
+Existing rows stay NULL until the backfill tasks hash their files:
+    features.images.tasks_dedup.backfill_image_hashes
+    features.documents.tasks.backfill_document_hashes
+
+Run: docker-compose exec backend python -m migrations.add_upload_content_hashes
+"""
+
+import logging
+from sqlalchemy import text
+
+from core.database import engine
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = {
+    "images": {"content_hash": "VARCHAR(64)", "perceptual_hash": "BIGINT"},
+    "documents": {"content_hash": "VARCHAR(64)", "analysis_instructions": "TEXT"},
+}
+
+
+def upgrade():
+    """Add hash columns and owner/hash indexes to images and documents."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table, columns in COLUMNS.items():
+            exists = conn.execute(text(f"SELECT to_regclass('{table}')")).scalar()
+            if not exists:
+                logger.info(f"Table {table} does not exist yet, skipping")
+                continue
+
+            for column, column_type in columns.items():
+                conn.execute(text(
+                    f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {column_type} NULL"
+                ))
+
+            index_name = f"idx_{table}_owner_content_hash"
+            logger.info(f"Creating {index_name}...")
+            conn.execute(text(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+                f"ON {table} (owner_id, content_hash) WHERE content_hash IS NOT NULL"
+            ))
+
+        logger.info("Upload content hash migration completed successfully")
+
+
+if __name__ == "__main__":
+    upgrade()
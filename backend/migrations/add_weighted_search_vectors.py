@@ -0,0 +1,167 @@
+"""
+Migration: Weighted, trigger-maintained search_vector columns with GIN indexes.
+
+Full-text search reads a stored tsvector instead of calling to_tsvector()
+per row, so the GIN index is used for matching and ts_rank reads the
+stored vector. Titles are weighted A and body text B:
+
+- notes: title (A), content (B)
+- images: display_name + filename (A), ai_analysis_result + prompt (B)
+- document_chunks: content (B)
+
+For notes and images this replaces the unweighted tsvector_update_trigger
+triggers created by add_search_support.py (the column and index are
+created here if that script never ran). Existing rows are recomputed in
+batches; the column comment records a finished backfill, so an interrupted
+run simply starts the backfill again. A Postgres advisory lock keeps
+concurrent runs (one per API worker) from backfilling the same rows.
+
+The backfill rewrites every row, so startup runs this in a background
+thread (upgrade_in_background); until it finishes, full-text search only
+matches rows written since the triggers were installed.
+
+Run: docker-compose exec backend python -m migrations.add_weighted_search_vectors
+"""
+
+import logging
+import threading
+from sqlalchemy import text
+
+from core.database import engine
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_BATCH_SIZE = 5000
+BACKFILL_MARKER = "weighted search vector v1"
+
+# pg_try_advisory_lock key ("wsvc") so concurrent workers do not backfill twice
+ADVISORY_LOCK_KEY = 0x77737663
+
+# table -> (weighted tsvector expression over {row}columns, columns that feed it,
+#           GIN index, legacy unweighted trigger)
+SEARCH_VECTORS = {
+    "notes": (
+        "setweight(to_tsvector('english', COALESCE({row}title, '')), 'A') || "
+        "setweight(to_tsvector('english', COALESCE({row}content, '')), 'B')",
+        ("title", "content"),
+        "idx_notes_search",
+        "notes_search_vector_update",
+    ),
+    "images": (
+        "setweight(to_tsvector('english', COALESCE({row}display_name, '') || ' ' || COALESCE({row}filename, '')), 'A') || "
+        "setweight(to_tsvector('english', COALESCE({row}ai_analysis_result, '') || ' ' || COALESCE({row}prompt, '')), 'B')",
+        ("display_name", "filename", "ai_analysis_result", "prompt"),
+        "idx_images_search",
+        "images_search_vector_update",
+    ),
+    "document_chunks": (
+        "setweight(to_tsvector('english', COALESCE({row}content, '')), 'B')",
+        ("content",),
+        "idx_document_chunks_search",
+        None,
+    ),
+}
+
+
+def _install_trigger(conn, table: str, expression: str, columns, legacy_trigger) -> None:
+    """(Re)create the trigger function and its trigger for one table."""
+    function = f"{table}_search_vector_weighted"
+    conn.execute(text(f"""
+        CREATE OR REPLACE FUNCTION {function}() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.search_vector := {expression.format(row='NEW.')};
+            RETURN NEW;
+        END
+        $$
+    """))
+    if legacy_trigger:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {legacy_trigger} ON {table}"))
+    conn.execute(text(f"DROP TRIGGER IF EXISTS {function} ON {table}"))
+    conn.execute(text(f"""
+        CREATE TRIGGER {function}
+        BEFORE INSERT OR UPDATE OF {', '.join(columns)} ON {table}
+        FOR EACH ROW EXECUTE FUNCTION {function}()
+    """))
+
+
+def _backfill(conn, table: str, expression: str) -> int:
+    """Recompute search_vector for every row, in id order and small batches."""
+    statement = text(f"""
+        UPDATE {table} SET search_vector = {expression.format(row='')}
+        WHERE id IN (
+            SELECT id FROM {table} WHERE id > :last_id ORDER BY id LIMIT :batch
+        )
+        RETURNING id
+    """)
+    last_id, updated = 0, 0
+    while True:
+        ids = [row[0] for row in conn.execute(
+            statement, {"last_id": last_id, "batch": BACKFILL_BATCH_SIZE}
+        )]
+        if not ids:
+            return updated
+        last_id = max(ids)
+        updated += len(ids)
+
+
+def upgrade():
+    """Add weighted search_vector columns, triggers and GIN indexes."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        # One backfill at a time across API workers
+        if not conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY}).scalar():
+            logger.info("Weighted search vectors are being migrated by another process, skipping")
+            return
+
+        try:
+            for table, (expression, columns, index_name, legacy_trigger) in SEARCH_VECTORS.items():
+                exists = conn.execute(
+                    text("SELECT to_regclass(:table)"), {"table": table}
+                ).scalar()
+                if not exists:
+                    logger.info(f"Table {table} does not exist yet, skipping")
+                    continue
+
+                conn.execute(text(
+                    f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector"
+                ))
+                _install_trigger(conn, table, expression, columns, legacy_trigger)
+
+                marker = conn.execute(text(
+                    "SELECT col_description(CAST(:table AS regclass), attnum) FROM pg_attribute "
+                    "WHERE attrelid = CAST(:table AS regclass) AND attname = 'search_vector'"
+                ), {"table": table}).scalar()
+                if marker != BACKFILL_MARKER:
+                    logger.info(f"Backfilling weighted {table}.search_vector...")
+                    updated = _backfill(conn, table, expression)
+                    conn.execute(text(
+                        f"COMMENT ON COLUMN {table}.search_vector IS '{BACKFILL_MARKER}'"
+                    ))
+                    logger.info(f"Backfilled {updated} rows in {table}")
+
+                conn.execute(text(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} "
+                    f"ON {table} USING GIN (search_vector)"
+                ))
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+
+        logger.info("Weighted search vector migration completed successfully")
+
+
+def upgrade_in_background() -> threading.Thread:
+    """Run upgrade() in a daemon thread so startup does not wait for the backfill."""
+    def run():
+        try:
+            upgrade()
+        except Exception as e:
+            logger.warning(f"Weighted search vector migration failed: {str(e)}")
+
+    thread = threading.Thread(target=run, name="weighted-search-vector-migration", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    upgrade()
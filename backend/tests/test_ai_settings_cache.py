@@ -0,0 +1,168 @@
+"""
+Unit tests for the per-user AI settings cache and the cloud provider pool
+
+Tests cover:
+- Preferences and key fingerprint loaded once per TTL, not per call
+- Invalidation after settings or API key changes
+- Pooled cloud clients reused per user, never shared between users
+- Key rotation, idle timeout and pool bound evict clients
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from core import config, model_service
+from core.llm import registry
+from core.llm.base import ProviderType
+from features.settings import api_keys_service
+
+PREFS = dict(
+    rag_model=None, brain_model=None, nexus_model=None,
+    cloud_ai_enabled=True, cloud_ai_provider="anthropic",
+    cloud_rag_model="claude-x", cloud_brain_model=None,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    model_service.clear_ai_settings_cache()
+    registry.clear_cloud_provider_pool()
+    yield
+    model_service.clear_ai_settings_cache()
+    registry.clear_cloud_provider_pool()
+
+
+@pytest.fixture
+def keys(monkeypatch):
+    """Stored keys by user_id; records every key lookup (decryption)."""
+    keys = SimpleNamespace(stored={1: "sk-user-one", 2: "sk-user-two"}, lookups=[])
+
+    def get_api_key_with_url(db, user_id, provider):
+        keys.lookups.append(user_id)
+        api_key = keys.stored.get(user_id)
+        return {"api_key": api_key, "base_url": None} if api_key else None
+
+    monkeypatch.setattr(api_keys_service, "get_api_key_with_url", get_api_key_with_url)
+    return keys
+
+
+@pytest.fixture
+def created(monkeypatch):
+    """Providers built by the factory (stand-ins carrying provider_type and api_key)."""
+    built = []
+
+    def create(provider_type, api_key, base_url=None):
+        provider = SimpleNamespace(provider_type=provider_type, api_key=api_key)
+        built.append(provider)
+        return provider
+
+    monkeypatch.setattr(registry, "create_cloud_provider", create)
+    return built
+
+
+def _db(**overrides):
+    db = Mock()
+    db.query.return_value.filter.return_value.first.return_value = SimpleNamespace(**{**PREFS, **overrides})
+    return db
+
+
+def _queries(db):
+    return db.query.call_count
+
+
+class TestSettingsCache:
+
+    def test_loaded_once_per_ttl(self, keys, created):
+        db = _db()
+
+        for _ in range(3):
+            provider, model, name = model_service.get_provider_for_user(db, 1, "rag")
+
+        assert (model, name) == ("claude-x", "anthropic")
+        assert _queries(db) == 1
+        assert keys.lookups == [1, 1]  # fingerprint, then the pool miss
+        assert len(created) == 1
+
+    def test_expired_entry_reloads(self, keys, created, monkeypatch):
+        db = _db()
+        model_service.get_user_ai_settings(db, 1)
+        monkeypatch.setattr(config, "AI_SETTINGS_CACHE_TTL", 0)
+
+        model_service.get_user_ai_settings(db, 1)
+
+        assert _queries(db) == 2
+
+    def test_settings_never_hold_the_key(self, keys):
+        settings = model_service.get_user_ai_settings(_db(), 1)
+
+        assert "sk-user-one" not in repr(settings)
+        assert settings.key_fingerprint
+
+    def test_key_change_invalidates(self, keys, created):
+        db = _db()
+        first, _, _ = model_service.get_provider_for_user(db, 1, "rag")
+
+        keys.stored[1] = "sk-rotated"
+        api_keys_service._forget_cached_credentials(1)
+        second, _, _ = model_service.get_provider_for_user(db, 1, "rag")
+
+        assert _queries(db) == 2
+        assert (first.api_key, second.api_key) == ("sk-user-one", "sk-rotated")
+
+
+class TestCloudPool:
+
+    def test_clients_are_per_user(self, keys, created):
+        one, _, _ = model_service.get_provider_for_user(_db(), 1, "rag")
+        two, _, _ = model_service.get_provider_for_user(_db(), 2, "rag")
+
+        assert one is not two
+        assert (one.api_key, two.api_key) == ("sk-user-one", "sk-user-two")
+        assert model_service.get_provider_for_user(_db(), 2, "rag")[0] is two
+
+    def test_rotated_key_replaces_client(self, created):
+        credentials = {"api_key": "sk-old", "base_url": None}
+        old = registry.get_pooled_cloud_provider(1, ProviderType.OPENAI, "stale", lambda: credentials)
+        old_fingerprint = registry._cloud_pool[(1, ProviderType.OPENAI)].fingerprint
+
+        assert registry.get_pooled_cloud_provider(1, ProviderType.OPENAI, old_fingerprint, lambda: None) is old
+        credentials["api_key"] = "sk-new"
+        new = registry.get_pooled_cloud_provider(1, ProviderType.OPENAI, "changed", lambda: credentials)
+
+        assert new is not old and new.api_key == "sk-new"
+
+    def test_idle_and_bounded(self, created, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(registry.time, "monotonic", lambda: clock[0])
+        monkeypatch.setattr(config, "CLOUD_CLIENT_IDLE_SECONDS", 60)
+        monkeypatch.setattr(config, "CLOUD_CLIENT_POOL_SIZE", 2)
+
+        def get(user_id):
+            return registry.get_pooled_cloud_provider(
+                user_id, ProviderType.ANTHROPIC, "fp",
+                lambda: {"api_key": f"sk-{user_id}", "base_url": None},
+            )
+
+        for user_id in (1, 2, 3):
+            get(user_id)
+        assert [key[0] for key in registry._cloud_pool] == [2, 3]
+
+        clock[0] += 61
+        get(3)
+        assert [key[0] for key in registry._cloud_pool] == [3]
+
+    def test_missing_key_falls_back_to_ollama(self, keys, created, monkeypatch):
+        ollama = object()
+        monkeypatch.setattr("core.llm.get_default_provider", lambda: ollama)
+        monkeypatch.setattr(model_service, "get_effective_rag_model", lambda db, user_id: "qwen3:8b")
+
+        provider, model, name = model_service.get_provider_for_user(_db(), 9, "rag")
+
+        assert (provider, model, name) == (ollama, "qwen3:8b", "ollama")
+        assert created == []
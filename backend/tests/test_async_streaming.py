@@ -0,0 +1,243 @@
+"""
+Load tests for async LLM streaming
+
+Tests cover:
+- 50 concurrent Ollama streams on one event loop (one uvicorn worker)
+- Event loop stays responsive while streams are in flight
+- Sync-only providers are bridged through a worker thread
+- Transport errors become error chunks
+- The RAG SSE endpoint keeps provider lookup and usage logging off the loop
+"""
+
+import asyncio
+import gc
+import json
+import threading
+import time
+from types import SimpleNamespace
+from typing import List
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from core import ollama_transport
+from core.llm.base import LLMMessage, LLMProvider, LLMResponse, LLMStreamChunk, ProviderType
+from core.llm.circuit_breaker import CircuitBreaker
+from core.llm.ollama_provider import OllamaProvider
+from core.ollama_transport import OllamaTransport
+
+TOKENS = 10
+TOKEN_DELAY = 0.02  # One stream takes ~0.2s
+CONCURRENT_STREAMS = 50
+MESSAGES = [LLMMessage(role="user", content="hello")]
+
+
+async def _ollama_chat(request: httpx.Request) -> httpx.Response:
+    """Fake /api/chat that streams NDJSON tokens with a delay between them."""
+    async def body():
+        for i in range(TOKENS):
+            await asyncio.sleep(TOKEN_DELAY)
+            yield json.dumps({"message": {"content": f"t{i} "}, "done": False}).encode() + b"\n"
+        yield json.dumps({
+            "message": {"content": ""}, "done": True,
+            "prompt_eval_count": 3, "eval_count": TOKENS,
+        }).encode() + b"\n"
+
+    return httpx.Response(200, content=body())
+
+
+async def _max_loop_lag(stop: asyncio.Event) -> float:
+    """Largest delay seen by a 5ms ticker while other tasks run."""
+    lag = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.005)
+        lag = max(lag, time.perf_counter() - started - 0.005)
+    return lag
+
+
+async def _collect(stream) -> List[LLMStreamChunk]:
+    return [chunk async for chunk in stream]
+
+
+def _use_transport(monkeypatch, handler):
+    transport = OllamaTransport(async_transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(ollama_transport, "_transport", transport)
+    return transport
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    _use_transport(monkeypatch, _ollama_chat)
+    provider = OllamaProvider(host="http://ollama")
+    provider._breaker = CircuitBreaker(name="test")
+    return provider
+
+
+class TestOllamaAsyncStreaming:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_streams_share_one_loop(self, provider):
+        gc.collect()  # A full collection of earlier test modules is not loop blocking
+        stop = asyncio.Event()
+        ticker = asyncio.create_task(_max_loop_lag(stop))
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(
+            _collect(provider.astream(MESSAGES, model="m"))
+            for _ in range(CONCURRENT_STREAMS)
+        ))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        lag = await ticker
+
+        assert len(results) == CONCURRENT_STREAMS
+        for chunks in results:
+            assert "".join(c.content for c in chunks) == "".join(f"t{i} " for i in range(TOKENS))
+            assert chunks[-1].done and chunks[-1].output_tokens == TOKENS
+        # Serially this would take CONCURRENT_STREAMS * TOKENS * TOKEN_DELAY = 10s
+        assert elapsed < 5 * TOKENS * TOKEN_DELAY
+        assert lag < 0.1
+
+    @pytest.mark.asyncio
+    async def test_agenerate(self, monkeypatch, provider):
+        async def chat(request):
+            payload = json.loads(request.content)
+            assert payload["stream"] is False
+            assert payload["options"]["num_ctx"] == 8192
+            return httpx.Response(200, json={
+                "message": {"content": "answer"}, "prompt_eval_count": 4, "eval_count": 2,
+            })
+
+        _use_transport(monkeypatch, chat)
+
+        response = await provider.agenerate(MESSAGES, model="m", context_window=8192)
+
+        assert response.content == "answer"
+        assert (response.input_tokens, response.output_tokens) == (4, 2)
+
+    @pytest.mark.asyncio
+    async def test_connection_error_becomes_error_chunk(self, monkeypatch, provider):
+        def refuse(request):
+            raise httpx.ConnectError("connection refused", request=request)
+
+        _use_transport(monkeypatch, refuse)
+
+        chunks = await _collect(provider.astream(MESSAGES, model="m"))
+
+        assert len(chunks) == 1
+        assert chunks[0].is_error and chunks[0].error_type == "connection"
+        assert provider._breaker.failure_count == 1
+
+
+class SyncOnlyProvider(LLMProvider):
+    """Provider with only the blocking interface, like the cloud SDK wrappers."""
+
+    provider_type = ProviderType.CUSTOM
+
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def generate(self, messages, model, temperature=0.7, max_tokens=2048, **kwargs):
+        time.sleep(TOKEN_DELAY)
+        return LLMResponse(content="done", model=model, provider=self.provider_type)
+
+    def stream(self, messages, model, temperature=0.7, max_tokens=2048, **kwargs):
+        try:
+            for i in range(TOKENS):
+                time.sleep(TOKEN_DELAY)
+                yield LLMStreamChunk(content=f"t{i} ")
+            yield LLMStreamChunk(content="", done=True)
+        finally:
+            self.closed.set()
+
+    def health_check(self):
+        return {}
+
+    def list_models(self):
+        return []
+
+
+class TestThreadBridge:
+
+    @pytest.mark.asyncio
+    async def test_blocking_stream_does_not_block_loop(self):
+        providers = [SyncOnlyProvider() for _ in range(4)]
+        stop = asyncio.Event()
+        ticker = asyncio.create_task(_max_loop_lag(stop))
+
+        results = await asyncio.gather(*(
+            _collect(p.astream(MESSAGES, model="m")) for p in providers
+        ))
+        stop.set()
+        lag = await ticker
+
+        assert all(len(chunks) == TOKENS + 1 for chunks in results)
+        assert lag < 0.1
+
+    @pytest.mark.asyncio
+    async def test_early_exit_closes_sync_stream(self):
+        provider = SyncOnlyProvider()
+
+        stream = provider.astream(MESSAGES, model="m")
+        async for _chunk in stream:
+            break
+        await stream.aclose()
+
+        assert provider.closed.is_set()
+
+    @pytest.mark.asyncio
+    async def test_agenerate_runs_in_thread(self):
+        response = await SyncOnlyProvider().agenerate(MESSAGES, model="m")
+
+        assert response.content == "done"
+
+
+class TestRagStreamEndpoint:
+
+    @pytest.mark.asyncio
+    async def test_database_calls_run_off_the_loop(self, monkeypatch):
+        from features.rag_chat import router_query, schemas
+
+        threads = {}
+
+        def record(name, value=None):
+            def call(*args, **kwargs):
+                threads[name] = threading.get_ident()
+                return value
+            return call
+
+        class CloudProvider:
+            async def astream(self, **kwargs):
+                yield LLMStreamChunk(content="answer ")
+                yield LLMStreamChunk(content="", done=True, input_tokens=3, output_tokens=1)
+
+        context = SimpleNamespace(sources=[], formatted_context="", total_tokens_approx=0, truncated=False)
+        summary = {
+            "total_sources_searched": 0, "retrieval_methods_used": [],
+            "avg_relevance_score": 0, "source_type_breakdown": {},
+        }
+        monkeypatch.setattr(router_query, "execute_query", lambda *a: SimpleNamespace(
+            assembled_context=context, retrieval_summary=summary, conversation_context=None,
+        ))
+        monkeypatch.setattr(router_query, "get_provider_for_user",
+                            record("provider", (CloudProvider(), "cloud-model", "anthropic")))
+        monkeypatch.setattr(router_query, "log_stream_usage", record("usage"))
+        monkeypatch.setattr(router_query, "_save_streaming_conversation", lambda *a: 1)
+
+        response = await router_query.rag_query_stream.__wrapped__(
+            request=None,
+            body=schemas.RAGQueryRequest(query="hello", auto_create_conversation=False),
+            db=Mock(), current_user=SimpleNamespace(id=1),
+        )
+        events = [json.loads(line[6:]) async for line in response.body_iterator]
+
+        assert events[-1] == {"type": "done"}
+        loop_thread = threading.get_ident()
+        assert set(threads) == {"provider", "usage"}
+        assert loop_thread not in threads.values()
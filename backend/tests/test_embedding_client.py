@@ -0,0 +1,215 @@
+"""
+Unit tests for EmbeddingClient
+
+Tests cover:
+- Batched /api/embed requests and order preservation
+- Empty input handling
+- Retry on transient errors
+- Fallback to legacy /api/embeddings
+- Content-addressed cache
+"""
+
+import json
+import pytest
+import responses
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from features.search.logic import embedding_client as client_module
+from features.search.logic.embedding_client import EmbeddingClient
+from features.search.logic.embedding_cache import EmbeddingCache, make_cache_key
+
+HOST = "http://localhost:11434"
+DIM = 4
+
+
+def _vector(seed: float) -> list:
+    return [seed] * DIM
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    """Skip retry sleeps."""
+    monkeypatch.setattr(client_module, "RETRY_BACKOFF_SECONDS", 0)
+
+
+@pytest.fixture
+def client():
+    return EmbeddingClient(
+        host=HOST,
+        model="nomic-embed-text",
+        dimension=DIM,
+        max_text_length=100,
+        batch_size=2,
+        max_concurrency=1,
+        max_retries=2,
+    )
+
+
+def _echo_embed(request):
+    """Return one vector per input, seeded by input length."""
+    inputs = json.loads(request.body)["input"]
+    return (200, {}, json.dumps({"embeddings": [_vector(len(t)) for t in inputs]}))
+
+
+class TestEmbedBatch:
+
+    @responses.activate
+    def test_batches_and_preserves_order(self, client):
+        responses.add_callback(responses.POST, f"{HOST}/api/embed", callback=_echo_embed)
+
+        result = client.embed_batch(["a", "bb", "ccc", "dddd", "eeeee"])
+
+        assert len(responses.calls) == 3  # batch_size=2
+        assert [r[0] for r in result] == [1, 2, 3, 4, 5]
+
+    @responses.activate
+    def test_empty_texts_map_to_none_without_request(self, client):
+        responses.add_callback(responses.POST, f"{HOST}/api/embed", callback=_echo_embed)
+
+        result = client.embed_batch(["", "   ", "xy"])
+
+        assert result[0] is None
+        assert result[1] is None
+        assert result[2] == _vector(2)
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_all_empty_skips_http(self, client):
+        assert client.embed_batch(["", None]) == [None, None]
+        assert len(responses.calls) == 0
+
+    @responses.activate
+    def test_text_truncated_to_max_length(self, client):
+        responses.add_callback(responses.POST, f"{HOST}/api/embed", callback=_echo_embed)
+
+        result = client.embed("x" * 500)
+
+        assert result == _vector(100)
+
+    @responses.activate
+    def test_wrong_dimension_dropped(self, client):
+        responses.add(
+            responses.POST, f"{HOST}/api/embed",
+            json={"embeddings": [[0.1, 0.2]]}, status=200,
+        )
+        assert client.embed("hello") is None
+
+
+class TestRetry:
+
+    @responses.activate
+    def test_retries_transient_failure(self, client):
+        responses.add(responses.POST, f"{HOST}/api/embed", status=503)
+        responses.add_callback(responses.POST, f"{HOST}/api/embed", callback=_echo_embed)
+
+        assert client.embed("abc") == _vector(3)
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_gives_up_after_max_retries(self, client):
+        responses.add(responses.POST, f"{HOST}/api/embed", status=503)
+
+        assert client.embed_batch(["a", "b"]) == [None, None]
+        assert len(responses.calls) == 3  # 1 attempt + 2 retries
+
+    @responses.activate
+    def test_client_error_not_retried(self, client):
+        responses.add(responses.POST, f"{HOST}/api/embed", status=400)
+
+        assert client.embed("a") is None
+        assert len(responses.calls) == 1
+
+
+class TestLegacyFallback:
+
+    @responses.activate
+    def test_falls_back_when_embed_route_missing(self, client):
+        responses.add(responses.POST, f"{HOST}/api/embed", body="404 page not found", status=404)
+        responses.add(
+            responses.POST, f"{HOST}/api/embeddings",
+            json={"embedding": _vector(9)}, status=200,
+        )
+
+        assert client.embed_batch(["a", "b"]) == [_vector(9), _vector(9)]
+        # Later calls go straight to the legacy endpoint
+        client.embed("c")
+        assert sum(1 for c in responses.calls if c.request.url.endswith("/api/embed")) == 1
+
+    @responses.activate
+    def test_missing_model_does_not_trigger_fallback(self, client):
+        responses.add(
+            responses.POST, f"{HOST}/api/embed",
+            json={"error": 'model "nomic-embed-text" not found'}, status=404,
+        )
+
+        assert client.embed("a") is None
+        assert client._batch_supported is True
+
+
+class TestCache:
+
+    @pytest.fixture
+    def cached_client(self):
+        return EmbeddingClient(
+            host=HOST,
+            model="nomic-embed-text",
+            dimension=DIM,
+            max_text_length=100,
+            batch_size=8,
+            max_concurrency=1,
+            max_retries=0,
+            cache=EmbeddingCache(max_size=10, redis_url=None),
+        )
+
+    @responses.activate
+    def test_repeated_text_skips_model(self, cached_client):
+        responses.add_callback(responses.POST, f"{HOST}/api/embed", callback=_echo_embed)
+
+        first = cached_client.embed("hello world")
+        second = cached_client.embed("  hello world  ")
+
+        assert first == second
+        assert len(responses.calls) == 1
+        stats = cached_client.cache.stats()
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 1
+
+    @responses.activate
+    def test_duplicate_inputs_sent_once(self, cached_client):
+        responses.add_callback(responses.POST, f"{HOST}/api/embed", callback=_echo_embed)
+
+        result = cached_client.embed_batch(["same", "other", "same"])
+
+        assert json.loads(responses.calls[0].request.body)["input"] == ["same", "other"]
+        assert result[0] == result[2] == _vector(4)
+
+    @responses.activate
+    def test_only_misses_sent(self, cached_client):
+        responses.add_callback(responses.POST, f"{HOST}/api/embed", callback=_echo_embed)
+
+        cached_client.embed("cached")
+        cached_client.embed_batch(["cached", "fresh"])
+
+        assert json.loads(responses.calls[1].request.body)["input"] == ["fresh"]
+
+    @responses.activate
+    def test_failures_not_cached(self, cached_client):
+        responses.add(responses.POST, f"{HOST}/api/embed", status=400)
+
+        assert cached_client.embed("x") is None
+        assert cached_client.cache.stats()["stores"] == 0
+
+    def test_keys_depend_on_model(self):
+        assert make_cache_key("a", "text") != make_cache_key("b", "text")
+        assert make_cache_key("a", "text ") == make_cache_key("a", "text")
+
+    def test_lru_eviction(self):
+        cache = EmbeddingCache(max_size=2, redis_url=None)
+        cache.set_many({"k1": _vector(1), "k2": _vector(2)})
+        cache.get_many(["k1"])
+        cache.set_many({"k3": _vector(3)})
+
+        assert set(cache.get_many(["k1", "k2", "k3"])) == {"k1", "k3"}
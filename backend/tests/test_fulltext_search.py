@@ -0,0 +1,174 @@
+"""
+Unit tests for full-text search on the stored search_vector
+
+Tests cover:
+- RAG term extraction produces websearch_to_tsquery syntax (OR, dates AND-ed)
+- Search-box queries are passed through for websearch_to_tsquery
+- Every full-text path matches and ranks on search_vector, never to_tsvector()
+- Trigger and backfill use the same weighted expression
+- Migration holds an advisory lock and runs off the startup path
+"""
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from features.images.services.image_search import ImageSearchService
+from features.rag_chat.services.retrieval import _extract_search_terms, fulltext_search_notes
+from features.search.logic.fulltext import search_images_fulltext, search_notes_fulltext
+from features.search.logic.fulltext_helpers import parse_search_query
+from migrations import add_weighted_search_vectors as migration
+
+
+def _db():
+    db = Mock()
+    db.execute.return_value = []
+    return db
+
+
+def _sql(db):
+    return str(db.execute.call_args[0][0])
+
+
+class FakeConnection:
+    """Records migration statements; the backfill fails when fail_backfill is set."""
+
+    def __init__(self, locked=False, fail_backfill=False):
+        self.locked = locked
+        self.fail_backfill = fail_backfill
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = " ".join(str(statement).split())
+        self.statements.append(sql)
+        result = Mock()
+        result.__iter__ = Mock(return_value=iter([]))
+        if "pg_try_advisory_lock" in sql:
+            result.scalar.return_value = not self.locked
+        elif "to_regclass" in sql:
+            result.scalar.return_value = params["table"]
+        elif "col_description" in sql:
+            result.scalar.return_value = None
+        elif sql.startswith("UPDATE") and self.fail_backfill:
+            raise RuntimeError("deadlock detected")
+        return result
+
+
+@pytest.fixture
+def run_migration(monkeypatch):
+    def install(conn):
+        @contextmanager
+        def connect():
+            yield conn
+
+        engine = Mock()
+        engine.connect.return_value.execution_options.return_value = connect()
+        monkeypatch.setattr(migration, "engine", engine)
+        return conn
+    return install
+
+
+class TestQueryParsing:
+
+    def test_rag_terms_are_or_joined(self):
+        assert _extract_search_terms("tell me about cars and boats") == "cars or boats"
+
+    def test_rag_dates_stay_together(self):
+        assert _extract_search_terms("notes from 2025-12-10 meeting") == "2025 12 10 or meeting"
+
+    def test_rag_terms_drop_websearch_operators(self):
+        assert _extract_search_terms('"python" -rust or go') == "python or rust or go"
+
+    def test_search_box_query_is_normalized_only(self):
+        assert parse_search_query('  "exact  phrase" or  -other ') == '"exact phrase" or -other'
+        assert parse_search_query("   ") == ""
+
+
+class TestStatements:
+
+    def test_every_path_uses_stored_vector(self):
+        calls = [
+            lambda db: fulltext_search_notes(db, "cars", owner_id=1),
+            lambda db: search_notes_fulltext(db, "cars", owner_id=1),
+            lambda db: search_images_fulltext(db, "cars", owner_id=1),
+            lambda db: ImageSearchService.search_images_text(db, 1, "cars"),
+        ]
+        for call in calls:
+            db = _db()
+            call(db)
+            sql = _sql(db)
+            assert "websearch_to_tsquery('english'" in sql
+            assert "search_vector @@ query" in sql
+            assert "to_tsvector" not in sql
+
+    def test_rag_rank_uses_weighted_vector(self):
+        db = _db()
+        db.execute.return_value = [SimpleNamespace(id=1, title="Cars", content="c", rank=2.0)]
+
+        results = fulltext_search_notes(db, "cars", owner_id=1)
+
+        assert "ts_rank(search_vector, query)" in _sql(db)
+        assert results[0].similarity == 0.5
+
+
+class TestMigration:
+
+    def test_trigger_and_backfill_share_expression(self):
+        for table, (expression, columns, _, _) in migration.SEARCH_VECTORS.items():
+            conn = Mock()
+            migration._install_trigger(conn, table, expression, columns, None)
+            conn.execute.return_value = []
+            migration._backfill(conn, table, expression)
+
+            trigger_sql = " ".join(str(c[0][0]) for c in conn.execute.call_args_list[:3])
+            backfill_sql = str(conn.execute.call_args_list[-1][0][0])
+            assert expression.format(row="NEW.") in trigger_sql
+            assert expression.format(row="") in backfill_sql
+            assert f"UPDATE OF {', '.join(columns)}" in trigger_sql
+
+    def test_titles_outrank_body_text(self):
+        notes = migration.SEARCH_VECTORS["notes"][0]
+        assert "COALESCE({row}title, '')), 'A')" in notes
+        assert "COALESCE({row}content, '')), 'B')" in notes
+
+    def test_backfills_under_advisory_lock(self, run_migration):
+        conn = run_migration(FakeConnection())
+
+        migration.upgrade()
+
+        assert conn.statements[0] == "SELECT pg_try_advisory_lock(:key)"
+        assert conn.statements[-1] == "SELECT pg_advisory_unlock(:key)"
+        assert sum(s.startswith("UPDATE") for s in conn.statements) == len(migration.SEARCH_VECTORS)
+
+    def test_skips_when_locked(self, run_migration):
+        conn = run_migration(FakeConnection(locked=True))
+
+        migration.upgrade()
+
+        assert conn.statements == ["SELECT pg_try_advisory_lock(:key)"]
+
+    def test_failed_backfill_releases_lock(self, run_migration):
+        conn = run_migration(FakeConnection(fail_backfill=True))
+
+        with pytest.raises(RuntimeError):
+            migration.upgrade()
+
+        assert conn.statements[-1] == "SELECT pg_advisory_unlock(:key)"
+        assert not any(s.startswith("COMMENT ON") for s in conn.statements)
+
+    def test_background_run_logs_failures(self, run_migration, caplog):
+        run_migration(FakeConnection(fail_backfill=True))
+
+        thread = migration.upgrade_in_background()
+        thread.join(5)
+
+        assert thread.daemon and not thread.is_alive()
+        assert "Weighted search vector migration failed" in caplog.text
@@ -0,0 +1,125 @@
+"""
+Unit tests for RAG graph traversal
+
+Tests cover:
+- Two round-trips: the recursive walk, then one note fetch
+- Content requested only for the notes that survive the walk
+- Relationship chains rebuilt from walked paths (wikilink and backlink)
+- Per-hop cap applies to each seed, ties go to the higher-ranked seed
+- Relevance decay by hop and failure handling
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from features.rag_chat.services.graph_retrieval import (
+    GraphTraversalConfig,
+    graph_traversal,
+)
+
+TITLES = {1: "Seed", 2: "Linked", 3: "Linker", 4: "Far"}
+
+
+class FakeResult(list):
+    def fetchall(self):
+        return list(self)
+
+
+def _db(walked):
+    """Session whose first execute is the walk and second is the note fetch."""
+    calls = []
+
+    def execute(statement, params):
+        calls.append(params)
+        if len(calls) == 1:
+            return FakeResult(SimpleNamespace(**row) for row in walked)
+        return FakeResult(
+            SimpleNamespace(
+                id=i, title=TITLES[i],
+                content=f"content {i}" if i in params["hit_ids"] else None,
+            )
+            for i in params["note_ids"]
+        )
+
+    db = Mock()
+    db.execute.side_effect = execute
+    return db, calls
+
+
+WALKED = [
+    {"note_id": 2, "hop": 1, "path": [1, 2], "link_types": ["wikilink"]},
+    {"note_id": 3, "hop": 1, "path": [1, 3], "link_types": ["backlink"]},
+    {"note_id": 4, "hop": 2, "path": [1, 2, 4], "link_types": ["wikilink", "wikilink"]},
+]
+
+
+class TestGraphTraversal:
+
+    def test_two_round_trips_and_content_only_for_hits(self):
+        db, calls = _db(WALKED)
+
+        results = graph_traversal(db, [1], owner_id=7, config=GraphTraversalConfig(max_results_per_hop=3))
+
+        assert len(calls) == 2
+        assert calls[0]["per_seed_limit"] == 3
+        assert sorted(calls[1]["hit_ids"]) == [2, 3, 4]
+        assert sorted(calls[1]["note_ids"]) == [1, 2, 3, 4]  # seed title for the chain
+        assert [r.source_id for r in results] == [2, 3, 4]
+        assert results[0].content == "content 2"
+
+    def test_cap_is_per_seed(self):
+        db, calls = _db([])
+
+        graph_traversal(db, [9, 1, 5], owner_id=7, config=GraphTraversalConfig(max_results_per_hop=3))
+
+        assert calls[0]["per_seed_limit"] == 3
+        assert calls[0]["fanout"] == 9
+        assert calls[0]["seed_ids"] == [9, 1, 5]  # rank order, not id order
+        sql = " ".join(str(db.execute.call_args[0][0]).split())
+        assert "PARTITION BY hop, path[1]" in sql
+        assert "array_position(:seed_ids, w.path[1])" in sql
+
+    def test_relationship_chains(self):
+        db, _ = _db(WALKED)
+
+        by_id = {r.source_id: r for r in graph_traversal(db, [1], owner_id=7)}
+
+        backlink = by_id[3].metadata["relationship_chain"]
+        assert backlink == [{
+            "type": "backlink", "from": 3, "to": 1,
+            "from_title": "Linker", "to_title": "Seed",
+        }]
+        far = by_id[4].metadata["relationship_chain"]
+        assert [(link["from"], link["to"]) for link in far] == [(1, 2), (2, 4)]
+        assert by_id[4].metadata["hop_count"] == 2
+
+    def test_relevance_decays_by_hop(self):
+        db, _ = _db(WALKED)
+
+        results = graph_traversal(db, [1], owner_id=7, config=GraphTraversalConfig(relevance_decay=0.5))
+
+        assert [r.similarity for r in results] == [0.5, 0.5, 0.25]
+
+    def test_nothing_reached_skips_note_fetch(self):
+        db, calls = _db([])
+
+        assert graph_traversal(db, [1], owner_id=7) == []
+        assert len(calls) == 1
+
+    def test_database_error_returns_empty(self):
+        db = Mock()
+        db.execute.side_effect = RuntimeError("boom")
+
+        assert graph_traversal(db, [1], owner_id=7) == []
+        db.rollback.assert_called_once()
+
+    def test_no_seeds(self):
+        db = Mock()
+
+        assert graph_traversal(db, [], owner_id=7) == []
+        db.execute.assert_not_called()
@@ -0,0 +1,188 @@
+"""
+Unit tests for GraphSnapshot and load_graph_snapshot
+
+Tests cover:
+- Path finding, neighbours and stats over the adjacency arrays
+- Patching changed notes into a snapshot
+- Serving, patching or rebuilding depending on the stored version
+"""
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from features.graph.services import graph_snapshot
+from features.graph.services.graph_index import (
+    TypedNode, TypedEdge, TypedGraphData, NodeType, EdgeType,
+)
+from features.graph.services.graph_snapshot import (
+    GraphSnapshot, GraphSnapshotStore, load_graph_snapshot,
+)
+
+
+def _note(i):
+    return TypedNode(id=f"note-{i}", type=NodeType.NOTE, title=f"Note {i}")
+
+
+def _tag(i, count=0):
+    return TypedNode(id=f"tag-{i}", type=NodeType.TAG, title=f"tag{i}", metadata={"note_count": count})
+
+
+def _link(a, b):
+    return TypedEdge(source=f"note-{a}", target=f"note-{b}", type=EdgeType.WIKILINK, weight=1.0)
+
+
+def _tagged(note, tag):
+    return TypedEdge(source=f"note-{note}", target=f"tag-{tag}", type=EdgeType.TAG, weight=0.7)
+
+
+def _graph():
+    """1 -> 2 -> 3, 4 isolated, notes 1 and 4 share tag 1."""
+    return TypedGraphData(
+        nodes=[_note(1), _note(2), _note(3), _note(4), _tag(1, 2)],
+        edges=[_link(1, 2), _link(2, 3), _tagged(1, 1), _tagged(4, 1), _link(3, 99)],
+    )
+
+
+class TestGraphSnapshot:
+
+    def test_round_trip_drops_dangling_edges(self):
+        snapshot = GraphSnapshot.from_graph_data(_graph(), version=1)
+        data = snapshot.to_graph_data()
+
+        assert [n.id for n in data.nodes] == ["note-1", "note-2", "note-3", "note-4", "tag-1"]
+        assert len(data.edges) == 4
+
+    def test_shortest_path_orients_edges_along_path(self):
+        snapshot = GraphSnapshot.from_graph_data(_graph(), version=1)
+
+        path, edges = snapshot.shortest_path("note-3", "note-4", limit=10)
+
+        assert path == ["note-3", "note-2", "note-1", "tag-1", "note-4"]
+        assert [(e.source, e.target) for e in edges] == [
+            ("note-3", "note-2"), ("note-2", "note-1"), ("note-1", "tag-1"), ("tag-1", "note-4"),
+        ]
+        assert snapshot.shortest_path("note-3", "note-4", limit=3) == ([], [])
+        assert snapshot.shortest_path("note-1", "note-99", limit=10) == ([], [])
+
+    def test_neighbors_respect_depth_and_types(self):
+        snapshot = GraphSnapshot.from_graph_data(_graph(), version=1)
+
+        assert set(snapshot.neighbors("note-1", depth=1)) == {"note-2", "tag-1"}
+        assert set(snapshot.neighbors("note-1", depth=2)) == {"note-2", "note-3", "tag-1", "note-4"}
+        assert snapshot.neighbors("note-1", depth=2, node_types=[NodeType.NOTE]) == ["note-2", "note-3"]
+
+    def test_stats(self):
+        stats = GraphSnapshot.from_graph_data(_graph(), version=1).stats()
+
+        assert stats["total_nodes"] == 5
+        assert stats["node_counts"] == {"note": 4, "tag": 1}
+        assert stats["edge_counts"] == {"wikilink": 2, "tag": 2}
+
+    def test_replace_notes(self):
+        snapshot = GraphSnapshot.from_graph_data(_graph(), version=1)
+
+        # Note 4 now links to 3 and lost its tag; note 1 was trashed
+        patched = snapshot.replace_notes(
+            {"note-1", "note-4"}, [_note(4)], [_link(4, 3)], version=2,
+        )
+
+        assert patched.version == 2
+        assert "note-1" not in patched.index
+        assert patched.node("tag-1").metadata["note_count"] == 0
+        assert set(patched.neighbors("note-3")) == {"note-2", "note-4"}
+        assert snapshot.node("tag-1").metadata["note_count"] == 2  # original untouched
+
+    def test_replace_notes_with_unknown_tag_needs_rebuild(self):
+        snapshot = GraphSnapshot.from_graph_data(_graph(), version=1)
+
+        assert snapshot.replace_notes({"note-4"}, [_note(4)], [_tagged(4, 2)], version=2) is None
+
+
+class FakeBuilder:
+    user_id = 7
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.full_builds = 0
+        self.patches = []
+
+    def build_full_graph(self, include_semantic=False):
+        self.full_builds += 1
+        return self.graph
+
+    def build_note_patch(self, note_ids):
+        self.patches.append(note_ids)
+        return [_note(i) for i in note_ids], [_link(i, 1) for i in note_ids]
+
+
+class VersionedStore(GraphSnapshotStore):
+    """Store with an in-memory version counter instead of Redis."""
+
+    def __init__(self):
+        super().__init__(redis_url=None)
+        self.current = 0
+        self.changes = []
+
+    def version(self, user_id):
+        return self.current
+
+    def invalidate(self, user_id, node_ids=None):
+        self.current += 1
+        self.changes.append((self.current, list(node_ids) if node_ids else ["*"]))
+
+    def changed_since(self, user_id, since, until):
+        return {n for v, ids in self.changes if since < v <= until for n in ids}
+
+
+class TestLoadGraphSnapshot:
+
+    @pytest.fixture
+    def store(self, monkeypatch):
+        store = VersionedStore()
+        monkeypatch.setattr(graph_snapshot, "_snapshot_store", store)
+        return store
+
+    def test_current_version_is_served_from_cache(self, store):
+        builder = FakeBuilder(_graph())
+
+        first = load_graph_snapshot(builder)
+        second = load_graph_snapshot(builder)
+
+        assert second is first
+        assert builder.full_builds == 1
+        assert store.stats()["hits"] == 1
+
+    def test_note_changes_are_patched(self, store):
+        builder = FakeBuilder(_graph())
+        load_graph_snapshot(builder)
+
+        store.invalidate(7, ["note-4"])
+        snapshot = load_graph_snapshot(builder)
+
+        assert builder.full_builds == 1
+        assert builder.patches == [{4}]
+        assert snapshot.version == 1
+        assert "note-4" in snapshot.neighbors("note-1")
+
+    def test_full_invalidation_rebuilds(self, store):
+        builder = FakeBuilder(_graph())
+        load_graph_snapshot(builder)
+
+        store.invalidate(7, ["note-4"])
+        store.invalidate(7)
+        load_graph_snapshot(builder)
+
+        assert builder.full_builds == 2
+        assert builder.patches == []
+
+    def test_without_redis_nothing_is_cached(self, monkeypatch):
+        monkeypatch.setattr(graph_snapshot, "_snapshot_store", GraphSnapshotStore(redis_url=None))
+        builder = FakeBuilder(_graph())
+
+        load_graph_snapshot(builder)
+        load_graph_snapshot(builder)
+
+        assert builder.full_builds == 2
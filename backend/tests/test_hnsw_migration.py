@@ -0,0 +1,107 @@
+"""
+Unit tests for the HNSW index migration
+
+Tests cover:
+- Invalid indexes left by an interrupted build are dropped and rebuilt
+- IVFFlat indexes are only dropped once their HNSW replacement is valid
+- Concurrent runs skip when another process holds the advisory lock
+"""
+
+from contextlib import contextmanager
+from unittest.mock import Mock
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from migrations import add_hnsw_indexes as migration
+
+
+class FakeConnection:
+    """Simulates the catalog queries the migration runs."""
+
+    def __init__(self, indexes, tables=("notes",), fail_builds=(), locked=False):
+        self.indexes = dict(indexes)  # name -> indisvalid
+        self.tables = set(tables)
+        self.fail_builds = set(fail_builds)
+        self.locked = locked
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = " ".join(str(statement).split())
+        params = params or {}
+        self.statements.append(sql)
+        result = Mock()
+        if "pg_extension" in sql:
+            result.fetchone.return_value = ("0.7.0",)
+        elif "pg_try_advisory_lock" in sql:
+            result.scalar.return_value = not self.locked
+        elif "to_regclass" in sql:
+            result.scalar.return_value = params["table"] if params["table"] in self.tables else None
+        elif "indisvalid" in sql:
+            valid = self.indexes.get(params["name"])
+            result.fetchone.return_value = None if valid is None else (valid,)
+        elif sql.startswith("CREATE INDEX"):
+            name = sql.split()[3]
+            if name in self.fail_builds:
+                self.indexes[name] = False
+                raise RuntimeError("canceling statement due to user request")
+            self.indexes[name] = True
+        elif sql.startswith("DROP INDEX"):
+            self.indexes.pop(sql.split()[-1], None)
+        return result
+
+
+@pytest.fixture
+def run(monkeypatch):
+    monkeypatch.setattr(
+        migration, "EMBEDDING_TABLES", [("notes", "idx_notes_embedding_hnsw", "idx_notes_embedding")]
+    )
+
+    def run(conn):
+        @contextmanager
+        def connect():
+            yield conn
+
+        engine = Mock()
+        engine.connect.return_value.execution_options.return_value = connect()
+        monkeypatch.setattr(migration, "engine", engine)
+        migration.upgrade(m=16, ef_construction=64)
+        return conn
+    return run
+
+
+class TestHnswMigration:
+
+    def test_builds_then_drops_ivfflat(self, run):
+        conn = run(FakeConnection({"idx_notes_embedding": True}))
+
+        assert conn.indexes == {"idx_notes_embedding_hnsw": True}
+        assert conn.statements[-1] == "SELECT pg_advisory_unlock(:key)"
+
+    def test_rebuilds_invalid_index(self, run):
+        conn = run(FakeConnection({"idx_notes_embedding_hnsw": False, "idx_notes_embedding": True}))
+
+        drop = conn.statements.index("DROP INDEX CONCURRENTLY IF EXISTS idx_notes_embedding_hnsw")
+        assert conn.statements[drop + 1].startswith("CREATE INDEX CONCURRENTLY idx_notes_embedding_hnsw")
+        assert conn.indexes == {"idx_notes_embedding_hnsw": True}
+
+    def test_failed_build_keeps_ivfflat(self, run):
+        conn = run(FakeConnection({"idx_notes_embedding": True}, fail_builds={"idx_notes_embedding_hnsw"}))
+
+        # The invalid leftover is cleaned up; the IVFFlat index stays usable
+        assert conn.indexes == {"idx_notes_embedding": True}
+
+    def test_valid_index_left_alone(self, run):
+        conn = run(FakeConnection({"idx_notes_embedding_hnsw": True}))
+
+        assert not any(s.startswith(("CREATE", "DROP")) for s in conn.statements)
+
+    def test_skips_when_locked(self, run):
+        conn = run(FakeConnection({"idx_notes_embedding": True}, locked=True))
+
+        assert conn.indexes == {"idx_notes_embedding": True}
+        assert not any("advisory_unlock" in s for s in conn.statements)
@@ -0,0 +1,223 @@
+"""
+Unit tests for single-statement hybrid search
+
+Tests cover:
+- One fused statement with the ranking weights and per-generator thresholds
+- Fused rows mapped to RankedResults (best method, metadata, ranks)
+- Title tiers bound as parameters with trigram conditions; no title branch without terms
+- Failures roll back and return None so callers can fall back
+- SQL-fused scores extended in Python give the same ranking as pure-Python RRF
+- nexus_vector_search skips the per-method searches in hybrid mode
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from features.nexus.services import vector_search
+from features.rag_chat.services.hybrid_search import (
+    HybridSearchConfig,
+    hybrid_search,
+    results_for_method,
+)
+from features.rag_chat.services.ranking import RankingConfig, reciprocal_rank_fusion
+from features.rag_chat.services.retrieval import RetrievalResult
+
+
+class FakeResult(list):
+    def fetchall(self):
+        return list(self)
+
+
+def _row(source_type, source_id, methods, scores, similarity=0.8, best=None, **extra):
+    values = {
+        "source_type": source_type, "source_id": source_id,
+        "rrf_score": sum(scores), "similarity": similarity,
+        "best_method": best or methods[0], "methods": methods, "scores": scores,
+        "title": f"t{source_id}", "content": f"c{source_id}",
+        "note_id": None, "chunk_type": None, "char_start": None, "char_end": None,
+    }
+    values.update(extra)
+    return SimpleNamespace(**values)
+
+
+def _db(rows=()):
+    """Session recording (sql, params); two set_config calls, then the hybrid statement."""
+    calls = []
+
+    def execute(statement, params):
+        calls.append((str(statement), params))
+        return FakeResult(rows)
+
+    db = Mock()
+    db.execute.side_effect = execute
+    return db, calls
+
+
+def _result(source_id, method="semantic", similarity=0.8):
+    return RetrievalResult(
+        source_type="note", source_id=source_id, title=f"t{source_id}",
+        content="", similarity=similarity, retrieval_method=method,
+    )
+
+
+class TestStatement:
+
+    def test_single_statement_with_weights_and_thresholds(self):
+        db, calls = _db()
+        ranking = RankingConfig(rrf_k=10, semantic_weight=0.4, chunk_weight=0.3, fulltext_weight=0.2)
+        config = HybridSearchConfig(note_min_similarity=0.3, chunk_min_similarity=0.6, top_k=7)
+
+        hybrid_search(db, "tell me about gardening", [0.1, 0.2], owner_id=3, config=config, ranking_config=ranking)
+
+        assert len(calls) == 3
+        assert "hnsw.ef_search" in calls[0][0]
+        assert "pg_trgm.word_similarity_threshold" in calls[1][0]
+        sql, params = calls[2]
+        for cte in ("semantic AS", "chunks AS", "fulltext AS", "title_match AS", "fused AS"):
+            assert cte in sql
+        assert params["query_embedding"] == "[0.1,0.2]"
+        assert (params["rrf_k"], params["semantic_weight"], params["chunk_weight"]) == (10, 0.4, 0.3)
+        assert (params["note_min_similarity"], params["chunk_min_similarity"]) == (0.3, 0.6)
+        assert params["processed_query"] == "gardening"
+        assert params["top_k"] == 7
+
+    def test_title_tiers_are_bound_parameters(self):
+        db, calls = _db()
+
+        hybrid_search(db, 'find "Project X" plans', [0.1], owner_id=3)
+
+        sql, params = calls[-1]
+        assert params["title_exact_0_like"] == "%Project X%"
+        assert params["title_exact_0"] == "Project X"
+        assert {params["title_token_0"], params["title_token_1"]} == {"Project", "plans"}
+        assert ":title_exact_0 <% title" in sql
+        assert "word_similarity(:title_token_0, title) + word_similarity(:title_token_1, title)" in sql
+
+    def test_no_title_terms_means_empty_title_branch(self):
+        db, calls = _db()
+
+        hybrid_search(db, "me", [0.1], owner_id=3)
+
+        sql, params = calls[-1]
+        assert not any(key.startswith("title_") for key in params if key != "title_limit")
+        assert "WHERE false" in sql
+
+    def test_snippet_chars_only_when_requested(self):
+        db, calls = _db()
+
+        hybrid_search(db, "q", [0.1], owner_id=3, config=HybridSearchConfig(snippet_chars=200))
+        hybrid_search(db, "q", [0.1], owner_id=3)
+
+        assert "LEFT(n.content, :snippet_chars)" in calls[2][0]
+        assert "LEFT(n.content" not in calls[5][0]
+
+    def test_failure_rolls_back_and_returns_none(self):
+        db = Mock()
+        db.execute.side_effect = RuntimeError("syntax error in tsquery")
+
+        assert hybrid_search(db, "q", [0.1], owner_id=3) is None
+        db.rollback.assert_called_once()
+
+
+class TestFusedRows:
+
+    def test_rows_become_ranked_results(self):
+        db, _ = _db([
+            _row("note", 1, ["semantic", "direct"], [0.02, 0.05], similarity=0.95, best="direct"),
+            _row("chunk", 8, ["chunk_semantic"], [0.01], note_id=2, chunk_type="paragraph",
+                 char_start=0, char_end=40),
+        ])
+
+        ranked = hybrid_search(db, "q", [0.1], owner_id=3, config=HybridSearchConfig(snippet_chars=200))
+
+        note, chunk = ranked
+        assert (note.rank, chunk.rank) == (1, 2)
+        assert note.rrf_score == note.final_score == pytest.approx(0.07)
+        assert note.method_scores == {"semantic": 0.02, "direct": 0.05}
+        assert note.result.retrieval_method == "direct"
+        assert note.result.metadata == {"full_note": True, "snippet": True, "title_match": True}
+        assert chunk.result.retrieval_method == "semantic"
+        assert chunk.result.metadata["note_id"] == 2
+
+    def test_results_for_method_follow_method_rank(self):
+        db, _ = _db([
+            _row("note", 1, ["fulltext", "semantic"], [0.05, 0.01]),
+            _row("note", 2, ["semantic"], [0.03]),
+            _row("note", 3, ["fulltext"], [0.02]),
+        ])
+
+        ranked = hybrid_search(db, "q", [0.1], owner_id=3)
+
+        assert [r.source_id for r in results_for_method(ranked, "semantic")] == [2, 1]
+        assert results_for_method(ranked, "direct") == []
+
+
+class TestPrefusedRRF:
+
+    def test_matches_python_fusion(self):
+        config = RankingConfig()
+        sql_side = {
+            "semantic": [_result(1), _result(2)],
+            "fulltext": [_result(2, "fulltext", 0.5), _result(3, "fulltext", 0.4)],
+        }
+        graph = {"wikilink": [_result(3, "wikilink", 0.3), _result(4, "wikilink", 0.2)]}
+
+        expected = reciprocal_rank_fusion({**sql_side, **graph}, config)
+        prefused = reciprocal_rank_fusion(sql_side, config)
+        combined = reciprocal_rank_fusion(graph, config, prefused=prefused)
+
+        assert [(r.result.source_id, r.rrf_score) for r in combined] == [
+            (r.result.source_id, r.rrf_score) for r in expected
+        ]
+        assert combined[0].method_scores.keys() == {"semantic", "fulltext"}
+
+
+class TestNexusHybrid:
+
+    def test_hybrid_replaces_per_method_searches(self, monkeypatch):
+        fused = reciprocal_rank_fusion({"semantic": [_result(1), _result(2)]}, RankingConfig())
+        calls = []
+
+        def per_method(*args, **kwargs):
+            calls.append(args)
+            return []
+
+        monkeypatch.setattr(vector_search, "generate_embedding", lambda q: [0.1])
+        monkeypatch.setattr(vector_search, "hybrid_search", lambda *args, **kwargs: fused)
+        for name in ("semantic_search_notes", "semantic_search_chunks", "fulltext_search_notes", "_title_search"):
+            monkeypatch.setattr(vector_search, name, per_method)
+        monkeypatch.setattr(vector_search, "combined_image_retrieval", lambda *args, **kwargs: [])
+        seeds = []
+        monkeypatch.setattr(
+            vector_search, "graph_traversal",
+            lambda db, seed_ids, owner_id, config: seeds.extend(seed_ids) or [_result(5, "wikilink", 0.5)],
+        )
+
+        ranked = vector_search.nexus_vector_search(None, "q", 3, hybrid=True)
+
+        assert calls == []
+        assert seeds == [1, 2]
+        assert [r.result.source_id for r in ranked] == [1, 2, 5]
+
+    def test_failed_hybrid_falls_back(self, monkeypatch):
+        calls = []
+
+        def per_method(name):
+            def search(*args, **kwargs):
+                calls.append(name)
+                return []
+            return search
+
+        monkeypatch.setattr(vector_search, "generate_embedding", lambda q: [0.1])
+        monkeypatch.setattr(vector_search, "hybrid_search", lambda *args, **kwargs: None)
+        for name in ("semantic_search_notes", "semantic_search_chunks", "fulltext_search_notes", "_title_search"):
+            monkeypatch.setattr(vector_search, name, per_method(name))
+
+        assert vector_search.nexus_vector_search(None, "q", 3, include_images=False, hybrid=True) == []
+        assert len(calls) == 4
@@ -0,0 +1,210 @@
+"""
+Unit tests for image renditions
+
+Tests cover:
+- Buckets: no upscaling, one original-size bucket for small images
+- Generation: sizes, EXIF orientation, alpha kept, content-hash filenames, stale files removed
+- Lookup: smallest covering bucket, AVIF only when accepted
+- If-None-Match parsing
+- Rendition endpoint: ETag, 304, fallback to the original, ownership
+"""
+
+import asyncio
+import os
+from types import SimpleNamespace
+
+import pytest
+from pathlib import Path
+from fastapi import Request
+from PIL import Image as PILImage
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from core import config, exceptions
+from features.images import router_crud
+from features.images.service import ImageService
+from features.images.services import image_renditions
+from features.images.services.image_renditions import (
+    ImageRenditionService,
+    bucket_sizes,
+    etag_matches,
+)
+
+
+@pytest.fixture(autouse=True)
+def rendition_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "IMAGE_RENDITION_DIR", str(tmp_path / "renditions"))
+    monkeypatch.setattr(config, "IMAGE_RENDITION_SIZES", [256, 768, 1600])
+    monkeypatch.setattr(image_renditions, "rendition_formats", lambda: ["webp"])
+    return tmp_path / "renditions"
+
+
+def _original(tmp_path, size=(2000, 1000), mode="RGB", name="original.png", **save_kwargs):
+    path = tmp_path / name
+    PILImage.new(mode, size, "red").save(path, **save_kwargs)
+    return str(path)
+
+
+def _files(image_id):
+    return sorted(os.listdir(ImageRenditionService.rendition_dir(image_id)))
+
+
+class TestBuckets:
+
+    def test_large_image_gets_every_bucket(self):
+        assert bucket_sizes(4000, 3000) == [256, 768, 1600]
+
+    def test_small_image_stops_at_first_covering_bucket(self):
+        assert bucket_sizes(500, 300) == [256, 768]
+        assert bucket_sizes(100, 100) == [256]
+
+    def test_bucket_for_requested_size(self):
+        assert [ImageRenditionService.bucket_for(s) for s in (1, 256, 300, 5000)] == [256, 256, 768, 1600]
+
+
+class TestGenerate:
+
+    def test_sizes_and_hash_filenames(self, tmp_path):
+        renditions = ImageRenditionService.generate_renditions(7, _original(tmp_path))
+
+        assert [r.size for r in renditions] == [256, 768, 1600]
+        for rendition in renditions:
+            with PILImage.open(rendition.path) as img:
+                assert img.format == "WEBP"
+                assert max(img.size) == rendition.size
+            assert os.path.basename(rendition.path) == f"{rendition.size}.{rendition.etag}.webp"
+
+    def test_exif_orientation_applied(self, tmp_path):
+        exif = PILImage.Exif()
+        exif[0x0112] = 6  # rotate 90 degrees clockwise
+        path = _original(tmp_path, size=(400, 200), name="rotated.jpg", exif=exif)
+
+        rendition, = [r for r in ImageRenditionService.generate_renditions(1, path) if r.size == 256]
+
+        with PILImage.open(rendition.path) as img:
+            assert img.size == (128, 256)
+
+    def test_alpha_kept(self, tmp_path):
+        path = tmp_path / "alpha.png"
+        PILImage.new("RGBA", (300, 300), (255, 0, 0, 128)).save(path)
+
+        rendition = ImageRenditionService.generate_renditions(1, path)[0]
+
+        with PILImage.open(rendition.path) as img:
+            assert img.mode == "RGBA"
+
+    def test_regeneration_removes_stale_files(self, tmp_path, monkeypatch):
+        path = _original(tmp_path)
+        ImageRenditionService.generate_renditions(1, path)
+        monkeypatch.setattr(config, "IMAGE_RENDITION_SIZES", [512])
+
+        ImageRenditionService.generate_renditions(1, path)
+
+        assert [name.split(".")[0] for name in _files(1)] == ["512"]
+
+    def test_delete(self, tmp_path):
+        ImageRenditionService.generate_renditions(1, _original(tmp_path))
+        ImageRenditionService.delete_renditions(1)
+
+        assert ImageRenditionService.list_renditions(1) == []
+
+
+class TestFind:
+
+    @pytest.fixture
+    def stored(self, rendition_dir):
+        directory = rendition_dir / "1"
+        directory.mkdir(parents=True)
+        for name in ("256.a.webp", "256.b.avif", "768.c.webp", "notes.txt", "768.d.webp.tmp"):
+            (directory / name).write_bytes(b"x")
+
+    def test_smallest_covering_bucket(self, stored):
+        assert ImageRenditionService.find_rendition(1, 200).etag == "a"
+        assert ImageRenditionService.find_rendition(1, 700).etag == "c"
+        assert ImageRenditionService.find_rendition(1, 1600).etag == "c"
+
+    def test_avif_only_when_accepted(self, stored):
+        assert ImageRenditionService.find_rendition(1, 256, "image/avif,image/webp,*/*").format == "avif"
+        assert ImageRenditionService.find_rendition(1, 256, "image/webp,*/*").format == "webp"
+
+    def test_missing(self):
+        assert ImageRenditionService.find_rendition(2, 256) is None
+
+
+class TestEtagMatches:
+
+    def test_matches(self):
+        assert etag_matches('"abc"', "abc")
+        assert etag_matches('"x", W/"abc"', "abc")
+        assert etag_matches("*", "abc")
+
+    def test_no_match(self):
+        assert not etag_matches(None, "abc")
+        assert not etag_matches('"abcd"', "abc")
+
+
+def _request(**headers):
+    return Request({
+        "type": "http",
+        "headers": [(name.lower().replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+class TestEndpoint:
+
+    USER = SimpleNamespace(id=1, username="alice")
+
+    @pytest.fixture
+    def original(self, tmp_path, monkeypatch):
+        image = SimpleNamespace(id=1, owner_id=1, filepath=_original(tmp_path))
+        monkeypatch.setattr(ImageService, "get_image", lambda db, image_id: image)
+        return image.filepath
+
+    def _get(self, endpoint, *args, **headers):
+        return asyncio.run(endpoint(1, *args, _request(**headers), db=None, current_user=self.USER))
+
+    def test_falls_back_to_original(self, original):
+        response = self._get(router_crud.get_image_thumbnail)
+
+        assert response.status_code == 200
+        assert response.path == original
+
+    def test_rendition_with_etag_and_304(self, original):
+        renditions = ImageRenditionService.generate_renditions(1, original)
+
+        response = self._get(router_crud.get_image_rendition, 600)
+        etag = response.headers["etag"]
+
+        assert (response.path, response.media_type) == (renditions[1].path, "image/webp")
+        assert etag == f'"{renditions[1].etag}"'
+        assert response.headers["vary"] == "Accept"
+
+        cached = self._get(router_crud.get_image_rendition, 600, If_None_Match=etag)
+        assert cached.status_code == 304
+        assert cached.body == b""
+        assert cached.headers["etag"] == etag
+
+    def test_original_honours_if_none_match(self, original):
+        etag = self._get(router_crud.get_image_file).headers["etag"]
+
+        assert self._get(router_crud.get_image_file, If_None_Match=etag).status_code == 304
+
+    def test_replaced_original_gets_new_etag(self, original):
+        etag = self._get(router_crud.get_image_file).headers["etag"]
+        PILImage.new("RGB", (40, 30), (0, 0, 255)).save(original, "PNG")
+        os.utime(original, ns=(1, 1))
+
+        response = self._get(router_crud.get_image_file, If_None_Match=etag)
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_other_users_image(self, monkeypatch):
+        monkeypatch.setattr(
+            ImageService, "get_image",
+            lambda db, image_id: SimpleNamespace(id=1, owner_id=2, filepath="x"),
+        )
+
+        with pytest.raises(exceptions.AuthorizationException):
+            self._get(router_crud.get_image_thumbnail)
@@ -0,0 +1,140 @@
+"""
+Unit tests for incremental note re-chunking
+
+Tests cover:
+- Unchanged chunks keep their rows and embeddings and are not re-embedded
+- Edited chunks are replaced and re-embedded
+- Removed chunks are deleted
+- Reused / re-embedded / inserted / deleted counts and the task result
+"""
+
+import pytest
+from pathlib import Path
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+import models
+from features.rag_chat import tasks
+from features.rag_chat.tasks import _rechunk_notes
+
+TABLES = ["users", "notes", "note_chunks"]
+
+INTRO = "The first paragraph explains what the project is about in some detail."
+MIDDLE = "The second paragraph lists the decisions we made during the planning call."
+ENDING = "The third paragraph collects open questions for the next review meeting."
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    tables = models.Base.metadata.tables
+    models.Base.metadata.create_all(engine, tables=[tables[t] for t in TABLES])
+    session = sessionmaker(bind=engine)()
+    session.add(models.User(id=1, username="alice", email="alice@example.com", hashed_password="x"))
+    session.add(models.Note(id=1, title="Plan", content="", owner_id=1))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def embedded(monkeypatch):
+    """Records every text sent for embedding; each vector encodes its text length."""
+    texts = []
+
+    def batch_generate_embeddings(batch):
+        texts.extend(batch)
+        return [[float(len(text))] * 768 for text in batch]
+
+    monkeypatch.setattr(tasks, "batch_generate_embeddings", batch_generate_embeddings)
+    return texts
+
+
+def _rechunk(db, content):
+    note = db.get(models.Note, 1)
+    note.content = content
+    db.commit()
+    return _rechunk_notes(db, [note], generate_embeddings=True)
+
+
+def _chunks(db):
+    db.expire_all()
+    rows = db.query(models.NoteChunk).order_by(models.NoteChunk.chunk_index).all()
+    return [(row.id, row.content, row.embedding[0]) for row in rows]
+
+
+class TestRechunkNotes:
+
+    def test_first_run_embeds_everything(self, db, embedded):
+        stats = _rechunk(db, f"{INTRO}\n\n{MIDDLE}")
+
+        assert stats == {"total": 2, "reused": 0, "reembedded": 2, "inserted": 2, "deleted": 0}
+        assert embedded == [INTRO, MIDDLE]
+
+    def test_unchanged_note_reuses_all(self, db, embedded):
+        _rechunk(db, f"{INTRO}\n\n{MIDDLE}")
+        before = _chunks(db)
+        embedded.clear()
+
+        stats = _rechunk(db, f"{INTRO}\n\n{MIDDLE}")
+
+        assert stats == {"total": 2, "reused": 2, "reembedded": 0, "inserted": 0, "deleted": 0}
+        assert embedded == []
+        assert _chunks(db) == before
+
+    def test_edited_chunk_replaced(self, db, embedded):
+        _rechunk(db, f"{INTRO}\n\n{MIDDLE}")
+        (intro_id, _, intro_vector), (middle_id, _, _) = _chunks(db)
+        embedded.clear()
+        edited = MIDDLE.replace("decisions", "three decisions")
+
+        stats = _rechunk(db, f"{INTRO}\n\n{edited}")
+
+        assert stats == {"total": 2, "reused": 1, "reembedded": 1, "inserted": 0, "deleted": 0}
+        assert embedded == [edited]
+        # Unchanged intro keeps its row and vector; the edited row is recycled
+        assert _chunks(db) == [(intro_id, INTRO, intro_vector), (middle_id, edited, float(len(edited)))]
+
+    def test_removed_chunk_deleted(self, db, embedded):
+        _rechunk(db, f"{INTRO}\n\n{MIDDLE}\n\n{ENDING}")
+        intro, _, ending = _chunks(db)
+        embedded.clear()
+
+        stats = _rechunk(db, f"{INTRO}\n\n{ENDING}")
+
+        assert stats == {"total": 2, "reused": 2, "reembedded": 0, "inserted": 0, "deleted": 1}
+        assert embedded == []
+        # The ending moved up a position but kept its row and embedding
+        assert _chunks(db) == [intro, ending]
+
+    def test_inserted_chunk(self, db, embedded):
+        _rechunk(db, f"{INTRO}\n\n{ENDING}")
+        intro, ending = _chunks(db)
+        embedded.clear()
+
+        stats = _rechunk(db, f"{INTRO}\n\n{MIDDLE}\n\n{ENDING}")
+
+        assert stats == {"total": 3, "reused": 2, "reembedded": 1, "inserted": 1, "deleted": 0}
+        assert embedded == [MIDDLE]
+        assert [row[1] for row in _chunks(db)] == [INTRO, MIDDLE, ENDING]
+        assert [_chunks(db)[0], _chunks(db)[2]] == [intro, ending]
+
+
+class TestGenerateNoteChunksTask:
+
+    def test_reports_reused_counts(self, db, embedded, monkeypatch):
+        monkeypatch.setattr(tasks, "SessionLocal", lambda: db)
+        _rechunk(db, f"{INTRO}\n\n{MIDDLE}")
+        note = db.get(models.Note, 1)
+        note.content = f"{INTRO}\n\n{ENDING}"
+        db.commit()
+
+        result = tasks.generate_note_chunks_task.run(note_id=1)
+
+        assert result == {
+            "status": "success", "note_id": 1, "chunks_created": 2, "chunks_reused": 1,
+            "chunks_reembedded": 1, "chunks_deleted": 0, "embeddings_generated": 1,
+        }
@@ -0,0 +1,247 @@
+"""
+Unit tests for the LLM response cache
+
+Tests cover:
+- Repeated cacheable calls are served without calling the model
+- Key covers model, messages, temperature, max_tokens and context window
+- Empty responses are not cached; disabled cache passes through
+- In-process LRU eviction and expiry
+- Redis tier round-trip, entry cap and failure fallback
+"""
+
+import time
+
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from core import config
+from core.llm import response_cache
+from core.llm.base import LLMMessage, LLMProvider, LLMResponse, ProviderType
+from core.llm.response_cache import LLMResponseCache, make_llm_cache_key
+
+MESSAGES = [LLMMessage(role="user", content="compress this topic")]
+
+
+class CountingProvider(LLMProvider):
+    """Provider that records every real generation."""
+
+    provider_type = ProviderType.OLLAMA
+
+    def __init__(self, content="summary"):
+        self.content = content
+        self.calls = 0
+
+    def generate(self, messages, model, temperature=0.7, max_tokens=2048, **kwargs):
+        self.calls += 1
+        return LLMResponse(content=self.content, model=model, provider=self.provider_type)
+
+    def stream(self, messages, model, temperature=0.7, max_tokens=2048, **kwargs):
+        yield from ()
+
+    def health_check(self):
+        return {}
+
+    def list_models(self):
+        return []
+
+
+class FakeRedis:
+    """Just enough of redis-py for the cache (strings + one sorted set)."""
+
+    def __init__(self):
+        self.values = {}
+        self.index = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def pipeline(self, transaction=False):
+        return FakePipeline(self)
+
+    def zrange(self, key, start, end):
+        ordered = sorted(self.index, key=self.index.get)
+        return [k.encode() for k in ordered[start:end + 1]]
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def set(self, key, value, ex=None):
+        self.ops.append(lambda: self.redis.values.__setitem__(key, value.encode()))
+
+    def zadd(self, key, mapping):
+        self.ops.append(lambda: self.redis.index.update(mapping))
+
+    def zcard(self, key):
+        self.ops.append(lambda: len(self.redis.index))
+
+    def delete(self, *keys):
+        self.ops.append(lambda: [self.redis.values.pop(k, None) for k in keys])
+
+    def zrem(self, key, *members):
+        self.ops.append(lambda: [self.redis.index.pop(m, None) for m in members])
+
+    def execute(self):
+        return [op() for op in self.ops]
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = LLMResponseCache(max_size=10)
+    monkeypatch.setattr(response_cache, "_llm_response_cache", cache)
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", True)
+    return cache
+
+
+class TestGenerateCached:
+
+    def test_second_call_is_served_from_cache(self, cache):
+        provider = CountingProvider()
+
+        first = provider.generate_cached(MESSAGES, model="m", temperature=0.1)
+        second = provider.generate_cached(MESSAGES, model="m", temperature=0.1)
+
+        assert provider.calls == 1
+        assert first.content == second.content == "summary"
+        assert cache.stats()["memory_hits"] == 1
+
+    @pytest.mark.parametrize("change", [
+        {"model": "other"},
+        {"temperature": 0.2},
+        {"max_tokens": 100},
+        {"context_window": 8192},
+        {"messages": [LLMMessage(role="user", content="another topic")]},
+    ])
+    def test_request_parameters_are_part_of_key(self, cache, change):
+        provider = CountingProvider()
+        base = {"messages": MESSAGES, "model": "m", "temperature": 0.1, "max_tokens": 2000}
+
+        provider.generate_cached(**base)
+        provider.generate_cached(**{**base, **change})
+
+        assert provider.calls == 2
+
+    def test_timeout_is_not_part_of_key(self, cache):
+        provider = CountingProvider()
+
+        provider.generate_cached(MESSAGES, model="m", timeout=60)
+        provider.generate_cached(MESSAGES, model="m", timeout=120)
+
+        assert provider.calls == 1
+
+    def test_empty_response_is_not_cached(self, cache):
+        provider = CountingProvider(content="")
+
+        provider.generate_cached(MESSAGES, model="m")
+        provider.generate_cached(MESSAGES, model="m")
+
+        assert provider.calls == 2
+        assert cache.stats()["stores"] == 0
+
+    def test_disabled_cache_passes_through(self, cache, monkeypatch):
+        monkeypatch.setattr(config, "LLM_CACHE_ENABLED", False)
+        provider = CountingProvider()
+
+        provider.generate_cached(MESSAGES, model="m")
+        provider.generate_cached(MESSAGES, model="m")
+
+        assert provider.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_agenerate_cached(self, cache):
+        provider = CountingProvider()
+
+        await provider.agenerate_cached(MESSAGES, model="m", temperature=0.1)
+        response = await provider.agenerate_cached(MESSAGES, model="m", temperature=0.1)
+
+        assert provider.calls == 1
+        assert response.content == "summary"
+
+
+class TestMemoryTier:
+
+    def _response(self, content):
+        return LLMResponse(content=content, model="m", provider=ProviderType.OLLAMA)
+
+    def test_lru_eviction(self):
+        cache = LLMResponseCache(max_size=2)
+        cache.set("a", self._response("a"))
+        cache.set("b", self._response("b"))
+        cache.get("a")  # a is now most recently used
+        cache.set("c", self._response("c"))
+
+        assert cache.get("b") is None
+        assert cache.get("a").content == "a"
+        assert cache.get("c").content == "c"
+
+    def test_expired_entries_are_misses(self, monkeypatch):
+        cache = LLMResponseCache(max_size=2, ttl_seconds=10)
+        cache.set("a", self._response("a"))
+        now = time.time()
+        monkeypatch.setattr(response_cache.time, "time", lambda: now + 11)
+
+        assert cache.get("a") is None
+        assert cache.stats()["misses"] == 1
+
+
+class TestRedisTier:
+
+    def _cache(self, redis, **kwargs):
+        cache = LLMResponseCache(redis_url="redis://test", **kwargs)
+        cache._redis = redis
+        return cache
+
+    def test_shared_between_processes(self):
+        redis = FakeRedis()
+        response = LLMResponse(
+            content="facts", model="m", provider=ProviderType.OLLAMA,
+            input_tokens=12, output_tokens=3,
+        )
+        self._cache(redis).set("k", response)
+
+        other = self._cache(redis)
+        cached = other.get("k")
+
+        assert cached == response
+        assert other.stats()["redis_hits"] == 1
+
+    def test_entry_cap_evicts_oldest(self, monkeypatch):
+        redis = FakeRedis()
+        cache = self._cache(redis, redis_max_entries=2)
+        clock = iter(range(1000, 2000))
+        monkeypatch.setattr(response_cache.time, "time", lambda: next(clock))
+
+        for key in ("a", "b", "c"):
+            cache.set(key, LLMResponse(content=key, model="m", provider=ProviderType.OLLAMA))
+
+        assert sorted(redis.index) == ["b", "c"]
+        assert "llm:a" not in redis.values
+        assert cache.stats()["redis_evictions"] == 1
+
+    def test_redis_failure_falls_back_to_memory(self):
+        class BrokenRedis:
+            def get(self, key):
+                raise ConnectionError("down")
+
+            def pipeline(self, transaction=False):
+                raise ConnectionError("down")
+
+        cache = self._cache(BrokenRedis())
+        response = LLMResponse(content="x", model="m", provider=ProviderType.OLLAMA)
+        cache.set("k", response)
+
+        assert cache.get("k") == response
+        assert cache.get("missing") is None  # Redis skipped during cooldown
+        assert cache.stats()["redis_errors"] == 1
+
+
+def test_key_is_stable_and_namespaced():
+    key = make_llm_cache_key("ollama", "m", MESSAGES, 0.1, 2000)
+
+    assert key == make_llm_cache_key("ollama", "m", list(MESSAGES), 0.1, 2000, {"timeout": 5})
+    assert key.startswith("ollama:m:")
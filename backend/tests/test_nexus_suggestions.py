@@ -0,0 +1,98 @@
+"""
+Unit tests for accepting NEXUS link suggestions
+
+Tests cover:
+- Accepting writes a [[wikilink]] into the source note's content and HTML
+- The accepted link survives the next save of the source note (content sync)
+- Missing notes are rejected without changing the suggestion
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from pathlib import Path
+from fastapi import HTTPException
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from features.graph import note_links
+from features.nexus import router_admin
+from features.nexus.models import NexusLinkSuggestion
+
+
+def _note(id, title, content, html_content=None):
+    return SimpleNamespace(
+        id=id, title=title, slug=title.lower().replace(" ", "-"), content=content,
+        html_content=html_content, owner_id=1, is_trashed=False,
+    )
+
+
+def _db(suggestion, notes):
+    """Mock session: suggestion lookups, then note lookups in query order."""
+    db = Mock()
+    notes = iter(notes)
+
+    def query(model):
+        q = Mock()
+        first = suggestion if model is NexusLinkSuggestion else next(notes)
+        q.filter.return_value.first.return_value = first
+        return q
+
+    db.query.side_effect = query
+    return db
+
+
+def _accept(db):
+    return asyncio.run(router_admin.accept_suggestion.__wrapped__(
+        request=None, suggestion_id=5, db=db, current_user=SimpleNamespace(id=1),
+    ))
+
+
+class TestAcceptSuggestion:
+
+    @pytest.fixture
+    def suggestion(self, monkeypatch):
+        monkeypatch.setattr(
+            "features.graph.services.graph_snapshot.invalidate_graph_snapshot", lambda *a, **kw: None
+        )
+        return SimpleNamespace(id=5, status="pending", source_note_id=10, target_note_id=20)
+
+    def test_writes_wikilink_into_source(self, suggestion, monkeypatch):
+        synced = []
+        monkeypatch.setattr(router_admin, "sync_note_links", lambda db, notes, owner_id: synced.extend(notes))
+        source = _note(10, "Source", "Some text\n", "<p>Some text</p>")
+        target = _note(20, "Target <Note>", "")
+
+        result = _accept(_db(suggestion, [source, target]))
+
+        assert result == {"status": "accepted", "wikilink_created": True}
+        assert source.content == "Some text\n\n[[Target <Note>]]"
+        assert 'data-wikilink-title="Target &lt;Note&gt;"' in source.html_content
+        assert synced == [source]
+        assert suggestion.status == "accepted"
+
+    def test_link_survives_next_save(self, suggestion, monkeypatch):
+        monkeypatch.setattr(router_admin, "sync_note_links", lambda *a: None)
+        source = _note(10, "Source", "Some text")
+        target = _note(20, "Target", "")
+        _accept(_db(suggestion, [source, target]))
+
+        # Saving the source note re-syncs its links from content
+        db = Mock()
+        db.query.return_value.filter.return_value.filter.return_value.all.return_value = [target]
+        db.execute.return_value = [(10, 20)]  # the accepted link
+        inserted = note_links.sync_note_links(db, [source], owner_id=1)
+
+        # Only the existing-links read: nothing deleted, nothing inserted
+        assert inserted == 0
+        assert db.execute.call_count == 1
+
+    def test_missing_target_note(self, suggestion):
+        with pytest.raises(HTTPException) as exc:
+            _accept(_db(suggestion, [_note(10, "Source", "text"), None]))
+
+        assert exc.value.status_code == 404
+        assert suggestion.status == "pending"
@@ -0,0 +1,164 @@
+"""
+Tests for the /notes-enhanced/ listing
+
+Tests cover:
+- Constant number of SQL statements per page, independent of page size
+- Wikilinks, backlinks, tags and images resolved in bulk
+- Keyset cursor pagination walks every note exactly once
+- Offset pagination still works; malformed cursors are rejected
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import Response
+from pathlib import Path
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+import models
+from core import exceptions
+from features.notes.router_graph import get_notes_enhanced
+
+TABLES = [
+    "users", "notes", "tags", "note_tags", "images",
+    "image_tags", "image_note_relations", "note_links",
+]
+START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    tables = models.Base.metadata.tables
+    models.Base.metadata.create_all(engine, tables=[tables[t] for t in TABLES])
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user(db):
+    user = models.User(username="alice", email="alice@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _seed(db, user, count):
+    """Notes in a chain: each links to the previous one, with a tag and an image."""
+    notes = []
+    for i in range(count):
+        note = models.Note(
+            title=f"Note {i}",
+            slug=f"note-{i}",
+            content=f"See [[Note {i - 1}]]" if i else "First",
+            owner_id=user.id,
+            created_at=START + timedelta(minutes=i // 2),  # pairs share a timestamp
+        )
+        note.tags.append(models.Tag(name=f"tag{i}", owner_id=user.id))
+        note.images.append(models.Image(filename=f"{i}.png", owner_id=user.id))
+        notes.append(note)
+    db.add_all(notes)
+    db.flush()
+    db.add_all(
+        models.NoteLink(source_note_id=notes[i].id, target_note_id=notes[i - 1].id)
+        for i in range(1, count)
+    )
+    db.commit()
+    _reset(db, user)
+    return notes
+
+
+def _reset(db, user):
+    """Start from a cold identity map (the request's user is already loaded)."""
+    db.expire_all()
+    db.refresh(user)
+
+
+def _fetch(db, user, **params):
+    response = Response()
+    params.setdefault("skip", 0)
+    params.setdefault("limit", 100)
+    params.setdefault("cursor", None)
+    notes = asyncio.run(get_notes_enhanced(response, current_user=user, db=db, **params))
+    return notes, response.headers.get("X-Next-Cursor")
+
+
+def _count_statements(db, fn):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return len(statements)
+
+
+class TestQueryCount:
+
+    def test_statements_do_not_grow_with_page_size(self, db, user):
+        _seed(db, user, 40)
+
+        small = _count_statements(db, lambda: _fetch(db, user, limit=5))
+        _reset(db, user)
+        large = _count_statements(db, lambda: _fetch(db, user, limit=40))
+
+        assert small == large
+        # notes, tags, images, wikilink targets, backlinks
+        assert large <= 5
+
+
+class TestContent:
+
+    def test_links_tags_and_images(self, db, user):
+        notes = _seed(db, user, 4)
+
+        result, _ = _fetch(db, user)
+        by_id = {n["id"]: n for n in result}
+
+        middle = by_id[notes[1].id]
+        assert middle["linked_notes"] == [notes[0].id]
+        assert middle["backlinks"] == [notes[2].id]
+        assert [t.name for t in middle["tags"]] == ["tag1"]
+        assert len(middle["image_ids"]) == 1
+        assert by_id[notes[3].id]["backlinks"] == []
+
+
+class TestPagination:
+
+    def test_cursor_walks_all_notes_once(self, db, user):
+        notes = _seed(db, user, 11)
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = _fetch(db, user, limit=4, cursor=cursor)
+            seen.extend(n["id"] for n in page)
+            if cursor is None:
+                break
+
+        expected = sorted(notes, key=lambda n: (n.created_at, n.id), reverse=True)
+        assert seen == [n.id for n in expected]
+
+    def test_offset_still_supported(self, db, user):
+        _seed(db, user, 6)
+
+        first, _ = _fetch(db, user, limit=3)
+        second, _ = _fetch(db, user, skip=3, limit=3)
+        everything, cursor = _fetch(db, user)
+
+        assert [n["id"] for n in first + second] == [n["id"] for n in everything]
+        assert cursor is None  # partial page: nothing more to fetch
+
+    def test_malformed_cursor_is_rejected(self, db, user):
+        with pytest.raises(exceptions.ValidationException):
+            _fetch(db, user, cursor="not-a-cursor")
@@ -0,0 +1,193 @@
+"""
+Unit tests for OllamaTransport
+
+Tests cover:
+- One pooled session reused across calls, re-created after fork
+- Default per-endpoint timeouts and caller overrides
+- Latency / response-size histograms and error counts
+- Async requests and streams on the shared AsyncClient
+- Per-loop AsyncClient closed with short-lived task loops
+"""
+
+import asyncio
+import threading
+
+import httpx
+import pytest
+import requests
+import responses
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from core import config
+from core import ollama_transport as transport_module
+from core.ollama_transport import Histogram, OllamaTransport
+
+HOST = "http://localhost:11434"
+
+
+@pytest.fixture
+def transport():
+    return OllamaTransport(pool_size=4)
+
+
+class TestSyncTransport:
+
+    def test_session_is_reused(self, transport):
+        assert transport.session is transport.session
+
+    def test_session_recreated_after_fork(self, transport, monkeypatch):
+        parent = transport.session
+        monkeypatch.setattr(transport_module.os, "getpid", lambda: -1)
+
+        assert transport.session is not parent
+
+    @responses.activate
+    def test_default_and_explicit_timeouts(self, transport):
+        responses.add(responses.GET, f"{HOST}/api/tags", json={"models": []})
+        responses.add(responses.POST, f"{HOST}/api/generate", json={"response": "hi"})
+
+        transport.get(f"{HOST}/api/tags")
+        transport.post(f"{HOST}/api/generate", json={}, timeout=42)
+
+        timeouts = [c.request.req_kwargs["timeout"] for c in responses.calls]
+        assert timeouts == [
+            (config.OLLAMA_CONNECT_TIMEOUT, config.OLLAMA_METADATA_TIMEOUT),
+            (config.OLLAMA_CONNECT_TIMEOUT, 42),
+        ]
+
+    @responses.activate
+    def test_records_latency_size_and_errors(self, transport):
+        responses.add(responses.POST, f"{HOST}/api/embed", body=b"x" * 2000)
+        responses.add(responses.POST, f"{HOST}/api/chat", status=500)
+
+        transport.post(f"{HOST}/api/embed", json={})
+        transport.post(f"{HOST}/api/chat", json={})
+        with pytest.raises(requests.exceptions.ConnectionError):
+            transport.get(f"{HOST}/api/ps")  # not registered -> connection refused
+
+        stats = transport.stats()
+        assert stats["/api/embed"]["requests"] == 1
+        assert stats["/api/embed"]["errors"] == 0
+        assert stats["/api/embed"]["response_bytes"]["buckets"]["4096"] == 1
+        assert stats["/api/chat"]["errors"] == 1
+        assert stats["/api/ps"]["errors"] == 1
+        assert stats["/api/ps"]["response_bytes"]["count"] == 0
+
+
+class TestAsyncTransport:
+
+    @pytest.mark.asyncio
+    async def test_arequest_and_astream(self):
+        def handler(request):
+            assert request.extensions["timeout"]["read"] == config.OLLAMA_GENERATE_TIMEOUT
+
+            async def body():
+                for _ in range(10):
+                    yield b'{"done": true}\n'
+
+            return httpx.Response(200, content=body())
+
+        transport = OllamaTransport(async_transport=httpx.MockTransport(handler))
+
+        response = await transport.apost(f"{HOST}/api/generate", json={})
+        async with transport.astream("POST", f"{HOST}/api/generate", json={}) as stream:
+            lines = [line async for line in stream.aiter_lines()]
+        client = transport.async_client
+        await transport.aclose()
+
+        assert response.status_code == 200
+        assert len(lines) == 10
+        assert client.is_closed
+        stats = transport.stats()["/api/generate"]
+        assert stats["requests"] == 2
+        assert stats["response_bytes"]["count"] == 2
+        assert stats["response_bytes"]["sum"] == 2 * 150
+
+
+class TestAsyncClientLifecycle:
+
+    def _mock_transport(self):
+        return OllamaTransport(async_transport=httpx.MockTransport(lambda r: httpx.Response(200)))
+
+    def _run_task_loop(self, transport):
+        """Mirror the Celery tasks: fresh loop, request, close client, close loop."""
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(transport.apost(f"{HOST}/api/generate", json={}))
+            client = transport._async_client
+        finally:
+            loop.run_until_complete(transport.aclose_async_client())
+            loop.close()
+        return client
+
+    def test_task_loop_closes_its_client(self):
+        transport = self._mock_transport()
+
+        first = self._run_task_loop(transport)
+        second = self._run_task_loop(transport)
+
+        assert first is not second
+        assert first.is_closed and second.is_closed
+        assert transport._async_client is None
+
+    def test_aclose_async_client_ignores_other_loop(self):
+        transport = self._mock_transport()
+        loop = asyncio.new_event_loop()
+        client = loop.run_until_complete(self._client(transport))
+
+        asyncio.run(transport.aclose_async_client())
+
+        assert transport._async_client is client
+        assert not client.is_closed
+        loop.run_until_complete(transport.aclose_async_client())
+        loop.close()
+        assert client.is_closed
+
+    def test_loop_change_closes_client_on_running_loop(self):
+        transport = self._mock_transport()
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            old = asyncio.run_coroutine_threadsafe(self._client(transport), loop).result(5)
+
+            new = asyncio.run(self._client(transport))
+
+            asyncio.run_coroutine_threadsafe(asyncio.sleep(0.05), loop).result(5)
+            assert new is not old
+            assert old.is_closed
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(5)
+            loop.close()
+
+    def test_loop_change_drops_client_of_closed_loop(self):
+        transport = self._mock_transport()
+        loop = asyncio.new_event_loop()
+        old = loop.run_until_complete(self._client(transport))
+        loop.close()
+
+        new = asyncio.run(self._client(transport))
+
+        assert new is not old
+        assert transport._async_client is not old
+
+    @staticmethod
+    async def _client(transport):
+        return transport.async_client
+
+
+class TestHistogram:
+
+    def test_bucket_boundaries_are_inclusive(self):
+        hist = Histogram([1, 10])
+        for value in (0.5, 1, 5, 10, 11):
+            hist.observe(value)
+
+        snapshot = hist.snapshot()
+        assert snapshot["buckets"] == {"1": 2, "10": 2, "+Inf": 1}
+        assert snapshot["count"] == 5
+        assert snapshot["sum"] == 27.5
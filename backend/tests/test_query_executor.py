@@ -0,0 +1,264 @@
+"""
+Unit tests for query_executor.execute_retrieval
+
+Tests cover:
+- Each parallel search gets its own session (never the request session)
+- Image and graph stages run off the semantic results
+- A failing search does not drop the other results
+- Real search functions raise to the executor, which logs the traceback
+- Note searches are asked for snippets only
+- hydrate_note_content loads content for surviving notes in one query
+- Hybrid retrieval seeds image and graph stages from the fused semantic hits
+"""
+
+import logging
+import threading
+from types import SimpleNamespace
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from features.rag_chat.services import query_executor
+from features.rag_chat.services.query_executor import (
+    QueryExecutionConfig,
+    execute_hybrid_retrieval,
+    execute_retrieval,
+)
+from features.rag_chat.services.ranking import RankingConfig, reciprocal_rank_fusion
+from features.nexus.services.vector_search import _title_search
+from features.rag_chat.services.retrieval import (
+    RetrievalResult,
+    fulltext_search_notes,
+    hydrate_note_content,
+)
+
+
+class FakeSession:
+    def __init__(self):
+        self.closed = False
+        self.rolled_back = False
+
+    def execute(self, *args, **kwargs):
+        raise RuntimeError("relation \"notes\" does not exist")
+
+    def rollback(self):
+        self.rolled_back = True
+
+    def close(self):
+        self.closed = True
+
+
+def _result(source_id, source_type="note", content="", snippet=False):
+    return RetrievalResult(
+        source_type=source_type, source_id=source_id,
+        title=f"n{source_id}", content=content, similarity=0.9,
+        metadata={"snippet": snippet},
+    )
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    created = []
+
+    def factory():
+        session = FakeSession()
+        created.append(session)
+        return session
+
+    monkeypatch.setattr(query_executor, "SessionLocal", factory)
+    return created
+
+
+@pytest.fixture
+def searches(monkeypatch):
+    """Replace every search with a stub recording the session it ran on."""
+    calls = {}
+    lock = threading.Lock()
+
+    def stub(name, value):
+        def search(db, *args, **kwargs):
+            with lock:
+                calls[name] = (db, args)
+            if isinstance(value, Exception):
+                raise value
+            return value
+        return search
+
+    def install(**overrides):
+        values = {
+            "semantic_search_notes": [_result(1), _result(2)],
+            "semantic_search_chunks": [_result(3, "chunk")],
+            "fulltext_search_notes": [_result(4)],
+            "_title_search": [_result(5)],
+            "combined_image_retrieval": [_result(6, "image")],
+            "graph_traversal": [_result(7)],
+        }
+        values.update(overrides)
+        for name, value in values.items():
+            monkeypatch.setattr(query_executor, name, stub(name, value))
+        return calls
+
+    return install
+
+
+class TestExecuteRetrieval:
+
+    def test_each_search_uses_own_session(self, sessions, searches):
+        calls = searches()
+        request_db = object()
+
+        execute_retrieval(request_db, "q", [0.1], 1, QueryExecutionConfig())
+
+        used = [db for db, _ in calls.values()]
+        assert len(used) == 6
+        assert request_db not in used
+        assert len({id(db) for db in used}) == 6
+        assert all(s.closed for s in sessions)
+
+    def test_dependent_stages_use_semantic_results(self, sessions, searches):
+        calls = searches()
+
+        semantic, chunk, fulltext, image, graph, title = execute_retrieval(
+            None, "q", [0.1], 1, QueryExecutionConfig()
+        )
+
+        assert calls["combined_image_retrieval"][1][2] == [1, 2]
+        assert calls["graph_traversal"][1][0] == [1, 2]
+        assert calls["graph_traversal"][1][2].snippet_chars == 200
+        assert calls["semantic_search_notes"][1][2].snippet_chars == 200
+        assert calls["fulltext_search_notes"][1][3] == 200
+        assert [r.source_id for r in image] == [6]
+        assert [r.source_id for r in graph] == [7]
+        assert [r.source_id for r in title] == [5]
+
+    def test_no_dependent_stages_without_semantic_results(self, sessions, searches):
+        calls = searches(semantic_search_notes=[])
+
+        execute_retrieval(None, "q", [0.1], 1, QueryExecutionConfig())
+
+        assert "combined_image_retrieval" not in calls
+        assert "graph_traversal" not in calls
+
+    def test_failed_search_keeps_other_results(self, sessions, searches):
+        searches(fulltext_search_notes=RuntimeError("boom"))
+
+        semantic, chunk, fulltext, image, graph, title = execute_retrieval(
+            None, "q", [0.1], 1, QueryExecutionConfig()
+        )
+
+        assert fulltext == []
+        assert len(semantic) == 2 and len(chunk) == 1 and len(graph) == 1
+        assert all(s.closed for s in sessions)
+
+    def test_real_search_errors_reach_executor_log(self, sessions, searches, monkeypatch, caplog):
+        searches()
+        monkeypatch.setattr(query_executor, "fulltext_search_notes", fulltext_search_notes)
+        monkeypatch.setattr(query_executor, "_title_search", _title_search)
+
+        with caplog.at_level(logging.WARNING, logger=query_executor.__name__):
+            semantic, chunk, fulltext, image, graph, title = execute_retrieval(
+                None, "quarterly budget", [0.1], 1, QueryExecutionConfig()
+            )
+
+        assert fulltext == [] and title == []
+        assert len(semantic) == 2
+        failed = {
+            r.getMessage().split()[1]: r for r in caplog.records
+            if r.name == query_executor.__name__ and "search failed" in r.getMessage()
+        }
+        assert set(failed) == {"fulltext", "title"}
+        assert all(r.exc_info for r in failed.values())
+        assert any(s.rolled_back for s in sessions)
+
+    def test_skip_rag_runs_nothing(self, sessions, searches):
+        calls = searches()
+
+        assert execute_retrieval(None, "q", [0.1], 1, QueryExecutionConfig(), skip_rag=True) == (
+            [], [], [], [], [], []
+        )
+        assert calls == {}
+        assert sessions == []
+
+
+class TestExecuteHybridRetrieval:
+
+    def test_dependent_stages_use_fused_semantic_hits(self, sessions, searches, monkeypatch):
+        calls = searches()
+        fused = reciprocal_rank_fusion(
+            {"fulltext": [_result(4)], "semantic": [_result(2), _result(1)]}, RankingConfig()
+        )
+        request_db = object()
+        hybrid_calls = []
+        monkeypatch.setattr(
+            query_executor, "hybrid_search",
+            lambda db, *args: hybrid_calls.append((db, args)) or fused,
+        )
+
+        result, image, graph = execute_hybrid_retrieval(request_db, "q", [0.1], 1, QueryExecutionConfig())
+
+        assert hybrid_calls[0][0] is request_db
+        assert hybrid_calls[0][1][3].snippet_chars == 200
+        assert result is fused
+        assert calls["combined_image_retrieval"][1][2] == [2, 1]
+        assert calls["graph_traversal"][1][0] == [2, 1]
+        assert request_db not in [db for db, _ in calls.values()]
+        assert "semantic_search_notes" not in calls
+        assert [r.source_id for r in image] == [6] and [r.source_id for r in graph] == [7]
+
+    def test_failed_statement_returns_none(self, sessions, searches, monkeypatch):
+        calls = searches()
+        monkeypatch.setattr(query_executor, "hybrid_search", lambda *args: None)
+
+        assert execute_hybrid_retrieval(None, "q", [0.1], 1, QueryExecutionConfig()) is None
+        assert calls == {}
+
+
+class RecordingSession:
+    def __init__(self, contents):
+        self.contents = contents
+        self.calls = []
+
+    def execute(self, statement, params):
+        self.calls.append(params)
+        return [
+            SimpleNamespace(id=i, content=self.contents[i][:params["max_chars"]])
+            for i in params["note_ids"]
+        ]
+
+
+class TestHydrateNoteContent:
+
+    def test_loads_snippet_notes_in_one_query(self):
+        db = RecordingSession({1: "a" * 1000, 2: "b" * 10})
+        results = [
+            _result(1, content="aaa", snippet=True),
+            _result(9, "chunk", content="chunk text"),
+            _result(2, content="bbb", snippet=True),
+        ]
+
+        hydrated = hydrate_note_content(db, results, owner_id=7, max_chars=801)
+
+        assert len(db.calls) == 1
+        assert sorted(db.calls[0]["note_ids"]) == [1, 2]
+        assert [len(r.content) for r in hydrated] == [801, 10, 10]
+        assert hydrated[1] is results[1]
+        assert not hydrated[0].metadata["snippet"]
+
+    def test_does_not_mutate_cached_results(self):
+        db = RecordingSession({1: "full content"})
+        original = _result(1, content="full", snippet=True)
+
+        hydrate_note_content(db, [original], owner_id=7, max_chars=100)
+
+        assert original.content == "full"
+        assert original.metadata["snippet"] is True
+
+    def test_nothing_to_hydrate_skips_query(self):
+        db = RecordingSession({})
+
+        hydrated = hydrate_note_content(db, [_result(1, content="full")], owner_id=7, max_chars=100)
+
+        assert db.calls == []
+        assert hydrated[0].content == "full"
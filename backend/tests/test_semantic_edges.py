@@ -0,0 +1,127 @@
+"""
+Unit tests for SemanticEdgesService similarity computation
+
+Tests cover:
+- Blockwise top-k pairs match a brute-force n x n computation
+- Per-note edge cap, including edges kept from earlier runs
+- Edge cap matches a plain greedy pass in similarity order
+"""
+
+import numpy as np
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from features.graph.services.semantic_edges import SemanticEdgesService
+
+
+@pytest.fixture
+def service():
+    service = SemanticEdgesService(db=None, user_id=1)
+    service.BLOCK_SIZE = 7  # several blocks, last one partial
+    return service
+
+
+def _embeddings(n=30, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    base = rng.normal(size=(4, dim))
+    x = base[rng.integers(0, 4, n)] + 0.5 * rng.normal(size=(n, dim))
+    x = x.astype(np.float32)
+    return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def _brute_force_pairs(x, rows, threshold, k):
+    sims = x @ x.T
+    np.fill_diagonal(sims, -np.inf)
+    pairs = set()
+    for i in rows:
+        for j in np.argsort(-sims[i])[:k]:
+            if sims[i, j] >= threshold:
+                pairs.add((min(i, j), max(i, j)))
+    return pairs
+
+
+def _greedy_cap(lo, hi, existing, cap):
+    degree = list(existing)
+    keep = []
+    for a, b in zip(lo, hi):
+        ok = degree[a] < cap and degree[b] < cap
+        if ok:
+            degree[a] += 1
+            degree[b] += 1
+        keep.append(ok)
+    return keep
+
+
+class TestTopKPairs:
+
+    def test_matches_brute_force(self, service):
+        x = _embeddings()
+        rows = np.arange(len(x))
+
+        lo, hi, sims = service._top_k_pairs(x, rows, threshold=0.5, k=3)
+
+        assert set(zip(lo.tolist(), hi.tolist())) == _brute_force_pairs(x, rows, 0.5, 3)
+        assert np.all(lo < hi)
+        assert np.all(np.diff(sims) <= 0)  # sorted by similarity
+
+    def test_subset_of_rows(self, service):
+        x = _embeddings(seed=1)
+        rows = np.array([2, 5, 17])
+
+        lo, hi, _ = service._top_k_pairs(x, rows, threshold=0.3, k=4)
+
+        assert set(zip(lo.tolist(), hi.tolist())) == _brute_force_pairs(x, rows, 0.3, 4)
+        assert all(a in rows or b in rows for a, b in zip(lo, hi))
+
+
+class TestApplyCap:
+
+    def test_caps_edges_per_note(self):
+        # Pairs in similarity order; note 0 appears in the first three
+        lo = np.array([0, 0, 0, 1])
+        hi = np.array([1, 2, 3, 2])
+
+        keep = SemanticEdgesService._apply_cap(lo, hi, np.zeros(4, dtype=np.int64), max_per_note=2)
+
+        assert keep.tolist() == [True, True, False, True]
+
+    def test_counts_existing_edges(self):
+        lo = np.array([0, 1])
+        hi = np.array([2, 2])
+        existing = np.array([0, 0, 1])
+
+        keep = SemanticEdgesService._apply_cap(lo, hi, existing, max_per_note=2)
+
+        assert keep.tolist() == [True, False]
+
+    def test_rejected_pairs_do_not_use_slots(self):
+        # (0, 2) is rejected at note 0, so note 2 still has room for (2, 3)
+        lo = np.array([0, 0, 2])
+        hi = np.array([1, 2, 3])
+
+        keep = SemanticEdgesService._apply_cap(lo, hi, np.zeros(4, dtype=np.int64), max_per_note=1)
+
+        assert keep.tolist() == [True, False, True]
+
+    @pytest.mark.parametrize("seed", [2, 3, 4])
+    def test_matches_greedy(self, service, seed):
+        x = _embeddings(n=80, seed=seed)
+        lo, hi, _ = service._top_k_pairs(x, np.arange(80), threshold=0.0, k=10)
+        existing = np.random.default_rng(seed).integers(0, 3, 80)
+
+        keep = service._apply_cap(lo, hi, existing, max_per_note=4)
+
+        assert keep.tolist() == _greedy_cap(lo.tolist(), hi.tolist(), existing.tolist(), 4)
+
+    def test_no_note_exceeds_cap(self, service):
+        x = _embeddings(n=60, seed=2)
+        lo, hi, _ = service._top_k_pairs(x, np.arange(60), threshold=0.0, k=8)
+
+        keep = service._apply_cap(lo, hi, np.zeros(60, dtype=np.int64), max_per_note=3)
+
+        degree = np.bincount(np.concatenate([lo[keep], hi[keep]]), minlength=60)
+        assert degree.max() <= 3
+        assert keep.sum() > 0
@@ -0,0 +1,202 @@
+"""
+Unit tests for streamed uploads
+
+Tests cover:
+- Chunked copy hashes while copying and stops one byte past the limit
+- Commit renames into place; discard and failures leave no temp files
+- Blur hash from a file path matches the in-memory version
+- upload_image streams to disk and registers the image off the event loop
+- Oversized uploads are rejected without leaving files behind
+- Failed registrations (lookup or record creation) leave no files behind
+"""
+
+import asyncio
+import hashlib
+import io
+import os
+import threading
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from pathlib import Path
+from fastapi import UploadFile
+from PIL import Image as PILImage
+from starlette.datastructures import Headers
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from core import config, exceptions
+from core.uploads import copy_to_disk, stream_upload_to_disk
+from features.documents import router_upload as document_upload
+from features.documents.service import DocumentService
+from features.images import router_upload
+from features.images.service import ImageService
+
+
+def _png_bytes(size=(640, 480)):
+    buffer = io.BytesIO()
+    PILImage.effect_noise(size, 64).convert("RGB").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def _upload(data, filename="photo.png", content_type="image/png"):
+    return UploadFile(
+        io.BytesIO(data), filename=filename,
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+class TestCopyToDisk:
+
+    def test_hashes_and_commits(self, tmp_path):
+        data = os.urandom(10_000)
+
+        stored = copy_to_disk(io.BytesIO(data), str(tmp_path), max_bytes=20_000, chunk_size=1024)
+        path = stored.commit("final.bin")
+
+        assert (stored.size, stored.sha256) == (10_000, hashlib.sha256(data).hexdigest())
+        assert Path(path).read_bytes() == data
+        assert os.listdir(tmp_path) == ["final.bin"]
+
+    def test_stops_one_byte_past_limit(self, tmp_path):
+        source = io.BytesIO(os.urandom(50_000))
+
+        stored = copy_to_disk(source, str(tmp_path), max_bytes=4_000, chunk_size=1024)
+
+        assert stored.size == 4_001
+        assert source.tell() == 4_001
+        stored.discard()
+        assert os.listdir(tmp_path) == []
+
+    def test_discard_after_commit(self, tmp_path):
+        stored = copy_to_disk(io.BytesIO(b"data"), str(tmp_path), max_bytes=100)
+        stored.commit("final.bin")
+
+        stored.discard()
+
+        assert os.listdir(tmp_path) == []
+
+    def test_failed_copy_leaves_nothing(self, tmp_path):
+        source = Mock()
+        source.read.side_effect = [b"abc", OSError("disk full")]
+
+        with pytest.raises(OSError):
+            copy_to_disk(source, str(tmp_path), max_bytes=100)
+        assert os.listdir(tmp_path) == []
+
+    def test_stream_upload_file(self, tmp_path):
+        data = _png_bytes()
+        upload = _upload(data)
+        upload.file.read()  # already consumed once
+
+        stored = asyncio.run(stream_upload_to_disk(upload, str(tmp_path), max_bytes=len(data)))
+
+        assert stored.size == len(data)
+
+
+class TestBlurHash:
+
+    def test_path_matches_bytes(self, tmp_path):
+        data = _png_bytes()
+        path = tmp_path / "image.png"
+        path.write_bytes(data)
+
+        assert ImageService.generate_blur_hash(str(path)) == ImageService.generate_blur_hash(data)
+        assert ImageService.generate_blur_hash(str(path))[1:] == (640, 480)
+
+
+class TestUploadImage:
+
+    @pytest.fixture
+    def env(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "UPLOAD_DIR", str(tmp_path))
+        env = SimpleNamespace(threads=[], created=[])
+
+        def create_image(db, **kwargs):
+            env.threads.append(threading.get_ident())
+            env.created.append(kwargs)
+            return SimpleNamespace(id=42)
+
+        monkeypatch.setattr(ImageService, "create_image", create_image)
+        monkeypatch.setattr(ImageService, "find_exact_duplicate", lambda *a, **kw: None)
+        monkeypatch.setattr(router_upload.analyze_image_task, "delay", lambda **kw: SimpleNamespace(id="task-1"))
+        monkeypatch.setattr(router_upload.generate_image_renditions_task, "delay", lambda **kw: None)
+        return env
+
+    def _call(self, upload):
+        db = Mock()
+        db.query.return_value.filter.return_value.first.return_value = None
+        user = SimpleNamespace(id=1, username="alice")
+        upload_image = router_upload.upload_image.__wrapped__
+
+        async def run():
+            return threading.get_ident(), await upload_image(
+                request=None, file=upload, prompt=None, album_id=None, auto_tagging=True,
+                max_tags=10, auto_create_note=True, current_user=user, db=db,
+            )
+        return asyncio.run(run())
+
+    def test_registers_off_the_event_loop(self, env, tmp_path):
+        data = _png_bytes()
+
+        loop_thread, response = self._call(_upload(data))
+
+        assert (response.image_id, response.task_id) == (42, "task-1")
+        assert env.threads and env.threads[0] != loop_thread
+        created = env.created[0]
+        assert (created["file_size"], created["width"], created["height"]) == (len(data), 640, 480)
+        assert created["blur_hash"]
+        assert os.listdir(tmp_path) == [response.filename]
+
+    def test_oversized_upload_rejected(self, env, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "MAX_UPLOAD_SIZE_BYTES", 1000)
+
+        with pytest.raises(exceptions.ValidationException):
+            self._call(_upload(_png_bytes()))
+
+        assert env.created == []
+        assert os.listdir(tmp_path) == []
+
+    def test_failed_record_leaves_no_file(self, env, tmp_path, monkeypatch):
+        def create_image(db, **kwargs):
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(ImageService, "create_image", create_image)
+
+        with pytest.raises(exceptions.FileUploadException):
+            self._call(_upload(_png_bytes()))
+
+        assert os.listdir(tmp_path) == []
+
+    def test_failed_duplicate_lookup_leaves_no_file(self, env, tmp_path, monkeypatch):
+        def find_exact_duplicate(*args, **kwargs):
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(ImageService, "find_exact_duplicate", find_exact_duplicate)
+
+        with pytest.raises(exceptions.FileUploadException):
+            self._call(_upload(_png_bytes()))
+
+        assert env.created == []
+        assert os.listdir(tmp_path) == []
+
+
+class TestUploadDocument:
+
+    def test_failed_record_leaves_no_file(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(DocumentService, "find_duplicate", lambda *a, **kw: None)
+
+        def create_document(db, **kwargs):
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(DocumentService, "create_document", create_document)
+        stored = copy_to_disk(io.BytesIO(b"%PDF-1.4"), str(tmp_path), max_bytes=100)
+
+        with pytest.raises(RuntimeError):
+            document_upload._register_upload(
+                Mock(), SimpleNamespace(id=1, username="alice"), stored, "new.pdf", "Report.pdf", None,
+            )
+
+        assert os.listdir(tmp_path) == []
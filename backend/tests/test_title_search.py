@@ -0,0 +1,143 @@
+"""
+Unit tests for trigram title search and slug allocation
+
+Tests cover:
+- next_free_slug finds the lowest free suffix in one statement
+- Own note, other owners and non-numeric suffixes do not collide
+- LIKE wildcards in slugs are matched literally
+- Title tiers match substrings or close variants and rank by word similarity
+- A failing title query (e.g. pg_trgm missing) rolls the session back
+"""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from pathlib import Path
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+import models
+from features.nexus.services.vector_search import _title_query_exact, _title_search
+from features.notes.service import next_free_slug
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    tables = models.Base.metadata.tables
+    models.Base.metadata.create_all(engine, tables=[tables["users"], tables["notes"]])
+    session = sessionmaker(bind=engine, autoflush=False)()
+    session.add_all([
+        models.User(id=1, username="alice", email="alice@example.com", hashed_password="x"),
+        models.User(id=2, username="bob", email="bob@example.com", hashed_password="x"),
+    ])
+    session.commit()
+    yield session
+    session.close()
+
+
+def _notes(db, *slugs, owner_id=1):
+    notes = [models.Note(title=slug, slug=slug, content="", owner_id=owner_id) for slug in slugs]
+    db.add_all(notes)
+    db.commit()
+    return notes
+
+
+class TestNextFreeSlug:
+
+    def test_free_base_slug(self, db):
+        _notes(db, "other")
+        assert next_free_slug(db, "plans", owner_id=1) == "plans"
+
+    def test_lowest_free_suffix_in_one_statement(self, db):
+        _notes(db, "plans", "plans-2", "plans-3", "plans-5")
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db.get_bind(), "before_cursor_execute", record)
+        try:
+            assert next_free_slug(db, "plans", owner_id=1) == "plans-4"
+        finally:
+            event.remove(db.get_bind(), "before_cursor_execute", record)
+        assert len(statements) == 1
+
+    def test_exclude_own_note(self, db):
+        note, _ = _notes(db, "plans", "plans-2")
+        assert next_free_slug(db, "plans", owner_id=1, exclude_note_id=note.id) == "plans"
+
+    def test_ignores_other_owners_and_non_numeric_suffixes(self, db):
+        _notes(db, "plans", "plans-review", "plans-2b")
+        _notes(db, "plans-2", owner_id=2)
+        assert next_free_slug(db, "plans", owner_id=1) == "plans-2"
+
+    def test_wildcards_are_literal(self, db):
+        _notes(db, "a_b", "axb-2")
+        assert next_free_slug(db, "a_b", owner_id=1) == "a_b-2"
+        assert next_free_slug(db, "axb", owner_id=1) == "axb"
+
+
+def _title_db(rows=()):
+    db = Mock()
+    db.execute.return_value = rows
+    return db
+
+
+class TestTitleQueries:
+
+    def test_exact_tier_uses_trigram_match_and_threshold(self):
+        db = _title_db()
+
+        _title_query_exact(db, "Project X", owner_id=1, limit=5)
+
+        threshold, query = db.execute.call_args_list
+        assert "pg_trgm.word_similarity_threshold" in str(threshold[0][0])
+        sql, params = str(query[0][0]), query[0][1]
+        assert "(title ILIKE :search_like OR :search <% title)" in sql
+        assert "word_similarity(:search, title) AS score" in sql
+        assert (params["search"], params["search_like"]) == ("Project X", "%Project X%")
+
+    def test_fuzzy_hits_scored_below_substring_hits(self):
+        db = _title_db([
+            SimpleNamespace(id=1, title="Project X", content="c", contains=True, score=1.0),
+            SimpleNamespace(id=2, title="Projekt X", content="c", contains=False, score=0.8),
+        ])
+
+        exact, fuzzy = _title_query_exact(db, "Project X", owner_id=1, limit=5)
+
+        assert (exact.similarity, exact.metadata["exact_match"]) == (0.95, True)
+        assert (fuzzy.similarity, fuzzy.metadata["exact_match"]) == (0.76, False)
+
+    def test_token_tier_ranks_by_summed_similarity(self):
+        db = _title_db()
+
+        _title_search(db, "quarterly budget", owner_id=1)
+
+        sql = str(db.execute.call_args_list[-1][0][0])
+        assert "(title ILIKE :t0_like OR :t0 <% title) AND (title ILIKE :t1_like OR :t1 <% title)" in sql
+        assert "ORDER BY word_similarity(:t0, title) + word_similarity(:t1, title) DESC" in sql
+
+    def test_failed_query_rolls_back(self):
+        db = Mock()
+        db.execute.side_effect = [None, RuntimeError("operator does not exist: text <% character varying")]
+
+        assert _title_query_exact(db, "Project X", owner_id=1, limit=5) == []
+        db.rollback.assert_called_once()
+
+    def test_every_failed_tier_rolls_back(self):
+        db = Mock()
+
+        def execute(statement, params=None):
+            if "set_config" not in str(statement):
+                raise RuntimeError("function word_similarity does not exist")
+
+        db.execute.side_effect = execute
+
+        assert _title_search(db, "quarterly budget", owner_id=1) == []
+        # One exact tier (the cleaned query) and the token tier
+        assert db.rollback.call_count == 2
@@ -0,0 +1,148 @@
+"""
+Unit tests for the Mnemosyne topic index
+
+Tests cover:
+- Matrix scores equal per-topic cosine similarity (clipped at 0)
+- Missing, zero or mis-sized embeddings score 0
+- Keyword scoring: keyword share, title fallback, no keywords
+- Cached per user; rebuilt on fingerprint change or invalidation
+- select_topics scores from the index (pinned, persistence, budget)
+"""
+
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from pathlib import Path
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from embeddings import cosine_similarity
+from features.mnemosyne_brain.services import topic_index, topic_selector
+from features.mnemosyne_brain.services.topic_index import TopicIndex
+
+
+def _index(embeddings, keywords=None, titles=None, token_counts=None):
+    count = len(embeddings)
+    return TopicIndex(
+        file_keys=[f"topic_{i}" for i in range(count)],
+        titles=titles or [f"Topic {i}" for i in range(count)],
+        token_counts=token_counts or [100] * count,
+        keywords=keywords or [None] * count,
+        embeddings=embeddings,
+    )
+
+
+class TestScores:
+
+    def test_embedding_scores_match_cosine_similarity(self):
+        rng = np.random.default_rng(7)
+        vectors = [list(rng.normal(size=16)) for _ in range(5)]
+        query = list(rng.normal(size=16))
+
+        scores = _index(vectors).embedding_scores(query)
+
+        expected = [max(cosine_similarity(query, v), 0.0) for v in vectors]
+        assert scores == pytest.approx(expected, abs=1e-5)
+
+    def test_unusable_embeddings_score_zero(self):
+        index = _index([[1.0, 0.0], None, [0.0, 0.0], [1.0, 0.0, 0.0]])
+
+        assert list(index.embedding_scores([2.0, 0.0])) == [1.0, 0.0, 0.0, 0.0]
+        assert list(index.embedding_scores(None)) == [0.0] * 4
+        assert list(index.embedding_scores([1.0, 0.0, 0.0])) == [0.0] * 4
+
+    def test_keyword_scores(self):
+        index = _index(
+            [None] * 3,
+            keywords=[["Python", "ML", "pandas", "numpy"], ["garden"], None],
+            titles=["Data", "Garden Planning", "Python Everywhere"],
+        )
+
+        scores = index.keyword_scores("python ml planning")
+
+        assert list(scores) == [0.5, pytest.approx(0.5 / 3), 0.0]
+
+
+class TestCache:
+
+    @pytest.fixture(autouse=True)
+    def clean_cache(self):
+        topic_index.clear_topic_index_cache()
+        yield
+        topic_index.clear_topic_index_cache()
+
+    def _patch(self, monkeypatch, versions):
+        builds = []
+
+        def build(db, user_id, version=None):
+            builds.append(user_id)
+            index = _index([[1.0]])
+            index.version = version
+            return index
+
+        monkeypatch.setattr(topic_index, "topic_version", lambda db, user_id: versions[-1])
+        monkeypatch.setattr(topic_index, "build_topic_index", build)
+        return builds
+
+    def test_reused_until_fingerprint_changes(self, monkeypatch):
+        versions = [(3, "t1")]
+        builds = self._patch(monkeypatch, versions)
+
+        first = topic_index.get_topic_index(None, 1)
+        assert topic_index.get_topic_index(None, 1) is first
+        versions.append((3, "t2"))
+        assert topic_index.get_topic_index(None, 1) is not first
+        assert builds == [1, 1]
+
+    def test_invalidation_forces_rebuild(self, monkeypatch):
+        builds = self._patch(monkeypatch, [(3, "t1")])
+
+        topic_index.get_topic_index(None, 1)
+        topic_index.get_topic_index(None, 2)
+        topic_index.invalidate_topic_index(1)
+        topic_index.get_topic_index(None, 1)
+        topic_index.get_topic_index(None, 2)
+
+        assert builds == [1, 2, 1]
+
+
+class TestSelectTopics:
+
+    def _select(self, monkeypatch, index, **kwargs):
+        monkeypatch.setattr(topic_selector, "get_topic_index", lambda db, user_id: index)
+        return topic_selector.select_topics(Mock(), 1, **kwargs)
+
+    def test_ranked_by_combined_score(self, monkeypatch):
+        index = _index(
+            [[1.0, 0.0], [0.6, 0.8], [0.0, 1.0]],
+            keywords=[None, ["gardening"], None],
+        )
+
+        selected = self._select(
+            monkeypatch, index, query="gardening", query_embedding=[1.0, 0.0], max_topics=5,
+        )
+
+        assert [t.file_key for t in selected] == ["topic_1", "topic_0"]
+        assert selected[0].score == pytest.approx(0.3 + 0.7 * 0.6)
+        assert (selected[0].match_method, selected[1].match_method) == ("both", "embedding")
+
+    def test_pinned_persistent_and_budget(self, monkeypatch):
+        index = _index(
+            [[1.0, 0.0], [0.0, 1.0], [0.9, 0.1]],
+            token_counts=[100, 100, 900],
+        )
+
+        selected = self._select(
+            monkeypatch, index, query="q", query_embedding=[1.0, 0.0],
+            token_budget=1000, pinned_topics=["topic_1", "missing"],
+            previously_loaded_topics=["topic_0"],
+        )
+
+        assert [t.file_key for t in selected] == ["topic_1", "topic_0"]
+        assert selected[0].match_method == "pinned" and selected[0].score == 1.0
+        assert selected[1].match_method == "embedding+persistent"
+
+    def test_no_topics(self, monkeypatch):
+        assert self._select(monkeypatch, _index([]), query="q") == []
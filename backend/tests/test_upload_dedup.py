@@ -0,0 +1,257 @@
+"""
+Unit tests for upload deduplication
+
+Tests cover:
+- dHash is stable under resizing and re-encoding, and differs for other images
+- Near-duplicate report groups exact and perceptual matches
+- Duplicate image uploads reuse the existing image without re-running analysis
+- Exact duplicates only match analyses run with the same prompt (real query)
+- Duplicate document uploads are only reused with the same instructions
+"""
+
+import asyncio
+import io
+import os
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from pathlib import Path
+from fastapi import UploadFile
+from PIL import Image as PILImage
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.datastructures import Headers
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+import models
+from core import config
+from features.documents import router_upload as document_upload
+from features.documents.service import DocumentService
+from features.images import router_upload
+from features.images.service import ImageService
+from features.images.services.image_dedup import ImageDedupService, compute_dhash
+
+
+def _distance(a, b):
+    return bin((a ^ b) & ((1 << 64) - 1)).count("1")
+
+
+def _photo(seed=0, size=(800, 600)):
+    """Smooth gradient with a few shapes - stands in for a photo or screenshot."""
+    img = PILImage.linear_gradient("L").resize(size).convert("RGB")
+    for i in range(4):
+        box = ((seed * 97 + i * 150) % 600, (seed * 53 + i * 110) % 400)
+        img.paste((255 - i * 60, i * 60, (seed * 40) % 255), box + (box[0] + 120, box[1] + 120))
+    return img
+
+
+def _encode(img, fmt="PNG", **params):
+    buffer = io.BytesIO()
+    img.save(buffer, fmt, **params)
+    return buffer.getvalue()
+
+
+class TestPerceptualHash:
+
+    def test_stable_under_resize_and_reencode(self, tmp_path):
+        original = _photo()
+        path = tmp_path / "copy.jpg"
+        original.resize((400, 300)).save(path, "JPEG", quality=60)
+
+        assert _distance(compute_dhash(original), compute_dhash(str(path))) <= config.IMAGE_NEAR_DUPLICATE_DISTANCE
+
+    def test_different_images_are_far_apart(self):
+        assert _distance(compute_dhash(_photo(seed=1)), compute_dhash(_photo(seed=5).rotate(90))) > 10
+
+    def test_fits_signed_bigint(self):
+        value = compute_dhash(_photo())
+        assert -(1 << 63) <= value < (1 << 63)
+
+    def test_undecodable_file(self, tmp_path):
+        path = tmp_path / "broken.png"
+        path.write_bytes(b"not an image")
+        assert compute_dhash(str(path)) is None
+
+
+class TestNearDuplicateReport:
+
+    def _db(self, rows):
+        db = Mock()
+        db.query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [
+            SimpleNamespace(id=i, content_hash=c, perceptual_hash=p) for i, c, p in rows
+        ]
+        return db
+
+    def test_groups_exact_and_near(self):
+        base = compute_dhash(_photo())
+        db = self._db([
+            (1, "aaa", base),
+            (2, "aaa", base),
+            (3, "bbb", base ^ 0b111),        # 3 bits apart
+            (4, "ccc", base ^ (1 << 40)),    # 1 bit apart
+            (5, "ddd", ~base),               # unrelated
+            (6, "eee", None),
+            (7, "eee", None),                # exact, no perceptual hash
+        ])
+
+        groups = ImageDedupService.find_near_duplicates(db, owner_id=1, max_distance=4)
+
+        assert [(g.image_ids, g.exact, g.max_distance) for g in groups] == [
+            ([1, 2, 3, 4], False, 4),
+            ([6, 7], True, 0),
+        ]
+
+    def test_no_images(self):
+        assert ImageDedupService.find_near_duplicates(self._db([]), owner_id=1) == []
+
+
+class TestDuplicateImageUpload:
+
+    @pytest.fixture
+    def env(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "UPLOAD_DIR", str(tmp_path))
+        env = SimpleNamespace(created=[], queued=[], existing=None)
+        monkeypatch.setattr(ImageService, "find_exact_duplicate", lambda *a, **kw: env.existing)
+        monkeypatch.setattr(
+            ImageService, "create_image",
+            lambda db, **kw: env.created.append(kw) or SimpleNamespace(id=7),
+        )
+        monkeypatch.setattr(
+            router_upload.analyze_image_task, "delay",
+            lambda **kw: env.queued.append(kw) or SimpleNamespace(id="task-1"),
+        )
+        monkeypatch.setattr(router_upload.generate_image_renditions_task, "delay", lambda **kw: None)
+        return env
+
+    def _call(self, data):
+        upload = UploadFile(io.BytesIO(data), filename="shot.png", headers=Headers({"content-type": "image/png"}))
+        return asyncio.run(router_upload.upload_image.__wrapped__(
+            request=None, file=upload, prompt=None, album_id=None, auto_tagging=True, max_tags=10,
+            auto_create_note=True, current_user=SimpleNamespace(id=1, username="alice"), db=Mock(),
+        ))
+
+    def test_new_upload_stores_hashes(self, env):
+        self._call(_encode(_photo()))
+
+        created = env.created[0]
+        assert len(created["content_hash"]) == 64
+        assert created["perceptual_hash"] == compute_dhash(_photo())
+        assert len(env.queued) == 1
+
+    def test_duplicate_reuses_existing_image(self, env, tmp_path):
+        env.existing = SimpleNamespace(
+            id=3, filename="first.png", prompt=None, ai_analysis_status="completed"
+        )
+
+        response = self._call(_encode(_photo()))
+
+        assert (response.image_id, response.filename, response.deduplicated) == (3, "first.png", True)
+        assert response.analysis_status == "completed" and response.task_id is None
+        assert env.created == [] and env.queued == []
+        assert os.listdir(tmp_path) == []
+
+    def test_dedup_disabled(self, env, monkeypatch):
+        monkeypatch.setattr(config, "UPLOAD_DEDUP_ENABLED", False)
+        env.existing = SimpleNamespace(id=3)
+
+        response = self._call(_encode(_photo()))
+
+        assert (response.image_id, response.deduplicated) == (7, False)
+
+
+class TestExactDuplicateQuery:
+
+    @pytest.fixture
+    def db(self):
+        engine = create_engine("sqlite://")
+        tables = models.Base.metadata.tables
+        models.Base.metadata.create_all(engine, tables=[tables["users"], tables["images"]])
+        session = sessionmaker(bind=engine)()
+        session.add(models.User(id=1, username="alice", email="alice@example.com", hashed_password="x"))
+        for id, prompt, status in [
+            (1, "Read the chart labels", "completed"),
+            (2, None, "failed"),
+            (3, None, "completed"),
+        ]:
+            session.add(models.Image(
+                id=id, filename=f"{id}.png", filepath=f"{id}.png", owner_id=1, prompt=prompt,
+                ai_analysis_status=status, content_hash="a" * 64,
+            ))
+        session.commit()
+        yield session
+        session.close()
+
+    def _find(self, db, prompt=None, owner_id=1):
+        image = ImageDedupService.find_exact_duplicate(db, owner_id, "a" * 64, prompt)
+        return image.id if image else None
+
+    def test_no_prompt_skips_custom_prompt_and_failed(self, db):
+        assert self._find(db) == 3
+
+    def test_matching_prompt(self, db):
+        assert self._find(db, "Read the chart labels") == 1
+        assert self._find(db, "Something else") is None
+
+    def test_other_owner_and_trash(self, db):
+        assert self._find(db, owner_id=2) is None
+        db.get(models.Image, 3).is_trashed = True
+        db.commit()
+        assert self._find(db) is None
+
+
+class TestDuplicateDocumentUpload:
+
+    @pytest.fixture
+    def env(self, tmp_path, monkeypatch):
+        env = SimpleNamespace(created=[], lookups=[], existing=None)
+
+        def find_duplicate(db, owner_id, content_hash, instructions=None):
+            env.lookups.append((content_hash, instructions))
+            return env.existing
+
+        monkeypatch.setattr(DocumentService, "find_duplicate", find_duplicate)
+        monkeypatch.setattr(
+            DocumentService, "create_document",
+            lambda db, **kw: env.created.append(kw) or SimpleNamespace(id=9),
+        )
+        from features.documents import tasks
+        monkeypatch.setattr(tasks.analyze_document_task, "delay", lambda **kw: SimpleNamespace(id="task-2"))
+        env.stored = SimpleNamespace(sha256="f" * 64, size=100, discard=Mock(), commit=lambda name: name)
+        return env
+
+    def _register(self, env, instructions=None):
+        return document_upload._register_upload(
+            Mock(), SimpleNamespace(id=1, username="alice"), env.stored, "new.pdf", "Report.pdf", instructions,
+        )
+
+    def test_duplicate_reused(self, env):
+        env.existing = SimpleNamespace(id=5, filename="report.pdf", ai_analysis_status="completed")
+
+        doc, task_id, reused = self._register(env)
+
+        assert (doc.id, task_id, reused) == (5, None, True)
+        assert env.lookups == [("f" * 64, None)]
+        env.stored.discard.assert_called_once()
+        assert env.created == []
+
+    def test_new_upload_records_hash_and_instructions(self, env):
+        doc, task_id, reused = self._register(env, "Summarise the financials")
+
+        assert (doc.id, task_id, reused) == (9, "task-2", False)
+        assert env.lookups == [("f" * 64, "Summarise the financials")]
+        created = env.created[0]
+        assert (created["content_hash"], created["analysis_instructions"]) == ("f" * 64, "Summarise the financials")
+
+    def test_lookup_filters_on_instructions(self):
+        db = Mock()
+        query = db.query.return_value.filter.return_value
+
+        DocumentService.find_duplicate(db, 1, "f" * 64)
+        DocumentService.find_duplicate(db, 1, "f" * 64, "Summarise")
+
+        no_instructions, with_instructions = (str(call.args[0]) for call in query.filter.call_args_list)
+        assert "analysis_instructions IS NULL" in no_instructions
+        assert with_instructions == "documents.analysis_instructions = :analysis_instructions_1"
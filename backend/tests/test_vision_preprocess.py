@@ -0,0 +1,148 @@
+"""
+Unit tests for vision input pre-processing
+
+Tests cover:
+- Per-model longest edge (prefix overrides)
+- Large images downscaled and re-encoded; EXIF orientation applied; alpha flattened
+- Small upright JPEG/PNG files sent unchanged
+- Prepared files cached by content hash and reused; cache pruned by size
+- ModelRouter sends the prepared file and reports bytes saved and latency
+"""
+
+import os
+from unittest.mock import Mock
+
+import pytest
+from pathlib import Path
+from PIL import Image as PILImage
+
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent / "app"))
+
+from adapters.image_preprocessor import max_edge_for, prepare_image, prune_cache, try_prepare_image
+from core import config
+from model_router import ModelRouter
+
+
+@pytest.fixture(autouse=True)
+def vision_config(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "VISION_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(config, "VISION_MAX_EDGE", 500)
+    monkeypatch.setattr(config, "VISION_MAX_EDGE_BY_MODEL", {"llama3.2-vision": 280, "llama": 350})
+    monkeypatch.setattr(config, "VISION_IMAGE_FORMAT", "jpeg")
+    monkeypatch.setattr(config, "VISION_PREPROCESS_ENABLED", True)
+
+
+def _image(tmp_path, size, name="photo.png", mode="RGB", color="red", noise=False, **save_kwargs):
+    path = tmp_path / name
+    img = PILImage.effect_noise(size, 64).convert(mode) if noise else PILImage.new(mode, size, color)
+    img.save(path, **save_kwargs)
+    return str(path)
+
+
+class TestMaxEdge:
+
+    def test_longest_prefix_wins(self):
+        assert max_edge_for("llama3.2-vision:11b") == 280
+        assert max_edge_for("llama4:scout") == 350
+        assert max_edge_for("qwen2.5vl:7b") == 500
+
+
+class TestPrepare:
+
+    def test_large_image_downscaled_and_cached(self, tmp_path):
+        path = _image(tmp_path, (1500, 1000), noise=True)
+
+        prepared = prepare_image(path, "qwen2.5vl:7b")
+
+        assert prepared.path != path and not prepared.cache_hit
+        assert prepared.prepared_bytes < prepared.original_bytes
+        with PILImage.open(prepared.path) as img:
+            assert (img.format, img.size) == ("JPEG", (500, 333))
+
+        again = prepare_image(path, "qwen2.5vl:7b")
+        assert again.cache_hit and again.path == prepared.path
+
+    def test_cache_is_per_edge(self, tmp_path):
+        path = _image(tmp_path, (1500, 1000), noise=True)
+
+        qwen = prepare_image(path, "qwen2.5vl:7b")
+        llama = prepare_image(path, "llama3.2-vision:11b")
+
+        assert qwen.path != llama.path and not llama.cache_hit
+        with PILImage.open(llama.path) as img:
+            assert max(img.size) == 280
+
+    def test_small_upright_image_sent_unchanged(self, tmp_path):
+        path = _image(tmp_path, (400, 300), name="small.jpg")
+
+        prepared = prepare_image(path, "qwen2.5vl:7b")
+
+        assert prepared.path == path and prepared.bytes_saved == 0
+        assert not os.path.exists(config.VISION_CACHE_DIR)
+
+    def test_exif_orientation_applied(self, tmp_path):
+        exif = PILImage.Exif()
+        exif[0x0112] = 6
+        path = _image(tmp_path, (200, 100), name="rotated.jpg", exif=exif)
+
+        prepared = prepare_image(path, "qwen2.5vl:7b")
+
+        with PILImage.open(prepared.path) as img:
+            assert img.size == (100, 200)
+
+    def test_alpha_and_webp_converted(self, tmp_path):
+        path = _image(tmp_path, (300, 300), name="alpha.webp", mode="RGBA", color=(0, 0, 255, 0))
+
+        prepared = prepare_image(path, "qwen2.5vl:7b")
+
+        with PILImage.open(prepared.path) as img:
+            assert (img.format, img.mode) == ("JPEG", "RGB")
+            assert img.getpixel((10, 10)) == pytest.approx((255, 255, 255), abs=2)
+
+    def test_failures_fall_back_to_original(self, tmp_path):
+        broken = tmp_path / "broken.png"
+        broken.write_bytes(b"not an image")
+
+        assert try_prepare_image(str(broken), "qwen2.5vl:7b") is None
+        assert try_prepare_image(str(tmp_path / "missing.png"), "qwen2.5vl:7b") is None
+
+    def test_prune_removes_least_recently_used(self, tmp_path, monkeypatch):
+        cache = tmp_path / "cache"
+        cache.mkdir()
+        for i, name in enumerate(("old", "mid", "new")):
+            (cache / name).write_bytes(b"x" * 600_000)
+            os.utime(cache / name, (1000 + i, 1000 + i))
+        monkeypatch.setattr(config, "VISION_CACHE_MAX_MB", 1)
+
+        assert prune_cache() == 2
+        assert os.listdir(cache) == ["new"]
+
+
+class TestRouter:
+
+    def test_adapter_gets_prepared_file_and_result_reports_savings(self, tmp_path):
+        path = _image(tmp_path, (1500, 1000), noise=True)
+        router = ModelRouter(ollama_host="http://localhost:11434", use_new_model=False)
+        router.llama_adapter = Mock(model_name="llama3.2-vision:11b")
+        router.llama_adapter.analyze_image.return_value = {"status": "success", "response": "ok"}
+
+        result = router.analyze_image(image_path=path)
+
+        sent = router.llama_adapter.analyze_image.call_args.kwargs["image_path"]
+        assert sent.startswith(config.VISION_CACHE_DIR)
+        assert result["preprocessing"]["max_edge"] == 280
+        assert result["preprocessing"]["bytes_saved"] > 0
+        assert isinstance(result["latency_ms"], int)
+
+    def test_disabled_sends_original(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(config, "VISION_PREPROCESS_ENABLED", False)
+        path = _image(tmp_path, (1500, 1000))
+        router = ModelRouter(ollama_host="http://localhost:11434", vision_model="qwen2.5vl:7b")
+        router.generic_adapter = Mock(model_name="qwen2.5vl:7b")
+        router.generic_adapter.analyze_image.return_value = {"status": "success", "response": "ok"}
+
+        result = router.analyze_image(image_path=path)
+
+        assert router.generic_adapter.analyze_image.call_args.kwargs["image_path"] == path
+        assert "preprocessing" not in result
@@ -0,0 +1,61 @@
+"""
+Tests for the shared WikilinkResolver (features/graph/note_links.py).
+
+Tests cover:
+- load_all reads every link in a single query
+- prefetch batches uncached notes and skips cached ones
+- outgoing/backlinks lookups after loading
+"""
+
+import pytest
+from unittest.mock import Mock
+from sqlalchemy.orm import Session
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+from features.graph.note_links import WikilinkResolver
+
+
+@pytest.fixture
+def mock_db():
+    return Mock(spec=Session)
+
+
+class TestWikilinkResolver:
+
+    def test_load_all_single_query(self, mock_db):
+        mock_db.execute.return_value = [(1, 2), (1, 3), (3, 2)]
+        resolver = WikilinkResolver(mock_db, 100)
+
+        resolver.load_all()
+
+        assert sorted(resolver.outgoing(1)) == [2, 3]
+        assert sorted(resolver.backlinks(2)) == [1, 3]
+        assert resolver.outgoing(2) == []
+        assert resolver.backlinks(99) == []
+        assert mock_db.execute.call_count == 1
+
+    def test_load_all_is_idempotent(self, mock_db):
+        mock_db.execute.return_value = [(1, 2)]
+        resolver = WikilinkResolver(mock_db, 100)
+
+        resolver.load_all()
+        resolver.load_all()
+        resolver.prefetch([1, 2, 3])
+
+        assert mock_db.execute.call_count == 1
+
+    def test_prefetch_batches_and_caches(self, mock_db):
+        # First statement: outgoing (source, target); second: backlinks (target, source)
+        mock_db.execute.side_effect = [[(1, 2)], [(1, 5)]]
+        resolver = WikilinkResolver(mock_db, 100)
+
+        resolver.prefetch([1, 2])
+        assert mock_db.execute.call_count == 2
+
+        assert resolver.outgoing(1) == [2]
+        assert resolver.backlinks(1) == [5]
+        assert resolver.outgoing(2) == []
+        assert mock_db.execute.call_count == 2